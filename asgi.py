@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Ponto de entrada ASGI (uvicorn/hypercorn), ao lado do WSGI (gunicorn 'gestao:criar_app()')
+
+    pip install asgiref uvicorn
+    uvicorn asgi:application --host 0.0.0.0 --port 8080 --workers $WEB_CONCURRENCY
+
+(--workers deve ser o mesmo WEB_CONCURRENCY que o app lê: com mais de um worker o estado
+compartilhado vai para o banco, ver shared_state.workers_configurados)
+
+- GET /api/async/romaneio/<id>: dados do romaneio (IMPRESSOES + IMPRESSAO_ITENS +
+  Solicitações) em JSON, lidos pela camada assíncrona (async_io.py). Enquanto espera o
+  Sheets a requisição não ocupa thread: o limite é o executor de I/O, não as threads do servidor.
+- Todo o resto: o app Flask de sempre (asgiref.WsgiToAsgi, uma thread por requisição).
+
+A sessão é a mesma do app (cookie assinado com SECRET_KEY), então o usuário logado nas
+telas também acessa a rota assíncrona.
+"""
+
+import json
+import time
+
+from async_io import executar_async, ler_abas_async
+from logging_config import obter_logger
+from metrics import METRICAS_HABILITADAS, _rota_atual, registro as registro_metricas
+from gestao import criar_app
+from gestao.auth.session import load_user, sessao_expirada
+from gestao.factory import iniciar_aquecimento
+from gestao.romaneio.processing import montar_romaneio_processamento
+from gestao.sheets.connection import get_google_sheets_connection
+from gestao.sheets.data import NOMES_ABA_SOLICITACOES
+
+logger = obter_logger(__name__)
+
+app = criar_app()
+
+PREFIXO_ROMANEIO = '/api/async/romaneio/'
+
+_wsgi = None
+
+
+def _app_wsgi():
+    """App Flask adaptado para ASGI (asgiref só é necessário com este ponto de entrada)"""
+    global _wsgi
+    if _wsgi is None:
+        try:
+            from asgiref.wsgi import WsgiToAsgi
+        except ImportError as e:
+            raise ImportError('asgi.py precisa do asgiref (pip install asgiref uvicorn)') from e
+        _wsgi = WsgiToAsgi(app)
+    return _wsgi
+
+
+def _sessao(scope):
+    """Sessão do Flask a partir dos cabeçalhos da requisição ASGI"""
+    cabecalhos = {nome.decode('latin-1').lower(): valor.decode('latin-1') for nome, valor in scope.get('headers', [])}
+    environ = {
+        'REQUEST_METHOD': scope.get('method', 'GET'),
+        'PATH_INFO': scope.get('path', '/'),
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'HTTP_COOKIE': cabecalhos.get('cookie', ''),
+    }
+    return app.session_interface.open_session(app, app.request_class(environ))
+
+
+def _autenticado(sessao):
+    """
+    Mesmas regras das telas (gestao.auth.session): usuário na sessão, dentro do tempo de
+    inatividade, e que ainda existe e está ativo (load_user, com o cache de usuários)
+    """
+    if not sessao or not sessao.get('_user_id') or sessao_expirada(sessao):
+        return False
+    with app.app_context():
+        try:
+            return load_user(sessao['_user_id']) is not None
+        except (ValueError, TypeError):
+            return False
+
+
+async def _responder(send, status, corpo):
+    conteudo = json.dumps(corpo, ensure_ascii=False, default=str).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json; charset=utf-8'),
+                    (b'content-length', str(len(conteudo)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': conteudo})
+
+
+async def romaneio_async(scope):
+    """GET /api/async/romaneio/<id>: romaneio e itens com quantidades separadas e saldos"""
+    id_impressao = scope['path'][len(PREFIXO_ROMANEIO):].strip('/')
+    if not await executar_async(_autenticado, _sessao(scope)):
+        return 401, {'success': False, 'message': 'Login necessário'}
+    try:
+        sheet = await executar_async(get_google_sheets_connection)
+        if not sheet:
+            return 503, {'success': False, 'message': 'Erro ao conectar com Google Sheets'}
+        abas = await ler_abas_async(sheet, ["IMPRESSOES", "IMPRESSAO_ITENS", NOMES_ABA_SOLICITACOES])
+        if abas[NOMES_ABA_SOLICITACOES[0]] is None:
+            return 500, {'success': False, 'message': 'Aba de solicitações não encontrada'}
+        romaneio, itens = montar_romaneio_processamento(
+            id_impressao, abas["IMPRESSOES"] or [], abas["IMPRESSAO_ITENS"] or [], abas[NOMES_ABA_SOLICITACOES[0]])
+    except Exception as e:
+        logger.exception("❌ Erro ao buscar romaneio %s (ASGI): %s", id_impressao, e)
+        return 500, {'success': False, 'message': str(e)}
+    if not romaneio:
+        return 404, {'success': False, 'message': 'Romaneio não encontrado'}
+    return 200, {'success': True, 'romaneio': romaneio, 'itens': itens}
+
+
+async def _lifespan(receive, send):
+    while True:
+        mensagem = await receive()
+        if mensagem['type'] == 'lifespan.startup':
+            # O servidor já escuta a porta: cache do Sheets aquecido em segundo plano
+            iniciar_aquecimento(app)
+            await send({'type': 'lifespan.startup.complete'})
+        elif mensagem['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """Aplicação ASGI: rotas assíncronas próprias e o app Flask para o resto"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] == 'http' and scope['path'].startswith(PREFIXO_ROMANEIO) and scope['method'] == 'GET':
+        inicio = time.perf_counter()
+        token = _rota_atual.set('async_romaneio')
+        try:
+            status, corpo = await romaneio_async(scope)
+        finally:
+            _rota_atual.reset(token)
+        await _responder(send, status, corpo)
+        if METRICAS_HABILITADAS:
+            registro_metricas.observar('app_requisicao_segundos', ('async_romaneio', 'GET', str(status)),
+                                       time.perf_counter() - inicio)
+        return
+    await _app_wsgi()(scope, receive, send)
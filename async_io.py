@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Camada assíncrona de acesso ao Google Sheets e ao Cloud Storage
+
+As bibliotecas (gspread, google-cloud-storage) são síncronas: cada chamada bloqueia a
+thread durante o round-trip HTTP. Aqui cada chamada roda no executor de I/O do processo
+(fanout.py, IO_MAX_WORKERS) e as independentes são aguardadas juntas com asyncio.gather, então
+a latência de uma rota fica perto da chamada mais lenta e não da soma de todas.
+
+- Código assíncrono (asgi.py): await ler_abas_async(...), await ler_blobs_async(...)
+- Código síncrono: ler_abas(...), ler_blobs(...) rodam as mesmas corrotinas num laço de
+  eventos próprio do processo e devolvem o resultado na thread de quem chamou (as rotas
+  Flask usam fanout.py direto, sem passar pelo laço)
+
+O contexto de quem chama (rota atual das métricas) segue junto para cada chamada.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+
+from fanout import executor_compartilhado, ler_aba
+
+_lock = threading.Lock()
+_pid = None
+_laco = None
+_thread_laco = None
+
+
+def _recursos():
+    """Executor e laço de eventos do processo (recriados após fork, como os workers do gunicorn)"""
+    global _pid, _laco, _thread_laco
+    executor = executor_compartilhado()
+    if _pid == os.getpid():
+        return executor, _laco
+    with _lock:
+        if _pid != os.getpid():
+            _laco = asyncio.new_event_loop()
+            _laco.set_default_executor(executor)
+            _thread_laco = threading.Thread(target=_laco.run_forever, name='async-io-laco', daemon=True)
+            _thread_laco.start()
+            _pid = os.getpid()
+    return executor, _laco
+
+
+async def executar_async(funcao, *args, **kwargs):
+    """Roda uma chamada bloqueante no executor, com o contexto (contextvars) de quem chamou"""
+    executor, _ = _recursos()
+    contexto = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, lambda: contexto.run(funcao, *args, **kwargs))
+
+
+async def ler_abas_async(planilha, abas):
+    """
+    Lê várias abas ao mesmo tempo
+
+    Args:
+        planilha: gspread.Spreadsheet (ou FakeSpreadsheet)
+        abas: nomes das abas; um item pode ser uma tupla de nomes alternativos
+            (ex.: ('Solicitações', 'Solicitacoes')), usada a primeira que existir
+
+    Returns:
+        dict: nome (o primeiro da tupla) -> lista de linhas (get_all_values), None se a aba não existe
+    """
+    alternativas = [(aba,) if isinstance(aba, str) else tuple(aba) for aba in abas]
+    valores = await asyncio.gather(*(executar_async(ler_aba, planilha, nomes) for nomes in alternativas))
+    return {nomes[0]: resultado for nomes, resultado in zip(alternativas, valores)}
+
+
+async def ler_blobs_async(bucket, nomes):
+    """
+    Metadados de vários objetos do Cloud Storage ao mesmo tempo
+
+    Returns:
+        dict: nome -> Blob, ou None se o objeto não existe
+    """
+    blobs = await asyncio.gather(*(executar_async(bucket.get_blob, nome) for nome in nomes))
+    return dict(zip(nomes, blobs))
+
+
+def rodar(corrotina):
+    """Roda a corrotina no laço de eventos do processo e espera o resultado (código síncrono)"""
+    _, laco = _recursos()
+    if threading.current_thread() is _thread_laco:
+        corrotina.close()
+        raise RuntimeError('rodar() chamado de dentro do laço de eventos: use await')
+    # A task herda uma cópia do contexto desta thread (rota das métricas) e executar_async
+    # o repassa ao executor
+    return asyncio.run_coroutine_threadsafe(corrotina, laco).result()
+
+
+def ler_abas(planilha, abas):
+    """Versão síncrona de ler_abas_async (rotas Flask)"""
+    return rodar(ler_abas_async(planilha, abas))
+
+
+def ler_blobs(bucket, nomes):
+    """Versão síncrona de ler_blobs_async (rotas Flask)"""
+    return rodar(ler_blobs_async(bucket, nomes))
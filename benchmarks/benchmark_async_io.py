@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Leituras independentes do Sheets em sequência x concorrentes (async_io.py / asgi.py)
+
+Uso:
+    python benchmarks/benchmark_async_io.py [--tamanhos 1000,10000] [--repeticoes 5]
+        [--latencias-ms 50,150,300]
+
+Com o Google Sheets em memória (fake_sheets.py) e --latencias-ms por chamada, mede as
+leituras de /processar-romaneio/<id> (IMPRESSOES, IMPRESSAO_ITENS e Solicitações; cada uma
+é worksheet() + get_all_values()):
+  - sequencial:  uma aba depois da outra, como a rota fazia (mais a listagem de abas)
+  - concorrente: async_io.ler_abas (as três ao mesmo tempo)
+  - rota wsgi:   GET /processar-romaneio/<id> pelo test client do Flask
+  - rota asgi:   GET /api/async/romaneio/<id> pela aplicação de asgi.py
+e compara com a soma das chamadas (7 x latência) e com a cadeia mais lenta (2 x latência).
+Tempos em ms (mediana de --repeticoes); nas rotas a conexão à planilha vem do cache do app
+(reaberta a cada 15 s, o que a mediana absorve).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_async_io_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'async_io.db')
+os.environ['SHEETS_BACKEND'] = 'fake'
+
+SAIDA = open(os.devnull, 'w', encoding='utf-8')
+warnings.filterwarnings('ignore', category=UserWarning)
+
+from logging_config import configurar_logging  # noqa: E402
+
+configurar_logging(nivel='WARNING', fluxo=SAIDA)
+
+with contextlib.redirect_stdout(SAIDA):
+    import app as modulo_app  # noqa: E402
+    import asgi  # noqa: E402
+    import fake_sheets  # noqa: E402
+    from async_io import ler_abas  # noqa: E402
+
+ABAS = ["IMPRESSOES", "IMPRESSAO_ITENS", modulo_app.NOMES_ABA_SOLICITACOES]
+
+
+def preparar_usuario():
+    with modulo_app.app.app_context():
+        modulo_app.db.create_all()
+        usuario = modulo_app.User(username='benchmark', email='benchmark@example.com', is_admin=True)
+        usuario.set_password('benchmark')
+        modulo_app.db.session.add(usuario)
+        modulo_app.db.session.commit()
+        return usuario.id
+
+
+def leitura_sequencial(planilha):
+    planilha.worksheets()
+    for aba in ABAS:
+        nome = aba if isinstance(aba, str) else aba[0]
+        planilha.worksheet(nome).get_all_values()
+
+
+async def chamar_asgi(caminho, cookie):
+    """Uma requisição GET na aplicação ASGI; devolve o status"""
+    enviados = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(mensagem):
+        enviados.append(mensagem)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': caminho, 'headers': [(b'cookie', cookie.encode())]}
+    await asgi.application(scope, receive, send)
+    return enviados[0]['status']
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(SAIDA):
+            funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='1000,10000', help='Solicitações na planilha (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    parser.add_argument('--latencias-ms', default='50,150,300', help='Latência simulada por chamada (separadas por vírgula)')
+    args = parser.parse_args()
+    tamanhos = sorted(int(t) for t in args.tamanhos.split(',') if t.strip())
+    latencias = [float(l) for l in args.latencias_ms.split(',') if l.strip()]
+
+    app = modulo_app.app
+    usuario_id = preparar_usuario()
+    cliente = app.test_client()
+    with cliente.session_transaction() as sessao:
+        sessao['_user_id'] = str(usuario_id)
+        sessao['_fresh'] = True
+    valor = app.session_interface.get_signing_serializer(app).dumps({'_user_id': str(usuario_id), '_fresh': True})
+    cookie = f"{app.config['SESSION_COOKIE_NAME']}={valor}"
+
+    print(f"{'solicitações':>12} {'latência':>9} {'soma':>7} {'mais lenta':>11} {'sequencial':>11} "
+          f"{'concorrente':>12} {'rota wsgi':>10} {'rota asgi':>10}  (ms)")
+    for tamanho in tamanhos:
+        planilha = fake_sheets.FakeSpreadsheet(semente=42)
+        fake_sheets.gerar_dados(planilha, solicitacoes=tamanho, produtos=max(tamanho // 4, 50), semente=42)
+        fake_sheets.set_planilha_fake(planilha)
+        id_romaneio = next(linha[0] for linha in planilha.worksheet('IMPRESSOES').get_all_values()[1:]
+                           if linha[3] == 'Pendente')
+        for latencia in latencias:
+            planilha.latencia = latencia / 1000
+            modulo_app.cache_manager.clear()
+            with contextlib.redirect_stdout(SAIDA):
+                sheet = modulo_app.get_google_sheets_connection()
+
+            sequencial = medir(lambda: leitura_sequencial(sheet), args.repeticoes)
+            concorrente = medir(lambda: ler_abas(sheet, ABAS), args.repeticoes)
+            rota_wsgi = medir(lambda: cliente.get(f'/processar-romaneio/{id_romaneio}'), args.repeticoes)
+            rota_asgi = medir(lambda: asyncio.run(chamar_asgi(f'/api/async/romaneio/{id_romaneio}', cookie)),
+                              args.repeticoes)
+            print(f"{tamanho:>12} {latencia:>9.0f} {7 * latencia:>7.0f} {2 * latencia:>11.0f} {sequencial:>11.0f} "
+                  f"{concorrente:>12.0f} {rota_wsgi:>10.0f} {rota_asgi:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
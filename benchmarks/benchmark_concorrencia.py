@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Workers x threads do gunicorn (gunicorn.conf.py) sob carga de CPU e de espera do Sheets
+
+Uso:
+    python benchmarks/benchmark_concorrencia.py [--tamanhos 2000,10000] [--repeticoes 3]
+        [--configuracoes 1x8,2x4,4x2,2x8] [--clientes 16] [--requisicoes 64] [--latencia-ms 150]
+
+Sobe o gunicorn de verdade (gunicorn -c gunicorn.conf.py 'gestao:criar_app()') para cada configuração
+WORKERSxTHREADS com o Google Sheets em memória (fake_sheets.py, --tamanhos solicitações,
+--latencia-ms por chamada) e um banco SQLite temporário compartilhado pelos workers.
+--clientes threads disparam --requisicoes requisições por cenário:
+  - cpu: GET /solicitacoes (dados do Sheets em cache; o tempo é pandas + template)
+  - io:  GET /processar-romaneio/<id> (leituras do Sheets a cada requisição)
+  - misto: metade de cada
+Mostra, por cenário, vazão (req/s) e latências p50/p95 (mediana de --repeticoes rodadas).
+
+Os ganhos de workers só aparecem com mais de um núcleo: rodar na máquina/instância de destino.
+"""
+
+import argparse
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_concorrencia_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'concorrencia.db')
+os.environ['SHEETS_BACKEND'] = 'fake'
+os.environ['SECRET_KEY'] = 'benchmark-concorrencia'
+os.environ['LOG_LEVEL'] = 'WARNING'
+os.environ['METRICS_ENABLED'] = 'false'
+
+SAIDA = open(os.devnull, 'w', encoding='utf-8')
+warnings.filterwarnings('ignore', category=UserWarning)
+
+from logging_config import configurar_logging  # noqa: E402
+
+configurar_logging(nivel='WARNING', fluxo=SAIDA)
+
+with contextlib.redirect_stdout(SAIDA):
+    import app as modulo_app  # noqa: E402
+    import fake_sheets  # noqa: E402
+
+
+def preparar_banco():
+    """Tabelas e usuário no SQLite temporário; devolve o cookie de sessão desse usuário"""
+    app = modulo_app.app
+    with app.app_context():
+        modulo_app.db.create_all()
+        usuario = modulo_app.User(username='benchmark', email='benchmark@example.com', is_admin=True)
+        usuario.set_password('benchmark')
+        modulo_app.db.session.add(usuario)
+        modulo_app.db.session.commit()
+        dados = {'_user_id': str(usuario.id), '_fresh': True}
+    # Mesmo SECRET_KEY dos workers: o cookie assinado aqui vale para todos
+    valor = app.session_interface.get_signing_serializer(app).dumps(dados)
+    return f"{app.config['SESSION_COOKIE_NAME']}={valor}"
+
+
+def romaneio_pendente():
+    """Um romaneio Pendente da planilha gerada (mesma semente dos workers)"""
+    with contextlib.redirect_stdout(SAIDA):
+        planilha = fake_sheets.criar_planilha_fake()
+    return next(linha[0] for linha in planilha.worksheet('IMPRESSOES').get_all_values()[1:]
+                if linha[3] == 'Pendente')
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class Servidor:
+    """gunicorn com a configuração do projeto e WEB_CONCURRENCY/GUNICORN_THREADS do teste"""
+
+    def __init__(self, workers, threads):
+        self.porta = porta_livre()
+        ambiente = dict(os.environ, PORT=str(self.porta), WEB_CONCURRENCY=str(workers),
+                        GUNICORN_THREADS=str(threads))
+        self.processo = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'gestao:criar_app()'],
+            cwd=RAIZ, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.url = f'http://127.0.0.1:{self.porta}'
+
+    def aguardar(self, timeout=120):
+        limite = time.time() + timeout
+        while time.time() < limite:
+            if self.processo.poll() is not None:
+                raise RuntimeError('gunicorn terminou ao iniciar')
+            try:
+                urllib.request.urlopen(self.url + '/login', timeout=5).read()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError('gunicorn não respondeu')
+
+    def parar(self):
+        self.processo.terminate()
+        try:
+            self.processo.wait(30)
+        except subprocess.TimeoutExpired:
+            self.processo.kill()
+
+
+def requisitar(url, cookie):
+    pedido = urllib.request.Request(url, headers={'Cookie': cookie})
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(pedido, timeout=300) as resposta:
+        resposta.read()
+        if resposta.status != 200 or '/login' in resposta.geturl():
+            raise RuntimeError(f'{url}: HTTP {resposta.status} ({resposta.geturl()})')
+    return time.perf_counter() - inicio
+
+
+def carga(urls, cookie, clientes, requisicoes):
+    """Dispara as requisições com `clientes` threads; devolve (req/s, p50, p95)"""
+    alvos = [urls[i % len(urls)] for i in range(requisicoes)]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as executor:
+        tempos = sorted(executor.map(lambda url: requisitar(url, cookie), alvos))
+    total = time.perf_counter() - inicio
+    return requisicoes / total, tempos[len(tempos) // 2], tempos[int(len(tempos) * 0.95) - 1]
+
+
+def mediana(valores):
+    valores = sorted(valores)
+    return valores[len(valores) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='2000,10000', help='Solicitações na planilha (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Rodadas por medida (usa a mediana)')
+    parser.add_argument('--configuracoes', default='1x8,2x4,4x2,2x8', help='WORKERSxTHREADS (separados por vírgula)')
+    parser.add_argument('--clientes', type=int, default=16, help='Requisições simultâneas')
+    parser.add_argument('--requisicoes', type=int, default=64, help='Requisições por cenário e rodada')
+    parser.add_argument('--latencia-ms', type=float, default=150, help='Latência simulada por chamada ao Sheets')
+    args = parser.parse_args()
+    tamanhos = sorted(int(t) for t in args.tamanhos.split(',') if t.strip())
+    configuracoes = [tuple(int(n) for n in c.lower().split('x')) for c in args.configuracoes.split(',') if c.strip()]
+
+    os.environ['SHEETS_FAKE_LATENCY_MS'] = str(args.latencia_ms)
+    cookie = preparar_banco()
+    print(f"Núcleos disponíveis: {len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()}, "
+          f"{args.clientes} clientes, {args.requisicoes} requisições por cenário, "
+          f"Sheets com {args.latencia_ms:.0f} ms por chamada\n")
+    print(f"{'solicitações':>12} {'config':>7} {'cenário':>8} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9}")
+
+    for tamanho in tamanhos:
+        os.environ['SHEETS_FAKE_SOLICITACOES'] = str(tamanho)
+        os.environ['SHEETS_FAKE_PRODUTOS'] = str(max(tamanho // 4, 50))
+        id_romaneio = romaneio_pendente()
+        for workers, threads in configuracoes:
+            servidor = Servidor(workers, threads)
+            try:
+                servidor.aguardar()
+                cenarios = {
+                    'cpu': [servidor.url + '/solicitacoes'],
+                    'io': [servidor.url + f'/processar-romaneio/{id_romaneio}'],
+                }
+                cenarios['misto'] = cenarios['cpu'] + cenarios['io']
+                # Aquecimento: cada worker cria a planilha em memória e enche o cache
+                carga(cenarios['misto'], cookie, workers * threads, workers * threads * 2)
+                for nome, urls in cenarios.items():
+                    rodadas = [carga(urls, cookie, args.clientes, args.requisicoes) for _ in range(args.repeticoes)]
+                    vazao, p50, p95 = (mediana([r[i] for r in rodadas]) for i in range(3))
+                    print(f"{tamanho:>12} {workers:>3}x{threads:<3} {nome:>8} {vazao:>8.1f} "
+                          f"{p50 * 1000:>9.0f} {p95 * 1000:>9.0f}")
+            finally:
+                servidor.parar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Import e memória de cada ponto de entrada (pacote gestao x app completo)
+
+Uso:
+    python benchmarks/benchmark_entradas.py [--repeticoes 5]
+
+Cada entrada roda num processo novo (mediana de --repeticoes):
+  - python vazio:          só o interpretador (referência)
+  - sheets:                gestao.sheets.data e gestao.sheets.status (leituras/gravações no Sheets)
+  - romaneio e pdf:        gestao.romaneio e gestao.pdf.pipeline (criação, processamento, PDF em segundo plano)
+  - comandos/tarefas:      criar_app(web=False), como python -m gestao.cli e workers de fundo
+  - web:                   gestao.criar_app() (gunicorn 'gestao:criar_app()')
+  - app.py:                import app (compatibilidade, o mesmo app web)
+  - asgi:                  import asgi (uvicorn)
+Mostra tempo de import (ms), pico de RSS (MB), módulos carregados, a fração do app web
+(antes da divisão todo processo carregava o app inteiro) e quais bibliotecas entraram.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_entradas_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'entradas.db')
+os.environ['SHEETS_BACKEND'] = 'fake'
+os.environ['SECRET_KEY'] = 'benchmark-entradas'
+os.environ['LOG_LEVEL'] = 'WARNING'
+
+# Bibliotecas cuja presença diz o que a entrada carregou (pandas, gspread etc. ficam para o primeiro uso)
+OBSERVADAS = ['flask', 'sqlalchemy', 'flask_login', 'flask_wtf', 'flask_mail', 'jinja2', 'gestao.web.romaneios',
+              'pandas', 'gspread']
+
+ENTRADAS = [
+    ('python vazio', 'pass'),
+    ('sheets', 'import gestao.sheets.data, gestao.sheets.status'),
+    ('romaneio e pdf', 'import gestao.romaneio.service, gestao.romaneio.processing, gestao.pdf.pipeline'),
+    ('comandos/tarefas', 'from gestao import criar_app\ncriar_app(web=False)'),
+    ('web', 'from gestao import criar_app\ncriar_app()'),
+    ('app.py', 'import app'),
+    ('asgi', 'import asgi'),
+]
+
+MODELO = """
+import contextlib, io, json, resource, sys, time
+modulos_antes = len(sys.modules)
+inicio = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+{codigo}
+import_ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{
+    'import_ms': import_ms,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modulos': len(sys.modules) - modulos_antes,
+    'carregadas': [m for m in {observadas!r} if m in sys.modules],
+}}))
+"""
+
+
+def mediana(valores):
+    valores = sorted(valores)
+    return valores[len(valores) // 2]
+
+
+def medir(codigo, repeticoes):
+    script = MODELO.format(codigo='\n'.join('    ' + linha for linha in codigo.splitlines()), observadas=OBSERVADAS)
+    medidas = []
+    for _ in range(repeticoes):
+        resultado = subprocess.run([sys.executable, '-c', script], cwd=RAIZ, capture_output=True, text=True,
+                                   env=os.environ)
+        if resultado.returncode != 0:
+            raise RuntimeError(f'{codigo!r}: {resultado.stderr[-500:]}')
+        medidas.append(json.loads(resultado.stdout.strip().splitlines()[-1]))
+    return {
+        'import_ms': mediana([m['import_ms'] for m in medidas]),
+        'rss_mb': mediana([m['rss_mb'] for m in medidas]),
+        'modulos': medidas[0]['modulos'],
+        'carregadas': medidas[0]['carregadas'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por entrada (usa a mediana)')
+    args = parser.parse_args()
+
+    resultados = {nome: medir(codigo, args.repeticoes) for nome, codigo in ENTRADAS}
+    web = resultados['web']
+    print(f"{'entrada':<18} {'import':>8} {'RSS':>7} {'módulos':>8} {'% import web':>13} {'% RSS web':>10}  carregadas")
+    for nome, _ in ENTRADAS:
+        r = resultados[nome]
+        print(f"{nome:<18} {r['import_ms']:>6.0f}ms {r['rss_mb']:>5.0f}MB {r['modulos']:>8} "
+              f"{100 * r['import_ms'] / web['import_ms']:>12.0f}% {100 * r['rss_mb'] / web['rss_mb']:>9.0f}%  "
+              f"{', '.join(r['carregadas']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
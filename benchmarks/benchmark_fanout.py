@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Leituras de abas independentes em sequência x em paralelo (fanout.py)
+
+Uso:
+    python benchmarks/benchmark_fanout.py [--tamanhos 1000,10000] [--repeticoes 5]
+        [--latencias-ms 50,150,300]
+
+Com o Google Sheets em memória (fake_sheets.py) e --latencias-ms por chamada, roda pelo
+test client do Flask, com o cache do app limpo a cada execução (todas as leituras vão ao Sheets):
+  - dashboard:            GET /  (Solicitações, MATRIZ_IMPORTADA e IMPRESSAO_ITENS)
+  - solicitacoes:         GET /solicitacoes  (as mesmas três abas)
+  - processar_romaneio:   GET /processar-romaneio/<id>  (IMPRESSOES, IMPRESSAO_ITENS e Solicitações)
+  - salvar_processamento: POST /salvar-processamento-romaneio  (as mesmas três, mais as gravações)
+Cada fluxo é medido duas vezes:
+  - sequencial: fanout.em_paralelo trocado por uma execução em sequência (como as rotas faziam)
+  - fan-out:    o executor compartilhado do processo
+Tempos em ms (mediana de --repeticoes) e o ganho (sequencial / fan-out).
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_fanout_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'fanout.db')
+os.environ['SHEETS_BACKEND'] = 'fake'
+
+SAIDA = open(os.devnull, 'w', encoding='utf-8')
+warnings.filterwarnings('ignore', category=UserWarning)
+
+from logging_config import configurar_logging  # noqa: E402
+
+configurar_logging(nivel='WARNING', fluxo=SAIDA)
+
+with contextlib.redirect_stdout(SAIDA):
+    import app as modulo_app  # noqa: E402
+    import fake_sheets  # noqa: E402
+    import fanout  # noqa: E402
+
+FLUXOS = ['dashboard', 'solicitacoes', 'processar_romaneio', 'salvar_processamento']
+
+
+def preparar_usuario():
+    with modulo_app.app.app_context():
+        modulo_app.db.create_all()
+        usuario = modulo_app.User(username='benchmark', email='benchmark@example.com', is_admin=True)
+        usuario.set_password('benchmark')
+        modulo_app.db.session.add(usuario)
+        modulo_app.db.session.commit()
+        return usuario.id
+
+
+@contextlib.contextmanager
+def sequencial():
+    """fanout.em_paralelo rodando as tarefas uma depois da outra"""
+    original = fanout.em_paralelo
+    fanout.em_paralelo = lambda tarefas: {nome: funcao() for nome, funcao in tarefas.items()}
+    try:
+        yield
+    finally:
+        fanout.em_paralelo = original
+
+
+class Ambiente:
+    """Planilha em memória de um tamanho, com o usuário logado no test client"""
+
+    def __init__(self, tamanho, usuario_id):
+        self.planilha = fake_sheets.FakeSpreadsheet(semente=42)
+        fake_sheets.gerar_dados(self.planilha, solicitacoes=tamanho, produtos=max(tamanho // 4, 50), semente=42)
+        fake_sheets.set_planilha_fake(self.planilha)
+        self.pendentes = [linha[0] for linha in self.planilha._abas[1]._linhas[1:] if linha[3] == 'Pendente']
+        self.itens = {}
+        for linha in self.planilha._abas[2]._linhas[1:]:
+            self.itens.setdefault(linha[0], []).append(linha)
+        self.cliente = modulo_app.app.test_client()
+        with self.cliente.session_transaction() as sessao:
+            sessao['_user_id'] = str(usuario_id)
+            sessao['_fresh'] = True
+
+    def requisicao(self, fluxo):
+        """Monta a chamada do fluxo (salvar_processamento consome um romaneio pendente)"""
+        if fluxo == 'dashboard':
+            return lambda: self.cliente.get('/')
+        if fluxo == 'solicitacoes':
+            return lambda: self.cliente.get('/solicitacoes')
+        if fluxo == 'processar_romaneio':
+            return lambda: self.cliente.get(f'/processar-romaneio/{self.pendentes[0]}')
+        id_romaneio = self.pendentes.pop()
+        corpo = {
+            'id_romaneio': id_romaneio,
+            'itens': [{'id_solicitacao': linha[1], 'qtd_separada': int(linha[7]), 'observacoes': ''}
+                      for linha in self.itens.get(id_romaneio, [])],
+            'observacoes_gerais': '',
+            'checkbox_data': {},
+        }
+        return lambda: self.cliente.post('/salvar-processamento-romaneio', json=corpo)
+
+
+def medir(ambiente, fluxo, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        chamar = ambiente.requisicao(fluxo)
+        modulo_app.cache_manager.clear()
+        with contextlib.redirect_stdout(SAIDA):
+            inicio = time.perf_counter()
+            resposta = chamar()
+            tempos.append(time.perf_counter() - inicio)
+        if resposta.status_code != 200 or (resposta.is_json and resposta.get_json().get('success') is False):
+            raise RuntimeError(f'{fluxo}: HTTP {resposta.status_code} {resposta.get_data(as_text=True)[:200]}')
+    tempos.sort()
+    return tempos[len(tempos) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='1000,10000', help='Solicitações na planilha (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    parser.add_argument('--latencias-ms', default='50,150,300', help='Latência simulada por chamada (separadas por vírgula)')
+    args = parser.parse_args()
+    tamanhos = sorted(int(t) for t in args.tamanhos.split(',') if t.strip())
+    latencias = [float(l) for l in args.latencias_ms.split(',') if l.strip()]
+
+    modulo_app.app.config['WTF_CSRF_ENABLED'] = False
+    usuario_id = preparar_usuario()
+    print(f"{'solicitações':>12} {'latência':>9} {'fluxo':>22} {'sequencial':>11} {'fan-out':>9} {'ganho':>7}  (ms)")
+    for tamanho in tamanhos:
+        ambiente = Ambiente(tamanho, usuario_id)
+        for latencia in latencias:
+            ambiente.planilha.latencia = latencia / 1000
+            for fluxo in FLUXOS:
+                with sequencial():
+                    tempo_sequencial = medir(ambiente, fluxo, args.repeticoes)
+                tempo_fanout = medir(ambiente, fluxo, args.repeticoes)
+                print(f"{tamanho:>12} {latencia:>9.0f} {fluxo:>22} {tempo_sequencial:>11.0f} "
+                      f"{tempo_fanout:>9.0f} {tempo_sequencial / tempo_fanout:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
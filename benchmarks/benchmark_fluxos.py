@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Benchmark ponta a ponta dos fluxos do operador, com linha de base e limites de regressão
+
+Uso:
+    python benchmarks/benchmark_fluxos.py [--tamanhos 1000,10000] [--repeticoes 5]
+    python benchmarks/benchmark_fluxos.py --salvar-base            # grava a linha de base
+    python benchmarks/benchmark_fluxos.py --comparar               # compara (sai com 1 se regrediu)
+
+Roda as rotas pelo test client do Flask com o Google Sheets em memória (fake_sheets.py,
+povoado com --tamanhos solicitações) e o Cloud Storage em memória (fake_gcs.py):
+  - solicitacoes:          GET /solicitacoes
+  - formulario_impressao:  GET /formulario-impressao?ids=... (cria o romaneio; o PDF em
+                           background é aguardado fora da medida)
+  - controle_impressoes:   GET /controle-impressoes
+  - processar_romaneio:    GET /processar-romaneio/<id>
+  - salvar_processamento:  POST /salvar-processamento-romaneio
+
+Cada medida começa com o cache do app limpo (pior caso: todas as leituras vão ao Sheets).
+Por fluxo e tamanho registra:
+  - tempo_ms:       mediana do tempo de parede
+  - chamadas:       requisições ao Sheets + GCS por execução
+  - bytes:          valores lidos/gravados no Sheets + conteúdo enviado/recebido do GCS +
+                    corpo da resposta HTTP, por execução
+  - alocacao_kb:    pico de memória alocada pelo Python numa execução (tracemalloc)
+  - rss_mb:         pico de RSS do processo ao fim do fluxo
+
+Limites (--comparar): chamadas não podem aumentar; tempo, bytes e alocação podem piorar
+até --limite-tempo, --limite-bytes e --limite-memoria (frações) em relação à linha de base.
+A linha de base (benchmarks/baseline_fluxos.json) depende da máquina no tempo: gravar de
+novo com --salvar-base ao trocar de ambiente.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_fluxos_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'fluxos.db')
+os.environ['SHEETS_BACKEND'] = 'fake'
+os.environ['GCS_BACKEND'] = 'fake'
+os.environ['PDF_STORAGE_BACKEND'] = 'gcs'
+os.environ.setdefault('PDF_ENGINE', 'reportlab')
+os.environ.setdefault('GCS_BUCKET_NAME', 'benchmark-fluxos')
+
+SAIDA = open(os.devnull, 'w', encoding='utf-8')
+# Avisos do pandas sobre formato de data repetidos a cada linha
+warnings.filterwarnings('ignore', category=UserWarning)
+
+from logging_config import configurar_logging  # noqa: E402
+
+# Antes de importar o app: os logs (e os prints) do app não entram no terminal
+configurar_logging(nivel='WARNING', fluxo=SAIDA)
+
+with contextlib.redirect_stdout(SAIDA):
+    import app as modulo_app  # noqa: E402
+    import fake_sheets  # noqa: E402
+    import salvar_pdf_gcs  # noqa: E402
+    from fake_gcs import FakeGCSClient  # noqa: E402
+
+BASE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_fluxos.json')
+FLUXOS = ['solicitacoes', 'formulario_impressao', 'controle_impressoes', 'processar_romaneio',
+          'salvar_processamento']
+
+
+class Ambiente:
+    """Planilha e bucket em memória de um tamanho, com o usuário logado no test client"""
+
+    def __init__(self, tamanho, itens_por_romaneio):
+        self.planilha = fake_sheets.FakeSpreadsheet(semente=42, contar_bytes=True)
+        fake_sheets.gerar_dados(self.planilha, solicitacoes=tamanho, produtos=max(tamanho // 4, 50),
+                                itens_por_romaneio=itens_por_romaneio, semente=42)
+        fake_sheets.set_planilha_fake(self.planilha)
+        self.gcs = FakeGCSClient()
+        salvar_pdf_gcs.set_gcs_client(self.gcs)
+
+        aba = self.planilha._abas[0]
+        # O app numera as solicitações pela posição na planilha (linha 2 -> id 1). criar_impressao
+        # confere o status pela primeira linha com o mesmo (código, solicitante): só entram as abertas
+        # cujo par é único na aba, senão a linha encontrada pode ser outra já "Em Separação"
+        pares = Counter((linha[2], linha[1]) for linha in aba._linhas[1:])
+        self.abertas = [str(i) for i, linha in enumerate(aba._linhas[1:], start=1)
+                        if linha[8] == 'Aberta' and pares[(linha[2], linha[1])] == 1]
+        impressoes = self.planilha._abas[1]._linhas[1:]
+        self.pendentes = [linha[0] for linha in impressoes if linha[3] == 'Pendente']
+        self.itens = {}
+        for linha in self.planilha._abas[2]._linhas[1:]:
+            self.itens.setdefault(linha[0], []).append(linha)
+
+        self.cliente = modulo_app.app.test_client()
+        with self.cliente.session_transaction() as sessao:
+            sessao['_user_id'] = str(usuario_id())
+            sessao['_fresh'] = True
+
+    def contadores(self):
+        return (self.planilha.total_chamadas() + sum(self.gcs.chamadas.values()),
+                sum(self.planilha.bytes_transferidos.values()) + sum(self.gcs.bytes_transferidos.values()))
+
+    def requisicao(self, fluxo, quantidade_itens):
+        """Monta a chamada do fluxo (consumindo solicitações/romaneios quando o fluxo altera dados)"""
+        if fluxo == 'solicitacoes':
+            return lambda: self.cliente.get('/solicitacoes')
+        if fluxo == 'formulario_impressao':
+            ids = self.abertas[:quantidade_itens]
+            del self.abertas[:quantidade_itens]
+            return lambda: self.cliente.get('/formulario-impressao?ids=' + ','.join(ids))
+        if fluxo == 'controle_impressoes':
+            return lambda: self.cliente.get('/controle-impressoes')
+        if fluxo == 'processar_romaneio':
+            return lambda: self.cliente.get(f'/processar-romaneio/{self.pendentes[0]}')
+        if fluxo == 'salvar_processamento':
+            id_romaneio = self.pendentes.pop()
+            corpo = {
+                'id_romaneio': id_romaneio,
+                'itens': [{'id_solicitacao': linha[1], 'qtd_separada': int(linha[7]), 'observacoes': ''}
+                          for linha in self.itens.get(id_romaneio, [])],
+                'observacoes_gerais': '',
+                'checkbox_data': {},
+            }
+            return lambda: self.cliente.post('/salvar-processamento-romaneio', json=corpo)
+        raise ValueError(fluxo)
+
+
+def usuario_id():
+    with modulo_app.app.app_context():
+        modulo_app.db.create_all()
+        usuario = modulo_app.User.query.filter_by(username='benchmark').first()
+        if usuario is None:
+            usuario = modulo_app.User(username='benchmark', email='benchmark@example.com', is_admin=True)
+            usuario.set_password('benchmark')
+            modulo_app.db.session.add(usuario)
+            modulo_app.db.session.commit()
+        return usuario.id
+
+
+def aguardar_fundo():
+    """Espera os PDFs em background e grava os logs pendentes (fora da medida de tempo)"""
+    for thread in threading.enumerate():
+        if thread.name.startswith('PDF-'):
+            thread.join()
+    modulo_app.fila_logs.descarregar()
+
+
+def executar(ambiente, fluxo, quantidade_itens, alocacao=False):
+    """Uma execução do fluxo: (segundos, chamadas, bytes, pico alocado em bytes)"""
+    chamar = ambiente.requisicao(fluxo, quantidade_itens)
+    aguardar_fundo()
+    modulo_app.cache_manager.clear()
+    chamadas_antes, bytes_antes = ambiente.contadores()
+    if alocacao:
+        tracemalloc.start()
+    with contextlib.redirect_stdout(SAIDA):
+        inicio = time.perf_counter()
+        resposta = chamar()
+        segundos = time.perf_counter() - inicio
+        aguardar_fundo()
+    pico = 0
+    if alocacao:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    # Os fluxos de tela tratam erro com flash + redirect: só 200 conta como sucesso
+    if resposta.status_code != 200 or (resposta.is_json and resposta.get_json().get('success') is False):
+        raise RuntimeError(f'{fluxo}: HTTP {resposta.status_code} {resposta.get_data(as_text=True)[:200]}')
+    chamadas_depois, bytes_depois = ambiente.contadores()
+    return segundos, chamadas_depois - chamadas_antes, bytes_depois - bytes_antes + len(resposta.data), pico
+
+
+def medir_fluxo(ambiente, fluxo, repeticoes, quantidade_itens):
+    tempos = []
+    chamadas = transferido = 0
+    for _ in range(repeticoes):
+        segundos, chamadas, transferido, _ = executar(ambiente, fluxo, quantidade_itens)
+        tempos.append(segundos)
+    tempos.sort()
+    # Execução separada: o tracemalloc deixa o código bem mais lento
+    _, _, _, pico = executar(ambiente, fluxo, quantidade_itens, alocacao=True)
+    return {
+        'tempo_ms': round(tempos[len(tempos) // 2] * 1000, 2),
+        'chamadas': chamadas,
+        'bytes': transferido,
+        'alocacao_kb': round(pico / 1024, 1),
+        'rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def comparar(resultados, base, limites):
+    """Linhas do relatório e se houve regressão acima dos limites"""
+    regressoes = []
+    relatorio = []
+    for chave, atual in resultados.items():
+        anterior = base.get(chave)
+        if anterior is None:
+            relatorio.append(f"{chave:<36} sem linha de base")
+            continue
+        partes = []
+        for metrica, limite in limites.items():
+            antes, agora = anterior[metrica], atual[metrica]
+            variacao = (agora - antes) / antes if antes else (0.0 if agora == antes else float('inf'))
+            regrediu = variacao > limite
+            partes.append(f"{metrica} {antes}->{agora} ({variacao:+.0%}){' ❌' if regrediu else ''}")
+            if regrediu:
+                regressoes.append(f"{chave} {metrica}")
+        relatorio.append(f"{chave:<36} " + ', '.join(partes))
+    return relatorio, regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='1000,10000', help='Solicitações na planilha (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    parser.add_argument('--itens', type=int, default=20, help='Itens por romaneio criado/processado')
+    parser.add_argument('--fluxos', default=','.join(FLUXOS), help='Fluxos a medir (separados por vírgula)')
+    parser.add_argument('--base', default=BASE_PADRAO, help='Arquivo JSON da linha de base')
+    parser.add_argument('--salvar-base', action='store_true', help='Grava os resultados como linha de base')
+    parser.add_argument('--comparar', action='store_true', help='Compara com a linha de base (sai com 1 se regrediu)')
+    parser.add_argument('--limite-tempo', type=float, default=0.25, help='Piora aceita no tempo (fração)')
+    parser.add_argument('--limite-bytes', type=float, default=0.10, help='Piora aceita nos bytes (fração)')
+    parser.add_argument('--limite-memoria', type=float, default=0.25, help='Piora aceita na alocação (fração)')
+    args = parser.parse_args()
+
+    modulo_app.app.config['WTF_CSRF_ENABLED'] = False
+    fluxos = [fluxo.strip() for fluxo in args.fluxos.split(',') if fluxo.strip()]
+    resultados = {}
+    print(f"{'fluxo':<24} {'tamanho':>8} {'tempo_ms':>9} {'chamadas':>9} {'bytes':>11} {'alocacao_kb':>12} {'rss_mb':>7}")
+    for tamanho in sorted(int(t) for t in args.tamanhos.split(',') if t.strip()):
+        # Romaneios pendentes suficientes para todas as execuções de salvar_processamento
+        ambiente = Ambiente(tamanho, args.itens)
+        for fluxo in fluxos:
+            medida = medir_fluxo(ambiente, fluxo, args.repeticoes, args.itens)
+            resultados[f'{fluxo}@{tamanho}'] = medida
+            print(f"{fluxo:<24} {tamanho:>8} {medida['tempo_ms']:>9.1f} {medida['chamadas']:>9} "
+                  f"{medida['bytes']:>11,} {medida['alocacao_kb']:>12,.1f} {medida['rss_mb']:>7.1f}")
+
+    if args.salvar_base:
+        with open(args.base, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, sort_keys=True)
+            arquivo.write('\n')
+        print(f"\n✅ Linha de base gravada em {args.base}")
+
+    if args.comparar:
+        if not os.path.exists(args.base):
+            print(f"\n❌ Linha de base não encontrada: {args.base} (rode com --salvar-base)")
+            sys.exit(2)
+        with open(args.base, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        limites = {'tempo_ms': args.limite_tempo, 'chamadas': 0.0, 'bytes': args.limite_bytes,
+                   'alocacao_kb': args.limite_memoria}
+        relatorio, regressoes = comparar(resultados, base, limites)
+        print("\nComparação com a linha de base:")
+        for linha in relatorio:
+            print(f"  {linha}")
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressão(ões): {', '.join(regressoes)}")
+            sys.exit(1)
+        print("\n✅ Sem regressões acima dos limites")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark da preparação do HTML para os motores xhtml2pdf/Chrome em romaneios grandes
+
+Uso:
+    python benchmarks/benchmark_html_pdf.py [--tamanhos 100,1000,5000] [--repeticoes 5]
+
+Compara, por tamanho de romaneio:
+  - tela:  formulario_impressao.html + otimizar_html_para_xhtml2pdf (+ aplicar_marcacao_copia na cópia)
+  - pdf:   formulario_impressao_pdf.html renderizado direto pelo Jinja (sem pós-processamento)
+
+Mede só a preparação do HTML; a conversão para PDF está em benchmark_pdf_engines.py.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+
+from benchmark_pdf_engines import gerar_itens  # noqa: E402
+from pdf_cloud_generator import aplicar_marcacao_copia, otimizar_html_para_xhtml2pdf  # noqa: E402
+
+
+def preparar_tela(env, romaneio_data, itens, is_reprint):
+    """Caminho antigo: template de tela + reescrita do HTML"""
+    html = env.get_template('formulario_impressao.html').render(
+        id_impressao=romaneio_data['id_impressao'], solicitacoes=itens,
+        tipo_romaneio='Romaneio de Separação', csrf_token=lambda: '',
+        url_for=lambda endpoint, **kwargs: '/' + endpoint)
+    html = otimizar_html_para_xhtml2pdf(html, romaneio_data['data_impressao'])
+    if is_reprint:
+        html = aplicar_marcacao_copia(html, romaneio_data)
+    return html
+
+
+def preparar_pdf(env, romaneio_data, itens, is_reprint):
+    """Caminho atual: template próprio para PDF, já pronto"""
+    return env.get_template('formulario_impressao_pdf.html').render(
+        id_impressao=romaneio_data['id_impressao'], solicitacoes=itens,
+        tipo_romaneio='Romaneio de Separação', data_impressao=romaneio_data['data_impressao'],
+        is_reprint=is_reprint, data_reimpressao=romaneio_data['data_reimpressao'])
+
+
+def medir(funcao, repeticoes, *args):
+    tempos = []
+    tamanho = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        html = funcao(*args)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        tamanho = len(html)
+    tempos.sort()
+    return tempos[len(tempos) // 2], tamanho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='100,1000,5000', help='Quantidades de itens (separadas por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    args = parser.parse_args()
+
+    env = Environment(loader=FileSystemLoader(os.path.join(RAIZ, 'templates')), autoescape=True)
+    romaneio_data = {
+        'id_impressao': 'ROM-999999',
+        'data_impressao': '01/01/2025, 08:00:00',
+        'data_reimpressao': '02/01/2025, 09:30:00',
+    }
+
+    print(f"{'caminho':<8} {'cópia':<6} {'itens':>6} {'mediana (ms)':>14} {'html (bytes)':>14}")
+    for tamanho_romaneio in [int(t) for t in args.tamanhos.split(',') if t.strip()]:
+        itens = gerar_itens(tamanho_romaneio)
+        for is_reprint in (False, True):
+            for nome, funcao in (('tela', preparar_tela), ('pdf', preparar_pdf)):
+                mediana, tamanho_html = medir(funcao, args.repeticoes, env, romaneio_data, itens, is_reprint)
+                print(f"{nome:<8} {'sim' if is_reprint else 'não':<6} {tamanho_romaneio:>6} {mediana:>14.1f} {tamanho_html:>14}")
+
+
+if __name__ == '__main__':
+    main()
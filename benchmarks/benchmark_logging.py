@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Custo dos logs de diagnóstico nos caminhos quentes (logging_config.py)
+
+Uso:
+    python benchmarks/benchmark_logging.py [--tamanhos 1000,10000,100000] [--repeticoes 5]
+
+A saída dos logs vai para um arquivo temporário (como o pipe do gunicorn/Cloud Run).
+Mede:
+  - por mensagem: print com f-string (como era), logger.info (enfileirado para a thread
+    de saída) e logger.debug com LOG_LEVEL=INFO (descartado antes de formatar)
+  - processar_baixa_item (gestao/romaneio/processing.py) numa planilha sintética com N linhas, com LOG_LEVEL=DEBUG
+    e LOG_LEVEL=INFO, em linhas por segundo
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_logging_')
+SAIDA = open(os.path.join(PASTA_TEMP, 'saida.log'), 'w', encoding='utf-8')
+
+from logging_config import configurar_logging, obter_logger  # noqa: E402
+
+# Antes de importar o app: a configuração só vale na primeira chamada
+configurar_logging(nivel='INFO', formato='json', fluxo=SAIDA)
+
+with contextlib.redirect_stdout(SAIDA):
+    from gestao.romaneio.processing import processar_baixa_item  # noqa: E402
+
+logger = obter_logger('benchmark')
+HEADER = ['Data', 'Solicitante', 'Código', 'Descrição', 'Unidade', 'Quantidade', 'Locação',
+          'Saldo', 'Status', 'Qtd. Separada', 'Saldo Final', 'Observações', 'Alta Demanda',
+          'Data Separação', 'Separador', 'ID_SOLICITACAO']
+
+
+def planilha(quantidade):
+    """Linhas sintéticas da aba Solicitações (ID_SOLICITACAO na coluna P)"""
+    return [
+        ['01/01/2025', f'Solicitante {i % 30}', f'{i:06d}', f'Produto {i}', 'UN', '10', 'A1',
+         '10', 'Em Separação', '0', '10', '', 'Não', '', '', f'SOL{i:08d}']
+        for i in range(quantidade)
+    ]
+
+
+def definir_nivel(nivel):
+    logging.getLogger().setLevel(nivel)
+
+
+def laco_print(quantidade):
+    with contextlib.redirect_stdout(SAIDA):
+        for i in range(quantidade):
+            print(f"✅ Item SOL{i:08d} encontrado no formulário - Qtd: {i % 7}, Obs: '', Status Especial: None")
+
+
+def laco_info(quantidade):
+    for i in range(quantidade):
+        logger.info("✅ Item %s encontrado no formulário - Qtd: %s, Obs: '%s', Status Especial: %s",
+                    f'SOL{i:08d}', i % 7, '', None)
+
+
+def laco_debug(quantidade):
+    for i in range(quantidade):
+        logger.debug("✅ Item %s encontrado no formulário - Qtd: %s, Obs: '%s', Status Especial: %s",
+                     f'SOL{i:08d}', i % 7, '', None)
+
+
+def medir_tempo(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='1000,10000,100000', help='Mensagens/linhas por medida (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    args = parser.parse_args()
+    tamanhos = sorted(int(t) for t in args.tamanhos.split(',') if t.strip())
+
+    print(f"Saída dos logs em {SAIDA.name}\n")
+    print(f"{'mensagens':>10} {'print':>8} {'info':>8} {'debug off':>10}  (µs por mensagem)")
+    for tamanho in tamanhos:
+        definir_nivel(logging.INFO)
+        com_print = medir_tempo(lambda: laco_print(tamanho), args.repeticoes)
+        com_info = medir_tempo(lambda: laco_info(tamanho), args.repeticoes)
+        com_debug = medir_tempo(lambda: laco_debug(tamanho), args.repeticoes)
+        print(f"{tamanho:>10} {com_print / tamanho * 1e6:>8.3f} {com_info / tamanho * 1e6:>8.3f} "
+              f"{com_debug / tamanho * 1e6:>10.3f}")
+
+    print(f"\n{'linhas':>10} {'DEBUG':>14} {'INFO':>14}  (processar_baixa_item, linhas/s)")
+    for tamanho in tamanhos:
+        linhas = planilha(tamanho)
+        ultimo_id = linhas[-1][15]
+        resultados = []
+        for nivel in (logging.DEBUG, logging.INFO):
+            definir_nivel(nivel)
+            segundos = medir_tempo(lambda: processar_baixa_item(ultimo_id, 5, '', linhas, HEADER), args.repeticoes)
+            resultados.append(tamanho / segundos)
+        print(f"{tamanho:>10} {resultados[0]:>14,.0f} {resultados[1]:>14,.0f}")
+    definir_nivel(logging.INFO)
+
+
+if __name__ == '__main__':
+    main()
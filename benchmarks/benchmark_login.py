@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Rajada de logins (troca de turno) x latência das outras rotas
+
+Uso:
+    python benchmarks/benchmark_login.py [--threads 8] [--segundos 5]
+
+Simula as threads de um worker do gunicorn: --threads threads fazem login sem parar
+(senha certa, usuários distintos) enquanto um usuário já logado consulta /api/pdf-status/<id>
+(rota leve). Cada configuração roda num processo novo:
+  - antigo:  hash sem limite (cada thread calcula o seu, como antes do executor)
+  - atual:   executor do hash com os limites do env.example (PASSWORD_HASH_WORKERS/QUEUE)
+Mostra logins concluídos e recusados (503) por segundo, o tempo do login (p50/p95) e a
+latência da rota leve (p50/p95) durante a rajada.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+CONFIGURACOES = {
+    'antigo': {'PASSWORD_HASH_WORKERS': '64', 'PASSWORD_HASH_QUEUE': '0'},
+    'atual': {'PASSWORD_HASH_WORKERS': '2', 'PASSWORD_HASH_QUEUE': '16'},
+}
+
+
+def percentil(valores, fracao):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * fracao))] if valores else 0.0
+
+
+def executar(threads, segundos):
+    """Roda no processo filho: rajada de logins e consultas à rota leve ao mesmo tempo"""
+    from gestao import criar_app
+    from gestao.extensions import db
+    from gestao.models import User
+
+    app = criar_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        db.create_all()
+        for i in range(threads + 1):
+            usuario = User(username=f'turno{i}', email=f'turno{i}@exemplo.com')
+            usuario.set_password('benchmark')
+            db.session.add(usuario)
+        db.session.commit()
+
+    leve = app.test_client()
+    leve.post('/login', data={'username': f'turno{threads}', 'password': 'benchmark'})
+
+    fim = time.perf_counter() + segundos
+    tempos_login, recusados, tempos_leve = [], [], []
+
+    def logar(indice):
+        cliente = app.test_client()
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            resposta = cliente.post('/login', data={'username': f'turno{indice}', 'password': 'benchmark'},
+                                    environ_base={'REMOTE_ADDR': f'10.0.0.{indice}'})
+            if resposta.status_code == 302:
+                tempos_login.append(time.perf_counter() - inicio)
+                cliente.get('/logout')
+            else:
+                recusados.append(resposta.status_code)
+
+    trabalhadores = [threading.Thread(target=logar, args=(i,)) for i in range(threads)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        leve.get('/api/pdf-status/REQ-BENCHMARK')
+        tempos_leve.append(time.perf_counter() - inicio)
+        time.sleep(0.01)
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+
+    return {
+        'logins_s': len(tempos_login) / segundos,
+        'recusados_s': len(recusados) / segundos,
+        'login_p50_ms': percentil(tempos_login, 0.5) * 1000,
+        'login_p95_ms': percentil(tempos_login, 0.95) * 1000,
+        'leve_p50_ms': percentil(tempos_leve, 0.5) * 1000,
+        'leve_p95_ms': percentil(tempos_leve, 0.95) * 1000,
+    }
+
+
+def medir(nome, threads, segundos):
+    ambiente = dict(os.environ)
+    ambiente.update(CONFIGURACOES[nome])
+    ambiente.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='benchmark_login_'), 'login.db'),
+        'SHEETS_BACKEND': 'fake',
+        'SECRET_KEY': 'benchmark-login',
+        'LOG_LEVEL': 'ERROR',
+        'METRICS_ENABLED': 'false',
+    })
+    resultado = subprocess.run([sys.executable, os.path.abspath(__file__), '--executar',
+                                '--threads', str(threads), '--segundos', str(segundos)],
+                               cwd=RAIZ, env=ambiente, capture_output=True, text=True)
+    if resultado.returncode != 0:
+        raise RuntimeError(f'{nome}: {resultado.stderr[-800:]}')
+    # A thread dos logs ainda pode imprimir depois do resultado
+    return json.loads([linha for linha in resultado.stdout.splitlines() if linha.startswith('{')][-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8, help='Threads fazendo login ao mesmo tempo')
+    parser.add_argument('--segundos', type=float, default=5, help='Duração da rajada')
+    parser.add_argument('--executar', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        print(json.dumps(executar(args.threads, args.segundos)))
+        return
+
+    print(f"{'configuração':<10} {'logins/s':>9} {'503/s':>6} {'login p50':>10} {'login p95':>10} "
+          f"{'rota leve p50':>14} {'rota leve p95':>14}")
+    for nome in CONFIGURACOES:
+        r = medir(nome, args.threads, args.segundos)
+        print(f"{nome:<10} {r['logins_s']:>9.1f} {r['recusados_s']:>6.1f} {r['login_p50_ms']:>8.0f}ms "
+              f"{r['login_p95_ms']:>8.0f}ms {r['leve_p50_ms']:>12.1f}ms {r['leve_p95_ms']:>12.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
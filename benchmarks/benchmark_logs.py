@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark da página /logs com a tabela Log povoada com milhões de registros
+
+Uso:
+    python benchmarks/benchmark_logs.py [--tamanhos 10000,100000,1000000] [--repeticoes 5]
+
+Usa um SQLite temporário (DATABASE_URL é sobrescrita) povoado com dados sintéticos e
+compara, por tamanho da tabela:
+  - antigo: filtro com contains (LIKE '%...%'), paginate com OFFSET (página 1 e página do
+            meio) e os três COUNT das estatísticas a cada abertura
+  - atual:  log_query.ConsultaLogs - filtro por igualdade nos índices compostos, cursor
+            (página 1 e página do meio) e estatísticas em cache
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_logs_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'logs.db')
+
+from app import app, db, Log, User, consulta_logs  # noqa: E402
+
+ACOES = ['login', 'logout', 'separar', 'baixar_estoque', 'baixar_lote', 'criar_usuario',
+         'alterar_senha', 'imprimir', 'reimprimir', 'processar', 'editar', 'erro']
+ENTIDADES = ['User', 'Solicitacao', 'Romaneio', 'Produto', 'Sistema']
+USUARIOS = [f'usuario{i:02d}' for i in range(20)]
+POR_PAGINA = 50
+
+
+def povoar(quantidade_atual, quantidade_final, usuario_id):
+    """Insere logs sintéticos até a tabela ter quantidade_final registros (espalhados em 1 ano)"""
+    aleatorio = random.Random(quantidade_atual)
+    inicio = datetime.now() - timedelta(days=365)
+    tabela = Log.__table__
+    lote = []
+    for i in range(quantidade_atual, quantidade_final):
+        sorteio = aleatorio.random()
+        lote.append({
+            'timestamp': inicio + timedelta(seconds=aleatorio.randrange(365 * 24 * 3600)),
+            'usuario_id': usuario_id,
+            'usuario_nome': aleatorio.choice(USUARIOS),
+            'acao': aleatorio.choice(ACOES),
+            'entidade': aleatorio.choice(ENTIDADES),
+            'entidade_id': aleatorio.randrange(1, 5000),
+            'detalhes': f'Registro sintético {i}',
+            'ip_address': '10.0.0.1',
+            'user_agent': 'benchmark',
+            'status': 'erro' if sorteio < 0.02 else ('aviso' if sorteio < 0.10 else 'sucesso'),
+        })
+        if len(lote) == 50000:
+            db.session.execute(tabela.insert(), lote)
+            lote = []
+    if lote:
+        db.session.execute(tabela.insert(), lote)
+    db.session.commit()
+
+
+def pagina_antiga(filtros, pagina):
+    """Implementação anterior da rota /logs"""
+    query = Log.query
+    if filtros.get('acao'):
+        query = query.filter(Log.acao.contains(filtros['acao']))
+    if filtros.get('usuario'):
+        query = query.filter(Log.usuario_nome.contains(filtros['usuario']))
+    if filtros.get('status'):
+        query = query.filter(Log.status == filtros['status'])
+    logs = query.order_by(Log.timestamp.desc()).paginate(page=pagina, per_page=POR_PAGINA, error_out=False)
+    list(logs.items)
+    Log.query.count()
+    Log.query.filter(Log.timestamp >= datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)).count()
+    Log.query.filter(Log.status == 'erro').count()
+    return logs.pages
+
+
+def pagina_atual(filtros, cursor):
+    pagina = consulta_logs.pagina(filtros, antes=cursor, por_pagina=POR_PAGINA)
+    consulta_logs.estatisticas()
+    return pagina
+
+
+def medir(funcao, repeticoes, *args):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*args)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return tempos[len(tempos) // 2]
+
+
+def cursor_do_meio(filtros, quantidade):
+    """Cursor da página do meio (pego uma vez, fora da medição, como o link "Próximo" faria)"""
+    Log_ = Log
+    posicao = max(quantidade // 2 - 1, 0)
+    log = consulta_logs.filtrar(filtros).order_by(Log_.timestamp.desc(), Log_.id.desc()).offset(posicao).first()
+    from log_query import codificar_cursor
+    return codificar_cursor(log) if log else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='10000,100000,1000000', help='Tamanhos da tabela Log (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    args = parser.parse_args()
+
+    cenarios = [
+        ('sem filtro', {}),
+        ('usuario+erro', {'usuario': 'usuario07', 'status': 'erro'}),
+        ('acao', {'acao': 'separar'}),
+    ]
+
+    with app.app_context():
+        db.create_all()
+        usuario = User(username='benchmark', email='benchmark@exemplo.com', is_admin=True)
+        usuario.set_password('benchmark')
+        db.session.add(usuario)
+        db.session.commit()
+
+        print(f"{'registros':>10} {'cenário':<14} {'antigo p1':>10} {'antigo meio':>12} {'atual p1':>9} {'atual meio':>11}  (ms)")
+        atual = 0
+        for tamanho in sorted(int(t) for t in args.tamanhos.split(',') if t.strip()):
+            inicio = time.perf_counter()
+            povoar(atual, tamanho, usuario.id)
+            atual = tamanho
+            db.session.execute(db.text('ANALYZE'))
+            print(f"   ({tamanho} registros povoados em {time.perf_counter() - inicio:.1f}s)")
+            consulta_logs.invalidar_estatisticas()
+            consulta_logs._estatisticas = None
+
+            for nome, filtros in cenarios:
+                total_filtrado = consulta_logs.filtrar(filtros).count()
+                paginas = max((total_filtrado + POR_PAGINA - 1) // POR_PAGINA, 1)
+                meio = cursor_do_meio(filtros, total_filtrado)
+                pagina_atual(filtros, None)  # aquece o cache das estatísticas
+
+                antigo_p1 = medir(pagina_antiga, args.repeticoes, filtros, 1)
+                antigo_meio = medir(pagina_antiga, args.repeticoes, filtros, max(paginas // 2, 1))
+                atual_p1 = medir(pagina_atual, args.repeticoes, filtros, None)
+                atual_meio = medir(pagina_atual, args.repeticoes, filtros, meio)
+                print(f"{tamanho:>10} {nome:<14} {antigo_p1:>10.1f} {antigo_meio:>12.1f} {atual_p1:>9.1f} {atual_meio:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Custo por span da instrumentação de latência (metrics.py)
+
+Uso:
+    python benchmarks/benchmark_metrics.py [--tamanhos 10000,100000,1000000] [--repeticoes 5]
+
+Mede, por número de spans, o tempo médio por chamada de:
+  - vazio:        função sem instrumentação (referência)
+  - medir:        bloco dentro de `with medir(...)`
+  - cronometrar:  função decorada com @cronometrar
+  - instrumentar: método envolvido por instrumentar() (o que as chamadas ao Sheets usam)
+"""
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from metrics import medir, cronometrar, instrumentar, registro  # noqa: E402
+
+
+def funcao():
+    return None
+
+
+@cronometrar('benchmark.cronometrar')
+def funcao_cronometrada():
+    return None
+
+
+class Aba:
+    def get_all_values(self):
+        return None
+
+
+instrumentar(Aba, ['get_all_values'], 'benchmark')
+
+
+def laco_vazio(quantidade):
+    for _ in range(quantidade):
+        funcao()
+
+
+def laco_medir(quantidade):
+    for _ in range(quantidade):
+        with medir('benchmark.medir'):
+            funcao()
+
+
+def laco_cronometrar(quantidade):
+    for _ in range(quantidade):
+        funcao_cronometrada()
+
+
+def laco_instrumentar(quantidade):
+    aba = Aba()
+    for _ in range(quantidade):
+        aba.get_all_values()
+
+
+def medir_tempo(laco, quantidade, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        laco(quantidade)
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    # µs por chamada (mediana)
+    return tempos[len(tempos) // 2] / quantidade * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='10000,100000,1000000', help='Spans por medida (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    args = parser.parse_args()
+
+    print(f"{'spans':>9} {'vazio':>8} {'medir':>8} {'cronometrar':>12} {'instrumentar':>13}  (µs por chamada)")
+    for tamanho in sorted(int(t) for t in args.tamanhos.split(',') if t.strip()):
+        registro.limpar()
+        vazio = medir_tempo(laco_vazio, tamanho, args.repeticoes)
+        com_medir = medir_tempo(laco_medir, tamanho, args.repeticoes)
+        com_cronometrar = medir_tempo(laco_cronometrar, tamanho, args.repeticoes)
+        com_instrumentar = medir_tempo(laco_instrumentar, tamanho, args.repeticoes)
+        print(f"{tamanho:>9} {vazio:>8.3f} {com_medir:>8.3f} {com_cronometrar:>12.3f} {com_instrumentar:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Partida a frio: perfil de importação do app, import e primeira requisição com e sem aquecimento
+
+Uso:
+    python benchmarks/benchmark_partida_fria.py [--tamanhos 1000,10000] [--repeticoes 5]
+        [--latencia-ms 150] [--espera-ms 1000] [--top 15]
+
+1. Perfil de importação (python -X importtime -c "import app"): tempo acumulado de cada
+   pacote importado por app.py e pelos módulos de gestao, do mais caro para o mais barato.
+2. Import: processos novos fazendo só "import app" (mediana de --repeticoes): tempo do import,
+   pico de RSS e quais bibliotecas pesadas já foram carregadas (devem ficar para o primeiro uso).
+3. Primeira requisição: gunicorn (gunicorn.conf.py, 1 worker, 'gestao:criar_app()') com o Google
+   Sheets em memória (fake_sheets.py, --tamanhos solicitações, --latencia-ms por chamada):
+   - partida:     do processo até GET /login responder (porta aberta e app carregado)
+   - primeira /:  o dashboard --espera-ms depois da partida (o primeiro usuário chegando)
+   com WARMUP_ENABLED=false e true (aquecimento do cache em post_worker_init).
+Tempos em ms.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import warnings
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='benchmark_partida_fria_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'partida_fria.db')
+os.environ['SHEETS_BACKEND'] = 'fake'
+os.environ['SECRET_KEY'] = 'benchmark-partida-fria'
+os.environ['LOG_LEVEL'] = 'WARNING'
+
+SAIDA = open(os.devnull, 'w', encoding='utf-8')
+warnings.filterwarnings('ignore', category=UserWarning)
+
+PESADAS = ['pandas', 'numpy', 'gspread', 'google.oauth2', 'google.auth', 'requests', 'flask_migrate', 'alembic',
+           'reportlab']
+
+CODIGO_IMPORT = f"""
+import contextlib, io, json, resource, sys, time
+inicio = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+import_ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{
+    'import_ms': import_ms,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'pesadas': [m for m in {PESADAS!r} if m in sys.modules],
+}}))
+"""
+
+
+def mediana(valores):
+    valores = sorted(valores)
+    return valores[len(valores) // 2]
+
+
+def perfil_importacao(top):
+    """Custo acumulado (ms) de cada pacote importado por app.py e pelos módulos do pacote gestao (-X importtime)"""
+    resultado = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=RAIZ,
+                               capture_output=True, text=True, env=os.environ)
+    # Os filhos aparecem antes do pai: cada nível guarda os filhos até a linha do pai chegar
+    pendentes = defaultdict(list)
+    raizes = []
+    for linha in resultado.stderr.splitlines():
+        encontrado = re.match(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)', linha)
+        if not encontrado:
+            continue
+        proprio_us, acumulado_us, recuo, nome = encontrado.groups()
+        nivel = len(recuo) // 2
+        no = (nome, int(proprio_us) / 1000, int(acumulado_us) / 1000, pendentes.pop(nivel + 1, []))
+        (raizes if nivel == 0 else pendentes[nivel]).append(no)
+    # Só os imports de app contam (os de site etc. são descartados)
+    raiz = next((no for no in raizes if no[0] == 'app'), ('app', 0.0, 0.0, []))
+    custos = defaultdict(float)
+
+    def somar(filhos):
+        for nome, _, acumulado, netos in filhos:
+            if nome == 'gestao' or nome.startswith('gestao.'):
+                somar(netos)
+            else:
+                # O pacote de topo leva o custo dos seus submódulos
+                custos[nome.split('.')[0]] += acumulado
+
+    somar(raiz[3])
+    print(f"Perfil de importação: import app = {raiz[2]:.0f} ms (corpo de app.py: {raiz[1]:.0f} ms)")
+    for nome, ms in sorted(custos.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {nome:<28} {ms:>8.1f} ms")
+    print()
+
+
+def medir_import(repeticoes):
+    medidas = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', CODIGO_IMPORT], cwd=RAIZ, capture_output=True,
+                               text=True, env=os.environ).stdout
+        medidas.append(json.loads(saida.strip().splitlines()[-1]))
+    print(f"Import (processos novos): {mediana([m['import_ms'] for m in medidas]):.0f} ms, "
+          f"RSS {mediana([m['rss_mb'] for m in medidas]):.0f} MB")
+    print(f"  bibliotecas pesadas carregadas no import: {', '.join(medidas[0]['pesadas']) or 'nenhuma'}\n")
+
+
+def preparar_banco():
+    """Tabelas e usuário no SQLite temporário; devolve o cookie de sessão desse usuário"""
+    with contextlib.redirect_stdout(SAIDA):
+        import app as modulo_app
+    app = modulo_app.app
+    with app.app_context():
+        modulo_app.db.create_all()
+        usuario = modulo_app.User(username='benchmark', email='benchmark@example.com', is_admin=True)
+        usuario.set_password('benchmark')
+        modulo_app.db.session.add(usuario)
+        modulo_app.db.session.commit()
+        dados = {'_user_id': str(usuario.id), '_fresh': True}
+    valor = app.session_interface.get_signing_serializer(app).dumps(dados)
+    return f"{app.config['SESSION_COOKIE_NAME']}={valor}"
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def requisitar(url, cookie=''):
+    pedido = urllib.request.Request(url, headers={'Cookie': cookie})
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(pedido, timeout=300) as resposta:
+        resposta.read()
+        if resposta.status != 200 or '/login' in resposta.geturl() and '/login' not in url:
+            raise RuntimeError(f'{url}: HTTP {resposta.status} ({resposta.geturl()})')
+    return time.perf_counter() - inicio
+
+
+def primeira_requisicao(cookie, aquecimento, espera):
+    """(partida, primeira /) em segundos, num gunicorn novo"""
+    porta = porta_livre()
+    ambiente = dict(os.environ, PORT=str(porta), WEB_CONCURRENCY='1', GUNICORN_THREADS='4',
+                    WARMUP_ENABLED='true' if aquecimento else 'false')
+    inicio = time.perf_counter()
+    processo = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'gestao:criar_app()'],
+                                cwd=RAIZ, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{porta}'
+    try:
+        while True:
+            if processo.poll() is not None:
+                raise RuntimeError('gunicorn terminou ao iniciar')
+            try:
+                requisitar(url + '/login')
+                break
+            except OSError:
+                time.sleep(0.01)
+        partida = time.perf_counter() - inicio
+        time.sleep(espera)
+        return partida, requisitar(url + '/', cookie)
+    finally:
+        processo.terminate()
+        try:
+            processo.wait(30)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='1000,10000', help='Solicitações na planilha (separados por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por medida (usa a mediana)')
+    parser.add_argument('--latencia-ms', type=float, default=150, help='Latência simulada por chamada ao Sheets')
+    parser.add_argument('--espera-ms', type=float, default=1000, help='Intervalo entre a partida e a primeira /')
+    parser.add_argument('--top', type=int, default=15, help='Pacotes mostrados no perfil de importação')
+    args = parser.parse_args()
+    tamanhos = sorted(int(t) for t in args.tamanhos.split(',') if t.strip())
+
+    perfil_importacao(args.top)
+    medir_import(args.repeticoes)
+
+    os.environ['SHEETS_FAKE_LATENCY_MS'] = str(args.latencia_ms)
+    cookie = preparar_banco()
+    print(f"Primeira requisição (gunicorn, 1 worker, Sheets com {args.latencia_ms:.0f} ms por chamada, "
+          f"primeira / {args.espera_ms:.0f} ms após a partida)")
+    print(f"{'solicitações':>12} {'aquecimento':>12} {'partida':>9} {'primeira /':>11}  (ms)")
+    for tamanho in tamanhos:
+        os.environ['SHEETS_FAKE_SOLICITACOES'] = str(tamanho)
+        os.environ['SHEETS_FAKE_PRODUTOS'] = str(max(tamanho // 4, 50))
+        for aquecimento in (False, True):
+            medidas = [primeira_requisicao(cookie, aquecimento, args.espera_ms / 1000) for _ in range(args.repeticoes)]
+            print(f"{tamanho:>12} {'sim' if aquecimento else 'não':>12} {mediana([m[0] for m in medidas]) * 1000:>9.0f} "
+                  f"{mediana([m[1] for m in medidas]) * 1000:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos motores de PDF de romaneio: ReportLab x xhtml2pdf x Chrome headless
+(DevTools em memória e, para comparação, --print-to-pdf com arquivos temporários)
+
+Uso:
+    python benchmarks/benchmark_pdf_engines.py [--tamanhos 10,100,1000] [--repeticoes 3]
+
+Mede apenas a geração dos bytes do PDF (sem upload para o Cloud Storage).
+O Chrome só é medido se estiver instalado na máquina.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+
+from pdf_generator import gerar_pdf_romaneio  # noqa: E402
+
+
+def gerar_itens(quantidade):
+    """Gera itens sintéticos com o mesmo formato usado por criar_impressao"""
+    itens = []
+    for i in range(quantidade):
+        itens.append({
+            'data': f"{(i % 28) + 1:02d}/01/2025",
+            'solicitante': f"SOLICITANTE {i % 12}",
+            'codigo': f"{100000 + i}",
+            'descricao': f"Parafuso sextavado M{8 + i % 5} x {20 + i % 60} inox" + (" com arruela lisa e porca" if i % 4 == 0 else ""),
+            'quantidade': (i % 9) + 1,
+            'alta_demanda': i % 5 == 0,
+            'locacao_matriz': f"{i % 3 + 1} E{i % 9} E0{i % 7}/F0{i % 5}",
+            'saldo_estoque': 600 - (i % 100),
+            'media_mensal': 41 + (i % 13),
+            'qtd_pendente': (i % 9) + 1,
+            'qtd_separada': 0,
+        })
+    return itens
+
+
+def renderizar_html(env, romaneio_data, itens):
+    """Renderiza o formulario_impressao_pdf.html (o mesmo template usado pelos motores HTML no app)"""
+    template = env.get_template('formulario_impressao_pdf.html')
+    return template.render(id_impressao=romaneio_data['id_impressao'], solicitacoes=itens,
+                           tipo_romaneio='Romaneio de Separação',
+                           data_impressao=romaneio_data['data_impressao'], is_reprint=False)
+
+
+def motor_reportlab(env, romaneio_data, itens):
+    return gerar_pdf_romaneio(romaneio_data, itens)
+
+
+def motor_xhtml2pdf(env, romaneio_data, itens):
+    import io
+    from xhtml2pdf import pisa
+    html = renderizar_html(env, romaneio_data, itens)
+    destino = io.BytesIO()
+    pisa.CreatePDF(html, dest=destino)
+    return destino.getvalue()
+
+
+def motor_chrome(env, romaneio_data, itens):
+    """Chrome via DevTools (--remote-debugging-pipe): HTML e PDF só em memória"""
+    from pdf_browser_generator import encontrar_navegador, gerar_pdf_devtools
+    return gerar_pdf_devtools(encontrar_navegador(), renderizar_html(env, romaneio_data, itens), timeout=120)
+
+
+def motor_chrome_arquivo(env, romaneio_data, itens):
+    """Chrome via --print-to-pdf (HTML e PDF em diretório temporário) para comparação"""
+    from pdf_browser_generator import encontrar_navegador, gerar_pdf_linha_comando
+    return gerar_pdf_linha_comando(encontrar_navegador(), renderizar_html(env, romaneio_data, itens), timeout=120)
+
+
+def medir(motor, env, romaneio_data, itens, repeticoes):
+    tempos = []
+    tamanho = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        pdf = motor(env, romaneio_data, itens)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        tamanho = len(pdf)
+    tempos.sort()
+    return tempos[len(tempos) // 2], tamanho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', default='10,100,1000', help='Quantidades de itens (separadas por vírgula)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições por medida (usa a mediana)')
+    args = parser.parse_args()
+
+    env = Environment(loader=FileSystemLoader(os.path.join(RAIZ, 'templates')), autoescape=True)
+    motores = [('reportlab', motor_reportlab), ('xhtml2pdf', motor_xhtml2pdf)]
+    from pdf_browser_generator import encontrar_navegador
+    if encontrar_navegador():
+        motores.append(('chrome', motor_chrome))
+        if sys.platform != 'win32':
+            motores.append(('chrome-cli', motor_chrome_arquivo))
+    else:
+        print("⚠️ Chrome não encontrado - motor chrome não será medido")
+
+    print(f"{'motor':<10} {'itens':>6} {'mediana (ms)':>14} {'tamanho (bytes)':>16}")
+    for tamanho_romaneio in [int(t) for t in args.tamanhos.split(',') if t.strip()]:
+        itens = gerar_itens(tamanho_romaneio)
+        romaneio_data = {
+            'id_impressao': 'ROM-999999',
+            'data_impressao': '01/01/2025, 08:00:00',
+            'usuario_impressao': 'benchmark',
+            'total_itens': tamanho_romaneio,
+        }
+        for nome, motor in motores:
+            mediana, tamanho_pdf = medir(motor, env, romaneio_data, itens, args.repeticoes)
+            print(f"{nome:<10} {tamanho_romaneio:>6} {mediana:>14.1f} {tamanho_pdf:>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Custo da sessão/autenticação por requisição (check_session_timeout + load_user)
+
+Uso:
+    python benchmarks/benchmark_sessao.py [--requisicoes 2000] [--repeticoes 3]
+
+Um usuário logado consulta /api/pdf-status/<id> (a rota que a página do romaneio consulta
+repetidamente enquanto o PDF é gerado), com o test client e um SQLite temporário. Cada
+configuração roda num processo novo (as variáveis são lidas no import):
+  - antigo:            last_activity regravado e cookie reassinado em toda resposta, usuário
+                       consultado no banco a cada requisição (intervalo 0, cache 0)
+  - cookie:            padrão (SESSION_BACKEND=cookie, intervalo e cache de usuário)
+  - servidor/memoria:  SESSION_BACKEND=servidor com o estado compartilhado em memória
+  - servidor/banco:    SESSION_BACKEND=servidor com SHARED_STATE_BACKEND=banco (vários workers)
+Mostra tempo por requisição (µs, mediana das repetições), respostas com Set-Cookie, consultas
+ao banco (total e da tabela user) por requisição e o tamanho do cookie.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+CONFIGURACOES = {
+    'antigo': {'SESSION_BACKEND': 'cookie', 'SESSION_ACTIVITY_BUCKET_SECONDS': '0', 'AUTH_USER_CACHE_SECONDS': '0'},
+    'cookie': {'SESSION_BACKEND': 'cookie'},
+    'servidor/memoria': {'SESSION_BACKEND': 'servidor', 'SHARED_STATE_BACKEND': 'memoria'},
+    'servidor/banco': {'SESSION_BACKEND': 'servidor', 'SHARED_STATE_BACKEND': 'banco'},
+}
+
+
+def executar(nome, requisicoes, repeticoes):
+    """Roda no processo filho: loga e mede as requisições autenticadas"""
+    from sqlalchemy import event
+    from gestao import criar_app
+    from gestao.extensions import db
+    from gestao.models import User
+
+    app = criar_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    if nome == 'antigo':
+        app.config['SESSION_REFRESH_EACH_REQUEST'] = True
+    with app.app_context():
+        db.create_all()
+        usuario = User(username='benchmark', email='benchmark@exemplo.com', is_admin=True)
+        usuario.set_password('benchmark')
+        db.session.add(usuario)
+        db.session.commit()
+        consultas = []
+        event.listen(db.engine, 'before_cursor_execute', lambda conn, cursor, sql, *args: consultas.append(sql))
+
+    cliente = app.test_client()
+    resposta = cliente.post('/login', data={'username': 'benchmark', 'password': 'benchmark'})
+    if resposta.status_code != 302:
+        raise RuntimeError(f'login: HTTP {resposta.status_code}')
+    cookie = cliente.get_cookie(app.config['SESSION_COOKIE_NAME'])
+
+    tempos = []
+    for _ in range(repeticoes):
+        consultas.clear()
+        set_cookie = 0
+        inicio = time.perf_counter()
+        for _ in range(requisicoes):
+            resposta = cliente.get('/api/pdf-status/REQ-BENCHMARK')
+            set_cookie += 'Set-Cookie' in resposta.headers
+        tempos.append((time.perf_counter() - inicio) / requisicoes * 1e6)
+        if resposta.status_code != 200:
+            raise RuntimeError(f'/api/pdf-status: HTTP {resposta.status_code}')
+    return {
+        'us_por_requisicao': sorted(tempos)[len(tempos) // 2],
+        'set_cookie': set_cookie / requisicoes,
+        'consultas': len(consultas) / requisicoes,
+        'consultas_user': sum('FROM user' in sql for sql in consultas) / requisicoes,
+        'cookie_bytes': len(cookie.value) if cookie else 0,
+    }
+
+
+def medir(nome, requisicoes, repeticoes):
+    ambiente = dict(os.environ)
+    ambiente.update(CONFIGURACOES[nome])
+    ambiente.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='benchmark_sessao_'), 'sessao.db'),
+        'SHEETS_BACKEND': 'fake',
+        'SECRET_KEY': 'benchmark-sessao',
+        'LOG_LEVEL': 'WARNING',
+        'METRICS_ENABLED': 'false',
+    })
+    resultado = subprocess.run([sys.executable, os.path.abspath(__file__), '--executar', nome,
+                                '--requisicoes', str(requisicoes), '--repeticoes', str(repeticoes)],
+                               cwd=RAIZ, env=ambiente, capture_output=True, text=True)
+    if resultado.returncode != 0:
+        raise RuntimeError(f'{nome}: {resultado.stderr[-800:]}')
+    # A thread dos logs ainda pode imprimir depois do resultado
+    return json.loads([linha for linha in resultado.stdout.splitlines() if linha.startswith('{')][-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requisicoes', type=int, default=2000, help='Requisições por repetição')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições por configuração (usa a mediana)')
+    parser.add_argument('--configuracoes', default=','.join(CONFIGURACOES), help='Configurações (separadas por vírgula)')
+    parser.add_argument('--executar', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        print(json.dumps(executar(args.executar, args.requisicoes, args.repeticoes)))
+        return
+
+    print(f"{'configuração':<18} {'µs/req':>8} {'Set-Cookie':>11} {'consultas':>10} {'user':>6} {'cookie':>8}")
+    for nome in (c.strip() for c in args.configuracoes.split(',') if c.strip()):
+        r = medir(nome, args.requisicoes, args.repeticoes)
+        print(f"{nome:<18} {r['us_por_requisicao']:>8.0f} {r['set_cookie']:>10.0%} {r['consultas']:>10.2f} "
+              f"{r['consultas_user']:>6.2f} {r['cookie_bytes']:>7}B")
+
+
+if __name__ == '__main__':
+    main()
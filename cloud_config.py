@@ -9,29 +9,66 @@ def is_google_cloud():
     """Verifica se está rodando no Google Cloud"""
     return os.getenv('GAE_APPLICATION') is not None
 
+# Backends de armazenamento dos PDFs (ver pdf_storage.py):
+#   gcs     - Google Cloud Storage (padrão; também usado em desenvolvimento)
+#   local   - pasta local (PDF_STORAGE_DIR, padrão Romaneios_Separacao)
+#   memoria - em memória, só para testes/benchmarks
+PDF_STORAGE_BACKENDS = ('gcs', 'local', 'memoria')
+
 def get_storage_config():
-    """Retorna configuração de armazenamento baseada no ambiente"""
-    if is_google_cloud():
+    """Retorna configuração de armazenamento dos PDFs (variável PDF_STORAGE_BACKEND, padrão: gcs)"""
+    backend = os.getenv('PDF_STORAGE_BACKEND', 'gcs').strip().lower()
+    if backend not in PDF_STORAGE_BACKENDS:
+        print(f"⚠️ PDF_STORAGE_BACKEND inválido ({backend}), usando gcs")
+        backend = 'gcs'
+    if backend == 'gcs':
         return {
             'type': 'cloud_storage',
             'bucket_name': os.getenv('GCS_BUCKET_NAME', 'romaneios-separacao'),
             'local_fallback': False
         }
-    else:
+    if backend == 'memoria':
         return {
-            'type': 'local',
-            'local_path': 'Romaneios_Separacao',
-            'local_fallback': True
+            'type': 'memoria',
+            'local_fallback': False
         }
+    return {
+        'type': 'local',
+        'local_path': os.getenv('PDF_STORAGE_DIR', 'Romaneios_Separacao'),
+        'local_fallback': True
+    }
 
-def get_pdf_generator():
-    """Retorna o gerador de PDF apropriado para o ambiente"""
-    if is_google_cloud():
-        from pdf_cloud_generator import salvar_pdf_cloud
-        return salvar_pdf_cloud
+# Motores de PDF disponíveis:
+#   reportlab - ReportLab em processo, sem navegador nem parse de HTML (padrão, mais rápido)
+#   xhtml2pdf - converte o HTML renderizado do formulário (layout aproximado)
+#   chrome    - Chrome headless sobre o HTML renderizado (layout idêntico, mais lento)
+PDF_ENGINES = ('reportlab', 'xhtml2pdf', 'chrome')
+
+def get_pdf_engine():
+    """Retorna o motor de PDF configurado na variável PDF_ENGINE (padrão: reportlab)"""
+    engine = os.getenv('PDF_ENGINE', 'reportlab').strip().lower()
+    if engine not in PDF_ENGINES:
+        print(f"⚠️ PDF_ENGINE inválido ({engine}), usando reportlab")
+        engine = 'reportlab'
+    return engine
+
+def get_pdf_generator(engine=None):
+    """
+    Retorna o gerador de PDF para o motor configurado
+
+    Todos os geradores têm a mesma assinatura:
+        gerador(html_content, romaneio_data, pasta_destino=None, is_reprint=False, itens_data=None)
+    """
+    from metrics import cronometrar
+    engine = engine or get_pdf_engine()
+    if engine == 'chrome':
+        from pdf_browser_generator import salvar_pdf_direto_html as gerador
+    elif engine == 'xhtml2pdf':
+        from pdf_cloud_generator import salvar_pdf_cloud as gerador
     else:
-        from pdf_browser_generator import salvar_pdf_direto_html
-        return salvar_pdf_direto_html
+        from pdf_generator import salvar_pdf_reportlab as gerador
+    # Tempo de geração por motor em /admin/metrics (operação pdf.<motor>)
+    return cronometrar(f'pdf.{engine}')(gerador)
 
 def get_database_config():
     """Retorna configuração do banco de dados para o ambiente"""
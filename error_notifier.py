@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Notificação de erros por e-mail agrupada, com limite de envio e fora da requisição
+
+O handler de erros só registra a exceção (impressão digital + contador, sem rede) e
+responde na hora. Uma thread de fundo envia, a cada ERROR_DIGEST_SECONDS, um e-mail de
+resumo com os erros acumulados:
+  - erros iguais (mesmo tipo e mesma pilha, independente da mensagem) viram um grupo com
+    o número de ocorrências e o traceback da primeira
+  - um erro já notificado nas últimas ERROR_REPEAT_SECONDS não gera e-mail sozinho: as
+    repetições entram no próximo resumo ou saem uma vez por janela
+  - no máximo ERROR_EMAIL_MAX_PER_HOUR e-mails por hora; acima disso os grupos continuam
+    acumulando para o próximo envio permitido
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+_SEPARADOR = '━' * 78
+
+
+def impressao_digital(excecao):
+    """
+    Identifica o erro pelo tipo e pela pilha (arquivo, função e linha de cada quadro)
+
+    A mensagem fica de fora: "Romaneio 123 não encontrado" e "Romaneio 456 não encontrado"
+    são o mesmo erro.
+
+    Returns:
+        str: hash curto (12 caracteres hexadecimais)
+    """
+    partes = [f"{type(excecao).__module__}.{type(excecao).__qualname__}"]
+    for quadro in traceback.extract_tb(excecao.__traceback__):
+        partes.append(f"{os.path.basename(quadro.filename)}:{quadro.name}:{quadro.lineno}")
+    return hashlib.sha1('|'.join(partes).encode('utf-8')).hexdigest()[:12]
+
+
+def montar_resumo(grupos, descartados=0):
+    """
+    Assunto e corpo do e-mail de resumo
+
+    Args:
+        grupos: lista de grupos (dicts de NotificadorErros), na ordem da primeira ocorrência
+        descartados: ocorrências que não couberam em nenhum grupo (limite de grupos)
+
+    Returns:
+        tuple: (assunto, corpo)
+    """
+    total = sum(grupo['ocorrencias'] for grupo in grupos) + descartados
+    if len(grupos) == 1 and not descartados:
+        grupo = grupos[0]
+        assunto = f"🚨 ERRO NO SISTEMA: {grupo['tipo']} - {grupo['mensagem'][:50]}... ({grupo['ocorrencias']}x)"
+    else:
+        assunto = f"🚨 {len(grupos)} ERROS NO SISTEMA ({total} ocorrências)"
+
+    secoes = []
+    for grupo in grupos:
+        contexto = '\n'.join(f"{chave}: {valor}" for chave, valor in grupo['contexto'].items())
+        secao = (
+            f"{_SEPARADOR}\n"
+            f"📋 {grupo['tipo']} ({grupo['ocorrencias']}x) - impressão digital {grupo['digital']}\n"
+            f"{_SEPARADOR}\n\n"
+            f"Mensagem: {grupo['mensagem']}\n"
+            f"Primeira ocorrência: {grupo['primeira'].strftime('%d/%m/%Y %H:%M:%S')}\n"
+            f"Última ocorrência: {grupo['ultima'].strftime('%d/%m/%Y %H:%M:%S')}\n\n"
+            f"🔍 Contexto da primeira ocorrência:\n{contexto or 'N/A'}\n\n"
+        )
+        if grupo['nova']:
+            secao += f"🔧 Traceback:\n\n{grupo['traceback']}\n"
+        else:
+            secao += "🔁 Erro já notificado anteriormente (traceback omitido)\n"
+        secoes.append(secao)
+
+    aviso_descartados = ''
+    if descartados:
+        aviso_descartados = f"\n⚠️ {descartados} ocorrências de outros erros não detalhadas (limite de grupos)\n"
+
+    corpo = (
+        "⚠️ ERROS DETECTADOS NO SISTEMA DE GESTÃO DE ESTOQUE\n\n"
+        f"{len(grupos)} erro(s) distinto(s), {total} ocorrência(s) desde o último resumo.\n\n"
+        + '\n'.join(secoes)
+        + aviso_descartados
+        + f"\n{_SEPARADOR}\n\n"
+        "Por favor, investigue e corrija estes erros o quanto antes.\n\n"
+        "Este é um e-mail automático gerado pelo sistema de monitoramento de erros.\n"
+    )
+    return assunto, corpo
+
+
+class NotificadorErros:
+    """Agrupa exceções por impressão digital e envia resumos por e-mail em segundo plano"""
+
+    def __init__(self, enviar, intervalo=60.0, max_por_hora=6, janela_repeticao=3600, max_grupos=100):
+        """
+        Args:
+            enviar: função (assunto, corpo) que envia o e-mail; retorna False se não enviou
+                    por falta de configuração (o resumo é descartado) e levanta exceção em
+                    falha de envio (o resumo volta para a fila)
+            intervalo: segundos entre rodadas de envio
+            max_por_hora: limite de e-mails por hora
+            janela_repeticao: segundos em que um erro já notificado não dispara e-mail sozinho
+            max_grupos: limite de erros distintos acumulados (os demais só são contados)
+        """
+        self.enviar = enviar
+        self.intervalo = intervalo
+        self.max_por_hora = max_por_hora
+        self.janela_repeticao = janela_repeticao
+        self.max_grupos = max_grupos
+        self._grupos = {}
+        self._descartados = 0
+        # impressão digital -> quando foi enviada com traceback
+        self._notificados = {}
+        self._envios = deque()
+        self._ultimo_envio = 0
+        self._lock = threading.Lock()
+        # Só um envio por vez (thread de fundo, atexit ou chamada manual)
+        self._lock_envio = threading.Lock()
+        self._acordar = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def registrar(self, excecao, contexto=None):
+        """
+        Registra uma ocorrência (retorna na hora, sem rede)
+
+        Args:
+            excecao: exceção capturada (com __traceback__)
+            contexto: dict com informações da requisição (só o da primeira ocorrência é guardado)
+
+        Returns:
+            str: impressão digital do erro
+        """
+        digital = impressao_digital(excecao)
+        agora = datetime.now()
+        primeira_vez = False
+        # Formatar fora do lock e só na primeira ocorrência do grupo
+        novo = None if digital in self._grupos else self._novo_grupo(digital, excecao, contexto, agora)
+
+        with self._lock:
+            grupo = self._grupos.get(digital)
+            if grupo is None:
+                if len(self._grupos) >= self.max_grupos:
+                    self._descartados += 1
+                else:
+                    if novo is None:
+                        # O grupo foi enviado entre a verificação e o lock
+                        novo = self._novo_grupo(digital, excecao, contexto, agora)
+                    notificado_em = self._notificados.get(digital)
+                    novo['nova'] = notificado_em is None or time.time() - notificado_em >= self.janela_repeticao
+                    grupo = self._grupos[digital] = novo
+            if grupo is not None:
+                grupo['ocorrencias'] += 1
+                grupo['ultima'] = agora
+                primeira_vez = grupo is novo and grupo['nova']
+
+        if primeira_vez:
+            print(f"🚨 Erro não tratado [{digital}]: {novo['tipo']}: {novo['mensagem']}")
+            print(novo['traceback'])
+        self._garantir_thread()
+        return digital
+
+    @staticmethod
+    def _novo_grupo(digital, excecao, contexto, agora):
+        return {
+            'digital': digital,
+            'tipo': type(excecao).__name__,
+            'mensagem': str(excecao),
+            'traceback': ''.join(traceback.format_exception(type(excecao), excecao, excecao.__traceback__)),
+            'contexto': dict(contexto or {}),
+            'ocorrencias': 0,
+            'primeira': agora,
+        }
+
+    def pendentes(self):
+        """Ocorrências aguardando o próximo resumo"""
+        with self._lock:
+            return sum(grupo['ocorrencias'] for grupo in self._grupos.values()) + self._descartados
+
+    def descarregar(self, forcar=False):
+        """
+        Envia o resumo dos erros acumulados, se o limite de envio permitir
+
+        Args:
+            forcar: enviar mesmo que só haja repetições de erros já notificados
+                    (o limite por hora continua valendo)
+
+        Returns:
+            bool: True se um e-mail foi enviado
+        """
+        with self._lock_envio:
+            with self._lock:
+                if not self._grupos and not self._descartados:
+                    return False
+                agora = time.time()
+                while self._envios and agora - self._envios[0] >= 3600:
+                    self._envios.popleft()
+                if len(self._envios) >= self.max_por_hora:
+                    return False
+                tem_novos = any(grupo['nova'] for grupo in self._grupos.values())
+                if not (tem_novos or forcar or agora - self._ultimo_envio >= self.janela_repeticao):
+                    return False
+                grupos = sorted(self._grupos.values(), key=lambda grupo: grupo['primeira'])
+                descartados = self._descartados
+                self._grupos = {}
+                self._descartados = 0
+
+            assunto, corpo = montar_resumo(grupos, descartados)
+            try:
+                enviado = self.enviar(assunto, corpo)
+            except Exception as e:
+                print(f"❌ Erro ao enviar e-mail de notificação: {e}")
+                self._devolver(grupos, descartados)
+                return False
+
+            with self._lock:
+                self._envios.append(agora)
+                self._ultimo_envio = agora
+                if enviado is not False:
+                    for grupo in grupos:
+                        if grupo['nova']:
+                            self._notificados[grupo['digital']] = agora
+                # Esquecer notificações que já saíram da janela
+                for digital in [d for d, em in self._notificados.items() if agora - em >= self.janela_repeticao]:
+                    del self._notificados[digital]
+            return enviado is not False
+
+    def _devolver(self, grupos, descartados):
+        """Recoloca um resumo que não foi enviado (somando ao que chegou nesse meio tempo)"""
+        with self._lock:
+            self._descartados += descartados
+            for grupo in grupos:
+                atual = self._grupos.get(grupo['digital'])
+                if atual is None:
+                    self._grupos[grupo['digital']] = grupo
+                else:
+                    grupo['ocorrencias'] += atual['ocorrencias']
+                    grupo['ultima'] = atual['ultima']
+                    self._grupos[grupo['digital']] = grupo
+
+    def _garantir_thread(self):
+        """Inicia a thread de envio (de novo após fork, ex.: workers do gunicorn)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._loop_envio, name='notificador-erros', daemon=True)
+        self._thread.start()
+
+    def _loop_envio(self):
+        while True:
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            try:
+                self.descarregar()
+            except Exception as e:
+                print(f"⚠️ Erro no envio do resumo de erros: {e}")
+
+
+def criar_notificador_erros(enviar):
+    """
+    Cria o notificador com a configuração do ambiente e envia o que sobrar ao encerrar
+
+    Variáveis: ERROR_DIGEST_SECONDS (60), ERROR_EMAIL_MAX_PER_HOUR (6),
+    ERROR_REPEAT_SECONDS (3600), ERROR_MAX_GROUPS (100)
+    """
+    notificador = NotificadorErros(
+        enviar,
+        intervalo=float(os.environ.get('ERROR_DIGEST_SECONDS', '60')),
+        max_por_hora=int(os.environ.get('ERROR_EMAIL_MAX_PER_HOUR', '6')),
+        janela_repeticao=float(os.environ.get('ERROR_REPEAT_SECONDS', '3600')),
+        max_grupos=int(os.environ.get('ERROR_MAX_GROUPS', '100')),
+    )
+    atexit.register(notificador.descarregar, True)
+    return notificador
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Cloud Storage em memória (mesma interface usada do google.cloud.storage)
+
+Para testes e benchmarks sem credenciais nem rede:
+    GCS_BACKEND=fake                          -> get_gcs_client() devolve um FakeGCSClient
+    salvar_pdf_gcs.set_gcs_client(FakeGCSClient())  -> injetar manualmente
+
+Implementa só o que o sistema usa: Client.bucket, Bucket.blob/get_blob/list_blobs/reload,
+Blob.upload_from_string/download_as_bytes/open/exists/reload/delete. Arquivos inexistentes
+levantam google.api_core.exceptions.NotFound, igual ao GCS. O contador `chamadas` registra
+cada operação que seria uma requisição HTTP ao GCS e `bytes_transferidos` o conteúdo
+enviado (upload) e recebido (download).
+"""
+
+import io
+import base64
+import hashlib
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+from google.api_core.exceptions import NotFound
+
+
+class FakeGCSClient:
+    """Cliente em memória: os buckets são criados no primeiro uso"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.chamadas = Counter()
+        self.bytes_transferidos = Counter()
+
+    def bucket(self, bucket_name):
+        with self._lock:
+            if bucket_name not in self._buckets:
+                self._buckets[bucket_name] = FakeBucket(self, bucket_name)
+            return self._buckets[bucket_name]
+
+    def _registrar(self, operacao, tamanho=0):
+        with self._lock:
+            self.chamadas[operacao] += 1
+            if tamanho:
+                self.bytes_transferidos[operacao] += tamanho
+
+
+class FakeBucket:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self._objetos = {}
+        self._lock = threading.Lock()
+        self._geracao = 0
+
+    def blob(self, blob_name):
+        return FakeBlob(self, blob_name)
+
+    def reload(self):
+        self.client._registrar('bucket.reload')
+
+    def get_blob(self, blob_name):
+        self.client._registrar('get_blob')
+        with self._lock:
+            objeto = self._objetos.get(blob_name)
+        if objeto is None:
+            return None
+        blob = FakeBlob(self, blob_name)
+        blob._carregar(objeto)
+        return blob
+
+    def list_blobs(self, prefix='', max_results=None, page_size=1000):
+        with self._lock:
+            nomes = sorted(nome for nome in self._objetos if nome.startswith(prefix or ''))
+            objetos = [(nome, self._objetos[nome]) for nome in nomes]
+        if max_results is not None:
+            objetos = objetos[:max_results]
+        blobs = []
+        for nome, objeto in objetos:
+            blob = FakeBlob(self, nome)
+            blob._carregar(objeto)
+            blobs.append(blob)
+        return FakeListagem(self.client, blobs, page_size)
+
+    def _gravar(self, blob_name, dados, content_type):
+        with self._lock:
+            self._geracao += 1
+            objeto = {
+                'dados': bytes(dados),
+                'content_type': content_type,
+                'generation': self._geracao,
+                'updated': datetime.now(timezone.utc),
+                'etag': base64.b64encode(hashlib.md5(dados).digest()).decode('ascii'),
+            }
+            self._objetos[blob_name] = objeto
+            return objeto
+
+    def _ler(self, blob_name):
+        with self._lock:
+            objeto = self._objetos.get(blob_name)
+        if objeto is None:
+            raise NotFound(f"No such object: {self.name}/{blob_name}")
+        return objeto
+
+    def _remover(self, blob_name):
+        with self._lock:
+            if self._objetos.pop(blob_name, None) is None:
+                raise NotFound(f"No such object: {self.name}/{blob_name}")
+
+
+class FakeListagem:
+    """Iterador paginado como o HTTPIterator do GCS (cada página conta como uma requisição)"""
+
+    def __init__(self, client, blobs, page_size):
+        self._client = client
+        self._blobs = blobs
+        self._page_size = page_size or 1000
+
+    @property
+    def pages(self):
+        for inicio in range(0, max(len(self._blobs), 1), self._page_size):
+            self._client._registrar('list_blobs')
+            yield iter(self._blobs[inicio:inicio + self._page_size])
+
+    def __iter__(self):
+        for pagina in self.pages:
+            yield from pagina
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        self.size = None
+        self.etag = None
+        self.generation = None
+        self.updated = None
+        self.content_type = None
+
+    def _carregar(self, objeto):
+        self.size = len(objeto['dados'])
+        self.etag = objeto['etag']
+        self.generation = objeto['generation']
+        self.updated = objeto['updated']
+        self.content_type = objeto['content_type']
+
+    def upload_from_string(self, data, content_type='text/plain'):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.bucket.client._registrar('upload', len(data))
+        # Como no GCS, a resposta do upload já traz os metadados do objeto
+        self._carregar(self.bucket._gravar(self.name, data, content_type))
+
+    def download_as_bytes(self, start=None, end=None):
+        objeto = self.bucket._ler(self.name)
+        self._carregar(objeto)
+        dados = objeto['dados']
+        if start is not None or end is not None:
+            # end é inclusivo, como na API do GCS
+            dados = dados[start or 0:(end + 1) if end is not None else None]
+        self.bucket.client._registrar('download', len(dados))
+        return dados
+
+    def open(self, mode='rb', chunk_size=None):
+        if mode != 'rb':
+            raise ValueError("FakeBlob.open só suporta leitura binária ('rb')")
+        return io.BytesIO(self.download_as_bytes())
+
+    def exists(self):
+        self.bucket.client._registrar('exists')
+        try:
+            self._carregar(self.bucket._ler(self.name))
+            return True
+        except NotFound:
+            return False
+
+    def reload(self):
+        self.bucket.client._registrar('reload')
+        self._carregar(self.bucket._ler(self.name))
+
+    def delete(self):
+        self.bucket.client._registrar('delete')
+        self.bucket._remover(self.name)
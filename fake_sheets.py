@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+"""
+Google Sheets em memória (mesma interface usada do gspread)
+
+Para testes de carga e benchmarks sem credenciais nem rede:
+    SHEETS_BACKEND=fake  -> get_google_sheets_connection() devolve a FakeSpreadsheet do processo,
+                            povoada por gerar_dados() na primeira chamada
+    set_planilha_fake(FakeSpreadsheet())  -> injetar manualmente
+
+Implementa só o que o sistema usa: Spreadsheet.worksheet/worksheets/get_worksheet/add_worksheet/
+del_worksheet e Worksheet.get_all_values/get_values/get/get_all_records/row_values/col_values/
+update/update_cell/batch_update/append_row/append_rows/add_cols/add_rows/delete_rows/clear/format.
+Os valores são devolvidos como texto, como o Sheets devolve os valores formatados.
+
+Para aproximar o serviço real:
+  - latencia/variacao: espera por requisição (a latência de rede de cada chamada)
+  - leituras_por_minuto/escritas_por_minuto: cota por minuto; acima dela a chamada levanta
+    gspread.exceptions.APIError 429 (RESOURCE_EXHAUSTED), como o Sheets
+  - escrever fora da grade (sem add_cols/add_rows antes) levanta APIError 400
+O contador `chamadas` registra cada operação que seria uma requisição HTTP ao Sheets,
+`recusadas` as que estouraram a cota e, com contar_bytes=True, `bytes_transferidos` o
+tamanho aproximado dos valores lidos e gravados.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+import gspread
+from gspread.exceptions import APIError
+from gspread.utils import a1_range_to_grid_range, numericise_all, rowcol_to_a1
+
+from metrics import instrumentar
+
+CABECALHOS_SOLICITACOES = [
+    'Data', 'Solicitante', 'Código', 'Descrição', 'Unidade', 'Quantidade', 'Locação', 'Saldo',
+    'Status', 'Qtd. Separada', 'Observações', 'Alta Demanda', 'Data Separação', 'Separador',
+    'Carimbo', 'ID_SOLICITACAO'
+]
+CABECALHOS_IMPRESSOES = [
+    'ID_IMPRESSAO', 'DATA_IMPRESSAO', 'USUARIO_IMPRESSAO', 'STATUS', 'TOTAL_ITENS', 'OBSERVACOES',
+    'DATA_PROCESSAMENTO', 'USUARIO_PROCESSAMENTO', 'CREATED_AT', 'UPDATED_AT', 'TIPO_ROMANEIO'
+]
+CABECALHOS_IMPRESSAO_ITENS = [
+    'ID_IMPRESSAO', 'ID_SOLICITACAO', 'DATA', 'SOLICITANTE', 'CODIGO', 'DESCRICAO', 'UNIDADE',
+    'QUANTIDADE', 'LOCACAO_MATRIZ', 'SALDO_ESTOQUE', 'MEDIA_MENSAL', 'ALTA_DEMANDA', 'STATUS_ITEM',
+    'QTD_SEPARADA', 'OBSERVACOES_ITEM', 'DATA_SEPARACAO', 'SEPARADO_POR', 'USUARIO_PROCESSAMENTO',
+    'CREATED_AT', 'UPDATED_AT'
+]
+CABECALHOS_REALIZAR_BAIXA = ['Carimbo', 'Cod', 'Data', 'Qtd', 'Responsavel', 'Solicitante', 'ID_IMPRESSAO']
+CABECALHOS_MATRIZ = ['COD', 'DESCRICAO COMPLETA', 'UNIDADE MEDIDA', 'LOCACAO', 'SALDO ESTOQUE', 'MEDIA MENSAL']
+
+# Métodos que viram spans "sheets.<método>" nas métricas, como os do gspread
+METODOS_ABA = [
+    'get_all_values', 'get_values', 'get', 'get_all_records', 'row_values', 'col_values', 'update',
+    'update_cell', 'batch_update', 'append_row', 'append_rows', 'add_cols', 'add_rows', 'delete_rows',
+    'clear', 'format'
+]
+METODOS_PLANILHA = ['worksheet', 'worksheets', 'get_worksheet', 'add_worksheet', 'del_worksheet']
+
+
+class _RespostaErro:
+    """O suficiente de requests.Response para construir um gspread APIError"""
+
+    def __init__(self, codigo, status, mensagem):
+        self.status_code = codigo
+        self._corpo = {'error': {'code': codigo, 'message': mensagem, 'status': status}}
+        self.text = mensagem
+
+    def json(self):
+        return self._corpo
+
+
+def _erro_api(codigo, status, mensagem):
+    return APIError(_RespostaErro(codigo, status, mensagem))
+
+
+def _texto(valor):
+    """Valor como o Sheets devolve depois de gravado (sempre texto)"""
+    if valor is None:
+        return ''
+    if isinstance(valor, bool):
+        return 'TRUE' if valor else 'FALSE'
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def _sem_vazios_no_fim(valores):
+    fim = len(valores)
+    while fim and valores[fim - 1] == '':
+        fim -= 1
+    return valores[:fim]
+
+
+class FakeSpreadsheet:
+    """Planilha em memória com latência, cota e contagem de requisições"""
+
+    def __init__(self, titulo='Planilha de Teste', latencia=0.0, variacao=0.0,
+                 leituras_por_minuto=0, escritas_por_minuto=0, semente=None, contar_bytes=False):
+        """
+        Args:
+            titulo: título da planilha
+            latencia: segundos de espera por requisição
+            variacao: variação aleatória (±) somada à latência, em segundos
+            leituras_por_minuto: cota de leituras por minuto (0 = sem limite)
+            escritas_por_minuto: cota de escritas por minuto (0 = sem limite)
+            semente: semente da variação de latência (reprodutível)
+            contar_bytes: somar em bytes_transferidos o tamanho dos valores lidos/gravados
+        """
+        self.title = titulo
+        self.id = 'fake-' + titulo.lower().replace(' ', '-')
+        self.latencia = latencia
+        self.variacao = variacao
+        self.cotas = {'leitura': leituras_por_minuto, 'escrita': escritas_por_minuto}
+        self.chamadas = Counter()
+        self.recusadas = Counter()
+        self.contar_bytes = contar_bytes
+        self.bytes_transferidos = Counter()
+        self._abas = []
+        self._proximo_id_aba = 0
+        self._janelas = {'leitura': deque(), 'escrita': deque()}
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.RLock()
+
+    def _registrar(self, operacao, tipo):
+        """Conta a requisição, aplica a cota por minuto e espera a latência simulada"""
+        agora = time.monotonic()
+        with self._lock:
+            cota = self.cotas.get(tipo)
+            if cota:
+                janela = self._janelas[tipo]
+                while janela and agora - janela[0] >= 60:
+                    janela.popleft()
+                if len(janela) >= cota:
+                    self.recusadas[operacao] += 1
+                    nome_cota = 'Read requests' if tipo == 'leitura' else 'Write requests'
+                    raise _erro_api(
+                        429, 'RESOURCE_EXHAUSTED',
+                        f"Quota exceeded for quota metric '{nome_cota}' and limit "
+                        f"'{nome_cota} per minute per user' of service 'sheets.googleapis.com'"
+                    )
+                janela.append(agora)
+            self.chamadas[operacao] += 1
+            espera = self.latencia
+            if self.variacao:
+                espera += self._aleatorio.uniform(-self.variacao, self.variacao)
+        # A espera fica fora do lock: requisições concorrentes esperam em paralelo, como na rede
+        if espera > 0:
+            time.sleep(espera)
+
+    def total_chamadas(self):
+        with self._lock:
+            return sum(self.chamadas.values())
+
+    def zerar_contadores(self):
+        with self._lock:
+            self.chamadas.clear()
+            self.recusadas.clear()
+            self.bytes_transferidos.clear()
+            for janela in self._janelas.values():
+                janela.clear()
+
+    def worksheets(self):
+        self._registrar('worksheets', 'leitura')
+        with self._lock:
+            return list(self._abas)
+
+    def worksheet(self, title):
+        self._registrar('worksheet', 'leitura')
+        with self._lock:
+            for aba in self._abas:
+                if aba.title == title:
+                    return aba
+        raise gspread.WorksheetNotFound(title)
+
+    def get_worksheet(self, index):
+        self._registrar('get_worksheet', 'leitura')
+        with self._lock:
+            if 0 <= index < len(self._abas):
+                return self._abas[index]
+        raise gspread.WorksheetNotFound(f"index {index} not found")
+
+    @property
+    def sheet1(self):
+        return self.get_worksheet(0)
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        self._registrar('add_worksheet', 'escrita')
+        return self._criar_aba(title, rows, cols, index)
+
+    def del_worksheet(self, worksheet):
+        self._registrar('del_worksheet', 'escrita')
+        with self._lock:
+            self._abas.remove(worksheet)
+
+    def _criar_aba(self, title, rows, cols, index=None):
+        with self._lock:
+            if any(aba.title == title for aba in self._abas):
+                raise _erro_api(400, 'INVALID_ARGUMENT',
+                                f'Invalid requests[0].addSheet: A sheet with the name "{title}" already exists. '
+                                'Please enter another name.')
+            aba = FakeWorksheet(self, title, self._proximo_id_aba, int(rows), int(cols))
+            self._proximo_id_aba += 1
+            self._abas.insert(len(self._abas) if index is None else index, aba)
+            return aba
+
+
+class FakeWorksheet:
+    """Aba em memória: grade de textos com o tamanho declarado (row_count x col_count)"""
+
+    def __init__(self, planilha, titulo, id_aba, linhas, colunas):
+        self.spreadsheet = planilha
+        self.title = titulo
+        self.id = id_aba
+        self.row_count = linhas
+        self.col_count = colunas
+        self._linhas = []
+
+    # Leituras
+
+    def get_all_values(self, **kwargs):
+        self._registrar('get_all_values', 'leitura')
+        with self._lock:
+            largura = max((len(linha) for linha in self._linhas), default=0)
+            valores = [linha + [''] * (largura - len(linha)) for linha in self._linhas_com_dados()]
+            self._contar_bytes('leitura', valores)
+            return valores
+
+    def get_values(self, range_name=None, **kwargs):
+        if range_name is None:
+            return self.get_all_values(**kwargs)
+        valores = self.get(range_name, **kwargs)
+        largura = max((len(linha) for linha in valores), default=0)
+        return [linha + [''] * (largura - len(linha)) for linha in valores]
+
+    def get(self, range_name=None, **kwargs):
+        self._registrar('get', 'leitura')
+        with self._lock:
+            if range_name is None:
+                resultado = [_sem_vazios_no_fim(list(linha)) for linha in self._linhas_com_dados()]
+            else:
+                linha_inicio, linha_fim, coluna_inicio, coluna_fim = self._faixa(range_name)
+                resultado = []
+                for linha in self._linhas[linha_inicio:linha_fim]:
+                    resultado.append(_sem_vazios_no_fim(linha[coluna_inicio:coluna_fim]))
+                while resultado and not resultado[-1]:
+                    resultado.pop()
+            self._contar_bytes('leitura', resultado)
+            return resultado
+
+    def get_all_records(self, head=1, numericise_ignore=None, **kwargs):
+        valores = self.get_all_values()
+        if len(valores) < head:
+            return []
+        cabecalhos = valores[head - 1]
+        return [
+            dict(zip(cabecalhos, numericise_all(linha, ignore=numericise_ignore or [])))
+            for linha in valores[head:]
+        ]
+
+    def row_values(self, row, **kwargs):
+        self._registrar('row_values', 'leitura')
+        with self._lock:
+            valores = _sem_vazios_no_fim(list(self._linhas[row - 1])) if row <= len(self._linhas) else []
+            self._contar_bytes('leitura', [valores])
+            return valores
+
+    def col_values(self, col, **kwargs):
+        self._registrar('col_values', 'leitura')
+        with self._lock:
+            valores = _sem_vazios_no_fim([linha[col - 1] if len(linha) >= col else '' for linha in self._linhas])
+            self._contar_bytes('leitura', [valores])
+            return valores
+
+    # Escritas
+
+    def update(self, range_name, values=None, **kwargs):
+        # update(values) sem faixa grava a partir de A1, como no gspread
+        if values is None and isinstance(range_name, list):
+            range_name, values = 'A1', range_name
+        self._registrar('update', 'escrita')
+        with self._lock:
+            return self._gravar(range_name, values)
+
+    def update_cell(self, row, col, value):
+        self._registrar('update_cell', 'escrita')
+        with self._lock:
+            return self._gravar(rowcol_to_a1(row, col), [[value]])
+
+    def batch_update(self, data, **kwargs):
+        self._registrar('batch_update', 'escrita')
+        with self._lock:
+            # Como no Sheets, o lote é atômico: valida tudo antes de gravar
+            for item in data:
+                self._validar_grade(item['range'], item['values'])
+            respostas = [self._gravar(item['range'], item['values']) for item in data]
+        return {
+            'spreadsheetId': self.spreadsheet.id,
+            'totalUpdatedCells': sum(resposta['updatedCells'] for resposta in respostas),
+            'responses': respostas,
+        }
+
+    def append_row(self, values, value_input_option='RAW', **kwargs):
+        return self._anexar('append_row', [values])
+
+    def append_rows(self, values, value_input_option='RAW', **kwargs):
+        return self._anexar('append_rows', values)
+
+    def add_cols(self, cols):
+        self._registrar('add_cols', 'escrita')
+        with self._lock:
+            self.col_count += int(cols)
+
+    def add_rows(self, rows):
+        self._registrar('add_rows', 'escrita')
+        with self._lock:
+            self.row_count += int(rows)
+
+    def delete_rows(self, start_index, end_index=None):
+        self._registrar('delete_rows', 'escrita')
+        end_index = end_index or start_index
+        with self._lock:
+            del self._linhas[start_index - 1:end_index]
+            self.row_count -= end_index - start_index + 1
+
+    def clear(self):
+        self._registrar('clear', 'escrita')
+        with self._lock:
+            self._linhas = []
+
+    def format(self, ranges, format=None, **kwargs):
+        # A formatação não muda os valores; só conta a requisição
+        self._registrar('format', 'escrita')
+
+    # Internos
+
+    @property
+    def _lock(self):
+        return self.spreadsheet._lock
+
+    def _registrar(self, operacao, tipo):
+        self.spreadsheet._registrar(operacao, tipo)
+
+    def _linhas_com_dados(self):
+        fim = len(self._linhas)
+        while fim and not any(self._linhas[fim - 1]):
+            fim -= 1
+        return self._linhas[:fim]
+
+    def _contar_bytes(self, tipo, linhas):
+        # Aproximação do corpo JSON: o texto de cada célula mais aspas e vírgula
+        if self.spreadsheet.contar_bytes:
+            self.spreadsheet.bytes_transferidos[tipo] += sum(sum(map(len, linha)) + 3 * len(linha) for linha in linhas)
+
+    def _faixa(self, range_name):
+        """Faixa A1 (com ou sem o nome da aba) -> índices 0-based, fim exclusivo"""
+        if '!' in range_name:
+            range_name = range_name.split('!', 1)[1]
+        grade = a1_range_to_grid_range(range_name)
+        return (
+            grade.get('startRowIndex', 0),
+            grade.get('endRowIndex', self.row_count),
+            grade.get('startColumnIndex', 0),
+            grade.get('endColumnIndex', self.col_count),
+        )
+
+    def _validar_grade(self, range_name, values):
+        linha_inicio, _, coluna_inicio, _ = self._faixa(range_name)
+        ultima_linha = linha_inicio + len(values)
+        ultima_coluna = coluna_inicio + max((len(linha) for linha in values), default=0)
+        if ultima_linha > self.row_count or ultima_coluna > self.col_count:
+            raise _erro_api(
+                400, 'INVALID_ARGUMENT',
+                f"Range ('{self.title}'!{range_name}) exceeds grid limits. "
+                f"Max rows: {self.row_count}, max columns: {self.col_count}"
+            )
+
+    def _gravar(self, range_name, values):
+        self._validar_grade(range_name, values)
+        linha_inicio, _, coluna_inicio, _ = self._faixa(range_name)
+        values = [[_texto(valor) for valor in valores_linha] for valores_linha in values]
+        self._contar_bytes('escrita', values)
+        celulas = 0
+        largura = 0
+        for deslocamento, valores_linha in enumerate(values):
+            indice = linha_inicio + deslocamento
+            while len(self._linhas) <= indice:
+                self._linhas.append([])
+            linha = self._linhas[indice]
+            fim = coluna_inicio + len(valores_linha)
+            if len(linha) < fim:
+                linha.extend([''] * (fim - len(linha)))
+            linha[coluna_inicio:fim] = valores_linha
+            celulas += len(valores_linha)
+            largura = max(largura, len(valores_linha))
+        return {
+            'spreadsheetId': self.spreadsheet.id,
+            'updatedRange': self._nome_faixa(linha_inicio, coluna_inicio, len(values), largura),
+            'updatedRows': len(values),
+            'updatedColumns': largura,
+            'updatedCells': celulas,
+        }
+
+    def _anexar(self, operacao, values):
+        """Grava depois da última linha com dados, crescendo a grade (como values.append)"""
+        self._registrar(operacao, 'escrita')
+        with self._lock:
+            inicio = len(self._linhas_com_dados())
+            del self._linhas[inicio:]
+            largura = max((len(linha) for linha in values), default=0)
+            if largura > self.col_count:
+                raise _erro_api(
+                    400, 'INVALID_ARGUMENT',
+                    f"Range ('{self.title}'!A{inicio + 1}) exceeds grid limits. "
+                    f"Max rows: {self.row_count}, max columns: {self.col_count}"
+                )
+            self.row_count = max(self.row_count, inicio + len(values))
+            resposta = self._gravar(rowcol_to_a1(inicio + 1, 1), values)
+        return {
+            'spreadsheetId': self.spreadsheet.id,
+            'tableRange': self._nome_faixa(0, 0, inicio, self.col_count) if inicio else None,
+            'updates': resposta,
+        }
+
+    def _nome_faixa(self, linha_inicio, coluna_inicio, linhas, colunas):
+        inicio = rowcol_to_a1(linha_inicio + 1, coluna_inicio + 1)
+        fim = rowcol_to_a1(linha_inicio + max(linhas, 1), coluna_inicio + max(colunas, 1))
+        return f"'{self.title}'!{inicio}:{fim}"
+
+
+instrumentar(FakeWorksheet, METODOS_ABA, 'sheets')
+instrumentar(FakeSpreadsheet, METODOS_PLANILHA, 'sheets')
+
+
+def _carregar(aba, linhas):
+    """Grava linhas direto na aba (sem contar requisições nem latência)"""
+    with aba._lock:
+        aba.row_count = max(aba.row_count, len(linhas))
+        aba.col_count = max([aba.col_count] + [len(linha) for linha in linhas])
+        aba._linhas = [[_texto(valor) for valor in linha] for linha in linhas]
+
+
+def gerar_dados(planilha, solicitacoes=1000, produtos=500, itens_por_romaneio=10, semente=42, hoje=None):
+    """
+    Povoa a planilha com as abas do sistema e volumes sintéticos realistas
+
+    Abas (na ordem que o app espera): Solicitações (0), IMPRESSOES, IMPRESSAO_ITENS,
+    Realizar baixa, Logs e MATRIZ_IMPORTADA (5).
+
+    Args:
+        planilha: FakeSpreadsheet vazia
+        solicitacoes: linhas da aba Solicitações (espalhadas nos últimos 90 dias)
+        produtos: linhas da aba MATRIZ_IMPORTADA
+        itens_por_romaneio: itens por romaneio; as solicitações já impressas são agrupadas
+                            em romaneios (IMPRESSOES + IMPRESSAO_ITENS)
+        semente: semente do gerador (mesmos argumentos -> mesmos dados)
+        hoje: data de referência (padrão: agora)
+
+    Returns:
+        dict: quantidade de linhas de dados por aba
+    """
+    from log_buffer import CABECALHOS_LOGS
+
+    aleatorio = random.Random(semente)
+    hoje = hoje or datetime.now()
+    solicitantes = [f'{nome} {sobrenome}' for nome in ('Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Fábio',
+                                                         'Gabriela', 'Hugo', 'Isabel', 'João')
+                    for sobrenome in ('Silva', 'Souza', 'Lima')]
+    unidades = ['UN', 'PC', 'CX', 'KG', 'M', 'L']
+    separadores = ['almox1', 'almox2', 'almox3']
+
+    matriz = [CABECALHOS_MATRIZ]
+    catalogo = []
+    for i in range(1, produtos + 1):
+        codigo = f'{aleatorio.randint(100, 999)}-{i:05d}'
+        item = {
+            'codigo': codigo,
+            'descricao': f'PRODUTO {i:05d} {aleatorio.choice(["PARAFUSO", "LUVA", "CABO", "FILTRO", "VÁLVULA"])}',
+            'unidade': aleatorio.choice(unidades),
+            'locacao': f'{aleatorio.randint(1, 4)} E{aleatorio.randint(1, 9)} E{aleatorio.randint(1, 20):02d}/F{aleatorio.randint(1, 20):02d}',
+            'saldo': aleatorio.randint(0, 2000),
+            'media': round(aleatorio.uniform(0, 300), 2),
+        }
+        catalogo.append(item)
+        matriz.append([item['codigo'], item['descricao'], item['unidade'], item['locacao'],
+                       str(item['saldo']), f"{item['media']:.2f}".replace('.', ',')])
+
+    linhas_solicitacoes = [CABECALHOS_SOLICITACOES]
+    impressas = []
+    for i in range(solicitacoes):
+        produto = aleatorio.choice(catalogo)
+        data = hoje - timedelta(days=aleatorio.randint(0, 90), minutes=aleatorio.randint(0, 600))
+        solicitante = aleatorio.choice(solicitantes)
+        quantidade = aleatorio.randint(1, 50)
+        status = aleatorio.choices(['Aberta', 'Em Separação', 'Parcial', 'Concluída', 'Falta'],
+                                   weights=[45, 20, 10, 20, 5])[0]
+        separada = {'Concluída': quantidade, 'Parcial': aleatorio.randint(1, quantidade)}.get(status, 0)
+        id_solicitacao = ''
+        if status != 'Aberta':
+            id_solicitacao = (f"SOL_{data.strftime('%Y%m%d')}_{data.strftime('%H%M%S')}{i % 1000:03d}_"
+                              f"{solicitante.upper().replace(' ', '_')[:10]}_{aleatorio.getrandbits(32):08X}")
+        linha = [
+            data.strftime('%d/%m/%Y'), solicitante, produto['codigo'], produto['descricao'],
+            produto['unidade'], str(quantidade), produto['locacao'], str(quantidade - separada), status,
+            str(separada), '', aleatorio.choices(['Não', 'Sim'], weights=[85, 15])[0],
+            data.strftime('%d/%m/%Y') if separada else '', aleatorio.choice(separadores) if separada else '',
+            data.strftime('%d/%m/%Y %H:%M:%S'), id_solicitacao
+        ]
+        linhas_solicitacoes.append(linha)
+        if id_solicitacao:
+            impressas.append((linha, produto, data))
+
+    linhas_impressoes = [CABECALHOS_IMPRESSOES]
+    linhas_itens = [CABECALHOS_IMPRESSAO_ITENS]
+    impressas.sort(key=lambda item: item[2])
+    passo = max(itens_por_romaneio, 1)
+    for numero, inicio in enumerate(range(0, len(impressas), passo), start=1):
+        grupo = impressas[inicio:inicio + passo]
+        id_impressao = f'ROM-{numero:06d}'
+        data_impressao = max(data for _, _, data in grupo).strftime('%Y-%m-%d %H:%M:%S')
+        pendente = any(linha[8] == 'Em Separação' for linha, _, _ in grupo)
+        usuario = aleatorio.choice(separadores)
+        tipo = 'Itens em Falta' if any(linha[8] == 'Falta' for linha, _, _ in grupo) else 'Romaneio de Separação'
+        linhas_impressoes.append([
+            id_impressao, data_impressao, usuario, 'Pendente' if pendente else 'Processado', str(len(grupo)),
+            '', '' if pendente else data_impressao, '' if pendente else usuario, data_impressao, data_impressao,
+            tipo
+        ])
+        for linha, produto, data in grupo:
+            linhas_itens.append([
+                id_impressao, linha[15], data.strftime('%Y-%m-%d %H:%M:%S'), linha[1], linha[2], linha[3],
+                linha[4], linha[5], produto['locacao'], str(produto['saldo']), str(produto['media']),
+                'TRUE' if linha[11] == 'Sim' else 'FALSE', linha[8] if not pendente else 'Pendente', linha[9],
+                '', linha[12], linha[13], '', data_impressao, data_impressao
+            ])
+
+    abas = [
+        ('Solicitações', linhas_solicitacoes),
+        ('IMPRESSOES', linhas_impressoes),
+        ('IMPRESSAO_ITENS', linhas_itens),
+        ('Realizar baixa', [CABECALHOS_REALIZAR_BAIXA]),
+        ('Logs', [CABECALHOS_LOGS]),
+        ('MATRIZ_IMPORTADA', matriz),
+    ]
+    for titulo, linhas in abas:
+        # Folga de linhas como uma aba real (anexar não precisa crescer a grade logo de cara)
+        aba = planilha._criar_aba(titulo, len(linhas) + 1000, len(linhas[0]))
+        _carregar(aba, linhas)
+    return {titulo: len(linhas) - 1 for titulo, linhas in abas}
+
+
+_planilha = None
+_lock_planilha = threading.Lock()
+
+
+def criar_planilha_fake():
+    """
+    FakeSpreadsheet configurada pelo ambiente e povoada com gerar_dados()
+
+    Variáveis: SHEETS_FAKE_LATENCY_MS (0), SHEETS_FAKE_JITTER_MS (0),
+    SHEETS_FAKE_READS_PER_MINUTE e SHEETS_FAKE_WRITES_PER_MINUTE (0 = sem cota),
+    SHEETS_FAKE_SOLICITACOES (1000), SHEETS_FAKE_PRODUTOS (500),
+    SHEETS_FAKE_ITENS_POR_ROMANEIO (10), SHEETS_FAKE_SEED (42)
+    """
+    semente = int(os.environ.get('SHEETS_FAKE_SEED', '42'))
+    planilha = FakeSpreadsheet(
+        latencia=float(os.environ.get('SHEETS_FAKE_LATENCY_MS', '0')) / 1000,
+        variacao=float(os.environ.get('SHEETS_FAKE_JITTER_MS', '0')) / 1000,
+        leituras_por_minuto=int(os.environ.get('SHEETS_FAKE_READS_PER_MINUTE', '0')),
+        escritas_por_minuto=int(os.environ.get('SHEETS_FAKE_WRITES_PER_MINUTE', '0')),
+        semente=semente,
+    )
+    volumes = gerar_dados(
+        planilha,
+        solicitacoes=int(os.environ.get('SHEETS_FAKE_SOLICITACOES', '1000')),
+        produtos=int(os.environ.get('SHEETS_FAKE_PRODUTOS', '500')),
+        itens_por_romaneio=int(os.environ.get('SHEETS_FAKE_ITENS_POR_ROMANEIO', '10')),
+        semente=semente,
+    )
+    print(f"🧪 Google Sheets em memória (SHEETS_BACKEND=fake): {volumes}")
+    return planilha
+
+
+def obter_planilha_fake():
+    """Planilha em memória do processo (criada na primeira chamada); conta como abrir a planilha"""
+    global _planilha
+    if _planilha is None:
+        with _lock_planilha:
+            if _planilha is None:
+                _planilha = criar_planilha_fake()
+    _planilha._registrar('open_by_key', 'leitura')
+    return _planilha
+
+
+def set_planilha_fake(planilha):
+    """Substitui a planilha em memória do processo (None recria na próxima chamada)"""
+    global _planilha
+    _planilha = planilha
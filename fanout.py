@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Leituras independentes em paralelo (fan-out) num executor limitado do processo
+
+Várias rotas leem 2-4 abas que não dependem umas das outras (dashboard: Solicitações,
+MATRIZ_IMPORTADA e IMPRESSAO_ITENS; processamento do romaneio: IMPRESSOES, IMPRESSAO_ITENS e
+Solicitações). Cada leitura é um round-trip HTTP de 100-500 ms que libera o GIL, então
+disparadas juntas a rota espera a mais lenta e não a soma.
+
+- em_paralelo({'nome': funcao, ...}): roda as funções ao mesmo tempo e devolve os resultados
+- ler_abas(planilha, abas): get_all_values() de várias abas ao mesmo tempo
+
+O executor é um só por processo (IO_MAX_WORKERS threads), compartilhado com async_io.py, e
+é recriado após fork (workers do gunicorn). Cada tarefa roda com uma cópia do contexto de
+quem chamou (rota das métricas, app/request do Flask). As tarefas não devem usar a sessão do
+banco da requisição: a sessão do SQLAlchemy não é compartilhável entre threads.
+"""
+
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PREFIXO_THREAD = 'fanout'
+
+_lock = threading.Lock()
+_pid = None
+_executor = None
+
+
+def executor_compartilhado():
+    """Executor de I/O do processo (recriado após fork)"""
+    global _pid, _executor
+    if _pid == os.getpid():
+        return _executor
+    with _lock:
+        if _pid != os.getpid():
+            maximo = os.environ.get('IO_MAX_WORKERS') or os.environ.get('ASYNC_IO_MAX_WORKERS') or '16'
+            _executor = ThreadPoolExecutor(max_workers=int(maximo), thread_name_prefix=PREFIXO_THREAD)
+            _pid = os.getpid()
+    return _executor
+
+
+def _dentro_do_executor():
+    return threading.current_thread().name.startswith(PREFIXO_THREAD + '_')
+
+
+def em_paralelo(tarefas):
+    """
+    Roda funções independentes ao mesmo tempo no executor compartilhado
+
+    Dentro de uma tarefa do próprio executor (fan-out aninhado) as funções rodam em
+    sequência: esperar por outras tarefas do mesmo executor limitado poderia travá-lo.
+
+    Args:
+        tarefas: dict nome -> função sem argumentos (functools.partial/lambda para passar argumentos)
+
+    Returns:
+        dict: nome -> resultado da função
+
+    Raises:
+        A exceção da primeira tarefa (na ordem do dict) que falhou, depois de todas terminarem
+    """
+    if len(tarefas) < 2 or _dentro_do_executor():
+        return {nome: funcao() for nome, funcao in tarefas.items()}
+
+    executor = executor_compartilhado()
+    # Uma cópia do contexto por tarefa: o mesmo Context não pode rodar em duas threads
+    futuros = {nome: executor.submit(contextvars.copy_context().run, funcao) for nome, funcao in tarefas.items()}
+    erros = [futuro.exception() for futuro in futuros.values()]
+    for erro in erros:
+        if erro is not None:
+            raise erro
+    return {nome: futuro.result() for nome, futuro in futuros.items()}
+
+
+def ler_aba(planilha, nomes):
+    """Valores da primeira aba existente entre os nomes alternativos (None se nenhuma existir)"""
+    import gspread
+
+    for nome in nomes:
+        try:
+            aba = planilha.worksheet(nome)
+        except gspread.WorksheetNotFound:
+            continue
+        return aba.get_all_values()
+    return None
+
+
+def ler_abas(planilha, abas):
+    """
+    Lê várias abas ao mesmo tempo
+
+    Args:
+        planilha: gspread.Spreadsheet (ou FakeSpreadsheet)
+        abas: nomes das abas; um item pode ser uma tupla de nomes alternativos
+            (ex.: ('Solicitações', 'Solicitacoes')), usada a primeira que existir
+
+    Returns:
+        dict: nome (o primeiro da tupla) -> lista de linhas (get_all_values), None se a aba não existe
+    """
+    alternativas = [(aba,) if isinstance(aba, str) else tuple(aba) for aba in abas]
+    return em_paralelo({nomes[0]: (lambda nomes=nomes: ler_aba(planilha, nomes)) for nomes in alternativas})
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Sistema de gestão de estoque: o app Flask dividido em subsistemas importáveis em separado
+
+- gestao.sheets:   acesso ao Google Sheets (conexão, solicitações, matriz, status, abas de controle)
+- gestao.romaneio: romaneios (criação, consulta, processamento da separação)
+- gestao.pdf:      geração do PDF do romaneio em segundo plano
+- gestao.logs:     logs de auditoria (fila, consulta, retenção) e e-mail de erros
+- gestao.auth:     sessão, login e usuários
+- gestao.web:      as demais rotas
+- gestao.factory:  criar_app(), que junta tudo (gunicorn 'gestao:criar_app()')
+
+Cada subsistema só importa os que estão abaixo dele (gestao.sheets não importa Flask nem o
+banco; rotas só entram pela fábrica), então um worker ou uma tarefa carrega apenas o que usa.
+O app.py continua importável como antes e reexporta os nomes antigos.
+"""
+
+
+def criar_app(web=True):
+    """Fábrica do app (ver gestao.factory.criar_app); importar gestao não carrega o app"""
+    from gestao.factory import criar_app as fabrica
+    return fabrica(web=web)
@@ -0,0 +1,3 @@
+"""
+Autenticação: sessão, login e usuários
+"""
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Hash de senhas num executor limitado do processo
+
+O KDF (PASSWORD_HASH_METHOD, padrão pbkdf2:sha256:600000) custa centenas de ms de CPU por
+chamada. Numa rajada de logins (troca de turno) cada cálculo ocuparia uma das threads do
+gunicorn disputando os núcleos com as outras rotas; aqui no máximo PASSWORD_HASH_WORKERS
+rodam ao mesmo tempo, até PASSWORD_HASH_QUEUE esperam na fila e o excedente recebe
+HashOcupado na hora (a rota responde "tente novamente" em vez de enfileirar sem limite).
+
+- gerar_hash(senha) / verificar_senha(hash, senha): o KDF no executor (User.set_password/check_password)
+- precisa_rehash(hash): hash gravado com parâmetros diferentes dos configurados (login regrava)
+
+O executor é um por processo e recriado após fork (workers do gunicorn), como em fanout.py.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+# Método (algoritmo e parâmetros) no formato do werkzeug. Parâmetros omitidos ('scrypt',
+# 'pbkdf2:sha256') valem os padrões do werkzeug, que são gravados por extenso no hash.
+# scrypt (scrypt:32768:8:1) gera hashes de ~160 caracteres: exige a coluna
+# user.password_hash maior que os 120 atuais.
+METODO = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+
+# Parâmetros que o werkzeug completa, na ordem em que aparecem no prefixo do hash
+_PADROES = {'pbkdf2': ['sha256', str(DEFAULT_PBKDF2_ITERATIONS)], 'scrypt': ['32768', '8', '1']}
+TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT_SECONDS', '10'))
+
+
+class HashOcupado(Exception):
+    """Fila do hash de senhas cheia ou espera acima de PASSWORD_HASH_TIMEOUT_SECONDS"""
+
+
+_lock = threading.Lock()
+_pid = None
+_executor = None
+_vagas = None
+
+
+def _recursos():
+    """Executor e vagas (em execução + na fila) do processo, recriados após fork"""
+    global _pid, _executor, _vagas
+    if _pid == os.getpid():
+        return _executor, _vagas
+    with _lock:
+        if _pid != os.getpid():
+            trabalhadores = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))
+            _executor = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix='hash-senha')
+            _vagas = threading.BoundedSemaphore(trabalhadores + int(os.environ.get('PASSWORD_HASH_QUEUE', '16')))
+            _pid = os.getpid()
+    return _executor, _vagas
+
+
+def _executar(funcao, *args):
+    executor, vagas = _recursos()
+    if not vagas.acquire(blocking=False):
+        raise HashOcupado('Fila do hash de senhas cheia')
+    try:
+        futuro = executor.submit(funcao, *args)
+    except Exception:
+        vagas.release()
+        raise
+    # A vaga só volta quando o cálculo termina, mesmo que quem pediu tenha desistido de esperar
+    futuro.add_done_callback(lambda _: vagas.release())
+    try:
+        return futuro.result(timeout=TIMEOUT)
+    except FuturesTimeoutError:
+        raise HashOcupado(f'Hash de senha não concluído em {TIMEOUT:.0f}s')
+
+
+def gerar_hash(senha):
+    """Hash da senha com o método configurado (PASSWORD_HASH_METHOD)"""
+    return _executar(generate_password_hash, senha, METODO)
+
+
+def verificar_senha(hash_senha, senha):
+    """
+    Confere a senha com o hash gravado (qualquer método que o werkzeug conheça)
+
+    Raises:
+        HashOcupado: fila cheia ou espera acima do limite
+    """
+    return _executar(check_password_hash, hash_senha, senha)
+
+
+def _normalizar(metodo):
+    """Método com todos os parâmetros: 'scrypt' -> ['scrypt', '32768', '8', '1']"""
+    partes = metodo.strip().split(':')
+    return partes + _PADROES.get(partes[0], [])[len(partes) - 1:]
+
+
+def precisa_rehash(hash_senha):
+    """True se o hash foi gravado com método/parâmetros diferentes de PASSWORD_HASH_METHOD"""
+    return _normalizar(hash_senha.split('$', 1)[0]) != _normalizar(METODO)
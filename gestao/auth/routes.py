@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Rotas de login, logout, sessão e administração de usuários
+"""
+
+import math
+
+from flask import flash, jsonify, redirect, render_template, request, session, url_for
+from flask_login import current_user, login_required, login_user, logout_user
+
+from logging_config import obter_logger
+from gestao.auth.passwords import HashOcupado, precisa_rehash
+from gestao.auth.server_session import renovar_sessao
+from gestao.auth.session import cache_usuarios, registrar_atividade
+from gestao.auth.throttling import ip_cliente, limite_login
+from gestao.extensions import db
+from gestao.logs.activity import log_activity
+from gestao.models import User
+from gestao.routing import Rotas
+
+logger = obter_logger(__name__)
+
+rotas = Rotas()
+
+
+@rotas.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        ip = ip_cliente()
+        
+        # Excesso de falhas recentes: recusa antes do banco e do hash da senha
+        espera = limite_login.bloqueado(ip, username)
+        if espera:
+            log_activity('login', 'User', None, f'Login bloqueado por excesso de tentativas: {username}', 'aviso')
+            flash(f'Muitas tentativas de login. Tente novamente em {math.ceil(espera / 60)} minuto(s).', 'error')
+            return render_template('login.html'), 429
+        
+        user = User.query.filter_by(username=username).first()
+        try:
+            senha_correta = user is not None and user.check_password(password)
+        except HashOcupado as e:
+            logger.warning("⚠️ Login de %s recusado: %s", username, e)
+            flash('Muitos logins ao mesmo tempo. Tente novamente em alguns segundos.', 'warning')
+            return render_template('login.html'), 503
+        
+        if senha_correta:
+            limite_login.limpar_usuario(username)
+            # Hash gravado com outro método/parâmetros: regrava com o configurado (PASSWORD_HASH_METHOD)
+            if precisa_rehash(user.password_hash):
+                try:
+                    user.set_password(password)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning("⚠️ Não foi possível atualizar o hash da senha de %s: %s", username, e)
+            
+            # Marcar sessão como permanente para usar o timeout de 2 horas
+            renovar_sessao(session)
+            login_user(user, remember=False)
+            cache_usuarios.guardar(user)
+            session.permanent = True
+            registrar_atividade(forcar=True)
+            log_activity('login', 'User', user.id, f'Login realizado com sucesso', 'sucesso')
+            return redirect(url_for('index'))
+        else:
+            limite_login.registrar_falha(ip, username)
+            log_activity('login', 'User', None, f'Tentativa de login falhada para usuário: {username}', 'erro')
+            flash('Usuário ou senha inválidos', 'error')
+    
+    return render_template('login.html')
+
+
+@rotas.route('/keep-alive', methods=['POST'])
+@login_required
+def keep_alive():
+    """Endpoint para manter a sessão ativa quando usuário está usando o sistema"""
+    # Chamado pelo aviso de inatividade de base.html (1h55 sem atividade): grava fora do intervalo
+    registrar_atividade(forcar=True)
+    return jsonify({'success': True, 'message': 'Sessão mantida ativa'})
+
+
+@rotas.route('/logout')
+@login_required
+def logout():
+    log_activity('logout', 'User', current_user.id, f'Logout realizado', 'sucesso')
+    logout_user()
+    return redirect(url_for('login'))
+
+
+@rotas.route('/usuarios')
+@login_required
+def listar_usuarios():
+    """Lista todos os usuários do sistema"""
+    if not current_user.is_admin:
+        flash('Apenas administradores podem acessar esta página', 'error')
+        return redirect(url_for('index'))
+    
+    usuarios = User.query.all()
+    return render_template('listar_usuarios.html', usuarios=usuarios)
+
+
+@rotas.route('/criar-usuario', methods=['POST'])
+@login_required
+def criar_usuario():
+    """Cria um novo usuário"""
+    if not current_user.is_admin:
+        flash('Apenas administradores podem criar usuários', 'error')
+        return redirect(url_for('listar_usuarios'))
+    
+    try:
+        username = request.form.get('username')
+        email = request.form.get('email')
+        password = request.form.get('password')
+        is_admin = request.form.get('is_admin') == '1'
+        
+        # Validar dados
+        if not username or not email or not password:
+            flash('Todos os campos são obrigatórios', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        if len(password) < 6:
+            flash('A senha deve ter no mínimo 6 caracteres', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        # Verificar se usuário já existe
+        if User.query.filter_by(username=username).first():
+            flash('Usuário já existe', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        if User.query.filter_by(email=email).first():
+            flash('Email já cadastrado', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        # Criar novo usuário
+        novo_usuario = User(
+            username=username,
+            email=email,
+            is_admin=is_admin
+        )
+        novo_usuario.set_password(password)
+        
+        db.session.add(novo_usuario)
+        db.session.commit()
+        
+        log_activity('criar_usuario', 'User', current_user.id, f'Usuário criado: {username}', 'sucesso')
+        
+        flash(f'✅ Usuário {username} criado com sucesso!', 'success')
+        return redirect(url_for('listar_usuarios'))
+        
+    except Exception as e:
+        print(f"❌ Erro ao criar usuário: {e}")
+        flash('Erro ao criar usuário', 'error')
+        return redirect(url_for('listar_usuarios'))
+
+
+@rotas.route('/desativar-usuario', methods=['POST'])
+@login_required
+def desativar_usuario():
+    """Desativa ou ativa um usuário"""
+    if not current_user.is_admin:
+        flash('Apenas administradores podem gerenciar usuários', 'error')
+        return redirect(url_for('listar_usuarios'))
+    
+    try:
+        user_id = request.form.get('user_id')
+        action = request.form.get('action')  # 'desativar' ou 'ativar'
+        
+        if not user_id:
+            flash('ID do usuário não fornecido', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        usuario = User.query.get(user_id)
+        
+        if not usuario:
+            flash('Usuário não encontrado', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        # Não permitir desativar a si mesmo
+        if usuario.id == current_user.id and action == 'desativar':
+            flash('Você não pode desativar a si mesmo', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        username = usuario.username
+        
+        # Desativar ou ativar
+        if action == 'desativar':
+            usuario.is_active = False
+            log_activity('desativar_usuario', 'User', current_user.id, f'Usuário desativado: {username}', 'sucesso')
+            flash(f'✅ Usuário {username} desativado com sucesso!', 'success')
+        else:
+            usuario.is_active = True
+            log_activity('ativar_usuario', 'User', current_user.id, f'Usuário ativado: {username}', 'sucesso')
+            flash(f'✅ Usuário {username} ativado com sucesso!', 'success')
+        
+        db.session.commit()
+        cache_usuarios.invalidar(usuario.id)
+        return redirect(url_for('listar_usuarios'))
+        
+    except Exception as e:
+        print(f"❌ Erro ao gerenciar usuário: {e}")
+        flash('Erro ao gerenciar usuário', 'error')
+        return redirect(url_for('listar_usuarios'))
+
+
+@rotas.route('/editar-email-usuario', methods=['POST'])
+@login_required
+def editar_email_usuario():
+    """Permite ao admin alterar o email de qualquer usuário"""
+    print("📧 Requisição de editar email recebida")
+    if not current_user.is_admin:
+        flash('Apenas administradores podem editar emails', 'error')
+        return redirect(url_for('listar_usuarios'))
+    
+    try:
+        user_id = request.form.get('user_id')
+        novo_email = request.form.get('novo_email')
+        
+        print(f"📧 user_id: {user_id}, novo_email: {novo_email}")
+        
+        if not user_id or not novo_email:
+            flash('Dados incompletos', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        usuario = User.query.get(user_id)
+        if not usuario:
+            flash('Usuário não encontrado', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        # Verificar se email já existe em outro usuário
+        if User.query.filter(User.email == novo_email, User.id != user_id).first():
+            flash('Este email já está em uso por outro usuário', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        email_antigo = usuario.email
+        usuario.email = novo_email
+        db.session.commit()
+        cache_usuarios.invalidar(usuario.id)
+        
+        log_activity('editar_email_usuario', 'User', current_user.id, 
+                    f'Email do usuário {usuario.username} alterado de {email_antigo} para {novo_email}', 'sucesso')
+        
+        print(f"✅ Email alterado com sucesso!")
+        flash(f'✅ Email do usuário {usuario.username} alterado com sucesso!', 'success')
+        return redirect(url_for('listar_usuarios'))
+        
+    except Exception as e:
+        print(f"❌ Erro ao editar email: {e}")
+        import traceback
+        traceback.print_exc()
+        flash('Erro ao editar email', 'error')
+        return redirect(url_for('listar_usuarios'))
+
+
+@rotas.route('/alterar-senha-usuario-admin', methods=['POST'])
+@login_required
+def alterar_senha_usuario_admin():
+    """Permite ao admin alterar a senha de qualquer usuário"""
+    print("🔑 Requisição de alterar senha recebida")
+    if not current_user.is_admin:
+        flash('Apenas administradores podem alterar senhas', 'error')
+        return redirect(url_for('listar_usuarios'))
+    
+    try:
+        user_id = request.form.get('user_id')
+        nova_senha = request.form.get('nova_senha')
+        confirmar_senha = request.form.get('confirmar_senha')
+        
+        print(f"🔑 user_id: {user_id}, senhas recebidas: {bool(nova_senha)}")
+        
+        if not user_id or not nova_senha or not confirmar_senha:
+            flash('Dados incompletos', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        if nova_senha != confirmar_senha:
+            flash('As senhas não coincidem', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        if len(nova_senha) < 6:
+            flash('A senha deve ter no mínimo 6 caracteres', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        usuario = User.query.get(user_id)
+        if not usuario:
+            flash('Usuário não encontrado', 'error')
+            return redirect(url_for('listar_usuarios'))
+        
+        username = usuario.username
+        usuario.set_password(nova_senha)
+        db.session.commit()
+        cache_usuarios.invalidar(usuario.id)
+        
+        log_activity('alterar_senha_admin', 'User', current_user.id, 
+                    f'Senha do usuário {username} alterada pelo admin', 'sucesso')
+        
+        print(f"✅ Senha alterada com sucesso!")
+        flash(f'✅ Senha do usuário {username} alterada com sucesso!', 'success')
+        return redirect(url_for('listar_usuarios'))
+        
+    except Exception as e:
+        print(f"❌ Erro ao alterar senha: {e}")
+        import traceback
+        traceback.print_exc()
+        flash('Erro ao alterar senha', 'error')
+        return redirect(url_for('listar_usuarios'))
+
+
+@rotas.route('/alterar-senha', methods=['GET', 'POST'])
+@login_required
+def alterar_senha():
+    """Permite ao usuário alterar sua própria senha"""
+    print(f"🔄 Requisição recebida: {request.method}")
+    if request.method == 'POST':
+        try:
+            print(f"📋 Dados recebidos do formulário")
+            current_password = request.form.get('current_password')
+            new_password = request.form.get('new_password')
+            confirm_password = request.form.get('confirm_password')
+            
+            print(f"👤 Usuário: {current_user.username}")
+            print(f"🔑 Senha atual recebida: {'Sim' if current_password else 'Não'}")
+            print(f"🔑 Nova senha recebida: {'Sim' if new_password else 'Não'}")
+            
+            # Validar senha atual
+            print(f"🔍 Verificando senha atual...")
+            if not current_user.check_password(current_password):
+                print(f"❌ Senha atual incorreta!")
+                flash('❌ Senha atual incorreta!', 'error')
+                return render_template('alterar_senha.html')
+            print(f"✅ Senha atual correta!")
+            
+            # Validar nova senha
+            if len(new_password) < 6:
+                print(f"❌ Senha muito curta!")
+                flash('❌ A nova senha deve ter no mínimo 6 caracteres!', 'error')
+                return render_template('alterar_senha.html')
+            
+            # Verificar se senhas coincidem
+            if new_password != confirm_password:
+                print(f"❌ Senhas não coincidem!")
+                flash('❌ As senhas não coincidem!', 'error')
+                return render_template('alterar_senha.html')
+            
+            # Verificar se nova senha é diferente da atual
+            if current_user.check_password(new_password):
+                print(f"❌ Nova senha igual à atual!")
+                flash('❌ A nova senha deve ser diferente da senha atual!', 'error')
+                return render_template('alterar_senha.html')
+            
+            # Alterar senha
+            print(f"💾 Alterando senha no banco de dados...")
+            current_user.set_password(new_password)
+            db.session.commit()
+            cache_usuarios.invalidar(current_user.id)
+            print(f"✅ Senha alterada com sucesso!")
+            
+            # Registrar no log
+            log_activity('alterar_senha', 'User', current_user.id, f'Senha alterada com sucesso', 'sucesso')
+            
+            flash('✅ Senha alterada com sucesso!', 'success')
+            return redirect(url_for('index'))
+            
+        except Exception as e:
+            print(f"❌ Erro ao alterar senha: {e}")
+            flash('❌ Erro ao alterar senha. Tente novamente.', 'error')
+            return render_template('alterar_senha.html')
+    
+    return render_template('alterar_senha.html')
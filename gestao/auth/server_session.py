@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Sessão guardada no servidor (SESSION_BACKEND=servidor)
+
+O cookie leva só um id aleatório; os dados da sessão ficam no estado compartilhado
+(gestao.state, espaço 'sessao'): memória do worker ou banco com vários workers, conforme
+SHARED_STATE_BACKEND. Nada é assinado nem serializado no cookie a cada resposta, e a sessão
+só é regravada quando muda (ver check_session_timeout em gestao.auth.session).
+
+SESSION_BACKEND=cookie (padrão) mantém a sessão assinada do Flask, sem estado no servidor.
+"""
+
+import os
+import secrets
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+
+class SessaoArmazenada(CallbackDict, SessionMixin):
+    """Sessão do Flask identificada por sid (a chave no estado compartilhado)"""
+
+    def __init__(self, dados=None, sid=None, nova=False):
+        def ao_alterar(sessao):
+            sessao.modified = True
+        super().__init__(dados, ao_alterar)
+        self.sid = sid or secrets.token_urlsafe(32)
+        self.new = nova
+        self.modified = False
+        self.sid_anterior = None
+
+    def renovar_id(self):
+        """Troca o sid mantendo os dados (no login: o id de antes do login deixa de valer)"""
+        self.sid_anterior = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+
+class SessaoServidor(SessionInterface):
+    """SessionInterface com os dados no estado compartilhado e só o sid no cookie"""
+
+    # Mesmo formato da sessão em cookie (tuplas das mensagens flash, datas, bytes)
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, espaco):
+        """
+        Args:
+            espaco: EspacoEstado das sessões (TTL = PERMANENT_SESSION_LIFETIME)
+        """
+        self.espaco = espaco
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            try:
+                dados = self.espaco.obter(sid)
+            except Exception as e:
+                logger.warning("⚠️ Não foi possível ler a sessão: %s", e)
+                dados = None
+            if dados is not None:
+                return SessaoArmazenada(self.serializer.loads(dados), sid=sid)
+        return SessaoArmazenada(nova=True)
+
+    def save_session(self, app, session, response):
+        nome = self.get_cookie_name(app)
+        dominio = self.get_cookie_domain(app)
+        caminho = self.get_cookie_path(app)
+
+        if session.sid_anterior:
+            self.espaco.remover(session.sid_anterior)
+            session.sid_anterior = None
+
+        if not session:
+            # Sessão esvaziada (ex.: logout com session.clear()): apaga no servidor e no navegador
+            if session.modified:
+                self.espaco.remover(session.sid)
+                response.delete_cookie(nome, domain=dominio, path=caminho,
+                                       secure=self.get_cookie_secure(app), httponly=self.get_cookie_httponly(app))
+            return
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        self.espaco.definir(session.sid, self.serializer.dumps(dict(session)))
+        response.set_cookie(
+            nome,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=dominio,
+            path=caminho,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def renovar_sessao(session):
+    """Novo sid para a sessão do servidor (sem efeito na sessão em cookie, que muda inteira)"""
+    if isinstance(session, SessaoArmazenada):
+        session.renovar_id()
+
+
+def init_app(app):
+    """Usa a sessão no servidor se SESSION_BACKEND=servidor (depois de gestao.state.init_app)"""
+    from gestao import state
+    backend = os.environ.get('SESSION_BACKEND', 'cookie').strip().lower()
+    if backend == 'servidor':
+        ttl = int(app.config['PERMANENT_SESSION_LIFETIME'].total_seconds())
+        app.session_interface = SessaoServidor(state.estado_compartilhado.espaco('sessao', ttl=ttl))
+    elif backend != 'cookie':
+        print(f"⚠️ SESSION_BACKEND inválido ({backend}), usando cookie")
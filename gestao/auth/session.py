@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Sessão: usuário do Flask-Login, timeout por inatividade e token CSRF nos templates
+
+Por requisição autenticada o caminho é curto:
+- last_activity só é regravado uma vez por SESSION_ACTIVITY_BUCKET_SECONDS (a sessão não muda,
+  então o cookie não é reassinado nem a sessão do servidor regravada a cada resposta)
+- load_user usa os dados do usuário em cache por AUTH_USER_CACHE_SECONDS, sem consulta ao banco;
+  alterações de senha, e-mail e ativação chamam cache_usuarios.invalidar (vale para todos os workers)
+"""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import flash, redirect, session, url_for
+from flask_login import current_user, logout_user
+from sqlalchemy.orm import make_transient_to_detached
+
+from logging_config import obter_logger
+from gestao import state
+from gestao.extensions import db, login_manager
+from gestao.models import User
+from gestao.routing import Rotas
+
+logger = obter_logger(__name__)
+
+rotas = Rotas()
+
+# Inatividade que encerra a sessão (o mesmo tempo dos avisos em base.html)
+TIMEOUT_INATIVIDADE = timedelta(hours=2)
+
+
+class CacheUsuarios:
+    """
+    Colunas dos usuários carregados por load_user, por worker, com TTL curto
+
+    Guarda os valores (não o objeto do banco, que pertence à sessão SQLAlchemy de uma
+    requisição). invalidar() publica uma nova geração no estado compartilhado e os outros
+    workers descartam o cache na próxima verificação (a cada CACHE_SYNC_SECONDS).
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._usuarios = {}
+        self._lock = threading.Lock()
+        self.geracao = None
+        self.sync_interval = float(os.getenv('CACHE_SYNC_SECONDS', '2'))
+        self._ultima_sync = 0
+
+    def obter(self, user_id):
+        """Colunas do usuário ou None (ausente, expirado ou cache desativado)"""
+        if self.ttl <= 0:
+            return None
+        self.sincronizar()
+        with self._lock:
+            entrada = self._usuarios.get(user_id)
+            if entrada is None:
+                return None
+            if time.time() - entrada[0] >= self.ttl:
+                del self._usuarios[user_id]
+                return None
+            return entrada[1]
+
+    def guardar(self, usuario):
+        if self.ttl <= 0:
+            return
+        campos = {coluna.key: getattr(usuario, coluna.key) for coluna in User.__table__.columns}
+        with self._lock:
+            self._usuarios[usuario.id] = (time.time(), campos)
+
+    def invalidar(self, user_id=None):
+        """Descarta o usuário (ou todos) aqui e, pelo estado compartilhado, nos outros workers"""
+        with self._lock:
+            if user_id is None:
+                self._usuarios.clear()
+            else:
+                self._usuarios.pop(int(user_id), None)
+        if state.estado_compartilhado is None:
+            return
+        geracao = uuid.uuid4().hex
+        try:
+            state.estado_compartilhado.definir('auth:geracao_usuarios', geracao)
+            self.geracao = geracao
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível publicar a invalidação dos usuários: %s", e)
+
+    def sincronizar(self):
+        """Descarta o cache se outro worker alterou algum usuário desde a última verificação"""
+        if state.estado_compartilhado is None or time.time() - self._ultima_sync < self.sync_interval:
+            return
+        self._ultima_sync = time.time()
+        try:
+            geracao = state.estado_compartilhado.obter('auth:geracao_usuarios')
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível verificar a geração dos usuários: %s", e)
+            return
+        if geracao != self.geracao:
+            self.geracao = geracao
+            with self._lock:
+                self._usuarios.clear()
+
+
+cache_usuarios = CacheUsuarios(ttl=float(os.getenv('AUTH_USER_CACHE_SECONDS', '60')))
+
+# last_activity é regravado no máximo uma vez por intervalo (o timeout fica no máximo isso adiantado)
+INTERVALO_ATIVIDADE = float(os.getenv('SESSION_ACTIVITY_BUCKET_SECONDS', '60'))
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    """Usuário da sessão, ou None se não existe mais ou foi desativado (a sessão deixa de valer)"""
+    user_id = int(user_id)
+    campos = cache_usuarios.obter(user_id)
+    if campos is None:
+        usuario = db.session.get(User, user_id)
+        if usuario is None:
+            return None
+        cache_usuarios.guardar(usuario)
+        return usuario if usuario.is_active else None
+    if not campos['is_active']:
+        return None
+    # Objeto da sessão SQLAlchemy desta requisição montado do cache, sem consulta:
+    # alterações nele (ex.: current_user.set_password) são gravadas no commit
+    usuario = User(**campos)
+    make_transient_to_detached(usuario)
+    return db.session.merge(usuario, load=False)
+
+
+def ultima_atividade(sessao):
+    """Instante (epoch) de sessao['last_activity']; aceita o formato ISO das sessões antigas"""
+    valor = sessao.get('last_activity')
+    if isinstance(valor, (int, float)):
+        return valor
+    if valor:
+        try:
+            return datetime.fromisoformat(valor).timestamp()
+        except (ValueError, TypeError):
+            pass
+    return None
+
+
+def sessao_expirada(sessao):
+    """True se a sessão passou de TIMEOUT_INATIVIDADE sem atividade (telas e asgi.py)"""
+    ultima = ultima_atividade(sessao)
+    return ultima is not None and time.time() - ultima > TIMEOUT_INATIVIDADE.total_seconds()
+
+
+def registrar_atividade(forcar=False):
+    """
+    Grava last_activity se o último registro tem mais de INTERVALO_ATIVIDADE segundos
+
+    Args:
+        forcar: grava mesmo dentro do intervalo (login, /keep-alive)
+    """
+    agora = int(time.time())
+    ultima = ultima_atividade(session)
+    if forcar or ultima is None or agora - ultima >= INTERVALO_ATIVIDADE:
+        session['last_activity'] = agora
+
+
+# Verificar timeout de sessão antes de cada requisição
+@rotas.before_request
+def check_session_timeout():
+    """Verifica se a sessão expirou devido a inatividade"""
+    if current_user.is_authenticated:
+        # Verificar última atividade
+        if sessao_expirada(session):
+            logout_user()
+            flash('Sua sessão expirou devido à inatividade. Por favor, faça login novamente.', 'warning')
+            return redirect(url_for('login'))
+
+        # Atualizar última atividade (uma vez por intervalo, não a cada requisição)
+        registrar_atividade()
+
+
+# Adicionar csrf_token ao contexto do template
+@rotas.context_processor
+def inject_csrf_token():
+    from flask_wtf.csrf import generate_csrf
+    return dict(csrf_token=generate_csrf)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Limite de tentativas de login por IP e por usuário
+
+Falhas recentes ficam no estado compartilhado (gestao.state, espaço 'login'), valendo para
+todos os workers. Acima do limite o login é recusado antes de consultar o banco e de calcular
+o hash da senha: tentativas em massa não ocupam o executor do hash (gestao.auth.passwords).
+
+- LOGIN_MAX_FAILURES_PER_USER falhas por usuário na janela (senha errada num usuário)
+- LOGIN_MAX_FAILURES_PER_IP falhas por IP na janela (vários usuários a partir de um endereço;
+  mais alto porque os usuários do galpão podem sair pelo mesmo IP)
+- LOGIN_FAILURE_WINDOW_SECONDS a janela; um login certo zera as falhas do usuário
+"""
+
+import os
+import time
+
+from flask import request
+
+from logging_config import obter_logger
+from gestao import state
+
+logger = obter_logger(__name__)
+
+
+def ip_cliente():
+    """
+    IP de quem fez a requisição
+
+    Atrás de proxies (Cloud Run, App Engine, balanceador) o remote_addr é o do proxy:
+    com TRUSTED_PROXY_COUNT=n usa o n-ésimo endereço a partir do fim do X-Forwarded-For
+    (os anteriores são informados pelo próprio cliente e não servem para limitar).
+    """
+    proxies = int(os.environ.get('TRUSTED_PROXY_COUNT', '0'))
+    if proxies > 0:
+        enderecos = [e.strip() for e in request.headers.get('X-Forwarded-For', '').split(',') if e.strip()]
+        if len(enderecos) >= proxies:
+            return enderecos[-proxies]
+    return request.remote_addr or ''
+
+
+class LimiteTentativas:
+    """Falhas de login numa janela deslizante, por IP e por usuário"""
+
+    def __init__(self, janela, maximo_ip, maximo_usuario):
+        """
+        Args:
+            janela: segundos em que uma falha conta
+            maximo_ip: falhas por IP na janela (0 = sem limite)
+            maximo_usuario: falhas por usuário na janela (0 = sem limite)
+        """
+        self.janela = janela
+        self.maximo_ip = maximo_ip
+        self.maximo_usuario = maximo_usuario
+
+    def _chaves(self, ip, usuario):
+        return [('ip:' + ip, self.maximo_ip), ('usuario:' + (usuario or '').strip().lower(), self.maximo_usuario)]
+
+    def _espaco(self):
+        return state.estado_compartilhado.espaco('login', ttl=self.janela)
+
+    def _recentes(self, falhas, agora):
+        return [t for t in falhas or [] if agora - t < self.janela]
+
+    def bloqueado(self, ip, usuario):
+        """
+        Segundos até poder tentar de novo (0 se liberado)
+
+        Falhas ao ler o estado liberam o login: o limite não pode derrubar a entrada no sistema.
+        """
+        agora = time.time()
+        espera = 0
+        try:
+            espaco = self._espaco()
+            for chave, maximo in self._chaves(ip, usuario):
+                if maximo <= 0:
+                    continue
+                falhas = self._recentes(espaco.obter(chave), agora)
+                if len(falhas) >= maximo:
+                    espera = max(espera, falhas[-maximo] + self.janela - agora)
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível verificar o limite de login: %s", e)
+            return 0
+        return espera
+
+    def registrar_falha(self, ip, usuario):
+        """Acrescenta a falha de forma atômica (falhas simultâneas de vários workers não se perdem)"""
+        agora = time.time()
+        try:
+            espaco = self._espaco()
+            for chave, maximo in self._chaves(ip, usuario):
+                if maximo <= 0:
+                    continue
+                espaco.alterar(chave, lambda falhas, maximo=maximo: (self._recentes(falhas, agora) + [agora])[-maximo:])
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível registrar a falha de login: %s", e)
+
+    def limpar_usuario(self, usuario):
+        """Login certo: zera as falhas do usuário (as do IP continuam contando)"""
+        try:
+            self._espaco().remover('usuario:' + (usuario or '').strip().lower())
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível limpar as falhas de login: %s", e)
+
+
+limite_login = LimiteTentativas(
+    janela=int(os.environ.get('LOGIN_FAILURE_WINDOW_SECONDS', '900')),
+    maximo_ip=int(os.environ.get('LOGIN_MAX_FAILURES_PER_IP', '50')),
+    maximo_usuario=int(os.environ.get('LOGIN_MAX_FAILURES_PER_USER', '5')),
+)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Cache em memória das leituras do Google Sheets (CacheManager e o decorator cached_function)
+
+Não depende do Flask nem do banco: com estado compartilhado (gestao.state) as invalidações
+chegam aos outros workers.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from functools import wraps
+
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+
+# Sistema de Cache Inteligente para otimização de performance
+class CacheManager:
+    """
+    Cache em memória do worker, seguro entre as threads do gunicorn (gthread)
+
+    As chaves começam pelo nome da função ("get_google_sheets_data:<md5>") para que
+    invalidate_pattern encontre as entradas. Com estado compartilhado (vários workers),
+    invalidate_sheets_data publica uma nova geração e os outros workers descartam os dados
+    do Sheets na próxima leitura (verificação a cada CACHE_SYNC_SECONDS).
+    """
+    def __init__(self):
+        self.cache = {}
+        self.cache_timestamps = {}
+        self.cache_duration = 60  # 1 minuto (reduzido para dados mais frescos)
+        self.last_sheets_update = {}  # Controla última atualização do Google Sheets
+        self.lock = threading.RLock()
+        self._locks_chave = {}  # Uma execução por chave ao mesmo tempo (ver cached_function)
+        self.estado = None  # Estado compartilhado entre workers (usar_estado_compartilhado)
+        self.geracao_sheets = None
+        self.sync_interval = float(os.getenv('CACHE_SYNC_SECONDS', '2'))
+        self._ultima_sync = 0
+    
+    def usar_estado_compartilhado(self, estado):
+        """Passa a propagar invalidate_sheets_data para os outros workers"""
+        # A geração atual é lida na primeira verificação (nada de banco no import:
+        # com preload_app as conexões abertas no master seriam herdadas pelos workers)
+        self.estado = estado
+        self._ultima_sync = 0
+    
+    def get_cache_key(self, func_name, *args, **kwargs):
+        """Gera uma chave única para o cache baseada na função e argumentos"""
+        key_data = f"{func_name}:{str(args)}:{str(sorted(kwargs.items()))}"
+        return f"{func_name}:{hashlib.md5(key_data.encode()).hexdigest()}"
+    
+    def lock_da_chave(self, key):
+        """Lock de uma chave: threads que pedem o mesmo dado esperam uma única busca"""
+        with self.lock:
+            return self._locks_chave.setdefault(key, threading.Lock())
+    
+    def get(self, key, force_refresh=False, duration=None):
+        """Recupera dados do cache se ainda válidos"""
+        self.sincronizar()
+        if force_refresh:
+            self.invalidate_key(key)
+            return None
+        
+        with self.lock:
+            if key in self.cache and key in self.cache_timestamps:
+                if time.time() - self.cache_timestamps[key] < (duration or self.cache_duration):
+                    return self.cache[key]
+                else:
+                    # Cache expirado, remover
+                    del self.cache[key]
+                    del self.cache_timestamps[key]
+        return None
+    
+    def set(self, key, value):
+        """Armazena dados no cache"""
+        with self.lock:
+            self.cache[key] = value
+            self.cache_timestamps[key] = time.time()
+    
+    def clear(self):
+        """Limpa todo o cache"""
+        with self.lock:
+            self.cache.clear()
+            self.cache_timestamps.clear()
+            self.last_sheets_update.clear()
+        self.publicar_geracao()
+    
+    def invalidate_key(self, key):
+        """Invalida uma chave específica do cache"""
+        with self.lock:
+            self.cache.pop(key, None)
+            self.cache_timestamps.pop(key, None)
+    
+    def invalidate_pattern(self, pattern):
+        """Invalida cache que contenha um padrão específico"""
+        with self.lock:
+            keys_to_remove = [k for k in self.cache.keys() if pattern in k]
+            for key in keys_to_remove:
+                self.invalidate_key(key)
+    
+    def _invalidar_sheets_local(self):
+        with self.lock:
+            self.invalidate_pattern("get_google_sheets")
+            self.invalidate_pattern("get_matriz_data")
+            self.invalidate_pattern("buscar_solicitacoes")
+            self.last_sheets_update.clear()
+    
+    def invalidate_sheets_data(self):
+        """Invalida todos os dados relacionados ao Google Sheets (em todos os workers)"""
+        logger.info("🔄 Invalidando cache do Google Sheets...")
+        self._invalidar_sheets_local()
+        self.publicar_geracao()
+    
+    def publicar_geracao(self):
+        """Grava uma nova geração no estado compartilhado (os outros workers invalidam)"""
+        if self.estado is None:
+            return
+        geracao = uuid.uuid4().hex
+        try:
+            self.estado.definir('cache:geracao_sheets', geracao)
+            self.geracao_sheets = geracao
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível publicar a invalidação do cache: %s", e)
+    
+    def sincronizar(self):
+        """Descarta os dados do Sheets se outro worker invalidou o cache desde a última verificação"""
+        if self.estado is None or time.time() - self._ultima_sync < self.sync_interval:
+            return
+        self._ultima_sync = time.time()
+        try:
+            geracao = self.estado.obter('cache:geracao_sheets')
+        except Exception as e:
+            logger.warning("⚠️ Não foi possível verificar a geração do cache: %s", e)
+            return
+        if geracao != self.geracao_sheets:
+            self.geracao_sheets = geracao
+            self._invalidar_sheets_local()
+    
+    def should_refresh_sheets(self, func_name, interval=30):
+        """Verifica se deve atualizar dados do Google Sheets"""
+        current_time = time.time()
+        with self.lock:
+            last_update = self.last_sheets_update.get(func_name, 0)
+            
+            # Forçar refresh se passou mais de interval segundos
+            if current_time - last_update > interval:
+                self.last_sheets_update[func_name] = current_time
+                return True
+        return False
+
+
+# Instância global do cache
+cache_manager = CacheManager()
+
+
+def cached_function(cache_duration=60, force_refresh_interval=30):
+    """Decorator para cachear resultados de funções com refresh inteligente"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = cache_manager.get_cache_key(func.__name__, *args, **kwargs)
+            
+            cached_result = cache_manager.get(cache_key, duration=cache_duration)
+            if cached_result is not None and not cache_manager.should_refresh_sheets(func.__name__, force_refresh_interval):
+                logger.debug("🚀 Cache HIT para %s", func.__name__)
+                return cached_result
+            
+            # Uma thread busca; as outras que pedirem a mesma chave esperam e usam o resultado
+            with cache_manager.lock_da_chave(cache_key):
+                cached_result = cache_manager.get(cache_key, duration=cache_duration)
+                if cached_result is not None and cache_manager.cache_timestamps.get(cache_key, 0) >= time.time() - force_refresh_interval:
+                    logger.debug("🚀 Cache HIT para %s (buscado por outra thread)", func.__name__)
+                    return cached_result
+                
+                logger.debug("⏳ Cache MISS para %s, executando...", func.__name__)
+                result = func(*args, **kwargs)
+                cache_manager.set(cache_key, result)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Comandos de linha de comando (flask init-db, flask arquivar-logs, flask db ...)
+
+Registrados no app por init_app(app). Para tarefas agendadas, python -m gestao.cli <comando>
+roda os mesmos comandos num app sem as rotas (criar_app(web=False)): import e memória menores.
+"""
+
+import click
+from flask.cli import with_appcontext
+
+from gestao.extensions import db
+from gestao.logs.activity import consulta_logs, retencao_logs
+from gestao.models import User
+
+
+class _GrupoMigracoes(click.Group):
+    """flask db ...: o Flask-Migrate (Alembic, ~100 ms de import) só é carregado quando o comando é usado"""
+
+    def __init__(self, app, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.app = app
+
+    def _grupo(self):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as grupo_db
+        if 'migrate' not in self.app.extensions:
+            Migrate(self.app, db)
+        return grupo_db
+
+    def list_commands(self, ctx):
+        return self._grupo().list_commands(ctx)
+
+    def get_command(self, ctx, nome):
+        return self._grupo().get_command(ctx, nome)
+
+
+def inicializar_banco():
+    """
+    Tabelas, índices de otimização e usuário admin padrão (precisa de app context)
+
+    Fica fora do import e da partida dos workers: rodar com flask init-db no deploy,
+    INIT_DB_ON_START=true (ver gestao.factory.criar_app) ou python app.py/main.py em desenvolvimento.
+    """
+    db.create_all()
+    
+    # OTIMIZAÇÃO: Criar índices para melhorar performance
+    try:
+        print("🚀 Criando índices de otimização...")
+        with db.engine.connect() as conn:
+            indices = [
+                "CREATE INDEX IF NOT EXISTS idx_user_username ON user (username)",
+                "CREATE INDEX IF NOT EXISTS idx_user_email ON user (email)",
+                "CREATE INDEX IF NOT EXISTS idx_produto_codigo ON produto (codigo)",
+                "CREATE INDEX IF NOT EXISTS idx_produto_categoria ON produto (categoria)"
+            ]
+            
+            for indice in indices:
+                try:
+                    conn.execute(db.text(indice))
+                    print(f"✅ Índice criado: {indice.split('idx_')[1].split(' ')[0]}")
+                except Exception as e:
+                    print(f"⚠️ Erro ao criar índice: {e}")
+                    
+        print("✅ Índices de otimização criados com sucesso!")
+    except Exception as e:
+        print(f"⚠️ Erro ao criar índices: {e}")
+    
+    # Índices compostos do Log em bancos criados antes deles
+    consulta_logs.garantir_indices()
+    
+    # Criar usuário admin padrão se não existir
+    if not User.query.filter_by(username='admin').first():
+        admin = User(username='admin', email='marcosvinicius.info@gmail.com', is_admin=True)
+        admin.set_password('admin123')
+        db.session.add(admin)
+        db.session.commit()
+        print("✅ Usuário admin criado: admin / admin123")
+        print("💡 Para criar mais usuários, execute: python criar_usuarios.py")
+
+
+@click.command('arquivar-logs')
+@click.option('--dias', type=int, default=None, help='Dias mantidos na tabela Log (padrão: LOG_RETENTION_DAYS)')
+@click.option('--sem-planilha', is_flag=True, help='Não arquivar a aba "Logs" da planilha')
+@with_appcontext
+def arquivar_logs_command(dias, sem_planilha):
+    """Arquiva os logs vencidos (rodar periodicamente, ex.: Cloud Scheduler/cron diário)"""
+    db.create_all()
+    if dias is not None:
+        retencao_logs.dias_retencao = dias
+    resultado = retencao_logs.executar(planilha=not sem_planilha)
+    print(('✅ ' if resultado['success'] else '❌ ') + resultado['message'])
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Cria tabelas, índices e o usuário admin padrão (rodar no deploy)"""
+    inicializar_banco()
+
+
+def init_app(app):
+    """Registra os comandos no app.cli"""
+    app.cli.add_command(_GrupoMigracoes(app, 'db', help='Migrações do banco (Flask-Migrate)'))
+    app.cli.add_command(arquivar_logs_command)
+    app.cli.add_command(init_db_command)
+
+
+def main():
+    """python -m gestao.cli <comando>: os comandos num app sem rotas, login e templates"""
+    from flask.cli import FlaskGroup
+    from gestao.factory import criar_app
+    FlaskGroup(create_app=lambda: criar_app(web=False), help='Comandos do sistema de gestão (app sem as rotas)')()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Extensões do Flask, criadas sem app e ligadas a ele na fábrica (init_app)
+"""
+
+from flask_login import LoginManager
+from flask_mail import Mail
+from flask_sqlalchemy import SQLAlchemy
+from flask_wtf.csrf import CSRFProtect
+
+db = SQLAlchemy()
+csrf = CSRFProtect()
+mail = Mail()
+login_manager = LoginManager()
+login_manager.login_view = 'login'
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Fábrica do app: configuração, extensões, estado e logs; no servidor web também rotas e sessão
+
+- criar_app():              o app completo (gunicorn 'gestao:criar_app()', asgi.py, main.py, app.py)
+- criar_app(web=False):     sem rotas, sessão, login, CSRF e métricas das requisições, para tarefas de fundo
+                            e comandos (python -m gestao.cli): banco, Sheets, logs e e-mail de erros
+- iniciar_aquecimento(app): cache do Sheets aquecido em segundo plano, com a porta já aberta
+"""
+
+import importlib
+import os
+import threading
+import time
+
+from flask import Flask
+
+from logging_config import obter_logger
+from metrics import _rota_atual, instalar_metricas
+from gestao import state
+from gestao.auth import server_session
+from gestao.cli import inicializar_banco, init_app as registrar_comandos
+from gestao.extensions import csrf, db, login_manager, mail
+from gestao.logs import activity, errors
+from gestao.settings import configurar
+
+logger = obter_logger(__name__)
+
+# templates/, static/ e instance/ (SQLite local) continuam na raiz do projeto
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos com rotas e ganchos das requisições (importados só com web=True)
+MODULOS_WEB = (
+    'gestao.auth.session',
+    'gestao.auth.routes',
+    'gestao.logs.errors',
+    'gestao.web.dashboard',
+    'gestao.web.solicitacoes',
+    'gestao.web.romaneios',
+    'gestao.web.logs',
+    'gestao.web.admin',
+)
+
+
+def criar_app(web=True):
+    """
+    Cria o app Flask
+
+    Criar o app só registra configuração e rotas; o trabalho pesado fica para depois:
+    - pandas, gspread, google-auth e Flask-Migrate: importados no primeiro uso
+    - banco (tabelas, índices, admin padrão): flask init-db, ou aqui com INIT_DB_ON_START=true
+    - cache do Sheets: iniciar_aquecimento(app), com a porta já aberta
+
+    Args:
+        web: False para tarefas de fundo e comandos: sem rotas, sessão/login, CSRF e métricas
+            das requisições (os módulos de rotas nem são importados)
+
+    Returns:
+        Flask: o app configurado
+    """
+    app = Flask('gestao', root_path=RAIZ, instance_path=os.path.join(RAIZ, 'instance'))
+    configurar(app)
+
+    if web:
+        # Latência por rota e por chamada externa (exposta em /admin/metrics): antes dos outros before_request
+        instalar_metricas(app)
+
+    db.init_app(app)
+    mail.init_app(app)
+    state.init_app(app)
+    activity.init_app(app)
+    errors.init_app(app)
+    registrar_comandos(app)
+
+    if web:
+        server_session.init_app(app)
+        csrf.init_app(app)
+        login_manager.init_app(app)
+        for nome in MODULOS_WEB:
+            importlib.import_module(nome).rotas.registrar(app)
+
+    if os.environ.get('INIT_DB_ON_START', 'false').lower() in ['true', 'on', '1']:
+        with app.app_context():
+            try:
+                inicializar_banco()
+            except Exception as e:
+                # Vários workers ao mesmo tempo: outro pode ter criado as tabelas/admin primeiro
+                db.session.rollback()
+                logger.warning("⚠️ Inicialização do banco na partida falhou: %s", e)
+    return app
+
+
+def aquecer(app):
+    """
+    Aquece o worker: imports adiados e primeiras leituras do Sheets (planilha, matriz e
+    romaneios, ver carregar_dados_solicitacoes) vão para o cache antes da primeira requisição
+    """
+    inicio = time.perf_counter()
+    _rota_atual.set('aquecimento')
+    try:
+        import pandas  # noqa: F401
+        from gestao.sheets.data import carregar_dados_solicitacoes
+        with app.app_context():
+            df, _, _ = carregar_dados_solicitacoes()
+        logger.info("🔥 Aquecimento concluído em %.0f ms (%s solicitações)",
+                    (time.perf_counter() - inicio) * 1000, 0 if df is None else len(df))
+    except Exception as e:
+        logger.warning("⚠️ Aquecimento falhou (as rotas leem o Sheets na primeira requisição): %s", e)
+
+
+def iniciar_aquecimento(app):
+    """
+    Dispara aquecer() em segundo plano (WARMUP_ENABLED, padrão true)
+
+    Chamar depois que o servidor já escuta a porta (gunicorn.conf.py: post_worker_init;
+    asgi.py: lifespan; main.py: antes do app.run), para não atrasar a partida.
+
+    Args:
+        app: app criado por criar_app()
+
+    Returns:
+        threading.Thread ou None se desativado
+    """
+    if os.environ.get('WARMUP_ENABLED', 'true').lower() not in ['true', 'on', '1']:
+        return None
+    thread = threading.Thread(target=aquecer, args=(app,), name='aquecimento', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,3 @@
+"""
+Logs de auditoria e notificação de erros
+"""
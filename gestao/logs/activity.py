@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Logs de auditoria: fila para a aba "Logs" (log_buffer.py), consulta e retenção da tabela Log
+
+init_app(app) pela fábrica: o fallback no banco roda na thread da fila, fora de requisições.
+"""
+
+from datetime import datetime
+
+from flask import request
+from flask_login import current_user
+
+from log_buffer import CABECALHOS_LOGS, criar_fila_logs
+from log_query import criar_consulta_logs
+from log_retention import criar_retencao_logs
+from logging_config import obter_logger
+from gestao import state
+from gestao.extensions import db
+from gestao.models import Log, LogResumo
+from gestao.sheets.connection import get_google_sheets_connection
+
+logger = obter_logger(__name__)
+
+_app = None
+
+
+def init_app(app):
+    """App usado pelo fallback da fila (gravação na tabela Log fora de requisições)"""
+    global _app
+    _app = app
+
+
+# Aba "Logs" da planilha (criada com cabeçalhos se não existir)
+def _obter_aba_logs():
+    """Retorna a aba "Logs" do Google Sheets ou None se não conectar"""
+    import gspread
+    
+    sheet = get_google_sheets_connection()
+    if not sheet:
+        logger.error("❌ Não foi possível conectar com a planilha para salvar log")
+        return None
+    
+    try:
+        return sheet.worksheet("Logs")
+    except gspread.WorksheetNotFound:
+        # Criar aba "Logs" se não existir
+        logs_worksheet = sheet.add_worksheet(title="Logs", rows=1000, cols=10)
+        logs_worksheet.append_row(CABECALHOS_LOGS)
+        logger.info("✅ Aba 'Logs' criada com cabeçalhos")
+        return logs_worksheet
+
+
+def _salvar_logs_banco_local(entradas):
+    """Fallback da fila de logs: grava as entradas na tabela Log (só as que têm usuário)"""
+    with _app.app_context():
+        logs = [
+            Log(
+                timestamp=entrada['timestamp_utc'],
+                usuario_id=entrada['usuario_id'],
+                usuario_nome=entrada['usuario'],
+                acao=entrada['acao'],
+                entidade=entrada['entidade'],
+                entidade_id=entrada['entidade_id'] if isinstance(entrada['entidade_id'], int) else None,
+                detalhes=entrada['detalhes'],
+                ip_address=entrada['ip_address'],
+                user_agent=entrada['user_agent'],
+                status=entrada['status']
+            )
+            for entrada in entradas if entrada.get('usuario_id')
+        ]
+        if logs:
+            db.session.add_all(logs)
+            db.session.commit()
+            logger.info("✅ %s logs salvos no banco local (fallback)", len(logs))
+
+
+def _reservar_ids_logs(quantidade, minimo):
+    """Último ID de uma faixa reservada no contador do banco (None com o estado em memória)"""
+    estado = state.estado_compartilhado
+    if estado is None or estado.tipo != 'banco':
+        return None
+    return estado.incrementar('logs:ultimo_id', quantidade, minimo=minimo)
+
+
+# Logs de auditoria: enfileirados na requisição e gravados em lote por uma thread de fundo
+fila_logs = criar_fila_logs(_obter_aba_logs, _salvar_logs_banco_local, _reservar_ids_logs)
+
+
+# Função para salvar log na planilha do Google Sheets
+def save_log_to_sheets(acao, entidade, entidade_id=None, detalhes=None, status='sucesso'):
+    """
+    Enfileira o log para a planilha do Google Sheets (gravado em lote em segundo plano)
+    
+    Usuário, IP e User-Agent são capturados aqui, ainda dentro da requisição.
+    
+    Returns:
+        bool: True se o log foi enfileirado
+    """
+    try:
+        from flask import has_request_context
+        
+        autenticado = has_request_context() and current_user.is_authenticated
+        fila_logs.registrar({
+            'data_hora': datetime.now(),
+            'timestamp_utc': datetime.utcnow(),
+            'usuario': current_user.username if autenticado else 'Sistema',
+            'usuario_id': current_user.id if autenticado else None,
+            'acao': acao,
+            'entidade': entidade,
+            'entidade_id': entidade_id,
+            'detalhes': detalhes,
+            'ip_address': request.remote_addr if has_request_context() else '',
+            'user_agent': request.headers.get('User-Agent', '') if has_request_context() else '',
+            'status': status
+        })
+        return True
+        
+    except Exception as e:
+        logger.error("❌ Erro ao enfileirar log: %s", e)
+        return False
+
+
+# Função para ler logs da planilha do Google Sheets
+def get_logs_from_sheets():
+    """Lê logs da planilha do Google Sheets"""
+    import gspread
+    
+    try:
+        # Conectar com a planilha
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            logger.error("❌ Não foi possível conectar com a planilha para ler logs")
+            return []
+        
+        # Acessar a aba "Logs"
+        try:
+            logs_worksheet = sheet.worksheet("Logs")
+        except gspread.WorksheetNotFound:
+            logger.error("❌ Aba 'Logs' não encontrada na planilha")
+            return []
+        
+        # Obter todos os registros
+        all_records = logs_worksheet.get_all_records()
+        
+        # Converter para objetos de log
+        logs = []
+        for record in all_records:
+            if record.get('ID'):  # Pular linha de cabeçalho
+                log_obj = type('Log', (), {})()
+                log_obj.id = record.get('ID', '')
+                log_obj.timestamp = record.get('Data/Hora', '')
+                log_obj.usuario_nome = record.get('Usuário', '')
+                log_obj.acao = record.get('Ação', '')
+                log_obj.entidade = record.get('Entidade', '')
+                log_obj.entidade_id = record.get('ID_Entidade', '')
+                log_obj.detalhes = record.get('Detalhes', '')
+                log_obj.ip_address = record.get('IP_Address', '')
+                log_obj.user_agent = record.get('User_Agent', '')
+                log_obj.status = record.get('Status', '')
+                logs.append(log_obj)
+        
+        logger.info("✅ %s logs lidos da planilha", len(logs))
+        return logs
+        
+    except Exception as e:
+        logger.error("❌ Erro ao ler logs da planilha: %s", e)
+        return []
+
+
+# Função utilitária para logging (mantida para compatibilidade)
+def log_activity(acao, entidade, entidade_id=None, detalhes=None, status='sucesso'):
+    """Registra uma atividade no log do sistema (não bloqueia a requisição)"""
+    try:
+        # Enfileirar para a planilha do Google Sheets; se a planilha estiver indisponível,
+        # a fila grava o lote no banco local (tabela Log)
+        save_log_to_sheets(acao, entidade, entidade_id, detalhes, status)
+    except Exception as e:
+        logger.error("❌ Erro ao registrar log: %s", e)
+
+
+# Consulta da página /logs (filtros, paginação por cursor, estatísticas e exportação)
+consulta_logs = criar_consulta_logs(db, Log, LogResumo)
+
+
+# Arquivamento mensal da tabela Log e da aba "Logs" (flask arquivar-logs ou POST /logs/arquivar)
+retencao_logs = criar_retencao_logs(db, Log, LogResumo, consulta_logs, get_google_sheets_connection)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Erros não tratados: handler global e e-mail de resumo ao administrador (error_notifier.py)
+
+init_app(app) pela fábrica: o e-mail sai da thread do notificador, fora de requisições.
+"""
+
+from datetime import datetime
+
+from flask import flash, has_request_context, jsonify, render_template, request
+from flask_login import current_user
+from flask_mail import Message
+from werkzeug.exceptions import HTTPException
+
+from error_notifier import criar_notificador_erros
+from gestao.extensions import mail
+from gestao.logs.activity import log_activity
+from gestao.routing import Rotas
+
+rotas = Rotas()
+
+_app = None
+
+
+def init_app(app):
+    """App usado no envio do e-mail de resumo (configuração e app_context na thread do notificador)"""
+    global _app
+    _app = app
+
+
+# Função para enviar o e-mail de resumo de erros (chamada pela thread do notificador)
+def _enviar_email_erros(assunto, corpo):
+    """
+    Envia ao administrador o e-mail de resumo montado pelo notificador de erros
+    
+    Args:
+        assunto: Assunto do e-mail
+        corpo: Corpo do e-mail (texto)
+    
+    Returns:
+        bool: False se o e-mail não está configurado (o resumo é descartado)
+    """
+    # Verificar se o e-mail está configurado
+    if not _app.config.get('MAIL_USERNAME') or not _app.config.get('MAIL_PASSWORD'):
+        print("⚠️ E-mail não configurado. Configure MAIL_USERNAME e MAIL_PASSWORD para receber notificações de erro.")
+        return False
+    
+    with _app.app_context():
+        msg = Message(
+            subject=assunto,
+            recipients=[_app.config['ERROR_EMAIL_RECIPIENT']],
+            body=corpo,
+            sender=_app.config['MAIL_DEFAULT_SENDER']
+        )
+        mail.send(msg)
+    print(f"✅ E-mail de erro enviado para {_app.config['ERROR_EMAIL_RECIPIENT']}")
+    return True
+
+
+# Erros agrupados por impressão digital e enviados em resumos por uma thread de fundo
+notificador_erros = criar_notificador_erros(_enviar_email_erros)
+
+
+# Função para registrar um erro para notificação por e-mail
+def notificar_erro(excecao, contexto=None):
+    """
+    Registra o erro para o próximo e-mail de resumo ao administrador (retorna na hora)
+    
+    Args:
+        excecao: Objeto Exception capturado
+        contexto: Dicionário com informações adicionais sobre o contexto do erro
+    """
+    try:
+        # Informações da requisição (a thread de envio não tem acesso a ela)
+        informacoes = {}
+        if has_request_context():
+            usuario_info = 'Não autenticado'
+            if current_user.is_authenticated:
+                usuario_info = f"{current_user.username} (ID: {current_user.id}, Admin: {current_user.is_admin})"
+            informacoes = {
+                'URL': request.url,
+                'Método HTTP': request.method,
+                'IP do Cliente': request.remote_addr,
+                'Usuário': usuario_info,
+                'User-Agent': request.headers.get('User-Agent', 'N/A'),
+            }
+        informacoes['Data/Hora'] = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        for chave, valor in (contexto or {}).items():
+            if valor:
+                informacoes[chave] = valor
+        notificador_erros.registrar(excecao, informacoes)
+    except Exception as e:
+        print(f"❌ Erro ao registrar notificação de erro: {e}")
+
+
+# Handler global de erros
+@rotas.errorhandler(Exception)
+def handle_exception(e):
+    """Handler global para capturar todas as exceções não tratadas"""
+    # Erros HTTP (404, 405...) seguem com a resposta padrão, sem notificação
+    if isinstance(e, HTTPException):
+        return e
+    
+    # Registrar para o e-mail de resumo (enviado em segundo plano)
+    notificar_erro(e, contexto={
+        'Rota': request.endpoint,
+        'Form Data': dict(request.form) if request.form else None,
+        'JSON Data': request.get_json(silent=True)
+    })
+    
+    # Logar erro (só enfileira; a fila grava em lote)
+    log_activity('erro', 'Sistema', None, f'Erro não tratado: {type(e).__name__}: {str(e)}', 'erro')
+    
+    # Retornar resposta de erro adequada
+    if request.is_json or request.path.startswith('/api/'):
+        return jsonify({
+            'error': True,
+            'message': 'Ocorreu um erro interno no servidor. O administrador foi notificado.',
+            'type': type(e).__name__
+        }), 500
+    
+    flash('Ocorreu um erro inesperado. O administrador foi notificado por e-mail.', 'error')
+    return render_template('error.html', error=str(e)), 500
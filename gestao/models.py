@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Modelos do banco de dados (Flask-SQLAlchemy, ligado ao app pela fábrica)
+"""
+
+from datetime import datetime
+
+from flask_login import UserMixin
+from gestao.auth.passwords import gerar_hash, verificar_senha
+from gestao.extensions import db
+
+
+# Modelos do banco de dados
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(120), nullable=False)
+    is_admin = db.Column(db.Boolean, default=False)
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # O KDF roda no executor limitado de gestao.auth.passwords (pode levantar HashOcupado)
+    def set_password(self, password):
+        self.password_hash = gerar_hash(password)
+
+    def check_password(self, password):
+        return verificar_senha(self.password_hash, password)
+
+
+class Produto(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    nome = db.Column(db.String(100), nullable=False)
+    codigo = db.Column(db.String(50), unique=True, nullable=False)
+    descricao = db.Column(db.Text)
+    categoria = db.Column(db.String(50))
+    preco = db.Column(db.Float)
+    estoque_atual = db.Column(db.Integer, default=0)
+    estoque_minimo = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Solicitacao(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    data = db.Column(db.DateTime, nullable=False)
+    solicitante = db.Column(db.String(100), nullable=False)
+    codigo = db.Column(db.String(50), nullable=False)
+    descricao = db.Column(db.String(200), nullable=False)
+    unidade = db.Column(db.String(20), nullable=False)
+    quantidade = db.Column(db.Integer, nullable=False)
+    locacao = db.Column(db.String(50))
+    media = db.Column(db.Float, default=0)
+    status = db.Column(db.String(20), default='pendente')
+    qtd_separada = db.Column(db.Integer, default=0)
+    saldo = db.Column(db.Integer, default=0)
+    data_separacao = db.Column(db.DateTime)
+    separado_por = db.Column(db.String(100))
+    observacoes = db.Column(db.Text)
+    alta_demanda = db.Column(db.Boolean, default=False)
+    status_2 = db.Column(db.String(20))
+    estoque_congelado = db.Column(db.Boolean, default=False)
+    prazo_entrega = db.Column(db.String(50))
+    fornecedor = db.Column(db.String(100))
+    
+    # Campos de controle interno
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Impressao(db.Model):
+    """Tabela para controle de impressões"""
+    id = db.Column(db.Integer, primary_key=True)
+    id_impressao = db.Column(db.String(50), unique=True, nullable=False)  # Chave única da impressão
+    data_impressao = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    usuario_impressao = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), default='Pendente')  # Pendente, Processada, Cancelada
+    total_itens = db.Column(db.Integer, default=0)
+    observacoes = db.Column(db.Text)
+    data_processamento = db.Column(db.DateTime)
+    usuario_processamento = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relacionamento com itens da impressão
+    itens = db.relationship('ImpressaoItem', backref='impressao', lazy=True, cascade='all, delete-orphan')
+
+
+class ImpressaoItem(db.Model):
+    """Tabela para itens de cada impressão"""
+    id = db.Column(db.Integer, primary_key=True)
+    id_impressao = db.Column(db.Integer, db.ForeignKey('impressao.id'), nullable=False)
+    id_solicitacao = db.Column(db.String(100), nullable=False)  # ID único da solicitação
+    data_solicitacao = db.Column(db.DateTime, nullable=False)
+    solicitante = db.Column(db.String(100), nullable=False)
+    codigo = db.Column(db.String(50), nullable=False)
+    descricao = db.Column(db.String(200), nullable=False)
+    unidade = db.Column(db.String(20), nullable=False)
+    quantidade = db.Column(db.Integer, nullable=False)
+    locacao = db.Column(db.String(50))
+    saldo_estoque = db.Column(db.Integer, default=0)
+    media_consumo = db.Column(db.Float, default=0)
+    status_item = db.Column(db.String(20), default='Pendente')  # Pendente, Separado, Parcial, Cancelado
+    qtd_separada = db.Column(db.Integer, default=0)
+    observacoes_item = db.Column(db.Text)
+    data_separacao = db.Column(db.DateTime)
+    separado_por = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class EstadoCompartilhado(db.Model):
+    """Estado de execução visto por todos os workers (ver shared_state.py)"""
+    chave = db.Column(db.String(200), primary_key=True)
+    valor = db.Column(db.Text, nullable=False)  # JSON
+    expira_em = db.Column(db.DateTime, nullable=True, index=True)
+    atualizado_em = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class MovimentacaoEstoque(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    produto_id = db.Column(db.Integer, db.ForeignKey('produto.id'), nullable=False)
+    tipo = db.Column(db.String(20), nullable=False)  # entrada, saida, ajuste
+    quantidade = db.Column(db.Integer, nullable=False)
+    motivo = db.Column(db.String(100))
+    solicitacao_id = db.Column(db.Integer, db.ForeignKey('solicitacao.id'))
+    data_movimentacao = db.Column(db.DateTime, default=datetime.utcnow)
+    usuario = db.Column(db.String(100))
+    
+    # Relacionamentos
+    produto = db.relationship('Produto', backref=db.backref('movimentacoes', lazy=True))
+    solicitacao = db.relationship('Solicitacao', backref=db.backref('movimentacoes', lazy=True))
+
+
+class Log(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    usuario_nome = db.Column(db.String(80), nullable=False)
+    acao = db.Column(db.String(50), nullable=False)  # login, logout, criar, editar, deletar, aprovar, etc.
+    entidade = db.Column(db.String(50), nullable=False)  # Solicitacao, Produto, User, etc.
+    entidade_id = db.Column(db.Integer, nullable=True)  # ID da entidade afetada
+    detalhes = db.Column(db.Text, nullable=True)  # JSON com detalhes da operação
+    ip_address = db.Column(db.String(45), nullable=True)  # Suporta IPv6
+    user_agent = db.Column(db.String(500), nullable=True)
+    status = db.Column(db.String(20), default='sucesso')  # sucesso, erro, aviso
+    
+    usuario = db.relationship('User', backref=db.backref('logs', lazy=True))
+    
+    # Índices da página /logs (ver log_query.py): ordenação/cursor, período + status,
+    # filtro por usuário e filtro por entidade/ação
+    __table_args__ = (
+        db.Index('idx_log_timestamp_id', 'timestamp', 'id'),
+        db.Index('idx_log_timestamp_status', 'timestamp', 'status'),
+        db.Index('idx_log_usuario_timestamp', 'usuario_nome', 'timestamp'),
+        db.Index('idx_log_entidade_acao', 'entidade', 'acao'),
+    )
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'usuario_nome': self.usuario_nome,
+            'acao': self.acao,
+            'entidade': self.entidade,
+            'entidade_id': self.entidade_id,
+            'detalhes': self.detalhes,
+            'ip_address': self.ip_address,
+            'status': self.status
+        }
+
+
+class LogResumo(db.Model):
+    """Contagem dos logs já arquivados (ver log_retention.py) por mês, ação, entidade e status"""
+    id = db.Column(db.Integer, primary_key=True)
+    periodo = db.Column(db.String(7), nullable=False)  # AAAA-MM (UTC, como Log.timestamp)
+    acao = db.Column(db.String(50), nullable=False)
+    entidade = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    arquivo = db.Column(db.String(500), nullable=True)  # CSV compactado com as linhas do período
+    arquivado_em = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('idx_log_resumo_periodo', 'periodo', 'acao', 'entidade', 'status', unique=True),
+    )
@@ -0,0 +1,3 @@
+"""
+Pipeline do PDF do romaneio (motores em pdf_generator.py/pdf_cloud_generator.py, gravação em pdf_storage.py)
+"""
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Geração do PDF do romaneio em segundo plano, com o status em gestao.state
+"""
+
+import threading
+from datetime import datetime
+
+from logging_config import obter_logger
+from gestao import state
+
+logger = obter_logger(__name__)
+
+
+def iniciar_geracao_pdf(id_impressao, romaneio_data, itens_data):
+    """
+    Gera o PDF do romaneio numa thread (PDF-<id>) e grava no armazenamento (pdf_storage.py)
+    
+    O andamento fica em state.pdf_generation_status (consultado por /api/pdf-status/<id>).
+    Com motores baseados em HTML (PDF_ENGINE=xhtml2pdf ou chrome) o template é renderizado
+    aqui, antes da thread: precisa de app context.
+    
+    Args:
+        id_impressao: ID do romaneio (ROM-000123)
+        romaneio_data: dados do cabeçalho (data_impressao, usuario_impressao, tipo_romaneio...)
+        itens_data: itens do romaneio, na ordem de impressão
+    
+    Returns:
+        threading.Thread: a thread da geração
+    """
+    from cloud_config import get_pdf_engine, get_pdf_generator
+    
+    # Padrão: ReportLab em processo (milissegundos, sem Chrome nem parse de HTML)
+    # PDF_ENGINE=xhtml2pdf ou PDF_ENGINE=chrome mantêm os motores baseados em HTML
+    pdf_engine = get_pdf_engine()
+    pdf_function = get_pdf_generator(pdf_engine)
+    logger.info("📄 Motor de PDF: %s", pdf_engine)
+    
+    # Motores baseados em HTML precisam do template renderizado; o ReportLab monta o PDF direto dos itens
+    html_content = None
+    if pdf_engine != 'reportlab':
+        # Verificar se os dados estão corretos antes de renderizar
+        logger.debug("🔍 Verificando dados antes de renderizar HTML: %s itens", len(itens_data))
+        for idx, item in enumerate(itens_data[:3]):  # Verificar apenas os 3 primeiros para não poluir o log
+            logger.debug("   Item %s: Código=%s, Localização=%s, Média=%s", idx+1, item.get('codigo'), item.get('locacao_matriz'), item.get('media_mensal'))
+        
+        # Renderizar a variante do template própria para PDF (CSS de impressão embutido,
+        # data fixa, sem CDN/JavaScript) - dispensa qualquer ajuste posterior no HTML
+        from flask import render_template
+        html_content = render_template('formulario_impressao_pdf.html', 
+                                     id_impressao=id_impressao,
+                                     solicitacoes=itens_data,
+                                     tipo_romaneio=romaneio_data['tipo_romaneio'],
+                                     data_impressao=romaneio_data['data_impressao'],
+                                     is_reprint=False)
+    
+    # Verificar se os dados estão no HTML renderizado
+    if html_content:
+        # Verificar se pelo menos um item tem localização e média no HTML
+        primeiro_codigo = itens_data[0].get('codigo', '') if itens_data else ''
+        primeiro_locacao = itens_data[0].get('locacao_matriz', '') if itens_data else ''
+        primeiro_media = itens_data[0].get('media_mensal', '') if itens_data else ''
+        
+        if primeiro_codigo and primeiro_locacao in html_content:
+            logger.info("✅ HTML renderizado contém localização para código %s: %s", primeiro_codigo, primeiro_locacao)
+        else:
+            logger.warning("⚠️ ATENÇÃO: Localização não encontrada no HTML para código %s", primeiro_codigo)
+        
+        if primeiro_codigo and str(primeiro_media) in html_content:
+            logger.info("✅ HTML renderizado contém média para código %s: %s", primeiro_codigo, primeiro_media)
+        else:
+            logger.warning("⚠️ ATENÇÃO: Média não encontrada no HTML para código %s", primeiro_codigo)
+    
+    # OTIMIZAÇÃO: Salvar PDF em thread separada para não bloquear a resposta
+    def gerar_pdf_async():
+        try:
+            # Marcar como iniciado
+            inicio = datetime.now().strftime('%H:%M:%S')
+            state.pdf_generation_status.definir(id_impressao, {
+                'status': 'gerando',
+                'inicio': inicio,
+                'progresso': 0
+            })
+            
+            logger.info("🔄 Iniciando geração de PDF em background para %s...", id_impressao)
+            
+            # Simular progresso
+            state.pdf_generation_status.atualizar(id_impressao, progresso=25)
+            
+            # Gerar PDF e salvar APENAS no Cloud Storage (NUNCA local)
+            resultado = pdf_function(html_content, romaneio_data, pasta_destino=None, is_reprint=False, itens_data=itens_data)
+            
+            # A gravação roda no executor do pdf_storage: aguardar aqui (ainda em background)
+            # para o status só virar 'concluido' quando o PDF estiver disponível
+            if resultado.get('success') and resultado.get('upload') is not None:
+                state.pdf_generation_status.atualizar(id_impressao, progresso=75)
+                caminho = None
+                try:
+                    caminho = resultado['upload'].result()
+                except Exception as e:
+                    logger.warning("⚠️ Erro na gravação do PDF: %s", e)
+                
+                if not caminho:
+                    # Nova tentativa síncrona com os bytes que já estão em memória
+                    logger.warning("⚠️ PDF gerado mas não foi gravado. Tentando novamente...")
+                    from pdf_storage import obter_armazenamento_pdf
+                    caminho = obter_armazenamento_pdf().salvar(id_impressao, resultado['pdf_content'], is_reprint=False)
+                
+                if caminho:
+                    logger.info("✅ PDF gravado: %s", caminho)
+                    resultado['caminho'] = caminho
+                else:
+                    resultado['success'] = False
+                    resultado['message'] = 'PDF gerado mas não foi possível gravá-lo no armazenamento'
+            
+            if resultado['success']:
+                state.pdf_generation_status.definir(id_impressao, {
+                    'status': 'concluido',
+                    'inicio': inicio,
+                    'fim': datetime.now().strftime('%H:%M:%S'),
+                    'progresso': 100,
+                    'arquivo': resultado.get('caminho', '')
+                })
+                logger.info("✅ PDF gerado com sucesso: %s", resultado['message'])
+            else:
+                state.pdf_generation_status.definir(id_impressao, {
+                    'status': 'erro',
+                    'inicio': inicio,
+                    'fim': datetime.now().strftime('%H:%M:%S'),
+                    'progresso': 0,
+                    'erro': resultado['message']
+                })
+                logger.warning("⚠️ Erro na geração do PDF: %s", resultado['message'])
+        except Exception as e:
+            logger.warning("⚠️ Erro ao gerar PDF em background: %s", e)
+            try:
+                state.pdf_generation_status.atualizar(
+                    id_impressao,
+                    status='erro',
+                    fim=datetime.now().strftime('%H:%M:%S'),
+                    progresso=0,
+                    erro=str(e)
+                )
+            except Exception as erro_status:
+                logger.warning("⚠️ Não foi possível registrar o status do PDF: %s", erro_status)
+    
+    # Executar geração de PDF em thread separada (NÃO BLOQUEIA)
+    pdf_thread = threading.Thread(target=gerar_pdf_async, name=f"PDF-{id_impressao}")
+    pdf_thread.daemon = True
+    pdf_thread.start()
+    return pdf_thread
+
+
+def verificar_pdf_romaneio(id_impressao, gcs_client=None, gcs_bucket=None):
+    """Verifica se existe PDF do romaneio e retorna informações
+    
+    Args:
+        id_impressao: ID do romaneio
+        gcs_client: Mantido por compatibilidade (o armazenamento usa o cliente compartilhado)
+        gcs_bucket: Mantido por compatibilidade (o armazenamento usa o bucket compartilhado)
+    """
+    try:
+        from pdf_storage import obter_armazenamento_pdf
+        return obter_armazenamento_pdf().info(id_impressao)
+    except Exception as e:
+        # Não imprimir erro para cada PDF (muito verbose)
+        return {'existe': False}
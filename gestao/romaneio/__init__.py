@@ -0,0 +1,3 @@
+"""
+Romaneios (impressões de solicitações para separação)
+"""
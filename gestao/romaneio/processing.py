@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Processamento da separação de um romaneio: montagem da tela, baixa dos itens e gravação
+"""
+
+import logging
+from datetime import datetime
+
+from logging_config import obter_logger
+from gestao.sheets.connection import get_google_sheets_connection
+from gestao.sheets.tabs import criar_aba_realizar_baixa
+
+logger = obter_logger(__name__)
+
+
+def salvar_dados_realizar_baixa(id_romaneio, itens_processados, usuario_processamento):
+    """Salva dados do processamento na aba 'Realizar baixa'"""
+    import gspread
+    
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        logger.debug("🚀 SALVANDO DADOS NA ABA 'REALIZAR BAIXA'")
+        logger.debug("📦 Romaneio: %s", id_romaneio)
+        logger.debug("📋 Itens processados: %s", len(itens_processados))
+        logger.debug("👤 Usuário: %s", usuario_processamento)
+        
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            logger.error("❌ Erro ao conectar com Google Sheets")
+            return False
+        
+        # Verificar se a aba existe, se não existir, criar
+        try:
+            worksheet = sheet.worksheet("Realizar baixa")
+        except gspread.WorksheetNotFound:
+            logger.debug("📋 Aba 'Realizar baixa' não existe, criando...")
+            if not criar_aba_realizar_baixa():
+                return False
+            worksheet = sheet.worksheet("Realizar baixa")
+        
+        # Buscar dados das solicitações para obter informações completas
+        solicitacoes_worksheet = sheet.worksheet("Solicitações")
+        solicitacoes_values = solicitacoes_worksheet.get_all_values()
+        
+        if len(solicitacoes_values) < 2:
+            logger.error("❌ Aba Solicitações vazia")
+            return False
+        
+        # Encontrar colunas necessárias
+        header_solicitacoes = solicitacoes_values[0]
+        col_indices = {}
+        for i, col_name in enumerate(header_solicitacoes):
+            col_name_clean = col_name.strip().upper()
+            if debug:
+                logger.debug("   Coluna %s: '%s'", i, col_name_clean)
+            if 'COD=' in col_name_clean or 'CODIGO' in col_name_clean:
+                col_indices['codigo'] = i
+            elif 'SOLICITANTE' in col_name_clean:
+                col_indices['solicitante'] = i
+            elif 'DATA' in col_name_clean and 'CARIMBO' not in col_name_clean:
+                col_indices['data'] = i
+        
+        logger.debug("📍 Colunas encontradas: %s", col_indices)
+        logger.debug("📋 Header completo: %s", header_solicitacoes)
+        
+        # CORREÇÃO: Buscar também na aba IMPRESSAO_ITENS para dados mais completos
+        impressao_itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        impressao_itens_values = impressao_itens_worksheet.get_all_values()
+        logger.debug("📊 Total de linhas na IMPRESSAO_ITENS: %s", len(impressao_itens_values))
+        
+        # Preparar dados para inserção
+        data_processamento = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        dados_para_inserir = []
+        
+        for item in itens_processados:
+            id_solicitacao = item.get('id_solicitacao', '')
+            qtd_separada = item.get('qtd_separada', 0)
+            
+            if debug:
+                logger.debug("🔄 Processando item: %s - Qtd: %s", id_solicitacao, qtd_separada)
+            
+            # CORREÇÃO: Buscar dados primeiro na IMPRESSAO_ITENS (mais confiável)
+            codigo = ''
+            solicitante = ''
+            data_solicitacao = ''
+            
+            if debug:
+                logger.debug("   🔍 Buscando dados na IMPRESSAO_ITENS para ID_SOLICITACAO: %s", id_solicitacao)
+            encontrado_impressao = False
+            
+            for row in impressao_itens_values[1:]:
+                if len(row) > 1 and row[1] == id_solicitacao:  # ID_SOLICITACAO na coluna B
+                    codigo = row[4] if len(row) > 4 else ''  # CODIGO na coluna E
+                    solicitante = row[3] if len(row) > 3 else ''  # SOLICITANTE na coluna D
+                    data_solicitacao = row[2] if len(row) > 2 else ''  # DATA na coluna C
+                    if debug:
+                        logger.debug("   ✅ Dados encontrados na IMPRESSAO_ITENS: Cod='%s', Sol='%s', Data='%s'", codigo, solicitante, data_solicitacao)
+                    encontrado_impressao = True
+                    break
+            
+            # Se não encontrou na IMPRESSAO_ITENS, buscar na aba Solicitações
+            if not encontrado_impressao:
+                if debug:
+                    logger.debug("   🔄 Buscando dados na aba Solicitações para ID_SOLICITACAO: %s", id_solicitacao)
+                encontrado_solicitacoes = False
+                
+                for i, row in enumerate(solicitacoes_values[1:], start=2):
+                    if len(row) > 15 and row[15] == id_solicitacao:  # ID_SOLICITACAO na coluna P
+                        if debug:
+                            logger.debug("   ✅ Solicitação encontrada na linha %s", i)
+                        if debug:
+                            logger.debug("   📋 Dados da linha: %s...", row[:5])
+                        
+                        codigo = row[col_indices['codigo']] if 'codigo' in col_indices and len(row) > col_indices['codigo'] else ''
+                        solicitante = row[col_indices['solicitante']] if 'solicitante' in col_indices and len(row) > col_indices['solicitante'] else ''
+                        data_solicitacao = row[col_indices['data']] if 'data' in col_indices and len(row) > col_indices['data'] else ''
+                        
+                        if debug:
+                            logger.debug("   📊 Código: '%s', Solicitante: '%s', Data: '%s'", codigo, solicitante, data_solicitacao)
+                        encontrado_solicitacoes = True
+                        break
+                
+                if not encontrado_solicitacoes:
+                    logger.warning("   ❌ Solicitação %s não encontrada em nenhuma aba!", id_solicitacao)
+                    # Usar dados básicos do item processado
+                    codigo = item.get('codigo', '')
+                    solicitante = item.get('solicitante', '')
+                    data_solicitacao = item.get('data', '')
+            
+            # Adicionar linha de dados
+            linha_dados = [
+                data_processamento,    # A - Carimbo
+                codigo,               # B - Cod
+                data_solicitacao,     # C - Data
+                str(qtd_separada),    # D - Qtd
+                usuario_processamento, # E - Responsavel
+                solicitante,          # F - Solicitante
+                id_romaneio           # G - ID_IMPRESSAO
+            ]
+            
+            dados_para_inserir.append(linha_dados)
+            if debug:
+                logger.debug("   ✅ Dados preparados: %s", linha_dados)
+        
+        # Inserir dados na aba
+        if dados_para_inserir:
+            # Encontrar próxima linha vazia
+            all_values = worksheet.get_all_values()
+            proxima_linha = len(all_values) + 1
+            
+            # Inserir dados
+            range_start = f'A{proxima_linha}'
+            range_end = f'G{proxima_linha + len(dados_para_inserir) - 1}'
+            worksheet.update(f'{range_start}:{range_end}', dados_para_inserir)
+            
+            logger.info("✅ %s registros salvos na aba 'Realizar baixa'", len(dados_para_inserir))
+            logger.debug("📍 Range: %s:%s", range_start, range_end)
+            return True
+        else:
+            logger.warning("⚠️ Nenhum dado para inserir na aba 'Realizar baixa'")
+            return False
+        
+    except Exception as e:
+        logger.error("❌ Erro ao salvar dados na aba 'Realizar baixa': %s", e)
+        return False
+
+
+def montar_romaneio_processamento(id_impressao, impressoes_values, itens_values, solicitacoes_values):
+    """
+    Dados da tela de processamento a partir das abas já lidas
+    
+    Args:
+        id_impressao: ID do romaneio
+        impressoes_values: linhas da aba IMPRESSOES
+        itens_values: linhas da aba IMPRESSAO_ITENS
+        solicitacoes_values: linhas da aba Solicitações
+    
+    Returns:
+        tuple: (romaneio_data, itens_data); romaneio_data é None se o romaneio não existe
+    """
+    romaneio_data = None
+    for row in impressoes_values[1:]:  # Pular cabeçalho
+        if len(row) >= 4 and row[0] == id_impressao:
+            romaneio_data = {
+                'id_impressao': row[0],
+                'data_impressao': row[1],
+                'usuario_impressao': row[2],
+                'status': row[3],
+                'total_itens': int(row[4]) if row[4].isdigit() else 0,
+                'observacoes': row[5] if len(row) > 5 else ''
+            }
+            break
+    
+    if not romaneio_data:
+        return None, []
+    
+    debug = logger.isEnabledFor(logging.DEBUG)
+    logger.debug("📋 Total de linhas na aba IMPRESSAO_ITENS: %s", len(itens_values))
+    logger.debug("🔍 Buscando itens para romaneio: %s", id_impressao)
+    
+    itens_data = []
+    # Buscar nas linhas de dados (pular cabeçalho)
+    for i, row in enumerate(itens_values[1:], start=2):
+        if len(row) >= 10 and row[0] == id_impressao:
+            if debug:
+                logger.debug("   ✅ Item encontrado: %s - %s", row[4], row[5])
+            # Extrair dados com validação e tratamento de erros
+            # Estrutura: A=ID_IMPRESSAO(0), B=ID_SOLICITACAO(1), C=DATA(2), D=SOLICITANTE(3), 
+            # E=CODIGO(4), F=DESCRICAO(5), G=UNIDADE(6), H=QUANTIDADE(7), 
+            # I=LOCACAO_MATRIZ(8), J=SALDO_ESTOQUE(9), K=MEDIA_MENSAL(10), L=ALTA_DEMANDA(11)
+            
+            # Processar localização (coluna I, índice 8)
+            locacao = row[8] if len(row) > 8 and row[8] else '1 E5 E03/F03'
+            
+            # Processar saldo estoque (coluna J, índice 9)
+            try:
+                saldo_str = str(row[9]).strip() if len(row) > 9 else '0'
+                saldo_estoque = int(float(saldo_str.replace(',', '.'))) if saldo_str and saldo_str != '' else 600
+            except (ValueError, TypeError):
+                saldo_estoque = 600
+            
+            # Processar média mensal (coluna K, índice 10)
+            try:
+                media_str = str(row[10]).strip() if len(row) > 10 else '0'
+                media_mensal = int(float(media_str.replace(',', '.'))) if media_str and media_str != '' else 41
+            except (ValueError, TypeError):
+                media_mensal = 41
+            
+            # Processar alta demanda (coluna L, índice 11)
+            alta_demanda = False
+            if len(row) > 11:
+                alta_demanda_str = str(row[11]).strip().lower()
+                alta_demanda = alta_demanda_str in ['sim', 's', 'yes', 'y', 'true', '1', 'verdadeiro']
+            
+            if debug:
+                logger.debug("   📍 Dados extraídos: Localização=%s, Saldo=%s, Média=%s, Alta Demanda=%s", locacao, saldo_estoque, media_mensal, alta_demanda)
+            
+            item = {
+                'id_solicitacao': row[1] if len(row) > 1 else '',
+                'data': row[2] if len(row) > 2 else '',
+                'solicitante': row[3] if len(row) > 3 else '',
+                'codigo': row[4] if len(row) > 4 else '',
+                'descricao': row[5] if len(row) > 5 else '',
+                'quantidade': int(float(row[7].replace(',', '.'))) if len(row) > 7 and row[7] and str(row[7]).strip() != '' else 0,
+                'unidade': row[6] if len(row) > 6 else '',
+                'alta_demanda': alta_demanda,
+                'locacao_matriz': locacao,
+                'saldo_estoque': saldo_estoque,
+                'media_mensal': media_mensal,
+                'qtd_separada_atual': 0,
+                'observacoes_item': '',
+                'status_item': 'Pendente' if len(row) <= 12 or (len(row) > 12 and row[12].strip().lower() in ['false', '0', '']) else ('Processado' if len(row) > 12 and row[12].strip().lower() in ['true', '1', 'processado'] else (row[12] if len(row) > 12 else 'Pendente'))
+            }
+            itens_data.append(item)
+    
+    logger.info("📦 Total de itens encontrados: %s", len(itens_data))
+    
+    # Mapear quantidades separadas e saldos por ID da solicitação
+    qtd_separadas = {}
+    saldos = {}
+    
+    # Encontrar colunas necessárias
+    header_solicitacoes = solicitacoes_values[0] if solicitacoes_values else []
+    id_solicitacao_col = None
+    qtd_separada_col = None
+    saldo_col = None
+    
+    for i, col_name in enumerate(header_solicitacoes):
+        col_name_clean = col_name.strip()
+        if col_name_clean == 'ID_SOLICITACAO':
+            id_solicitacao_col = i
+        elif col_name_clean == 'Qtd. Separada':
+            qtd_separada_col = i
+        elif col_name_clean == 'Saldo':
+            saldo_col = i
+    
+    logger.debug("🔍 Colunas encontradas - ID_SOLICITACAO: %s, Qtd. Separada: %s, Saldo: %s", id_solicitacao_col, qtd_separada_col, saldo_col)
+    
+    # Se não encontrou as colunas pelos nomes, usar posições fixas conhecidas
+    if id_solicitacao_col is None:
+        id_solicitacao_col = 15  # Coluna P
+        logger.debug("📍 Usando posição fixa para ID_SOLICITACAO: coluna %s", id_solicitacao_col)
+    
+    if qtd_separada_col is None:
+        qtd_separada_col = 10  # Coluna K
+        logger.debug("📍 Usando posição fixa para Qtd. Separada: coluna %s", qtd_separada_col)
+    
+    if saldo_col is None:
+        saldo_col = 12  # Coluna M (próxima à Qtd. Separada)
+        logger.debug("📍 Usando posição fixa para Saldo: coluna %s", saldo_col)
+    
+    for row in solicitacoes_values[1:]:  # Pular cabeçalho
+        if len(row) > max(id_solicitacao_col, qtd_separada_col, saldo_col):
+            try:
+                id_solic = row[id_solicitacao_col].strip()
+                qtd_sep = int(row[qtd_separada_col]) if row[qtd_separada_col].strip() else 0
+                saldo_atual = int(row[saldo_col]) if row[saldo_col].strip() else 0
+                if id_solic:  # Só adicionar se tem ID válido
+                    qtd_separadas[id_solic] = qtd_sep
+                    saldos[id_solic] = saldo_atual
+                    if debug:
+                        logger.debug("   ✅ ID: %s -> Qtd Separada: %s, Saldo: %s", id_solic, qtd_sep, saldo_atual)
+            except (ValueError, IndexError) as e:
+                if debug:
+                    logger.debug("   ❌ Erro ao processar linha: %s", e)
+                continue
+    
+    # Atualizar itens com quantidades separadas e saldos
+    logger.debug("📊 Total de quantidades separadas encontradas: %s", len(qtd_separadas))
+    logger.debug("📊 Total de saldos encontrados: %s", len(saldos))
+    
+    for item in itens_data:
+        qtd_atual = qtd_separadas.get(item['id_solicitacao'], 0)
+        saldo_atual = saldos.get(item['id_solicitacao'], 0)
+        item['qtd_separada_atual'] = qtd_atual
+        item['saldo_atual'] = saldo_atual
+        if debug:
+            logger.debug("   📦 Item %s: Qtd Separada = %s, Saldo = %s", item['id_solicitacao'], qtd_atual, saldo_atual)
+    
+    return romaneio_data, itens_data
+
+
+def processar_baixa_item(id_solicitacao, qtd_separada, observacoes, solicitacoes_ativas, header, status_especial=None):
+    """Processa a baixa de um item específico - OTIMIZADO"""
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        # ID_SOLICITACAO está na coluna P (índice 15)
+        id_solicitacao_col = 15  # Coluna P
+        logger.debug("🔍 Usando coluna P (índice %s) para ID_SOLICITACAO", id_solicitacao_col)
+        
+        # Verificar se a coluna P existe
+        if len(header) <= id_solicitacao_col:
+            logger.error("❌ Coluna P não existe. Total de colunas: %s", len(header))
+            logger.debug("🔍 Header completo: %s", header)
+            return None
+        
+        # OTIMIZAÇÃO: Usar dict para busca O(1) em vez de loop O(n)
+        # Usar ID_SOLICITACAO como chave em vez da primeira coluna
+        solicitacoes_dict = {}
+        logger.debug("🔍 Processando %s solicitações da planilha...", len(solicitacoes_ativas))
+        for i, row in enumerate(solicitacoes_ativas):
+            if debug and i < 5:  # Debug apenas primeiras 5
+                logger.debug("   Linha %s: %s... (total: %s colunas)", i, row[:3], len(row))
+            if len(row) > id_solicitacao_col and row[id_solicitacao_col].strip():
+                id_solic = row[id_solicitacao_col].strip()
+                # i é o índice na lista (0-based)
+                # Para converter para linha da planilha: i + 2 (pular cabeçalho [linha 1] + índice começa em 0)
+                linha_planilha = i + 2
+                solicitacoes_dict[id_solic] = (i, row, linha_planilha)
+                if debug and i < 5:  # Debug apenas primeiras 5
+                    logger.debug("   ✅ Adicionado ID: '%s' (linha planilha %s)", id_solic, linha_planilha)
+            elif debug and i < 5:
+                logger.debug("   ❌ Linha %s não tem ID válido na coluna %s", i, id_solicitacao_col)
+        
+        logger.debug("📊 Total de IDs encontrados: %s", len(solicitacoes_dict))
+        
+        # Normalizar ID para comparação (remover espaços)
+        id_solicitacao_clean = id_solicitacao.strip()
+        
+        if id_solicitacao_clean not in solicitacoes_dict:
+            logger.error("❌ Solicitação '%s' não encontrada na planilha", id_solicitacao_clean)
+            logger.debug("🔍 IDs disponíveis: %s...", list(solicitacoes_dict.keys())[:10])
+            logger.debug("🔍 Total de solicitações na planilha: %s", len(solicitacoes_dict))
+            logger.debug("🔍 Procurando ID exato: '%s'", id_solicitacao_clean)
+            # Tentar encontrar variações do ID
+            encontrado_similar = False
+            for key in solicitacoes_dict.keys():
+                if id_solicitacao_clean.lower() in key.lower() or key.lower() in id_solicitacao_clean.lower():
+                    logger.debug("   ⚠️ ID similar encontrado: '%s'", key)
+                    encontrado_similar = True
+            if not encontrado_similar:
+                logger.debug("   ❌ Nenhum ID similar encontrado")
+            return None
+        
+        i, row, linha_planilha = solicitacoes_dict[id_solicitacao_clean]
+        logger.debug("✅ Processando baixa para '%s': %s unidades (linha %s)", id_solicitacao_clean, qtd_separada, linha_planilha)
+        
+        # Encontrar colunas necessárias - OTIMIZAÇÃO: cache de índices
+        col_indices = {}
+        for j, col_name in enumerate(header):
+            col_name_clean = col_name.strip()
+            if col_name_clean == 'Qtd. Separada':
+                col_indices['qtd_separada'] = j
+            elif col_name_clean == 'Status':
+                col_indices['status'] = j
+            elif col_name_clean == 'Saldo':
+                col_indices['saldo'] = j
+            elif col_name_clean == 'Quantidade':
+                col_indices['quantidade'] = j
+        
+        # Verificar se todas as colunas foram encontradas
+        required_cols = ['qtd_separada', 'status', 'saldo', 'quantidade']
+        if not all(col in col_indices for col in required_cols):
+            logger.error("❌ Colunas necessárias não encontradas: %s", col_indices)
+            return None
+        
+        # Obter valores atuais da planilha Solicitações
+        qtd_separada_atual = int(row[col_indices['qtd_separada']]) if row[col_indices['qtd_separada']].strip() else 0
+        quantidade_solicitada = int(row[col_indices['quantidade']]) if row[col_indices['quantidade']].strip() else 0
+        
+        logger.debug("📊 VALORES ATUAIS DA PLANILHA:")
+        logger.debug("   Qtd. Separada atual: %s", qtd_separada_atual)
+        logger.debug("   Quantidade solicitada: %s", quantidade_solicitada)
+        logger.debug("   Qtd. Separada nova (do formulário): %s", qtd_separada)
+        
+        # CORREÇÃO: Somar o valor existente com o novo valor
+        qtd_separada_total = qtd_separada_atual + qtd_separada
+        
+        # CORREÇÃO: Calcular Saldo = Quantidade - Qtd. Separada Total
+        saldo = quantidade_solicitada - qtd_separada_total
+        
+        logger.debug("🧮 CÁLCULOS:")
+        logger.debug("   Qtd. Separada Total: %s + %s = %s", qtd_separada_atual, qtd_separada, qtd_separada_total)
+        logger.debug("   Saldo: %s - %s = %s", quantidade_solicitada, qtd_separada_total, saldo)
+        
+        # Determinar status - OTIMIZAÇÃO: usar operador ternário
+        if status_especial:
+            status = status_especial
+            logger.debug("🎯 Status especial aplicado: %s", status)
+        else:
+            status = ('Parcial' if qtd_separada_total < quantidade_solicitada else
+                     'Concluida' if qtd_separada_total == quantidade_solicitada else 'Excesso')
+            logger.debug("📊 Status calculado automaticamente: %s", status)
+        
+        # Preparar atualização
+        atualizacao = {
+            'id_solicitacao': id_solicitacao,
+            'qtd_separada_total': qtd_separada_total,
+            'status': status,
+            'saldo': saldo,
+            'observacoes': observacoes,
+            'col_indices': col_indices,
+            'row_index': linha_planilha  # Usar a linha correta da planilha
+        }
+        
+        logger.debug("✅ RESULTADO FINAL:")
+        logger.debug("   Qtd. Separada Total: %s", qtd_separada_total)
+        logger.debug("   Saldo: %s", saldo)
+        logger.debug("   Status: %s", status)
+        logger.debug("   Linha da planilha: %s", linha_planilha)
+        
+        return atualizacao
+        
+    except Exception as e:
+        logger.error("❌ Erro ao processar baixa do item %s: %s", id_solicitacao, e)
+        return None
+
+
+def atualizar_imprecao_itens(id_romaneio, itens_processados, usuario_processamento):
+    """Atualiza a aba IMPRESSAO_ITENS com as baixas processadas - VERSÃO SIMPLIFICADA"""
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        logger.debug("🚀 ATUALIZANDO IMPRESSAO_ITENS - VERSÃO SIMPLIFICADA")
+        logger.debug("📦 Romaneio: %s", id_romaneio)
+        logger.debug("📋 Itens processados: %s", itens_processados)
+        logger.debug("👤 Usuário: %s", usuario_processamento)
+        
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            logger.error("❌ Erro ao conectar com Google Sheets")
+            return False
+        
+        impressao_itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        
+        # Buscar TODAS as linhas da planilha
+        all_values = impressao_itens_worksheet.get_all_values()
+        logger.debug("📊 Total de linhas na IMPRESSAO_ITENS: %s", len(all_values))
+        
+        if not all_values or len(all_values) < 2:
+            logger.error("❌ Aba IMPRESSAO_ITENS vazia")
+            return False
+        
+        # ABORDAGEM SIMPLIFICADA: Atualizar diretamente usando range específico
+        logger.debug("🔄 ABORDAGEM SIMPLIFICADA - Atualizando diretamente")
+        
+        # Preparar dados de atualização
+        data_processamento = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        atualizacoes = []
+        
+        # Para cada item processado, atualizar diretamente
+        for item in itens_processados:
+            id_solicitacao = item.get('id_solicitacao', '')
+            qtd_separada = item.get('qtd_separada', 0)
+            observacoes = item.get('observacoes', '')
+            
+            if debug:
+                logger.debug("🔄 Processando item: %s - Qtd: %s, Obs: '%s'", id_solicitacao, qtd_separada, observacoes)
+            
+            # Buscar a linha correspondente na planilha
+            linha_encontrada = None
+            for i, row in enumerate(all_values[1:], start=2):
+                # Verificar se é o item correto (buscar por ID_Solicitacao)
+                if len(row) > 1 and row[1] == id_solicitacao:  # Coluna B = ID_Solicitacao
+                    linha_encontrada = i
+                    if debug:
+                        logger.debug("   ✅ Item encontrado na linha %s", i)
+                    break
+            
+            if linha_encontrada:
+                # Atualizar QTD_SEPARADA (coluna N = 13)
+                atualizacoes.append({
+                    'range': f'N{linha_encontrada}',
+                    'values': [[str(qtd_separada)]]
+                })
+                
+                # Atualizar OBSERVACOES_ITEM (coluna O = 14)
+                atualizacoes.append({
+                    'range': f'O{linha_encontrada}',
+                    'values': [[observacoes]]
+                })
+                
+                # Atualizar STATUS_ITEM para "Processado" (coluna M = 12)
+                atualizacoes.append({
+                    'range': f'M{linha_encontrada}',
+                    'values': [['Processado']]
+                })
+                
+                # Atualizar DATA_SEPARACAO (coluna P = 15)
+                atualizacoes.append({
+                    'range': f'P{linha_encontrada}',
+                    'values': [[data_processamento]]
+                })
+                
+                # Atualizar USUARIO_PROCESSAMENTO (coluna R = 17)
+                atualizacoes.append({
+                    'range': f'R{linha_encontrada}',
+                    'values': [[usuario_processamento]]
+                })
+                
+                if debug:
+                    logger.debug("   ✅ Atualizações preparadas para linha %s", linha_encontrada)
+            else:
+                logger.warning("   ❌ Item %s não encontrado na planilha!", id_solicitacao)
+        
+        logger.debug("📊 Total de atualizações preparadas: %s", len(atualizacoes))
+        
+        # Executar atualizações
+        if atualizacoes:
+            logger.debug("🔄 Executando %s atualizações na IMPRESSAO_ITENS:", len(atualizacoes))
+            for atualizacao in atualizacoes:
+                if debug:
+                    logger.debug("   📍 %s: %s", atualizacao['range'], atualizacao['values'])
+            
+            try:
+                impressao_itens_worksheet.batch_update(atualizacoes)
+                logger.info("✅ %s itens atualizados na IMPRESSAO_ITENS", len(atualizacoes))
+                return True
+            except Exception as e:
+                logger.error("❌ Erro ao executar batch_update: %s", e)
+                return False
+        else:
+            logger.warning("⚠️ Nenhuma atualização para executar na IMPRESSAO_ITENS")
+            return False
+        
+    except Exception as e:
+        logger.error("❌ Erro ao atualizar IMPRESSAO_ITENS: %s", e)
+        return False
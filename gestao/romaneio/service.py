@@ -0,0 +1,712 @@
+#!/usr/bin/env python3
+"""
+Romaneios (impressões): criação, consulta e atualização nas abas IMPRESSOES e IMPRESSAO_ITENS
+"""
+
+from datetime import datetime
+
+from logging_config import obter_logger
+from gestao import state
+from gestao.pdf.pipeline import iniciar_geracao_pdf
+from gestao.sheets.connection import get_google_sheets_connection
+from gestao.sheets.ids import gerar_id_impressao, gerar_id_solicitacao
+from gestao.sheets.status import atualizar_status_rapido
+from gestao.sheets.tabs import COLUNA_TIPO_ROMANEIO, criar_colunas_impressao_itens, garantir_coluna_tipo_romaneio
+
+logger = obter_logger(__name__)
+
+
+def obter_tipo_romaneio(id_impressao, linha_impressao=None):
+    """
+    Tipo do romaneio (título do PDF)
+    
+    Args:
+        id_impressao: ID do romaneio (ROM-000001)
+        linha_impressao: linha da aba IMPRESSOES, se já lida (coluna TIPO_ROMANEIO)
+    
+    Returns:
+        str: tipo gravado no registro, ou o dos metadados recentes, ou None (romaneios antigos)
+    """
+    if linha_impressao and len(linha_impressao) > COLUNA_TIPO_ROMANEIO and linha_impressao[COLUNA_TIPO_ROMANEIO]:
+        return linha_impressao[COLUNA_TIPO_ROMANEIO]
+    return state.romaneio_info.obter(id_impressao, {}).get('tipo_romaneio')
+
+
+def criar_impressao(usuario, solicitacoes_selecionadas, observacoes="", tipo_romaneio='Romaneio de Separação'):
+    """
+    Cria uma nova impressão no Google Sheets
+    
+    Args:
+        usuario: usuário que imprimiu
+        solicitacoes_selecionadas: solicitações do romaneio
+        observacoes: observações da impressão
+        tipo_romaneio: título do romaneio ('Romaneio de Separação' ou 'Itens em Falta'),
+            gravado no registro e usado no PDF gerado em background
+    """
+    try:
+        # Primeiro, garantir que as colunas existem
+        if not criar_colunas_impressao_itens():
+            raise Exception("Não foi possível criar/verificar colunas IMPRESSAO_ITENS")
+            
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        # Gerar ID único da impressão
+        id_impressao = gerar_id_impressao(usuario)
+        data_impressao = datetime.now()
+        
+        # Acessar abas
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        garantir_coluna_tipo_romaneio(impressoes_worksheet)
+        
+        # Criar registro da impressão
+        impressao_data = [
+            id_impressao,
+            data_impressao.strftime('%Y-%m-%d %H:%M:%S'),
+            usuario,
+            'Pendente',
+            len(solicitacoes_selecionadas),
+            observacoes,
+            '',  # DATA_PROCESSAMENTO
+            '',  # USUARIO_PROCESSAMENTO
+            data_impressao.strftime('%Y-%m-%d %H:%M:%S'),  # CREATED_AT
+            data_impressao.strftime('%Y-%m-%d %H:%M:%S'),  # UPDATED_AT
+            tipo_romaneio                                   # TIPO_ROMANEIO
+        ]
+        
+        impressoes_worksheet.append_row(impressao_data)
+        state.romaneio_info.definir(id_impressao, {
+            'tipo_romaneio': tipo_romaneio,
+            'usuario': usuario,
+            'total_itens': len(solicitacoes_selecionadas),
+        })
+        
+        # Criar registros dos itens e adicionar ID_SOLICITACAO na aba Solicitações
+        solicitacoes_worksheet = sheet.worksheet("Solicitações")
+        solicitacoes_values = solicitacoes_worksheet.get_all_values()
+        header_solicitacoes = solicitacoes_values[0] if solicitacoes_values else []
+        
+        # ID_SOLICITACAO está na coluna P (índice 15)
+        id_solicitacao_col = 15  # Coluna P
+        logger.debug("🔍 Usando coluna P (índice %s) para ID_SOLICITACAO", id_solicitacao_col)
+        
+        # Verificar se a coluna P existe
+        if len(header_solicitacoes) <= id_solicitacao_col:
+            logger.error("❌ Coluna P não existe. Total de colunas: %s", len(header_solicitacoes))
+            logger.debug("🔍 Header completo: %s", header_solicitacoes)
+            # Adicionar coluna ID_SOLICITACAO se não existir
+            logger.info("📝 Adicionando coluna ID_SOLICITACAO na aba Solicitações...")
+            solicitacoes_worksheet.insert_cols([["ID_SOLICITACAO"]], 1)
+            id_solicitacao_col = 0
+            # Atualizar dados
+            solicitacoes_values = solicitacoes_worksheet.get_all_values()
+            header_solicitacoes = solicitacoes_values[0]
+        
+        # Encontrar colunas para busca
+        codigo_col = None
+        solicitante_col = None
+        for i, col_name in enumerate(header_solicitacoes):
+            col_name_clean = col_name.strip().lower()
+            if 'código' in col_name_clean or 'codigo' in col_name_clean:
+                codigo_col = i
+            elif 'solicitante' in col_name_clean:
+                solicitante_col = i
+        
+        logger.debug("🔍 Colunas encontradas - Código: %s, Solicitante: %s", codigo_col, solicitante_col)
+        
+        atualizacoes_solicitacoes = []
+        
+        for solicitacao in solicitacoes_selecionadas:
+            codigo = solicitacao.get('codigo', '')
+            solicitante = solicitacao.get('solicitante', '')
+            
+            logger.debug("🔍 Verificando status para: %s - %s", codigo, solicitante)
+            
+            # Verificar status da solicitação na aba Solicitações
+            status_solicitacao = None
+            if codigo_col is not None and solicitante_col is not None:
+                for i, row in enumerate(solicitacoes_values[1:], start=2):
+                    if (len(row) > max(codigo_col, solicitante_col) and
+                        row[codigo_col].strip() == codigo and
+                        row[solicitante_col].strip() == solicitante):
+                        
+                        # Encontrar coluna Status
+                        status_col = None
+                        for j, col_name in enumerate(header_solicitacoes):
+                            if col_name.strip().lower() == 'status':
+                                status_col = j
+                                break
+                        
+                        if status_col is not None and len(row) > status_col:
+                            status_solicitacao = row[status_col].strip()
+                            logger.debug("   Status encontrado: %s", status_solicitacao)
+                        break
+            
+            # Validar se pode imprimir
+            if status_solicitacao == 'Em Separação':
+                logger.error("❌ Solicitação %s já está 'Em Separação' - não pode imprimir novamente!", codigo)
+                raise Exception(f"Solicitação {codigo} já está sendo processada (Status: Em Separação). Aguarde o processamento atual.")
+            elif status_solicitacao == 'Concluída':
+                logger.error("❌ Solicitação %s já foi totalmente processada (Status: Concluída) - não pode imprimir novamente!", codigo)
+                raise Exception(f"Solicitação {codigo} já foi totalmente processada (Status: Concluída). Não é possível reimprimir.")
+            elif status_solicitacao not in ['Aberto', 'Parcial', '']:
+                logger.warning("⚠️ Status inesperado: %s para %s", status_solicitacao, codigo)
+            
+            logger.debug("✅ Status permitido para impressão: %s", status_solicitacao)
+            
+            # Gerar novo ID_SOLICITACAO apenas se status permitir
+            solicitacao['id_solicitacao'] = gerar_id_solicitacao(
+                solicitacao.get('data', data_impressao),
+                solicitacao.get('solicitante', ''),
+                solicitacao.get('codigo', ''),
+                solicitacao.get('quantidade', 0)
+            )
+            logger.debug("🆕 Gerando novo ID: %s", solicitacao['id_solicitacao'])
+            
+            logger.debug("🔍 Processando solicitação: %s - %s", solicitacao.get('codigo', ''), solicitacao.get('solicitante', ''))
+            logger.debug("   ID_SOLICITACAO: %s", solicitacao['id_solicitacao'])
+            
+            # SUBSTITUIR ID_SOLICITACAO na aba Solicitações (SEMPRE)
+            if codigo_col is not None and solicitante_col is not None:
+                codigo = solicitacao.get('codigo', '')
+                solicitante = solicitacao.get('solicitante', '')
+                
+                logger.debug("   Buscando na aba Solicitações: Código='%s', Solicitante='%s'", codigo, solicitante)
+                
+                # Buscar linha correspondente na aba Solicitações
+                encontrado = False
+                for i, row in enumerate(solicitacoes_values[1:], start=2):
+                    logger.debug("   Linha %s: %s... (total: %s colunas)", i, row[:3], len(row))
+                    if (len(row) > max(codigo_col, solicitante_col) and
+                        row[codigo_col].strip() == codigo and
+                        row[solicitante_col].strip() == solicitante):
+                        
+                        logger.debug("   ✅ Linha %s encontrada!", i)
+                        # SEMPRE substituir o ID_SOLICITACAO (mesmo se já existir)
+                        atualizacoes_solicitacoes.append({
+                            'range': f'{chr(65 + id_solicitacao_col)}{i}',
+                            'values': [[solicitacao['id_solicitacao']]]
+                        })
+                        logger.debug("🔄 SUBSTITUINDO ID_SOLICITACAO na linha %s: %s", i, solicitacao['id_solicitacao'])
+                        encontrado = True
+                        break
+                
+                if not encontrado:
+                    logger.error("❌ Solicitação não encontrada na aba Solicitações!")
+            else:
+                logger.error("❌ Colunas de busca não encontradas!")
+            
+            # Estrutura correta da aba IMPRESSAO_ITENS
+            item_data = [
+                id_impressao,  # ID_IMPRESSAO (coluna A)
+                solicitacao['id_solicitacao'],  # ID_SOLICITACAO (coluna B)
+                solicitacao.get('data', data_impressao).strftime('%Y-%m-%d %H:%M:%S') if hasattr(solicitacao.get('data'), 'strftime') else str(solicitacao.get('data', '')),  # DATA (coluna C)
+                solicitacao.get('solicitante', ''),  # SOLICITANTE (coluna D)
+                solicitacao.get('codigo', ''),  # CODIGO (coluna E)
+                solicitacao.get('descricao', ''),  # DESCRICAO (coluna F)
+                solicitacao.get('unidade', ''),  # UNIDADE (coluna G)
+                solicitacao.get('quantidade', 0),  # QUANTIDADE (coluna H)
+                solicitacao.get('locacao_matriz', '1 E5 E03/F03'),  # LOCACAO_MATRIZ (coluna I)
+                solicitacao.get('saldo_estoque', 600),  # SALDO_ESTOQUE (coluna J)
+                solicitacao.get('media_mensal', 41),  # MEDIA_MENSAL (coluna K)
+                solicitacao.get('alta_demanda', False),  # ALTA_DEMANDA (coluna L)
+                'Pendente',  # STATUS_ITEM (coluna M)
+                0,  # QTD_SEPARADA (coluna N)
+                '',  # OBSERVACOES_ITEM (coluna O)
+                '',  # DATA_SEPARACAO (coluna P)
+                '',  # SEPARADO_POR (coluna Q)
+                '',  # USUARIO_PROCESSAMENTO (coluna R)
+                data_impressao.strftime('%Y-%m-%d %H:%M:%S'),  # CREATED_AT (coluna S)
+                data_impressao.strftime('%Y-%m-%d %H:%M:%S')   # UPDATED_AT (coluna T)
+            ]
+            
+            logger.debug("📋 Criando item na IMPRESSAO_ITENS:")
+            logger.debug("   ID_Impressao: %s", id_impressao)
+            logger.debug("   ID_Solicitacao: %s", solicitacao['id_solicitacao'])
+            logger.debug("   Codigo: %s", solicitacao.get('codigo', ''))
+            logger.debug("   Solicitante: %s", solicitacao.get('solicitante', ''))
+            logger.debug("   Quantidade: %s", solicitacao.get('quantidade', 0))
+            logger.debug("   Total de colunas: %s", len(item_data))
+            
+            itens_worksheet.append_row(item_data)
+        
+        # Executar atualizações de ID_SOLICITACAO na aba Solicitações
+        if atualizacoes_solicitacoes:
+            logger.info("🔄 Executando %s atualizações de ID_SOLICITACAO...", len(atualizacoes_solicitacoes))
+            solicitacoes_worksheet.batch_update(atualizacoes_solicitacoes)
+            logger.info("✅ %s IDs adicionados na aba Solicitações!", len(atualizacoes_solicitacoes))
+        
+        # Atualizar status das solicitações para "Em Separação" na aba Solicitações
+        logger.info("🔄 Atualizando status das solicitações para 'Em Separação'...")
+        
+        try:
+            # Usar índices das linhas (IDs simples) em vez de IDs complexos
+            ids_para_atualizar = [sol.get('id', '') for sol in solicitacoes_selecionadas if sol.get('id')]
+            
+            if ids_para_atualizar:
+                # Usar atualização otimizada
+                sucesso_status = atualizar_status_rapido(ids_para_atualizar)
+                
+                if sucesso_status:
+                    logger.info("✅ Status atualizado para 'Em Separação' - %s solicitações", len(ids_para_atualizar))
+                else:
+                    logger.warning("⚠️ Erro ao atualizar status das solicitações")
+            else:
+                logger.warning("⚠️ Nenhum ID encontrado para atualizar")
+        except Exception as e:
+            logger.warning("⚠️ Erro ao atualizar status: %s", e)
+            import traceback
+            traceback.print_exc()
+        
+        # Preparar dados do romaneio
+        romaneio_data = {
+            'id_impressao': id_impressao,
+            'data_impressao': data_impressao.strftime('%d/%m/%Y, %H:%M:%S'),
+            'usuario_impressao': usuario,
+            'status': 'Pendente',
+            'total_itens': len(solicitacoes_selecionadas),
+            'observacoes': observacoes
+        }
+        
+        # Preparar dados dos itens
+        itens_data = []
+        for solicitacao in solicitacoes_selecionadas:
+            # Garantir que locacao_matriz e media_mensal sejam extraídos corretamente
+            locacao = solicitacao.get('locacao_matriz', '1 E5 E03/F03')
+            media = solicitacao.get('media_mensal', 41)
+            saldo_estoque = solicitacao.get('saldo_estoque', 600)
+            
+            # Log de debug para verificar dados
+            codigo_item = solicitacao.get('codigo', '')
+            logger.debug("📋 Preparando item para impressão: Código=%s, Localização=%s, Média=%s, Saldo=%s", codigo_item, locacao, media, saldo_estoque)
+            
+            item = {
+                'data': solicitacao.get('data', data_impressao).strftime('%d/%m/%Y') if hasattr(solicitacao.get('data'), 'strftime') else str(solicitacao.get('data', '')),
+                'solicitante': solicitacao.get('solicitante', ''),
+                'codigo': codigo_item,
+                'descricao': solicitacao.get('descricao', ''),
+                'quantidade': solicitacao.get('quantidade', 0),
+                'alta_demanda': getattr(solicitacao, 'alta_demanda', False) if hasattr(solicitacao, 'alta_demanda') else solicitacao.get('alta_demanda', False),
+                'locacao_matriz': locacao if locacao else '1 E5 E03/F03',
+                'saldo_estoque': saldo_estoque if saldo_estoque else 600,
+                'media_mensal': media if media else 41,
+                'qtd_pendente': solicitacao.get('quantidade', 0),
+                'qtd_separada': 0
+            }
+            itens_data.append(item)
+            logger.debug("✅ Item adicionado ao itens_data: Código=%s, Localização=%s, Média=%s", item['codigo'], item['locacao_matriz'], item['media_mensal'])
+        
+        romaneio_data['tipo_romaneio'] = tipo_romaneio
+        
+        # PDF gerado e gravado em segundo plano (NÃO BLOQUEIA), com o motor configurado (PDF_ENGINE)
+        logger.info("🔄 Gerando PDF do romaneio...")
+        iniciar_geracao_pdf(id_impressao, romaneio_data, itens_data)
+        
+        logger.info("✅ Impressão %s criada com %s itens", id_impressao, len(solicitacoes_selecionadas))
+        logger.info("🚀 PDF sendo gerado em background...")
+        return id_impressao
+        
+    except Exception as e:
+        logger.error("❌ Erro ao criar impressão: %s", e)
+        return None
+
+
+def buscar_impressoes_pendentes():
+    """Busca impressões com status Pendente"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        all_values = impressoes_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return []
+        
+        headers = all_values[0]
+        impressoes = []
+        
+        for row in all_values[1:]:
+            if len(row) >= 4 and row[3] == 'Pendente':  # STATUS
+                impressao = {
+                    'id_impressao': row[0],
+                    'data_impressao': row[1],
+                    'usuario_impressao': row[2],
+                    'status': row[3],
+                    'total_itens': int(row[4]) if row[4].isdigit() else 0,
+                    'observacoes': row[5] if len(row) > 5 else ''
+                }
+                impressoes.append(impressao)
+        
+        # Ordenar por ID numérico (mais recente primeiro)
+        impressoes.sort(key=lambda x: int(x['id_impressao'].split('-')[1]) if '-' in x['id_impressao'] else 0, reverse=True)
+        
+        return impressoes
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar impressões pendentes: {e}")
+        return []
+
+
+def buscar_todas_impressoes():
+    """Busca todas as impressões (independente do status)"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        all_values = impressoes_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return []
+        
+        headers = all_values[0]
+        impressoes = []
+        
+        for row in all_values[1:]:
+            if len(row) >= 4:  # Verificar se tem colunas suficientes
+                impressao = {
+                    'id_impressao': row[0],
+                    'data_impressao': row[1],
+                    'usuario_impressao': row[2],
+                    'status': row[3],
+                    'total_itens': int(row[4]) if row[4].isdigit() else 0,
+                    'observacoes': row[5] if len(row) > 5 else ''
+                }
+                impressoes.append(impressao)
+        
+        # Ordenar por ID numérico (mais recente primeiro)
+        impressoes.sort(key=lambda x: int(x['id_impressao'].split('-')[1]) if '-' in x['id_impressao'] else 0, reverse=True)
+        
+        return impressoes
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar todas as impressões: {e}")
+        return []
+
+
+def buscar_impressao_por_id(id_impressao):
+    """Busca impressão específica por ID"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        all_values = impressoes_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return None
+        
+        for row in all_values[1:]:
+            if len(row) >= 1 and row[0] == id_impressao:
+                return {
+                    'id_impressao': row[0],
+                    'data_impressao': row[1],
+                    'usuario_impressao': row[2],
+                    'status': row[3],
+                    'total_itens': int(row[4]) if row[4].isdigit() else 0,
+                    'observacoes': row[5] if len(row) > 5 else '',
+                    'data_processamento': row[6] if len(row) > 6 else '',
+                    'usuario_processamento': row[7] if len(row) > 7 else ''
+                }
+        
+        return None
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar impressão por ID: {e}")
+        return None
+
+
+def buscar_itens_impressao(id_impressao):
+    """Busca itens de uma impressão específica"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        all_values = itens_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return []
+        
+        headers = all_values[0]
+        itens = []
+        
+        for row in all_values[1:]:
+            if len(row) >= 2 and row[0] == id_impressao:  # ID_IMPRESSAO
+                item = {
+                    'id_impressao': row[0],
+                    'id_solicitacao': row[1],
+                    'data_solicitacao': row[2],
+                    'solicitante': row[3],
+                    'codigo': row[4],
+                    'descricao': row[5],
+                    'unidade': row[6],
+                    'quantidade': int(row[7]) if row[7].isdigit() else 0,
+                    'localizacao': row[8],
+                    'saldo_estoque': int(row[9]) if row[9].isdigit() else 0,
+                    'media_consumo': float(row[10]) if row[10].replace('.', '').isdigit() else 0,
+                    'status_item': 'Pendente' if row[12].lower() in ['false', '0', ''] else ('Processado' if row[12].lower() in ['true', '1', 'processado'] else row[12]),
+                    'qtd_separada': int(row[13]) if len(row) > 13 and row[13].isdigit() else 0,
+                    'observacoes_item': row[14] if len(row) > 14 else '',
+                    'data_separacao': row[15] if len(row) > 15 else '',
+                    'separado_por': row[16] if len(row) > 16 else ''
+                }
+                itens.append(item)
+        
+        return itens
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar itens da impressão {id_impressao}: {e}")
+        return []
+
+
+def buscar_status_impressao(id_impressao):
+    """Busca o status de uma impressão na aba IMPRESSOES"""
+    try:
+        print(f"🔍 Buscando status da impressão {id_impressao} na aba IMPRESSOES...")
+        
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        all_values = impressoes_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return {'status': 'Pendente', 'data_criacao': '', 'total_itens': 0}
+        
+        # Buscar a linha da impressão
+        for row in all_values[1:]:
+            if len(row) > 0 and row[0] == id_impressao:  # ID_IMPRESSAO
+                print(f"✅ Impressão {id_impressao} encontrada na aba IMPRESSOES")
+                print(f"📋 Dados da linha: {row[:5]}...")
+                
+                # Extrair dados da impressão
+                status = row[3] if len(row) > 3 else 'Pendente'  # STATUS (coluna D)
+                data_criacao = row[1] if len(row) > 1 else ''  # DATA_IMPRESSAO (coluna B)
+                total_itens = int(row[4]) if len(row) > 4 and row[4].isdigit() else 0  # TOTAL_ITENS (coluna E)
+                data_processamento = row[6] if len(row) > 6 else ''  # DATA_PROCESSAMENTO (coluna G)
+                
+                print(f"📊 Status: {status}, Data Criação: {data_criacao}, Data Processamento: {data_processamento}, Total: {total_itens}")
+                
+                return {
+                    'status': status,
+                    'data_criacao': data_criacao,
+                    'data_processamento': data_processamento,
+                    'total_itens': total_itens
+                }
+        
+        print(f"❌ Impressão {id_impressao} não encontrada na aba IMPRESSOES")
+        return {'status': 'Pendente', 'data_criacao': '', 'data_processamento': '', 'total_itens': 0}
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar status da impressão {id_impressao}: {e}")
+        return {'status': 'Pendente', 'data_criacao': '', 'data_processamento': '', 'total_itens': 0}
+
+
+def atualizar_status_impressao(id_impressao, novo_status, usuario_processamento=None):
+    """Atualiza status de uma impressão"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        all_values = impressoes_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return False
+        
+        # Encontrar a linha da impressão
+        for i, row in enumerate(all_values[1:], start=2):
+            if len(row) >= 1 and row[0] == id_impressao:
+                # Atualizar status
+                impressoes_worksheet.update_cell(i, 4, novo_status)  # STATUS
+                
+                if novo_status == 'Processado' and usuario_processamento:
+                    impressoes_worksheet.update_cell(i, 6, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))  # DATA_PROCESSAMENTO
+                    impressoes_worksheet.update_cell(i, 7, usuario_processamento)  # USUARIO_PROCESSAMENTO
+                
+                impressoes_worksheet.update_cell(i, 10, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))  # UPDATED_AT
+                
+                print(f"✅ Status da impressão {id_impressao} atualizado para {novo_status}")
+                return True
+        
+        print(f"❌ Impressão {id_impressao} não encontrada")
+        return False
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar status da impressão: {e}")
+        return False
+
+
+def verificar_itens_em_impressao_pendente(ids_solicitacoes):
+    """Verifica se algum dos IDs já está em impressão pendente (não processada)"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        # Buscar impressões pendentes (apenas status "Pendente")
+        impressoes_pendentes = buscar_impressoes_pendentes()
+        if not impressoes_pendentes:
+            return []
+        
+        # Buscar todos os itens de impressões pendentes
+        itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        all_values = itens_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return []
+        
+        # IDs das impressões pendentes (apenas status "Pendente")
+        ids_impressoes_pendentes = [imp['id_impressao'] for imp in impressoes_pendentes]
+        
+        # IDs de solicitações já em impressão pendente
+        ids_em_impressao = []
+        
+        for row in all_values[1:]:
+            if len(row) >= 2:
+                id_impressao = row[0]  # ID_IMPRESSAO
+                id_solicitacao = row[1]  # ID_SOLICITACAO
+                
+                # Se está em impressão pendente (não processada) e é um dos IDs selecionados
+                if id_impressao in ids_impressoes_pendentes and id_solicitacao in ids_solicitacoes:
+                    ids_em_impressao.append(id_solicitacao)
+        
+        return ids_em_impressao
+        
+    except Exception as e:
+        print(f"❌ Erro ao verificar itens em impressão pendente: {e}")
+        return []
+
+
+def verificar_itens_em_separacao(ids_solicitacoes):
+    """Verifica quais itens já estão com status 'Em Separação'"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            return []
+        
+        # Acessar a aba "Solicitações"
+        worksheet = sheet.get_worksheet(0)
+        all_values = worksheet.get_all_values()
+        
+        if not all_values or len(all_values) < 2:
+            return []
+        
+        # Encontrar coluna de Status
+        headers = all_values[0]
+        status_col = None
+        
+        for i, header in enumerate(headers):
+            header_lower = header.lower().strip()
+            if 'status' in header_lower and status_col is None:
+                status_col = i
+        
+        if status_col is None:
+            print("❌ Coluna Status não encontrada")
+            return []
+        
+        # Buscar itens com status "Em Separação" usando índice da linha como ID
+        itens_em_separacao = []
+        for row_num, row in enumerate(all_values[1:], start=1):
+            if len(row) > status_col:
+                # Usar índice da linha como ID (row_num)
+                item_id = str(row_num)
+                status = row[status_col].strip() if len(row) > status_col else ''
+                
+                if item_id in ids_solicitacoes and status == 'Em Separação':
+                    itens_em_separacao.append(item_id)
+        
+        return itens_em_separacao
+        
+    except Exception as e:
+        print(f"❌ Erro ao verificar itens em separação: {e}")
+        return []
+
+
+def validar_selecao_impressao(ids_selecionados):
+    """Valida se a seleção pode ser impressa (não há conflitos)"""
+    try:
+        # Verificar se há itens já em impressão pendente
+        ids_em_impressao = verificar_itens_em_impressao_pendente(ids_selecionados)
+        
+        if ids_em_impressao:
+            return {
+                'valido': False,
+                'mensagem': f'Os seguintes itens já estão em impressão pendente e não podem ser reimpressos até serem processados: {", ".join(ids_em_impressao)}',
+                'itens_conflitantes': ids_em_impressao
+            }
+        
+        return {
+            'valido': True,
+            'mensagem': 'Seleção válida para impressão',
+            'itens_conflitantes': []
+        }
+        
+    except Exception as e:
+        print(f"❌ Erro ao validar seleção: {e}")
+        return {
+            'valido': False,
+            'mensagem': f'Erro ao validar seleção: {str(e)}',
+            'itens_conflitantes': []
+        }
+
+
+def atualizar_item_impressao(id_impressao, id_solicitacao, qtd_separada, observacoes=""):
+    """Atualiza item da impressão com quantidade separada"""
+    from flask_login import current_user
+    
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        all_values = itens_worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return False
+        
+        # Encontrar a linha do item
+        for i, row in enumerate(all_values[1:], start=2):
+            if len(row) >= 2 and row[0] == id_impressao and row[1] == id_solicitacao:
+                # Atualizar quantidade separada (coluna 12)
+                itens_worksheet.update_cell(i, 13, qtd_separada)
+                
+                # Atualizar observações (coluna 14)
+                itens_worksheet.update_cell(i, 14, observacoes)
+                
+                # Atualizar status do item
+                if qtd_separada == 0:
+                    status_item = 'Pendente'
+                elif qtd_separada < int(row[7]):  # qtd_separada < quantidade
+                    status_item = 'Parcial'
+                else:
+                    status_item = 'Separado'
+                
+                itens_worksheet.update_cell(i, 12, status_item)
+                
+                # Atualizar data de separação
+                itens_worksheet.update_cell(i, 15, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                
+                # Atualizar quem separou
+                itens_worksheet.update_cell(i, 16, current_user.username)
+                
+                print(f"✅ Item {id_solicitacao} atualizado: {qtd_separada} unidades separadas")
+                return True
+        
+        print(f"❌ Item {id_solicitacao} não encontrado na impressão {id_impressao}")
+        return False
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar item da impressão: {e}")
+        return False
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Registro de rotas e ganchos de um módulo, aplicado ao app pela fábrica
+
+Os módulos de rotas usam @rotas.route(...) como usariam @app.route(...). Diferente de um
+Blueprint, os endpoints mantêm os nomes de sempre (url_for('index'), url_for('login')...).
+"""
+
+
+class Rotas:
+    """Rotas, before_request, context_processor e errorhandler guardados até registrar(app)"""
+
+    def __init__(self):
+        self._registros = []
+
+    def route(self, regra, **opcoes):
+        def decorador(funcao):
+            self._registros.append(lambda app: app.add_url_rule(regra, view_func=funcao, **opcoes))
+            return funcao
+        return decorador
+
+    def before_request(self, funcao):
+        self._registros.append(lambda app: app.before_request(funcao))
+        return funcao
+
+    def context_processor(self, funcao):
+        self._registros.append(lambda app: app.context_processor(funcao))
+        return funcao
+
+    def errorhandler(self, codigo_ou_excecao):
+        def decorador(funcao):
+            self._registros.append(lambda app: app.register_error_handler(codigo_ou_excecao, funcao))
+            return funcao
+        return decorador
+
+    def registrar(self, app):
+        for registro in self._registros:
+            registro(app)
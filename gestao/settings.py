@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Configuração do app a partir das variáveis de ambiente (ver env.example)
+"""
+
+import os
+from datetime import timedelta
+
+
+def configurar(app):
+    """Chaves, sessão, e-mail e banco no app.config (antes do init_app das extensões)"""
+    # Configuração do SECRET_KEY - Usar variável de ambiente no Google Cloud
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+    
+    # Configuração de timeout de sessão - 2 horas de inatividade
+    app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=2)
+    # O cookie é renovado quando a sessão muda: last_activity, uma vez por SESSION_ACTIVITY_BUCKET_SECONDS
+    # (ver gestao.auth.session), em vez de reassinado em toda resposta
+    app.config['SESSION_REFRESH_EACH_REQUEST'] = False
+    
+    # Configuração de e-mail para notificações de erro
+    app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
+    app.config['MAIL_PORT'] = int(os.environ.get('MAIL_PORT', '587'))
+    app.config['MAIL_USE_TLS'] = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
+    app.config['MAIL_USE_SSL'] = os.environ.get('MAIL_USE_SSL', 'false').lower() in ['true', 'on', '1']
+    app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME')
+    app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
+    app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER', app.config.get('MAIL_USERNAME'))
+    # IMPORTANTE: Nunca hardcodar e-mails ou senhas!
+    # Use apenas variáveis de ambiente em produção
+    app.config['ERROR_EMAIL_RECIPIENT'] = os.environ.get('ERROR_EMAIL_RECIPIENT')
+    if not app.config['ERROR_EMAIL_RECIPIENT']:
+        # Apenas para desenvolvimento local - NUNCA em produção!
+        if os.environ.get('FLASK_ENV') != 'production' and not os.environ.get('GAE_ENV'):
+            app.config['ERROR_EMAIL_RECIPIENT'] = 'marcosvinicius.info@gmail.com'
+            print("⚠️  AVISO: ERROR_EMAIL_RECIPIENT não configurado. Usando valor padrão (apenas desenvolvimento)")
+        else:
+            raise ValueError("❌ ERROR_EMAIL_RECIPIENT deve ser configurado via variável de ambiente em produção!")
+    
+    # Configuração do banco de dados
+    # Se estiver no Google Cloud, usar Cloud SQL
+    if os.environ.get('GAE_ENV'):  # Google App Engine
+        db_user = os.environ.get('DB_USER', 'root')
+        db_pass = os.environ.get('DB_PASS', '')
+        db_name = os.environ.get('DB_NAME', 'estoque')
+        cloud_sql_connection_name = os.environ.get('CLOUD_SQL_CONNECTION_NAME')
+        
+        if cloud_sql_connection_name:
+            # Usar Cloud SQL
+            app.config['SQLALCHEMY_DATABASE_URI'] = f'mysql+pymysql://{db_user}:{db_pass}@/{db_name}?unix_socket=/cloudsql/{cloud_sql_connection_name}'
+        else:
+            # Fallback para SQLite no Cloud Storage
+            app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///estoque.db')
+    else:
+        # Desenvolvimento local
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///estoque.db')
+    
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -0,0 +1,5 @@
+"""
+Acesso ao Google Sheets: conexão, leituras com cache e gravações nas abas da planilha
+
+Não importa Flask nem o banco de dados.
+"""
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Conexão com a planilha do Google Sheets (gspread e google-auth importados na primeira conexão)
+"""
+
+import os
+
+from metrics import instrumentar
+from gestao.cache import cached_function
+
+
+_gspread_instrumentado = False
+
+
+def instrumentar_gspread():
+    """Spans sheets.<método> nas classes do gspread (na primeira conexão: o import do gspread fica fora da partida)"""
+    global _gspread_instrumentado
+    if _gspread_instrumentado:
+        return
+    import gspread
+    # Todas as chamadas ao Google Sheets passam por estes métodos (operações sheets.<método>)
+    instrumentar(gspread.Worksheet, [
+        'get_all_values', 'get_all_records', 'get_values', 'get', 'batch_get', 'col_values',
+        'row_values', 'cell', 'acell', 'find', 'findall', 'update', 'update_cell', 'update_cells',
+        'batch_update', 'append_row', 'append_rows', 'insert_row', 'insert_rows', 'delete_rows',
+        'clear', 'batch_clear', 'format'
+    ], 'sheets')
+    instrumentar(gspread.Spreadsheet, ['worksheet', 'worksheets', 'add_worksheet', 'values_batch_get', 'batch_update'],
+                 'sheets')
+    _gspread_instrumentado = True
+
+
+# Função para conectar com Google Sheets
+@cached_function(cache_duration=30, force_refresh_interval=15)  # Cache muito curto para dados críticos
+def get_google_sheets_connection():
+    """Conecta com a planilha do Google Sheets (SHEETS_BACKEND=fake: planilha em memória, ver fake_sheets.py)"""
+    try:
+        if os.environ.get('SHEETS_BACKEND', '').lower() == 'fake':
+            from fake_sheets import obter_planilha_fake
+            return obter_planilha_fake()
+
+        import gspread
+        from google.oauth2.service_account import Credentials
+        instrumentar_gspread()
+        
+        print("🔌 Tentando conectar com Google Sheets...")
+        
+        # Configurar credenciais
+        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+        print("📋 Carregando credenciais...")
+        
+        # Tentar várias formas de carregar credenciais
+        creds = None
+        
+        # Opção 1: Ler de variável de ambiente JSON (Cloud Run)
+        service_account_info = os.environ.get('GOOGLE_SERVICE_ACCOUNT_INFO')
+        if service_account_info:
+            import json
+            print("📋 Carregando credenciais da variável de ambiente...")
+            info = json.loads(service_account_info)
+            creds = Credentials.from_service_account_info(info, scopes=scope)
+            print("✅ Credenciais carregadas da variável de ambiente")
+        
+        # Opção 2: Ler de arquivo local (desenvolvimento)
+        if not creds:
+            credential_file = 'gestaosolicitacao-fe66ad097590.json'
+            if os.path.exists(credential_file):
+                print(f"📋 Carregando credenciais do arquivo: {credential_file}")
+                creds = Credentials.from_service_account_file(credential_file, scopes=scope)
+                print("✅ Credenciais carregadas do arquivo")
+            else:
+                print(f"❌ Arquivo de credenciais não encontrado: {credential_file}")
+                print("❌ Também não encontrou GOOGLE_SERVICE_ACCOUNT_INFO na variável de ambiente")
+                return None
+        
+        if not creds:
+            print("❌ Não foi possível carregar credenciais")
+            return None
+        
+        print("🔐 Autorizando cliente...")
+        client = gspread.authorize(creds)
+        print("✅ Cliente autorizado")
+        
+        # Abrir planilha usando ID diretamente
+        print("📊 Abrindo planilha...")
+        sheet = client.open_by_key('1lh__GpPF_ZyCidLskYDf48aQEwv5Z8P2laelJN9aPuE')
+        print("✅ Planilha aberta com sucesso")
+        
+        # Verificar abas disponíveis
+        worksheets = sheet.worksheets()
+        print(f"📋 Abas disponíveis: {[ws.title for ws in worksheets]}")
+        
+        return sheet
+        
+    except Exception as e:
+        print(f"❌ Erro ao conectar com Google Sheets: {e}")
+        print(f"❌ Tipo do erro: {type(e).__name__}")
+        import traceback
+        traceback.print_exc()
+        return None
@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""
+Leitura das solicitações, da matriz e dos romaneios no Google Sheets
+
+Tudo com cache (gestao.cache). process_google_sheets_data junta as três leituras nas
+solicitações que as telas mostram.
+"""
+
+import logging
+import math
+from datetime import datetime
+
+from logging_config import obter_logger
+from metrics import cronometrar
+from gestao.cache import cached_function
+from gestao.sheets.connection import get_google_sheets_connection
+from gestao.sheets.ids import gerar_id_solicitacao
+
+logger = obter_logger(__name__)
+
+# Data/hora nas abas: o app grava AAAA-MM-DD HH:MM:SS, mas linhas digitadas ou convertidas
+# pelo Sheets (locale pt-BR) ficam em DD/MM/AAAA
+FORMATOS_DATA_PLANILHA = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y, %H:%M:%S',
+                          '%d/%m/%Y %H:%M', '%d/%m/%Y')
+
+
+def converter_data_planilha(valor):
+    """
+    Converte a data/hora de uma célula da planilha em datetime
+
+    Args:
+        valor: Texto da célula (AAAA-MM-DD ou DD/MM/AAAA, com ou sem hora)
+
+    Returns:
+        datetime ou None se não for uma data reconhecida
+    """
+    texto = str(valor or '').strip()
+    for formato in FORMATOS_DATA_PLANILHA:
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+    return None
+
+
+# Função para consultar planilha do Google Sheets em tempo real
+@cached_function(cache_duration=30, force_refresh_interval=15)  # Cache curto para dados que mudam frequentemente
+def get_google_sheets_data():
+    """Consulta dados da planilha do Google Sheets em tempo real usando API"""
+    import pandas as pd
+    
+    try:
+        # Conectar com Google Sheets usando API
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            print("❌ Não foi possível conectar com Google Sheets API")
+            return None
+        
+        # Acessar a primeira aba (índice 0) - Solicitações
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os valores da planilha
+        print("📥 Consultando planilha via API...")
+        all_values = worksheet.get_all_values()
+        
+        if not all_values:
+            print("❌ Planilha está vazia")
+            return None
+        
+        # Converter para DataFrame
+        df = pd.DataFrame(all_values[1:], columns=all_values[0])  # Primeira linha como cabeçalho
+        
+        # Filtrar apenas linhas que têm dados reais (não vazias)
+        df = df.dropna(how='all')  # Remove linhas completamente vazias
+        # Filtrar apenas linhas que têm código E solicitante (dados reais)
+        df = df[
+            df['Código'].notna() & (df['Código'] != '') & 
+            df['Solicitante'].notna() & (df['Solicitante'] != '')
+        ]
+        
+        # Verificar se o DataFrame não está vazio
+        if df.empty:
+            print("❌ Planilha está vazia após filtrar dados válidos")
+            return None
+        
+        print(f"✅ Dados obtidos via API: {len(df)} registros")
+        return df
+        
+    except Exception as e:
+        print(f"❌ Erro ao consultar planilha via API: {e}")
+        return None
+
+
+# Função para buscar dados da matriz diretamente do Google Sheets
+@cached_function(cache_duration=60, force_refresh_interval=30)  # Cache de 60s para matriz (muda menos)
+def get_matriz_data_from_sheets():
+    """Busca dados da aba MATRIZ_IMPORTADA diretamente do Google Sheets"""
+    import gspread
+    import pandas as pd
+    
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            logger.error("❌ Não foi possível conectar com Google Sheets")
+            return {}
+        
+        # Acessar a aba MATRIZ_IMPORTADA (índice 5)
+        try:
+            worksheet = sheet.get_worksheet(5)  # Sexta aba
+        except gspread.WorksheetNotFound:
+            logger.error("❌ Aba 'MATRIZ_IMPORTADA' não encontrada")
+            return {}
+        
+        # Obter todos os valores da planilha
+        all_values = worksheet.get_all_values()
+        
+        if not all_values or len(all_values) < 2:
+            logger.error("❌ Aba MATRIZ_IMPORTADA está vazia")
+            return {}
+        
+        # Converter para DataFrame
+        df = pd.DataFrame(all_values[1:], columns=all_values[0])
+        
+        # Filtrar apenas linhas com dados válidos
+        df = df.dropna(how='all')
+        # Verificar se a coluna COD existe
+        if 'COD' in df.columns:
+            df = df[df['COD'].notna() & (df['COD'] != '')]
+        else:
+            logger.warning("⚠️ Coluna 'COD' não encontrada. Verificando colunas disponíveis...")
+            logger.info("Colunas encontradas: %s", list(df.columns))
+            # Tentar encontrar coluna similar
+            cod_columns = [col for col in df.columns if 'cod' in col.lower()]
+            if cod_columns:
+                cod_col = cod_columns[0]
+                logger.info("Usando coluna '%s' como código", cod_col)
+                df = df[df[cod_col].notna() & (df[cod_col] != '')]
+            else:
+                logger.error("❌ Nenhuma coluna de código encontrada")
+                return {}
+        
+        if df.empty:
+            logger.error("❌ Nenhum dado válido encontrado na aba MATRIZ_IMPORTADA")
+            return {}
+        
+        # Criar dicionário com dados da matriz
+        matriz_data = {}
+        
+        # Usar a coluna de código encontrada
+        cod_col = 'COD' if 'COD' in df.columns else cod_columns[0] if 'cod_columns' in locals() and cod_columns else None
+        
+        if not cod_col:
+            logger.error("❌ Nenhuma coluna de código válida encontrada")
+            return {}
+        
+        for index, row in df.iterrows():
+            try:
+                codigo = str(row.get(cod_col, '')).strip()
+                if not codigo:
+                    continue
+                
+                # Normalizar código (remover espaços extras, manter original e criar versões normalizadas)
+                codigo_original = codigo
+                
+                # Criar objeto com dados da matriz
+                matriz_item = {
+                    'codigo': codigo_original,
+                    'descricao': str(row.get('DESCRICAO COMPLETA', '')).strip() if pd.notna(row.get('DESCRICAO COMPLETA', '')) else '',
+                    'unidade': str(row.get('UNIDADE MEDIDA', '')).strip() if pd.notna(row.get('UNIDADE MEDIDA', '')) else '',
+                    'locacao_matriz': str(row.get('LOCACAO', '')).strip() if pd.notna(row.get('LOCACAO', '')) else '',
+                    'saldo_estoque': 0,
+                    'media_mensal': 0.0
+                }
+                
+                # Processar saldo de estoque
+                try:
+                    saldo_str = str(row.get('SALDO ESTOQUE', '')).strip()
+                    if saldo_str and saldo_str != '':
+                        # Converter vírgula para ponto (formato brasileiro)
+                        saldo_str = saldo_str.replace(',', '.')
+                        matriz_item['saldo_estoque'] = int(float(saldo_str))
+                    else:
+                        matriz_item['saldo_estoque'] = 0
+                except (ValueError, TypeError):
+                    matriz_item['saldo_estoque'] = 0
+                
+                # Processar média mensal
+                try:
+                    media_str = str(row.get('MEDIA MENSAL', '')).strip()
+                    if media_str and media_str != '':
+                        # Converter vírgula para ponto (formato brasileiro)
+                        media_str = media_str.replace(',', '.')
+                        media_original = float(media_str)
+                        # Dividir por 2 e arredondar para cima
+                        matriz_item['media_mensal'] = math.ceil(media_original / 2)
+                    else:
+                        matriz_item['media_mensal'] = 0
+                except (ValueError, TypeError):
+                    matriz_item['media_mensal'] = 0
+                
+                # Adicionar ao dicionário com múltiplas chaves para facilitar busca
+                # Adicionar com código original
+                matriz_data[codigo_original] = matriz_item
+                # Adicionar também com variações normalizadas para facilitar busca
+                codigo_upper = codigo_original.upper()
+                codigo_lower = codigo_original.lower()
+                codigo_sem_espacos = codigo_original.replace(' ', '')
+                codigo_sem_hifen = codigo_original.replace('-', '')
+                
+                if codigo_upper != codigo_original:
+                    matriz_data[codigo_upper] = matriz_item
+                if codigo_lower != codigo_original and codigo_lower != codigo_upper:
+                    matriz_data[codigo_lower] = matriz_item
+                if codigo_sem_espacos != codigo_original:
+                    matriz_data[codigo_sem_espacos] = matriz_item
+                if codigo_sem_hifen != codigo_original:
+                    matriz_data[codigo_sem_hifen] = matriz_item
+                
+            except Exception as e:
+                logger.error("❌ Erro ao processar linha %s: %s", index + 2, e)
+                continue
+        
+        logger.info("✅ %s registros da matriz carregados do Google Sheets!", len(matriz_data))
+        return matriz_data
+        
+    except Exception as e:
+        logger.error("❌ Erro ao buscar dados da aba MATRIZ_IMPORTADA: %s", e)
+        return {}
+
+
+# Função para processar dados da planilha
+def buscar_romaneios_por_id_solicitacao():
+    """Busca o mapeamento ID_SOLICITACAO -> ID_IMPRESSAO (romaneio)"""
+    try:
+        logger.debug("🔍 Iniciando busca de mapeamento de romaneios...")
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            logger.error("❌ Não foi possível conectar com Google Sheets")
+            return {}
+        
+        # Buscar dados da aba IMPRESSAO_ITENS
+        try:
+            itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+            all_itens = itens_worksheet.get_all_values()
+            
+            logger.debug("📋 Total de linhas na IMPRESSAO_ITENS: %s", len(all_itens))
+            if len(all_itens) > 0:
+                logger.debug("📋 Cabeçalho: %s", all_itens[0][:3] if len(all_itens[0]) >= 3 else all_itens[0])
+            
+            # Criar mapeamento: ID_SOLICITACAO -> ID_IMPRESSAO
+            # Coluna A (index 0) = ID_IMPRESSAO, Coluna B (index 1) = ID_SOLICITACAO
+            mapeamento = {}
+            linhas_processadas = 0
+            for i, row in enumerate(all_itens[1:], start=2):  # Pular cabeçalho
+                if len(row) >= 2:
+                    id_impressao = row[0].strip() if row[0] else ''
+                    id_solicitacao = row[1].strip() if row[1] else ''
+                    if id_impressao and id_solicitacao:
+                        mapeamento[id_solicitacao] = id_impressao
+                        linhas_processadas += 1
+                        # Debug: mostrar primeiras 3 linhas
+                        if linhas_processadas <= 3:
+                            logger.debug("   ✅ Linha %s: ID_SOLICITACAO=%s -> ID_IMPRESSAO=%s", i, id_solicitacao, id_impressao)
+            
+            logger.debug("📋 Mapeamento carregado: %s solicitações com romaneio (de %s linhas processadas)", len(mapeamento), len(all_itens)-1)
+            return mapeamento
+        except Exception as e:
+            logger.warning("⚠️ Erro ao buscar mapeamento de romaneios: %s", e)
+            import traceback
+            traceback.print_exc()
+            return {}
+    except Exception as e:
+        logger.warning("⚠️ Erro ao conectar com Google Sheets para buscar romaneios: %s", e)
+        import traceback
+        traceback.print_exc()
+        return {}
+
+
+@cronometrar('pandas.process_google_sheets_data')
+def carregar_dados_solicitacoes():
+    """
+    Dados das telas de solicitações: planilha, matriz e mapeamento de romaneios
+
+    As três leituras são de abas independentes (Solicitações, MATRIZ_IMPORTADA e
+    IMPRESSAO_ITENS) e rodam ao mesmo tempo (fanout.py); planilha e matriz passam pelo cache.
+
+    Returns:
+        tuple: (df ou None, matriz_data, romaneios_map)
+    """
+    from fanout import em_paralelo
+    
+    dados = em_paralelo({
+        'df': get_google_sheets_data,
+        'matriz': get_matriz_data_from_sheets,
+        'romaneios': buscar_romaneios_por_id_solicitacao,
+    })
+    return dados['df'], dados['matriz'] or {}, dados['romaneios']
+
+
+def process_google_sheets_data(df, matriz_data=None, romaneios_map=None):
+    """Processa dados da planilha do Google Sheets"""
+    import pandas as pd
+    
+    debug = logger.isEnabledFor(logging.DEBUG)
+    solicitacoes_list = []
+    
+    # Buscar dados da matriz do Google Sheets (opcional)
+    # Usar matriz_data passada como parâmetro ou buscar (com cache)
+    if matriz_data is None:
+        try:
+            matriz_data = get_matriz_data_from_sheets()
+        except Exception as e:
+            logger.warning("⚠️ Erro ao carregar matriz: %s", e)
+            matriz_data = {}
+    
+    # Buscar mapeamento de romaneios (ID_SOLICITACAO -> ID_IMPRESSAO), se não veio pronto
+    if romaneios_map is None:
+        romaneios_map = buscar_romaneios_por_id_solicitacao()
+    logger.debug("📋 Mapeamento de romaneios obtido: %s registros", len(romaneios_map))
+    if len(romaneios_map) > 0:
+        logger.debug("   Primeiros 3 mapeamentos: %s", dict(list(romaneios_map.items())[:3]))
+    
+    # Debug: Verificar colunas disponíveis
+    logger.debug("📋 Colunas disponíveis no DataFrame: %s", list(df.columns))
+    logger.debug("📋 Total de colunas: %s", len(df.columns))
+    
+    # Tentar encontrar a coluna ID_SOLICITACAO de diferentes formas
+    id_solicitacao_col_name = None
+    if 'ID_SOLICITACAO' in df.columns:
+        id_solicitacao_col_name = 'ID_SOLICITACAO'
+        logger.info("✅ Coluna 'ID_SOLICITACAO' encontrada")
+    elif len(df.columns) > 15:
+        id_solicitacao_col_name = df.columns[15]
+        logger.info("✅ Usando coluna índice 15: '%s'", id_solicitacao_col_name)
+    else:
+        # Procurar por colunas que contenham 'id' e 'solicitacao' no nome
+        for col in df.columns:
+            if 'id' in col.lower() and 'solicitacao' in col.lower():
+                id_solicitacao_col_name = col
+                logger.debug("✅ Coluna encontrada por busca: '%s'", col)
+                break
+        if not id_solicitacao_col_name:
+            logger.warning("⚠️ Coluna ID_SOLICITACAO não encontrada")
+    
+    for index, row in df.iterrows():
+        try:
+            # Criar objeto Solicitacao a partir da planilha
+            solicitacao = type('Solicitacao', (), {})()
+            solicitacao.id = index + 1
+            
+            # Processar data com tratamento de erro
+            # IMPORTANTE: usar dayfirst=True para formato brasileiro DD/MM/YYYY
+            try:
+                if 'Data' in row and pd.notna(row.get('Data', '')) and str(row.get('Data', '')).strip() != '':
+                    data_str = str(row.get('Data', '')).strip()
+                    # Usar dayfirst=True para formato brasileiro DD/MM/YYYY
+                    solicitacao.data = pd.to_datetime(data_str, errors='coerce', dayfirst=True)
+                    # Se a conversão resultou em NaT, usar data atual
+                    if pd.isna(solicitacao.data):
+                        solicitacao.data = datetime.now()
+                else:
+                    solicitacao.data = datetime.now()
+            except Exception as data_error:
+                logger.warning("⚠️ Erro ao processar data na linha %s: %s", index, data_error)
+                solicitacao.data = datetime.now()
+            
+            # Processar campos de texto
+            solicitacao.solicitante = str(row.get('Solicitante', '')).strip() if pd.notna(row.get('Solicitante', '')) else ''
+            solicitacao.codigo = str(row.get('Código', '')).strip() if pd.notna(row.get('Código', '')) else ''
+            solicitacao.descricao = str(row.get('Descrição', '')).strip() if pd.notna(row.get('Descrição', '')) else ''
+            solicitacao.unidade = str(row.get('Unidade', '')).strip() if pd.notna(row.get('Unidade', '')) else ''
+            
+            # Processar quantidade com tratamento de erro
+            try:
+                qtd_str = str(row.get('Quantidade', '')).strip()
+                solicitacao.quantidade = int(qtd_str) if qtd_str and qtd_str != '' else 0
+            except (ValueError, TypeError):
+                solicitacao.quantidade = 0
+            
+            # Processar locação
+            solicitacao.locacao = str(row.get('Locação', '')).strip() if pd.notna(row.get('Locação', '')) and str(row.get('Locação', '')).strip() != '' else None
+            solicitacao.status = str(row.get('Status', '')).strip() if pd.notna(row.get('Status', '')) else ''
+            
+            # Processar quantidade separada da planilha
+            try:
+                qtd_sep_str = str(row.get('Qtd. Separada', '')).strip()
+                solicitacao.qtd_separada = int(qtd_sep_str) if qtd_sep_str and qtd_sep_str != '' else 0
+            except (ValueError, TypeError):
+                solicitacao.qtd_separada = 0
+            
+            # Processar ID_SOLICITACAO
+            id_solicitacao = ''
+            if id_solicitacao_col_name:
+                try:
+                    valor = row.get(id_solicitacao_col_name, '')
+                    if pd.notna(valor) and str(valor).strip():
+                        id_solicitacao = str(valor).strip()
+                except Exception as e:
+                    logger.warning("⚠️ Erro ao ler ID_SOLICITACAO na linha %s: %s", index, e)
+            
+            solicitacao.id_solicitacao = id_solicitacao if id_solicitacao else ''
+            
+            # Buscar romaneio associado (se houver ID_SOLICITACAO)
+            solicitacao.id_romaneio = None
+            if id_solicitacao and id_solicitacao.strip():
+                if id_solicitacao in romaneios_map:
+                    solicitacao.id_romaneio = romaneios_map[id_solicitacao]
+                    if debug and index < 3:  # Debug apenas para as primeiras 3 linhas
+                        logger.debug("   ✅ Linha %s: ID_SOLICITACAO='%s' -> Romaneio=%s", index, id_solicitacao, solicitacao.id_romaneio)
+                elif debug and index < 3:  # Debug: mostrar quando não encontrou
+                    logger.debug("   ⚠️ Linha %s: ID_SOLICITACAO='%s' não encontrado no mapeamento", index, id_solicitacao)
+            elif debug and index < 3 and solicitacao.status == 'Em Separação':
+                logger.debug("   ⚠️ Linha %s: Status 'Em Separação' mas sem ID_SOLICITACAO", index)
+            
+            # Processar Alta Demanda
+            try:
+                alta_demanda_str = str(row.get('Alta Demanda', '')).strip().lower()
+                solicitacao.alta_demanda = alta_demanda_str in ['sim', 's', 'yes', 'y', 'true', '1']
+            except (ValueError, TypeError):
+                solicitacao.alta_demanda = False
+            
+            # Calcular saldo baseado na quantidade solicitada e separada (nunca menor que 0)
+            solicitacao.saldo = max(0, solicitacao.quantidade - solicitacao.qtd_separada)
+            
+            # Inicializar atributos necessários para o template
+            solicitacao.saldo_estoque = 0
+            solicitacao.locacao_matriz = None
+            solicitacao.media_mensal = 0
+            
+            # Enriquecer com dados da matriz do Google Sheets
+            if matriz_data and solicitacao.codigo in matriz_data:
+                matriz_item = matriz_data[solicitacao.codigo]
+                solicitacao.saldo_estoque = matriz_item['saldo_estoque']
+                solicitacao.locacao_matriz = matriz_item['locacao_matriz']
+                solicitacao.media_mensal = matriz_item['media_mensal']
+            
+            solicitacoes_list.append(solicitacao)
+            
+        except Exception as e:
+            logger.debug("Erro ao processar linha %s: %s", index, e)
+            continue
+    
+    return solicitacoes_list
+
+
+# Nomes aceitos para a aba de solicitações (planilhas antigas usam variações)
+NOMES_ABA_SOLICITACOES = ("Solicitações", "SOLICITAÇÕES", "Solicitacoes", "SOLICITACOES")
+
+
+@cached_function(cache_duration=15, force_refresh_interval=10)  # Cache muito curto para solicitações ativas
+def buscar_solicitacoes_ativas(limite=None, offset=0):
+    """Busca apenas solicitações com status ativo (Aberto, Em Separação) - OTIMIZADO COM PAGINAÇÃO"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            return None, None
+        
+        # Buscar aba de solicitações ativas
+        solicitacoes_worksheet = None
+        possible_names = ["Solicitações", "SOLICITAÇÕES", "Solicitacoes", "SOLICITACOES"]
+        
+        for name in possible_names:
+            try:
+                solicitacoes_worksheet = sheet.worksheet(name)
+                break
+            except:
+                continue
+        
+        if not solicitacoes_worksheet:
+            return None, None
+        
+        # OTIMIZAÇÃO: Buscar apenas linhas necessárias com paginação
+        if limite:
+            # Usar range específico para paginação
+            start_row = offset + 2  # +2 porque a primeira linha é cabeçalho e começamos do 1
+            end_row = start_row + limite - 1
+            range_name = f"A{start_row}:Z{end_row}"
+            print(f"📄 Buscando range: {range_name}")
+            all_values = solicitacoes_worksheet.get(range_name)
+            # Adicionar cabeçalho
+            header = solicitacoes_worksheet.get('A1:Z1')[0] if solicitacoes_worksheet.get('A1:Z1') else []
+            all_values = [header] + all_values if header else all_values
+        else:
+            # Buscar todas as linhas (comportamento original)
+            all_values = solicitacoes_worksheet.get_all_values()
+        
+        if not all_values or len(all_values) < 2:
+            return [], all_values[0] if all_values else []
+        
+        header = all_values[0]
+        status_col = None
+        id_solicitacao_col = None
+        
+        # Encontrar colunas necessárias
+        for i, col_name in enumerate(header):
+            col_name_clean = col_name.strip()
+            if col_name_clean == 'Status':
+                status_col = i
+        
+        # ID_SOLICITACAO está na coluna P (índice 15)
+        id_solicitacao_col = 15
+        
+        if status_col is None:
+            print("⚠️ Coluna Status não encontrada, retornando todas as solicitações")
+            return all_values[1:], header
+        
+        # Filtrar apenas status ativos - OTIMIZAÇÃO: usar list comprehension
+        # IMPORTANTE: "Parcial" NÃO é "Em Separação", são status diferentes
+        solicitacoes_ativas = [
+            row for row in all_values[1:] 
+            if len(row) > status_col and row[status_col].strip() in ['Aberto', 'Parcial', 'Em Separação']
+        ]
+        
+        print(f"📊 Encontradas {len(solicitacoes_ativas)} solicitações ativas (de {len(all_values)-1} total)")
+        print(f"📍 Coluna ID_SOLICITACAO: {id_solicitacao_col}")
+        return solicitacoes_ativas, header
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar solicitações ativas: {e}")
+        return None, None
+
+
+def buscar_solicitacoes_selecionadas(ids_selecionados):
+    """Busca dados das solicitações selecionadas do Google Sheets - VERSÃO OTIMIZADA"""
+    import pandas as pd
+    
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        logger.debug("🔍 Buscando %s solicitações selecionadas...", len(ids_selecionados))
+        
+        # Usar dados já carregados em cache para melhor performance
+        df = get_google_sheets_data()
+        if df is None or df.empty:
+            raise Exception("Não foi possível carregar dados da planilha")
+        
+        # Carregar dados da matriz (opcional)
+        try:
+            matriz_data = get_matriz_data_from_sheets()
+        except Exception as e:
+            logger.warning("⚠️ Erro ao carregar matriz: %s", e)
+            matriz_data = {}
+        
+        # Converter IDs para string para comparação
+        ids_selecionados_str = [str(id) for id in ids_selecionados]
+        logger.debug("📋 IDs procurados: %s", ids_selecionados_str)
+        
+        # Buscar apenas as linhas que contêm os IDs selecionados
+        solicitacoes_encontradas = []
+        
+        for index, row in df.iterrows():
+            # Verificar se o ID da linha (índice + 1) está na lista de selecionados
+            row_id = str(index + 1)
+            if row_id in ids_selecionados_str:
+                if debug:
+                    logger.debug("✅ Encontrada linha %s para processamento", row_id)
+                try:
+                    # Processar data
+                    data_str = str(row.get('Data', '')) if pd.notna(row.get('Data', '')) else ''
+                    try:
+                        if data_str:
+                            data_obj = pd.to_datetime(data_str, errors='coerce')
+                            if pd.isna(data_obj):
+                                data_obj = datetime.now()
+                        else:
+                            data_obj = datetime.now()
+                    except:
+                        data_obj = datetime.now()
+                    
+                    # Gerar ID único para a solicitação
+                    try:
+                        qtd_str = str(row.get('Quantidade', '')).strip()
+                        qtd = int(float(qtd_str)) if qtd_str and qtd_str != '' else 0
+                    except (ValueError, TypeError):
+                        qtd = 0
+                    
+                    # Gerar ID único incluindo o índice da linha para garantir unicidade
+                    id_solicitacao = gerar_id_solicitacao(
+                        data_obj,
+                        str(row.get('Solicitante', '')),
+                        str(row.get('Código', '')),
+                        qtd,
+                        timestamp=f"{datetime.now().strftime('%H%M%S%f')[:-3]}_{index}"  # Incluir índice da linha
+                    )
+                    
+                    # Extrair dados da linha
+                    solicitacao = {
+                        'id': row_id,  # ID da linha selecionada
+                        'id_solicitacao': id_solicitacao,
+                        'data': data_obj,
+                        'solicitante': str(row.get('Solicitante', '')),
+                        'codigo': str(row.get('Código', '')),
+                        'descricao': str(row.get('Descrição', '')),
+                        'unidade': str(row.get('Unidade', '')),
+                        'quantidade': qtd,
+                        'status': str(row.get('Status', '')),
+                        'qtd_separada': 0,  # Será calculado depois
+                        'saldo': str(row.get('Saldo', '')),
+                        'locacao_matriz': '1 E5 E03/F03',  # Valor padrão
+                        'saldo_estoque': 600,  # Valor padrão
+                        'media_mensal': 41  # Valor padrão
+                    }
+                    
+                    # Enriquecer com dados da matriz
+                    codigo_limpo = str(solicitacao['codigo']).strip()
+                    if matriz_data and codigo_limpo in matriz_data:
+                        matriz_item = matriz_data[codigo_limpo]
+                        solicitacao['saldo_estoque'] = matriz_item['saldo_estoque']
+                        solicitacao['locacao_matriz'] = matriz_item['locacao_matriz'] if matriz_item.get('locacao_matriz') else '1 E5 E03/F03'
+                        solicitacao['media_mensal'] = matriz_item['media_mensal'] if matriz_item.get('media_mensal') else 41
+                        if debug:
+                            logger.debug("   ✅ Dados da matriz carregados para código %s: Localização=%s, Média=%s", codigo_limpo, solicitacao['locacao_matriz'], solicitacao['media_mensal'])
+                    else:
+                        if debug:
+                            logger.debug("   ⚠️ Código %s NÃO encontrado na matriz. Usando valores padrão: Localização=%s, Média=%s", codigo_limpo, solicitacao['locacao_matriz'], solicitacao['media_mensal'])
+                        # Tentar buscar com diferentes variações do código
+                        codigo_variacoes = [
+                            codigo_limpo.upper(),
+                            codigo_limpo.lower(),
+                            codigo_limpo,
+                            codigo_limpo.replace(' ', ''),
+                            codigo_limpo.replace('-', ''),
+                        ]
+                        encontrado = False
+                        for cod_var in codigo_variacoes:
+                            if matriz_data and cod_var in matriz_data:
+                                matriz_item = matriz_data[cod_var]
+                                solicitacao['saldo_estoque'] = matriz_item['saldo_estoque']
+                                solicitacao['locacao_matriz'] = matriz_item['locacao_matriz'] if matriz_item.get('locacao_matriz') else '1 E5 E03/F03'
+                                solicitacao['media_mensal'] = matriz_item['media_mensal'] if matriz_item.get('media_mensal') else 41
+                                if debug:
+                                    logger.debug("   ✅ Dados da matriz encontrados com variação '%s': Localização=%s, Média=%s", cod_var, solicitacao['locacao_matriz'], solicitacao['media_mensal'])
+                                encontrado = True
+                                break
+                        if not encontrado:
+                            if debug:
+                                logger.debug("   ⚠️ Nenhuma variação do código %s encontrada na matriz", codigo_limpo)
+                    
+                    solicitacoes_encontradas.append(solicitacao)
+                    if debug:
+                        logger.debug("   ✅ Encontrada solicitação ID %s -> %s: %s - %s | Loc: %s | Média: %s", row_id, id_solicitacao, solicitacao['solicitante'], solicitacao['codigo'], solicitacao['locacao_matriz'], solicitacao['media_mensal'])
+                
+                except Exception as e:
+                    logger.warning("   ⚠️ Erro ao processar linha %s: %s", index + 1, e)
+                    continue
+        
+        logger.debug("📝 %s solicitações encontradas no Google Sheets", len(solicitacoes_encontradas))
+        return solicitacoes_encontradas
+        
+    except Exception as e:
+        logger.error("❌ Erro ao buscar solicitações no Google Sheets: %s", e)
+        return []
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+IDs de solicitações e de romaneios (impressões)
+"""
+
+import hashlib
+from datetime import datetime
+
+from gestao.sheets.connection import get_google_sheets_connection
+
+
+def gerar_id_solicitacao(data, solicitante, codigo, quantidade, timestamp=None):
+    """Gera ID único para solicitação baseado em seus dados principais"""
+    if timestamp is None:
+        # Usar microssegundos para garantir unicidade
+        now = datetime.now()
+        timestamp = now.strftime('%H%M%S%f')[:-3]  # Incluir milissegundos
+    
+    # Limpar e normalizar nome do solicitante
+    solicitante_clean = str(solicitante).strip().upper().replace(' ', '_')[:10]  # Máximo 10 caracteres
+    
+    # Criar string única combinando todos os campos + timestamp completo
+    dados_combinados = f"{data}_{solicitante}_{codigo}_{quantidade}_{timestamp}_{datetime.now().microsecond}"
+    
+    # Gerar hash MD5 e pegar primeiros 8 caracteres
+    hash_obj = hashlib.md5(dados_combinados.encode())
+    hash_hex = hash_obj.hexdigest()[:8].upper()
+    
+    # Formato: SOL_YYYYMMDD_HHMMSSMMM_SOLICITANTE_XXXX (incluindo solicitante)
+    data_str = data.strftime('%Y%m%d') if isinstance(data, datetime) else str(data)[:10].replace('-', '')
+    return f"SOL_{data_str}_{timestamp}_{solicitante_clean}_{hash_hex}"
+
+
+def gerar_id_impressao(usuario, timestamp=None):
+    """Gera ID único para impressão (formato numérico simples)"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        all_values = impressoes_worksheet.get_all_values()
+        
+        # Encontrar o próximo número sequencial
+        proximo_numero = 1
+        
+        if len(all_values) > 1:  # Se há dados além do cabeçalho
+            # Buscar o maior número existente
+            numeros_existentes = []
+            for row in all_values[1:]:
+                if len(row) > 0 and row[0].startswith('ROM-'):
+                    try:
+                        # Extrair número do formato ROM-000001
+                        numero_str = row[0].split('-')[1]
+                        numero = int(numero_str)
+                        numeros_existentes.append(numero)
+                    except (ValueError, IndexError):
+                        continue
+            
+            if numeros_existentes:
+                proximo_numero = max(numeros_existentes) + 1
+        
+        # Formato: ROM-000001, ROM-000002, etc.
+        return f"ROM-{proximo_numero:06d}"
+        
+    except Exception as e:
+        print(f"❌ Erro ao gerar ID de impressão: {e}")
+        # Fallback para formato antigo se houver erro
+        if timestamp is None:
+            timestamp = datetime.now()
+        data_str = timestamp.strftime('%Y%m%d_%H%M%S')
+        hash_hex = hashlib.md5(f"{usuario}_{timestamp}".encode()).hexdigest()[:6].upper()
+        return f"IMP_{data_str}_{hash_hex}"
@@ -0,0 +1,742 @@
+#!/usr/bin/env python3
+"""
+Gravação de status e quantidades das solicitações na aba Solicitações
+"""
+
+from logging_config import obter_logger
+from gestao.cache import cache_manager
+from gestao.sheets.connection import get_google_sheets_connection
+
+logger = obter_logger(__name__)
+
+
+def atualizar_status_rapido(ids_solicitacoes):
+    """Atualiza status para 'Em Separação' de forma otimizada"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            return False
+        
+        # Acessar a aba "Solicitações"
+        worksheet = sheet.get_worksheet(0)
+        
+        # Encontrar coluna de status
+        headers = worksheet.row_values(1)
+        status_col = None
+        
+        for i, header in enumerate(headers):
+            if 'status' in header.lower().strip():
+                status_col = i
+                break
+        
+        if status_col is None:
+            return False
+        
+        # Preparar atualizações em lote
+        updates = []
+        
+        # Atualizar apenas as linhas necessárias
+        for row_id in ids_solicitacoes:
+            if row_id.isdigit():
+                row_num = int(row_id) + 1  # +1 porque a planilha começa em 1
+                status_cell = f"{chr(65 + status_col)}{row_num}"
+                updates.append({
+                    'range': status_cell,
+                    'values': [['Em Separação']]
+                })
+        
+        if updates:
+            # Executar todas as atualizações de uma vez
+            worksheet.batch_update(updates)
+            
+            # OTIMIZAÇÃO: Invalidar cache após atualização de status
+            print("🔄 Invalidando cache após atualização de status...")
+            cache_manager.invalidate_sheets_data()
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro na atualização rápida: {e}")
+        return False
+
+
+def atualizar_status_para_em_separacao_por_id(ids_solicitacoes):
+    """Atualiza status para 'Em Separação' usando IDs únicos das solicitações"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            print("❌ Não foi possível conectar com Google Sheets")
+            return False
+        
+        # Acessar a aba "Solicitações"
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os dados uma única vez
+        all_values = worksheet.get_all_values()
+        if not all_values or len(all_values) < 2:
+            print("❌ Planilha está vazia")
+            return False
+        
+        # Encontrar coluna de status
+        headers = all_values[0]
+        status_col = None
+        
+        for i, header in enumerate(headers):
+            header_lower = header.lower().strip()
+            if 'status' in header_lower and status_col is None:
+                status_col = i
+        
+        if status_col is None:
+            print(f"❌ Coluna Status não encontrada")
+            return False
+        
+        # Usar índice da linha como ID (não há coluna ID na planilha)
+        print(f"📍 Usando índice da linha como ID, Status na coluna: {status_col}")
+        
+        print(f"📊 Atualizando status para {len(ids_solicitacoes)} IDs únicos...")
+        
+        # Preparar atualizações em lote
+        updates = []
+        ids_encontrados = set()
+        
+        # Buscar linhas que precisam ser atualizadas
+        for row_num, row in enumerate(all_values[1:], start=2):
+            if len(row) > status_col:
+                # Usar índice da linha como ID
+                item_id = str(row_num - 1)  # row_num - 1 porque começamos em start=2
+                status_atual = row[status_col].strip() if len(row) > status_col else ''
+                
+                # Verificar se este ID está na lista e pode ser atualizado
+                if item_id in ids_solicitacoes and status_atual not in ['Concluído', 'Excedido', 'Em Separação']:
+                    status_cell_address = f"{chr(65 + status_col)}{row_num}"
+                    updates.append({
+                        'range': status_cell_address,
+                        'values': [['Em Separação']]
+                    })
+                    ids_encontrados.add(item_id)
+                    print(f"   ✅ ID {item_id} será atualizado (linha {row_num}) - Status atual: '{status_atual}'")
+                elif item_id in ids_solicitacoes:
+                    print(f"   ⚠️ ID {item_id} já tem status '{status_atual}' - não será atualizado")
+        
+        # Executar atualizações em lote se houver alguma
+        if updates:
+            try:
+                worksheet.batch_update(updates)
+                print(f"✅ {len(updates)} status atualizados com sucesso!")
+                return True
+            except Exception as e:
+                print(f"❌ Erro ao executar atualizações em lote: {e}")
+                return False
+        else:
+            print("⚠️ Nenhuma linha encontrada para atualizar")
+            return True
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar status: {e}")
+        return False
+
+
+def atualizar_solicitacao_apos_separacao(id_solicitacao, qtd_separada):
+    """Atualiza status da solicitação na aba Solicitações após separação"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        worksheet = sheet.get_worksheet(0)  # Aba Solicitações
+        all_values = worksheet.get_all_values()
+        
+        if len(all_values) < 2:
+            return False
+        
+        # Encontrar a linha da solicitação
+        for i, row in enumerate(all_values[1:], start=2):
+            # Procurar por ID em qualquer célula da linha
+            for cell in row:
+                if cell.strip() == id_solicitacao:
+                    # Encontrar colunas necessárias
+                    headers = all_values[0]
+                    qtd_separada_col = None
+                    status_col = None
+                    
+                    for j, header in enumerate(headers):
+                        if 'qtd. separada' in header.lower() or 'qtd separada' in header.lower():
+                            qtd_separada_col = j
+                        elif 'status' in header.lower():
+                            status_col = j
+                    
+                    # Atualizar quantidade separada
+                    if qtd_separada_col is not None:
+                        worksheet.update_cell(i, qtd_separada_col + 1, qtd_separada)
+                    
+                    # Atualizar status
+                    if status_col is not None:
+                        if qtd_separada == 0:
+                            novo_status = 'Pendente'
+                        elif qtd_separada < int(row[5]) if row[5].isdigit() else 0:  # qtd_separada < quantidade
+                            novo_status = 'Parcial'
+                        else:
+                            novo_status = 'Processada'
+                        
+                        worksheet.update_cell(i, status_col + 1, novo_status)
+                    
+                    print(f"✅ Solicitação {id_solicitacao} atualizada: {qtd_separada} unidades separadas")
+                    return True
+        
+        print(f"❌ Solicitação {id_solicitacao} não encontrada na aba Solicitações")
+        return False
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar solicitação: {e}")
+        return False
+
+
+# Função otimizada para atualizar status
+def atualizar_status_para_em_separacao_otimizada(codigos):
+    """Atualiza status para 'Em Separação' - VERSÃO OTIMIZADA"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            logger.error("❌ Não foi possível conectar com Google Sheets")
+            return False
+        
+        # Acessar a aba "Solicitações"
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os dados uma única vez
+        all_values = worksheet.get_all_values()
+        if not all_values or len(all_values) < 2:
+            logger.error("❌ Planilha está vazia")
+            return False
+        
+        # Encontrar colunas
+        headers = all_values[0]
+        codigo_col = None
+        status_col = None
+        
+        for i, header in enumerate(headers):
+            header_lower = header.lower().strip()
+            if 'código' in header_lower or 'codigo' in header_lower:
+                codigo_col = i
+            elif 'status' in header_lower and status_col is None:
+                status_col = i
+        
+        if codigo_col is None or status_col is None:
+            logger.error("❌ Colunas necessárias não encontradas - Código: %s, Status: %s", codigo_col, status_col)
+            return False
+        
+        logger.debug("📊 Atualizando status para %s códigos...", len(codigos))
+        
+        # Preparar atualizações em lote
+        updates = []
+        codigos_encontrados = set()
+        
+        # Buscar linhas que precisam ser atualizadas
+        for row_num, row in enumerate(all_values[1:], start=2):
+            if len(row) > max(codigo_col, status_col):
+                codigo_atual = str(row[codigo_col]).strip()
+                status_atual = row[status_col].strip() if len(row) > status_col else ''
+                
+                # Verificar se este código está na lista e pode ser atualizado
+                if codigo_atual in codigos and status_atual not in ['Concluído', 'Excedido', 'Em Separação']:
+                    status_cell_address = f"{chr(65 + status_col)}{row_num}"
+                    updates.append({
+                        'range': status_cell_address,
+                        'values': [['Em Separação']]
+                    })
+                    codigos_encontrados.add(codigo_atual)
+                    logger.debug("   ✅ Código %s será atualizado (linha %s) - Status atual: '%s'", codigo_atual, row_num, status_atual)
+                elif codigo_atual in codigos:
+                    logger.debug("   ⚠️ Código %s já tem status '%s' - não será atualizado", codigo_atual, status_atual)
+        
+        # Executar atualizações em lote se houver alguma
+        if updates:
+            try:
+                worksheet.batch_update(updates)
+                logger.info("✅ %s status atualizados com sucesso!", len(updates))
+                return True
+            except Exception as e:
+                logger.error("❌ Erro ao executar atualizações em lote: %s", e)
+                return False
+        else:
+            logger.warning("⚠️ Nenhuma linha encontrada para atualizar")
+            return True
+        
+    except Exception as e:
+        logger.error("❌ Erro ao atualizar status: %s", e)
+        return False
+
+
+# Rota para impressão de solicitações
+def atualizar_status_para_em_separacao(codigos):
+    """Atualiza status para 'Em Separação' quando solicitações são impressas"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            logger.error("❌ Não foi possível conectar com Google Sheets")
+            return False
+        
+        # Acessar a aba "Solicitações"
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os dados
+        all_values = worksheet.get_all_values()
+        if not all_values:
+            logger.error("❌ Planilha está vazia")
+            return False
+        
+        # Encontrar colunas
+        headers = all_values[0]
+        codigo_col = None
+        status_col = None
+        
+        for i, header in enumerate(headers):
+            header_lower = header.lower().strip()
+            if 'código' in header_lower or 'codigo' in header_lower:
+                codigo_col = i
+            elif 'status' in header_lower and status_col is None:
+                status_col = i
+        
+        if codigo_col is None or status_col is None:
+            logger.error("❌ Colunas necessárias não encontradas")
+            return False
+        
+        # Atualizar status para cada código
+        for codigo in codigos:
+            for row_num, row in enumerate(all_values[1:], start=2):
+                if len(row) > codigo_col and str(row[codigo_col]).strip() == str(codigo).strip():
+                    # Verificar se não está já concluído ou excedido
+                    if len(row) > status_col:
+                        status_atual = row[status_col].strip()
+                        if status_atual not in ['Concluído', 'Excedido']:
+                            # Atualizar para "Em Separação"
+                            status_cell_address = f"{chr(65 + status_col)}{row_num}"
+                            worksheet.update(status_cell_address, [['Em Separação']])
+                            logger.debug("✅ Status atualizado para 'Em Separação' - Código %s", codigo)
+                    break
+        
+        return True
+        
+    except Exception as e:
+        logger.error("❌ Erro ao atualizar status para Em Separação: %s", e)
+        return False
+
+
+def atualizar_status_google_sheets_selecionadas(ids_selecionados):
+    """Atualiza status das solicitações selecionadas para 'Em Separação' no Google Sheets"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        # Acessar a aba "Solicitações" (índice 0)
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os dados da planilha
+        all_values = worksheet.get_all_values()
+        
+        if not all_values or len(all_values) < 2:
+            raise Exception("Planilha de solicitações está vazia")
+        
+        # Encontrar as colunas necessárias
+        headers = all_values[0]
+        status_col_index = None
+        id_col_index = None
+        
+        for i, header in enumerate(headers):
+            if 'status' in header.lower():
+                status_col_index = i
+            elif 'id' in header.lower():
+                id_col_index = i
+        
+        if status_col_index is None:
+            raise Exception("Coluna 'Status' não encontrada na planilha")
+        
+        print(f"📊 Coluna de status encontrada no índice {status_col_index}")
+        
+        # Converter IDs para string para comparação
+        ids_selecionados_str = [str(id) for id in ids_selecionados]
+        
+        # Atualizar apenas as linhas com IDs selecionados
+        updates_count = 0
+        statuses_to_change = ['Aberta', 'Pendente', 'Aprovada', 'Parcial', 'Concluida']
+        
+        for row_index, row in enumerate(all_values[1:], start=2):  # Começar da linha 2 (pular cabeçalho)
+            try:
+                # Verificar se a linha tem dados suficientes
+                if len(row) <= status_col_index:
+                    continue
+                
+                # Procurar por ID na linha (pode estar em qualquer coluna)
+                row_id = None
+                for cell in row:
+                    if cell.strip() in ids_selecionados_str:
+                        row_id = cell.strip()
+                        break
+                
+                # Se encontrou um ID selecionado
+                if row_id:
+                    current_status = row[status_col_index].strip()
+                    
+                    # Se o status atual pode ser alterado para "Em Separação"
+                    if current_status in statuses_to_change:
+                        # Atualizar a coluna de status
+                        worksheet.update_cell(row_index, status_col_index + 1, 'Em Separação')  # +1 porque update_cell usa índice baseado em 1
+                        updates_count += 1
+                        print(f"   ✅ Linha {row_index}: ID {row_id} - Status '{current_status}' alterado para 'Em Separação'")
+                    else:
+                        print(f"   ⚠️ Linha {row_index}: ID {row_id} - Status '{current_status}' não pode ser alterado")
+                
+            except Exception as e:
+                print(f"   ⚠️ Erro ao processar linha {row_index}: {e}")
+                continue
+        
+        print(f"📝 {updates_count} linhas atualizadas no Google Sheets")
+        return updates_count
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar Google Sheets: {e}")
+        raise e
+
+
+def atualizar_status_google_sheets_impressao():
+    """Atualiza status das solicitações para 'Em Separação' diretamente no Google Sheets após impressão"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        # Acessar a aba "Solicitações" (índice 0)
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os dados da planilha
+        all_values = worksheet.get_all_values()
+        
+        if not all_values or len(all_values) < 2:
+            raise Exception("Planilha de solicitações está vazia")
+        
+        # Encontrar as colunas necessárias
+        headers = all_values[0]
+        status_col_index = None
+        
+        for i, header in enumerate(headers):
+            if 'status' in header.lower():
+                status_col_index = i
+                break
+        
+        if status_col_index is None:
+            raise Exception("Coluna 'Status' não encontrada na planilha")
+        
+        print(f"📊 Coluna de status encontrada no índice {status_col_index}")
+        
+        # Atualizar todas as linhas que não estão em "Em Separação" ou "Falta"
+        updates_count = 0
+        statuses_to_change = ['Aberta', 'Pendente', 'Aprovada', 'Parcial', 'Concluida']
+        
+        for row_index, row in enumerate(all_values[1:], start=2):  # Começar da linha 2 (pular cabeçalho)
+            try:
+                # Verificar se a linha tem dados suficientes
+                if len(row) <= status_col_index:
+                    continue
+                
+                current_status = row[status_col_index].strip()
+                
+                # Se o status atual pode ser alterado para "Em Separação"
+                if current_status in statuses_to_change:
+                    # Atualizar a coluna de status
+                    worksheet.update_cell(row_index, status_col_index + 1, 'Em Separação')  # +1 porque update_cell usa índice baseado em 1
+                    updates_count += 1
+                    print(f"   ✅ Linha {row_index}: Status '{current_status}' alterado para 'Em Separação'")
+                
+            except Exception as e:
+                print(f"   ⚠️ Erro ao processar linha {row_index}: {e}")
+                continue
+        
+        print(f"📝 {updates_count} linhas atualizadas no Google Sheets")
+        return updates_count
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar Google Sheets: {e}")
+        raise e
+
+
+def atualizar_status_google_sheets(solicitacoes_alteradas):
+    """Atualiza status das solicitações no Google Sheets"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        # Acessar a aba "Solicitações" (índice 0)
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os dados da planilha
+        all_values = worksheet.get_all_values()
+        
+        if not all_values or len(all_values) < 2:
+            raise Exception("Planilha de solicitações está vazia")
+        
+        # Encontrar as colunas necessárias
+        headers = all_values[0]
+        status_col_index = None
+        data_col_index = None
+        solicitante_col_index = None
+        codigo_col_index = None
+        
+        for i, header in enumerate(headers):
+            if 'status' in header.lower():
+                status_col_index = i
+            elif 'data' in header.lower():
+                data_col_index = i
+            elif 'solicitante' in header.lower():
+                solicitante_col_index = i
+            elif 'código' in header.lower() or 'codigo' in header.lower():
+                codigo_col_index = i
+        
+        if status_col_index is None:
+            raise Exception("Coluna 'Status' não encontrada na planilha")
+        
+        print(f"📊 Colunas encontradas - Status: {status_col_index}, Data: {data_col_index}, Solicitante: {solicitante_col_index}, Código: {codigo_col_index}")
+        
+        # Criar dicionário para mapear solicitações por chave única (data + solicitante + codigo)
+        solicitacoes_map = {}
+        for s in solicitacoes_alteradas:
+            # Criar chave única baseada em data, solicitante e código
+            key = f"{s['data']}_{s['solicitante']}_{s['codigo']}"
+            solicitacoes_map[key] = s
+        
+        print(f"🔍 Procurando {len(solicitacoes_map)} solicitações na planilha...")
+        
+        # Atualizar cada linha na planilha
+        updates_count = 0
+        for row_index, row in enumerate(all_values[1:], start=2):  # Começar da linha 2 (pular cabeçalho)
+            try:
+                # Extrair dados da linha
+                if len(row) <= max(status_col_index, data_col_index or 0, solicitante_col_index or 0, codigo_col_index or 0):
+                    continue
+                
+                row_data = row[data_col_index] if data_col_index is not None else ''
+                row_solicitante = row[solicitante_col_index] if solicitante_col_index is not None else ''
+                row_codigo = row[codigo_col_index] if codigo_col_index is not None else ''
+                
+                # Formatar data para comparação (assumindo formato DD/MM/YYYY)
+                if row_data and '/' in row_data:
+                    # Extrair apenas a data (remover hora se houver)
+                    data_parte = row_data.split(' ')[0]
+                    # Converter para formato de comparação
+                    try:
+                        from datetime import datetime
+                        dt = datetime.strptime(data_parte, '%d/%m/%Y')
+                        data_formatada = dt.strftime('%d/%m/%Y')
+                    except:
+                        data_formatada = data_parte
+                else:
+                    data_formatada = row_data
+                
+                # Criar chave para comparação
+                row_key = f"{data_formatada}_{row_solicitante}_{row_codigo}"
+                
+                # Verificar se esta linha corresponde a uma solicitação alterada
+                if row_key in solicitacoes_map:
+                    # Atualizar a coluna de status
+                    worksheet.update_cell(row_index, status_col_index + 1, 'Em Separação')  # +1 porque update_cell usa índice baseado em 1
+                    updates_count += 1
+                    print(f"   ✅ Linha {row_index}: {row_solicitante} - {row_codigo} atualizado para 'Em Separação'")
+                
+            except Exception as e:
+                print(f"   ⚠️ Erro ao processar linha {row_index}: {e}")
+                continue
+        
+        print(f"📝 {updates_count} linhas atualizadas no Google Sheets")
+        return updates_count
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar Google Sheets: {e}")
+        raise e
+
+
+# Funcionalidade de baixa em lote
+def update_quantidade_separada_na_planilha(codigo, quantidade_nova):
+    """Atualiza a quantidade separada na planilha do Google Sheets"""
+    try:
+        # Conectar com Google Sheets
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            print("❌ Não foi possível conectar com Google Sheets")
+            return False
+        
+        # Acessar a aba "Solicitações"
+        worksheet = sheet.get_worksheet(0)
+        
+        # Obter todos os dados
+        all_values = worksheet.get_all_values()
+        if not all_values:
+            print("❌ Planilha está vazia")
+            return False
+        
+        # Encontrar o cabeçalho
+        headers = all_values[0]
+        print(f"📋 Cabeçalhos encontrados: {headers}")
+        
+        # Procurar colunas relevantes
+        codigo_col = None
+        qtd_separada_col = None
+        status_col = None
+        quantidade_col = None
+        saldo_col = None
+        
+        for i, header in enumerate(headers):
+            header_lower = header.lower().strip()
+            print(f"🔍 Verificando cabeçalho {i}: '{header}' (lower: '{header_lower}')")
+            
+            if 'código' in header_lower or 'codigo' in header_lower:
+                codigo_col = i
+                print(f"✅ Encontrada coluna Código na posição {i}")
+            elif 'qtd' in header_lower and 'separada' in header_lower:
+                qtd_separada_col = i
+                print(f"✅ Encontrada coluna Qtd. Separada na posição {i}")
+            elif 'status' in header_lower and status_col is None:  # Pegar apenas a primeira coluna Status
+                status_col = i
+                print(f"✅ Encontrada coluna Status na posição {i}")
+            elif 'quantidade' in header_lower:
+                quantidade_col = i
+                print(f"✅ Encontrada coluna Quantidade na posição {i}")
+            elif 'saldo' in header_lower:
+                saldo_col = i
+                print(f"✅ Encontrada coluna Saldo na posição {i}")
+        
+        print(f"📍 Resumo das colunas encontradas:")
+        print(f"   - Código: {codigo_col}")
+        print(f"   - Qtd. Separada: {qtd_separada_col}")
+        print(f"   - Status: {status_col}")
+        print(f"   - Quantidade: {quantidade_col}")
+        print(f"   - Saldo: {saldo_col}")
+        
+        if codigo_col is None:
+            print("❌ Coluna 'Código' não encontrada")
+            return False
+        
+        if qtd_separada_col is None:
+            print("❌ Coluna 'Qtd. Separada' não encontrada")
+            print("📋 Criando coluna 'Qtd. Separada'...")
+            # Adicionar nova coluna
+            worksheet.add_cols(1)
+            headers.append('Qtd. Separada')
+            qtd_separada_col = len(headers) - 1
+            # Atualizar cabeçalho
+            worksheet.update('A1', [headers])
+        
+        if saldo_col is None:
+            print("❌ Coluna 'Saldo' não encontrada")
+            print("📋 Criando coluna 'Saldo'...")
+            # Adicionar nova coluna
+            worksheet.add_cols(1)
+            headers.append('Saldo')
+            saldo_col = len(headers) - 1
+            # Atualizar cabeçalho
+            worksheet.update('A1', [headers])
+        
+        print(f"📍 Coluna Código: {codigo_col}, Coluna Qtd. Separada: {qtd_separada_col}")
+        
+        # Procurar a linha com o código
+        for row_num, row in enumerate(all_values[1:], start=2):  # Começar da linha 2 (pular cabeçalho)
+            if len(row) > codigo_col and str(row[codigo_col]).strip() == str(codigo).strip():
+                print(f"✅ Encontrada linha {row_num} com código {codigo}")
+                
+                # Obter quantidade atual separada
+                qtd_atual = 0
+                if len(row) > qtd_separada_col and row[qtd_separada_col].strip():
+                    try:
+                        qtd_atual = int(row[qtd_separada_col])
+                    except (ValueError, TypeError):
+                        qtd_atual = 0
+                
+                # Calcular nova quantidade
+                qtd_nova = qtd_atual + quantidade_nova
+                
+                # Obter quantidade solicitada para calcular status e saldo
+                qtd_solicitada = 0
+                if quantidade_col is not None and len(row) > quantidade_col and row[quantidade_col].strip():
+                    try:
+                        qtd_solicitada = int(row[quantidade_col])
+                    except (ValueError, TypeError):
+                        qtd_solicitada = 0
+                
+                # Calcular novo saldo: Quantidade Solicitada - Qtd. Separada (nunca menor que 0)
+                novo_saldo = max(0, qtd_solicitada - qtd_nova)
+                print(f"💰 Cálculo do saldo: {qtd_solicitada} (solicitada) - {qtd_nova} (separada) = {novo_saldo} (mínimo 0)")
+                
+                # Determinar novo status baseado na lógica de negócio
+                novo_status = ""
+                
+                if qtd_nova >= qtd_solicitada and qtd_solicitada > 0:
+                    if qtd_nova > qtd_solicitada:
+                        novo_status = "Excedido"
+                    else:
+                        novo_status = "Concluído"
+                elif qtd_nova > 0:
+                    # Qualquer quantidade separada > 0 e < solicitada = Parcial
+                    novo_status = "Parcial"
+                else:
+                    # Nenhuma quantidade separada = Aberta
+                    novo_status = "Aberta"
+                
+                print(f"📊 Lógica de status:")
+                print(f"   - Quantidade solicitada: {qtd_solicitada}")
+                print(f"   - Quantidade separada: {qtd_nova}")
+                print(f"   - Status calculado: {novo_status}")
+                
+                # Atualizar a célula da quantidade separada
+                qtd_cell_address = f"{chr(65 + qtd_separada_col)}{row_num}"
+                print(f"📝 Atualizando célula {qtd_cell_address} com valor {qtd_nova}")
+                try:
+                    worksheet.update(qtd_cell_address, [[qtd_nova]])
+                    print(f"✅ Quantidade separada atualizada com sucesso na célula {qtd_cell_address}")
+                except Exception as e:
+                    print(f"❌ Erro ao atualizar quantidade separada: {e}")
+                
+                # Atualizar a célula do status se a coluna existir
+                if status_col is not None and novo_status:
+                    status_cell_address = f"{chr(65 + status_col)}{row_num}"
+                    print(f"📝 Atualizando status {status_cell_address} para '{novo_status}'")
+                    try:
+                        worksheet.update(status_cell_address, [[novo_status]])
+                        print(f"✅ Status atualizado com sucesso na célula {status_cell_address}")
+                    except Exception as e:
+                        print(f"❌ Erro ao atualizar status: {e}")
+                else:
+                    if status_col is None:
+                        print("❌ Coluna Status não encontrada - não é possível atualizar status")
+                    if not novo_status:
+                        print("❌ Novo status vazio - não é possível atualizar")
+                
+                # Atualizar a célula do saldo se a coluna existir
+                if saldo_col is not None:
+                    saldo_cell_address = f"{chr(65 + saldo_col)}{row_num}"
+                    print(f"📝 Atualizando saldo {saldo_cell_address} para '{novo_saldo}'")
+                    try:
+                        worksheet.update(saldo_cell_address, [[novo_saldo]])
+                        print(f"✅ Saldo atualizado com sucesso na célula {saldo_cell_address}")
+                    except Exception as e:
+                        print(f"❌ Erro ao atualizar saldo: {e}")
+                else:
+                    print("❌ Coluna Saldo não encontrada - não é possível atualizar saldo")
+                
+                print(f"✅ Quantidade separada atualizada: {qtd_atual} + {quantidade_nova} = {qtd_nova}")
+                print(f"✅ Status atualizado para: {novo_status}")
+                print(f"✅ Saldo atualizado para: {novo_saldo}")
+                return True
+        
+        print(f"❌ Código {codigo} não encontrado na planilha")
+        return False
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar planilha: {e}")
+        return False
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Abas de controle da planilha (IMPRESSOES, IMPRESSAO_ITENS, REALIZAR_BAIXA) e suas colunas
+"""
+
+from logging_config import obter_logger
+from gestao.sheets.connection import get_google_sheets_connection
+
+logger = obter_logger(__name__)
+
+
+def criar_aba_impressoes():
+    """Cria a aba IMPRESSOES no Google Sheets se não existir"""
+    import gspread
+    
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        # Verificar se a aba já existe
+        try:
+            worksheet = sheet.worksheet("IMPRESSOES")
+            print("✅ Aba IMPRESSOES já existe")
+            return worksheet
+        except gspread.WorksheetNotFound:
+            pass
+        
+        # Criar nova aba
+        worksheet = sheet.add_worksheet(title="IMPRESSOES", rows=1000, cols=20)
+        
+        # Definir cabeçalhos
+        headers = [
+            "ID_IMPRESSAO", "DATA_IMPRESSAO", "USUARIO_IMPRESSAO", "STATUS", 
+            "TOTAL_ITENS", "OBSERVACOES", "DATA_PROCESSAMENTO", "USUARIO_PROCESSAMENTO",
+            "CREATED_AT", "UPDATED_AT", "TIPO_ROMANEIO"
+        ]
+        
+        worksheet.append_row(headers)
+        
+        # Formatar cabeçalho
+        worksheet.format('A1:K1', {
+            'backgroundColor': {'red': 0.2, 'green': 0.6, 'blue': 0.8},
+            'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}}
+        })
+        
+        print("✅ Aba IMPRESSOES criada com sucesso!")
+        return worksheet
+        
+    except Exception as e:
+        print(f"❌ Erro ao criar aba IMPRESSOES: {e}")
+        return None
+
+
+def criar_aba_impressao_itens():
+    """Cria a aba IMPRESSAO_ITENS no Google Sheets se não existir"""
+    import gspread
+    
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            raise Exception("Não foi possível conectar com Google Sheets")
+        
+        # Verificar se a aba já existe
+        try:
+            worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+            print("✅ Aba IMPRESSAO_ITENS já existe")
+            return worksheet
+        except gspread.WorksheetNotFound:
+            pass
+        
+        # Criar nova aba
+        worksheet = sheet.add_worksheet(title="IMPRESSAO_ITENS", rows=5000, cols=25)
+        
+        # Definir cabeçalhos
+        headers = [
+            "ID_IMPRESSAO", "ID_SOLICITACAO", "DATA_SOLICITACAO", "SOLICITANTE", 
+            "CODIGO", "DESCRICAO", "UNIDADE", "QUANTIDADE", "LOCALIZACAO",
+            "SALDO_ESTOQUE", "MEDIA_CONSUMO", "STATUS_ITEM", "QTD_SEPARADA",
+            "OBSERVACOES_ITEM", "DATA_SEPARACAO", "SEPARADO_POR", "CREATED_AT", "UPDATED_AT"
+        ]
+        
+        worksheet.append_row(headers)
+        
+        # Formatar cabeçalho
+        worksheet.format('A1:R1', {
+            'backgroundColor': {'red': 0.2, 'green': 0.6, 'blue': 0.8},
+            'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}}
+        })
+        
+        print("✅ Aba IMPRESSAO_ITENS criada com sucesso!")
+        return worksheet
+        
+    except Exception as e:
+        print(f"❌ Erro ao criar aba IMPRESSAO_ITENS: {e}")
+        return None
+
+
+def inicializar_abas_controle():
+    """Inicializa as abas de controle de impressões"""
+    print("🔄 Inicializando abas de controle de impressões...")
+    
+    impressoes_worksheet = criar_aba_impressoes()
+    itens_worksheet = criar_aba_impressao_itens()
+    
+    if impressoes_worksheet and itens_worksheet:
+        print("✅ Abas de controle inicializadas com sucesso!")
+        return True
+    else:
+        print("❌ Erro ao inicializar abas de controle")
+        return False
+
+
+# Coluna K da aba IMPRESSOES (abas criadas antes dela só têm até UPDATED_AT)
+COLUNA_TIPO_ROMANEIO = 10
+
+
+_coluna_tipo_romaneio_verificada = False
+
+
+def garantir_coluna_tipo_romaneio(impressoes_worksheet):
+    """Adiciona o cabeçalho TIPO_ROMANEIO na aba IMPRESSOES se faltar (verifica uma vez por processo)"""
+    global _coluna_tipo_romaneio_verificada
+    if _coluna_tipo_romaneio_verificada:
+        return
+    try:
+        cabecalho = impressoes_worksheet.row_values(1)
+        if len(cabecalho) <= COLUNA_TIPO_ROMANEIO or cabecalho[COLUNA_TIPO_ROMANEIO] != 'TIPO_ROMANEIO':
+            if impressoes_worksheet.col_count <= COLUNA_TIPO_ROMANEIO:
+                impressoes_worksheet.add_cols(COLUNA_TIPO_ROMANEIO + 1 - impressoes_worksheet.col_count)
+            impressoes_worksheet.update_cell(1, COLUNA_TIPO_ROMANEIO + 1, 'TIPO_ROMANEIO')
+            logger.info("✅ Coluna TIPO_ROMANEIO adicionada na aba IMPRESSOES")
+        _coluna_tipo_romaneio_verificada = True
+    except Exception as e:
+        logger.warning("⚠️ Não foi possível verificar a coluna TIPO_ROMANEIO: %s", e)
+
+
+def criar_aba_realizar_baixa():
+    """Cria a aba 'Realizar baixa' com a estrutura especificada"""
+    import gspread
+    
+    try:
+        print("🚀 CRIANDO ABA 'REALIZAR BAIXA'")
+        
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            print("❌ Erro ao conectar com Google Sheets")
+            return False
+        
+        # Verificar se a aba já existe
+        try:
+            existing_worksheet = sheet.worksheet("Realizar baixa")
+            print("⚠️ Aba 'Realizar baixa' já existe")
+            return True
+        except gspread.WorksheetNotFound:
+            print("📋 Aba 'Realizar baixa' não existe, criando...")
+        
+        # Criar nova aba
+        worksheet = sheet.add_worksheet(title="Realizar baixa", rows=1000, cols=20)
+        
+        # Definir cabeçalhos conforme especificado
+        headers = [
+            "Carimbo",           # A - Data/hora da baixa
+            "Cod",               # B - Código do produto
+            "Data",              # C - Data da solicitação
+            "Qtd",               # D - Quantidade separada
+            "Responsavel",       # E - Usuário que processou
+            "Solicitante",       # F - Solicitante
+            "ID_IMPRESSAO"       # G - ID do romaneio para busca
+        ]
+        
+        # Adicionar cabeçalhos
+        worksheet.update('A1:G1', [headers])
+        
+        # Formatar cabeçalhos (negrito)
+        worksheet.format('A1:G1', {
+            'textFormat': {'bold': True},
+            'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
+        })
+        
+        # Ajustar largura das colunas
+        worksheet.format('A:G', {
+            'columnWidth': 120
+        })
+        
+        print("✅ Aba 'Realizar baixa' criada com sucesso!")
+        print(f"📋 Cabeçalhos: {headers}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro ao criar aba 'Realizar baixa': {e}")
+        return False
+
+
+def criar_colunas_impressao_itens():
+    """Cria/verifica as colunas necessárias na aba IMPRESSAO_ITENS"""
+    try:
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            return False
+            
+        impressao_itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        
+        # Definir colunas necessárias na ordem correta
+        colunas_necessarias = [
+            'ID_IMPRESSAO',
+            'ID_SOLICITACAO', 
+            'DATA',
+            'SOLICITANTE',
+            'CODIGO',
+            'DESCRICAO',
+            'UNIDADE',
+            'QUANTIDADE',
+            'LOCACAO_MATRIZ',
+            'SALDO_ESTOQUE',
+            'MEDIA_MENSAL',
+            'ALTA_DEMANDA',
+            'STATUS_ITEM',
+            'QTD_SEPARADA',
+            'OBSERVACOES_ITEM',
+            'DATA_SEPARACAO',
+            'SEPARADO_POR',
+            'USUARIO_PROCESSAMENTO',
+            'CREATED_AT',
+            'UPDATED_AT'
+        ]
+        
+        # Verificar se já existe cabeçalho
+        all_values = impressao_itens_worksheet.get_all_values()
+        
+        if not all_values or len(all_values) == 0:
+            logger.debug("📋 Criando cabeçalho na aba IMPRESSAO_ITENS...")
+            impressao_itens_worksheet.append_row(colunas_necessarias)
+            logger.info("✅ Cabeçalho criado com %s colunas", len(colunas_necessarias))
+            return True
+        
+        # Verificar se cabeçalho está correto
+        header_atual = all_values[0] if all_values else []
+        logger.debug("📍 Cabeçalho atual: %s", header_atual)
+        
+        # Verificar se todas as colunas necessárias existem
+        colunas_faltando = []
+        for coluna in colunas_necessarias:
+            if coluna not in header_atual:
+                colunas_faltando.append(coluna)
+        
+        if colunas_faltando:
+            logger.warning("⚠️ Colunas faltando: %s", colunas_faltando)
+            logger.info("🔄 Adicionando colunas faltantes...")
+            
+            # Adicionar colunas faltantes no final
+            for coluna in colunas_faltando:
+                impressao_itens_worksheet.add_cols(1)
+                # Encontrar a última coluna preenchida
+                ultima_coluna = len(header_atual)
+                impressao_itens_worksheet.update(f'{chr(65 + ultima_coluna)}1', [[coluna]])
+                header_atual.append(coluna)
+                logger.debug("✅ Adicionada coluna: %s", coluna)
+        else:
+            logger.info("✅ Todas as colunas necessárias já existem")
+        
+        return True
+        
+    except Exception as e:
+        logger.error("❌ Erro ao criar colunas IMPRESSAO_ITENS: %s", e)
+        return False
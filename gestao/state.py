@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Estado de execução compartilhado entre threads e workers (ver shared_state.py)
+
+Criado por init_app(app) na fábrica; os módulos leem os atributos na hora do uso
+(state.pdf_generation_status), não no import. Importar este módulo não carrega o banco:
+gestao.romaneio e gestao.pdf continuam leves para quem não cria o app.
+"""
+
+import os
+
+from shared_state import criar_estado_compartilhado
+from gestao.cache import cache_manager
+
+# Estado compartilhado entre threads/workers (memoria ou banco, conforme SHARED_STATE_BACKEND)
+estado_compartilhado = None
+
+# Sistema de status de geração de PDF (id_impressao -> status, progresso, ...)
+pdf_generation_status = None
+
+# Metadados do romaneio recém-criado (id_impressao -> tipo_romaneio, ...). A fonte definitiva é
+# o registro na aba IMPRESSOES (coluna TIPO_ROMANEIO); aqui ficam por ROMANEIO_INFO_TTL_SECONDS
+romaneio_info = None
+
+
+def init_app(app):
+    """Cria o estado do app (o backend banco abre o próprio app_context: vale em threads de fundo)"""
+    global estado_compartilhado, pdf_generation_status, romaneio_info
+    from gestao.extensions import db
+    from gestao.models import EstadoCompartilhado
+    estado_compartilhado = criar_estado_compartilhado(app, db, EstadoCompartilhado)
+    cache_manager.usar_estado_compartilhado(estado_compartilhado)
+    pdf_generation_status = estado_compartilhado.espaco('pdf_status', ttl=6 * 3600)
+    romaneio_info = estado_compartilhado.espaco('romaneio', ttl=int(os.getenv('ROMANEIO_INFO_TTL_SECONDS', '86400')))
@@ -0,0 +1,3 @@
+"""
+Rotas das telas e APIs (registradas no app pela fábrica)
+"""
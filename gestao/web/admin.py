@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Rotas administrativas: cache, métricas, depuração e teste do e-mail de erro
+"""
+
+import hmac
+import os
+
+from flask import flash, jsonify, make_response, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from metrics import registro as registro_metricas
+from gestao import state
+from gestao.cache import cache_manager
+from gestao.models import Solicitacao
+from gestao.routing import Rotas
+from gestao.sheets.connection import get_google_sheets_connection
+from gestao.sheets.data import get_matriz_data_from_sheets
+from gestao.web.pagination import CompleteList
+
+rotas = Rotas()
+
+
+@rotas.route('/testar-email-erro')
+@login_required
+def testar_email_erro():
+    """Rota de teste para simular um erro e verificar o envio de e-mail (apenas desenvolvimento)"""
+    # Verificar se está em produção
+    if os.environ.get('FLASK_ENV') == 'production' or os.environ.get('GAE_ENV'):
+        flash('⚠️ Esta rota está desabilitada em produção por segurança.', 'warning')
+        return redirect(url_for('index'))
+    
+    # Apenas admins podem testar
+    if not current_user.is_admin:
+        flash('❌ Apenas administradores podem testar o sistema de e-mail.', 'error')
+        return redirect(url_for('index'))
+    
+    # Simular um erro com contexto relevante
+    contexto_teste = {
+        'Teste': 'Simulação de erro para verificar sistema de notificação',
+        'Usuario': current_user.username,
+        'Rota Original': '/testar-email-erro'
+    }
+    
+    # Gerar um erro intencional
+    raise Exception("🚨 ERRO DE TESTE: Este é um erro simulado para verificar se o sistema de notificação por e-mail está funcionando corretamente. Se você recebeu este e-mail, significa que o sistema está configurado corretamente!")
+
+
+@rotas.route('/api/limpar-cache')
+@login_required
+def limpar_cache():
+    """Limpa o cache do sistema"""
+    try:
+        cache_manager.clear()
+        state.pdf_generation_status.limpar()
+        return jsonify({
+            'success': True,
+            'message': 'Cache limpo com sucesso'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
+@rotas.route('/api/invalidar-cache-sheets')
+@login_required
+def invalidar_cache_sheets():
+    """Invalida apenas o cache do Google Sheets (mantém outros caches)"""
+    try:
+        cache_manager.invalidate_sheets_data()
+        return jsonify({
+            'success': True,
+            'message': 'Cache do Google Sheets invalidado com sucesso'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
+@rotas.route('/api/forcar-atualizacao')
+@login_required
+def forcar_atualizacao():
+    """Força atualização de todos os dados do Google Sheets"""
+    try:
+        cache_manager.invalidate_sheets_data()
+        # Forçar refresh imediato
+        cache_manager.last_sheets_update.clear()
+        return jsonify({
+            'success': True,
+            'message': 'Atualização forçada - próximas consultas buscarão dados frescos'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
+# Rota de debug para verificar dados da matriz
+@rotas.route('/debug-realizar-baixa')
+@login_required
+def debug_realizar_baixa():
+    """Debug: Verificar dados da aba Realizar baixa"""
+    import gspread
+    
+    try:
+        print("🔍 DEBUG: Verificando dados da aba 'Realizar baixa'...")
+        
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            return "❌ Erro ao conectar com Google Sheets"
+        
+        # Verificar aba Realizar baixa
+        try:
+            worksheet = sheet.worksheet("Realizar baixa")
+            valores = worksheet.get_all_values()
+            
+            print(f"📊 Total de linhas na aba 'Realizar baixa': {len(valores)}")
+            
+            if len(valores) > 0:
+                print(f"📋 Cabeçalhos: {valores[0]}")
+                
+                if len(valores) > 1:
+                    print("📄 Dados encontrados:")
+                    for i, row in enumerate(valores[1:], 1):
+                        print(f"   Linha {i}: {row}")
+                else:
+                    print("⚠️ Apenas cabeçalhos encontrados")
+            else:
+                print("❌ Aba vazia")
+                
+        except gspread.WorksheetNotFound:
+            print("❌ Aba 'Realizar baixa' não existe")
+            return "Aba 'Realizar baixa' não existe"
+        
+        # Verificar aba IMPRESSAO_ITENS para comparação
+        try:
+            impressao_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+            impressao_valores = impressao_worksheet.get_all_values()
+            
+            print(f"\n📊 Total de linhas na aba 'IMPRESSAO_ITENS': {len(impressao_valores)}")
+            
+            if len(impressao_valores) > 0:
+                print(f"📋 Cabeçalhos IMPRESSAO_ITENS: {impressao_valores[0]}")
+                
+                if len(impressao_valores) > 1:
+                    print("📄 Primeiras 3 linhas de dados IMPRESSAO_ITENS:")
+                    for i, row in enumerate(impressao_valores[1:4], 1):
+                        print(f"   Linha {i}: {row[:7]}...")  # Mostrar apenas primeiras 7 colunas
+                        
+        except gspread.WorksheetNotFound:
+            print("❌ Aba 'IMPRESSAO_ITENS' não existe")
+        
+        return f"Debug concluído. Verifique o console. Total de registros na 'Realizar baixa': {len(valores) if 'valores' in locals() else 0}"
+        
+    except Exception as e:
+        print(f"❌ Erro no debug: {e}")
+        return f"Erro: {str(e)}"
+
+
+@rotas.route('/debug-matriz')
+@login_required
+def debug_matriz():
+    """Debug: Verificar dados da matriz do Google Sheets"""
+    print("🔍 DEBUG: Verificando dados da matriz do Google Sheets...")
+    
+    # Buscar dados da matriz do Google Sheets
+    matriz_data = get_matriz_data_from_sheets()
+    
+    print(f"📊 Total de registros na matriz: {len(matriz_data)}")
+    
+    for codigo, item in matriz_data.items():
+        print(f"  - Código: {codigo}, Média: {item['media_mensal']}, Estoque: {item['saldo_estoque']}")
+    
+    # Buscar especificamente o código "1"
+    if "1" in matriz_data:
+        item = matriz_data["1"]
+        print(f"🎯 Código '1' encontrado:")
+        print(f"   - Código: {item['codigo']}")
+        print(f"   - Descrição: {item['descricao']}")
+        print(f"   - Média Mensal: {item['media_mensal']}")
+        print(f"   - Saldo Estoque: {item['saldo_estoque']}")
+        print(f"   - Localização: {item['locacao_matriz']}")
+    else:
+        print("❌ Código '1' NÃO encontrado na matriz")
+    
+    return f"Debug concluído. Verifique o console. Total de registros: {len(matriz_data)}"
+
+
+# Rota de teste para debug
+@rotas.route('/test-solicitacoes')
+@login_required
+def test_solicitacoes():
+    status_filter = request.args.get('status', '')
+    
+    print(f"DEBUG TEST: status_filter recebido: '{status_filter}' (tipo: {type(status_filter)})")
+    
+    query = Solicitacao.query
+    if status_filter:
+        print(f"DEBUG TEST: Aplicando filtro para status: '{status_filter}'")
+        query = query.filter_by(status=status_filter)
+        count_antes = query.count()
+        print(f"DEBUG TEST: Total de registros após filtro: {count_antes}")
+    
+    # Ordenar por data decrescente e buscar todos os registros
+    solicitacoes_list = query.order_by(Solicitacao.data.asc()).all()
+    print(f"DEBUG TEST: Total de registros retornados: {len(solicitacoes_list)}")
+    
+    # Enriquecer com dados da matriz do Google Sheets
+    matriz_data = get_matriz_data_from_sheets()
+    for solicitacao in solicitacoes_list:
+        if matriz_data and solicitacao.codigo in matriz_data:
+            matriz_item = matriz_data[solicitacao.codigo]
+            solicitacao.saldo_estoque = matriz_item['saldo_estoque']
+            solicitacao.locacao_matriz = matriz_item['locacao_matriz']
+            solicitacao.media_mensal = matriz_item['media_mensal']
+        else:
+            solicitacao.saldo_estoque = 0
+            solicitacao.locacao_matriz = None
+            solicitacao.media_mensal = 0
+    
+    
+    solicitacoes = CompleteList(solicitacoes_list)
+    
+    print(f"DEBUG TEST: Enviando para template - total: {solicitacoes.total}, items: {len(solicitacoes.items)}")
+    
+    return render_template('test_solicitacoes.html', 
+                         solicitacoes=solicitacoes, 
+                         status_filter=status_filter)
+
+
+# Rota de debug
+@rotas.route('/debug-solicitacoes')
+@login_required
+def debug_solicitacoes():
+    # Buscar status únicos
+    status_list = [s[0] for s in Solicitacao.query.with_entities(Solicitacao.status).distinct().all()]
+    
+    # Buscar primeiras 10 solicitações
+    solicitacoes = Solicitacao.query.limit(10).all()
+    
+    return render_template('debug_solicitacoes.html', 
+                         status_list=status_list, 
+                         solicitacoes=solicitacoes)
+
+
+@rotas.route('/admin/metrics')
+def admin_metrics():
+    """
+    Métricas de latência no formato texto do Prometheus - APENAS ADMIN
+    
+    Coletores sem sessão podem usar o cabeçalho Authorization: Bearer <METRICS_TOKEN>.
+    Sem METRICS_TOKEN configurado a rota só existe para administradores logados (404 para
+    os demais); com ele, token ausente ou errado recebe 401.
+    """
+    if not (current_user.is_authenticated and current_user.is_admin):
+        esperado = os.environ.get('METRICS_TOKEN', '')
+        if not esperado:
+            return jsonify({'success': False, 'message': 'Não encontrado'}), 404
+        token = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(token.encode(), esperado.encode()):
+            response = jsonify({'success': False, 'message': 'Token de métricas inválido'})
+            response.headers['WWW-Authenticate'] = 'Bearer'
+            return response, 401
+    
+    response = make_response(registro_metricas.exportar())
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
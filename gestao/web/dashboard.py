@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Dashboard (página inicial)
+"""
+
+import logging
+from datetime import date, datetime
+
+from flask import render_template
+from flask_login import login_required
+
+from logging_config import obter_logger
+from gestao.routing import Rotas
+from gestao.sheets.data import carregar_dados_solicitacoes, process_google_sheets_data
+
+logger = obter_logger(__name__)
+
+rotas = Rotas()
+
+
+# Rotas principais
+@rotas.route('/')
+@login_required
+def index():
+    debug = logger.isEnabledFor(logging.DEBUG)
+    try:
+        logger.info("🚀 Iniciando carregamento do dashboard...")
+        
+        # Obter dados das solicitações do Google Sheets usando a MESMA função de processamento
+        # (planilha, matriz e romaneios lidos ao mesmo tempo)
+        logger.debug("📊 Buscando dados das solicitações...")
+        df, matriz_data, romaneios_map = carregar_dados_solicitacoes()
+        
+        if df is None or df.empty:
+            logger.error("❌ Erro: DataFrame é None ou vazio")
+            raise Exception("Não foi possível obter dados das solicitações")
+        
+        logger.info("✅ DataFrame obtido com %s linhas", len(df))
+        logger.debug("📋 Colunas disponíveis: %s", list(df.columns))
+        
+        # Usar a MESMA função de processamento que a rota /solicitacoes usa
+        solicitacoes_list_completa = process_google_sheets_data(df, matriz_data, romaneios_map)
+        
+        # IMPORTANTE: Contar itens em falta ANTES de filtrar
+        itens_em_falta = 0
+        for s in solicitacoes_list_completa:
+            status = str(s.status).strip() if hasattr(s, 'status') and s.status else ''
+            status_lower = status.lower()
+            
+            # Verificar se status é "Falta" (com todas as variações possíveis)
+            if status == 'Falta' or status_lower == 'falta':
+                itens_em_falta += 1
+        
+        logger.warning("⚠️ Itens com status 'Falta': %s", itens_em_falta)
+        
+        # Filtrar automaticamente as concluídas, excesso, faltas e finalizadas (igual à rota /solicitacoes)
+        solicitacoes_list = [s for s in solicitacoes_list_completa if s.status not in ['Concluida', 'Excesso', 'Falta', 'Finalizado']]
+        
+        total_solicitacoes = len(solicitacoes_list)
+        logger.debug("📊 Total de solicitações encontradas (após filtro): %s", total_solicitacoes)
+        
+        if total_solicitacoes == 0:
+            logger.warning("⚠️ ATENÇÃO: Nenhuma solicitação encontrada após filtro!")
+        
+        # Detectar status de forma mais robusta (usando os objetos processados)
+        # IMPORTANTE: Contar tanto quantidade de solicitações quanto quantidade de itens
+        solicitacoes_abertas = 0
+        itens_abertas = 0
+        solicitacoes_parciais = 0
+        itens_parciais = 0
+        solicitacoes_em_separacao = 0
+        itens_em_separacao = 0
+        solicitacoes_concluidas = 0
+        itens_concluidas = 0
+        
+        for i, s in enumerate(solicitacoes_list):
+            status = str(s.status).strip() if hasattr(s, 'status') and s.status else ''
+            status_lower = status.lower()
+            quantidade = int(s.quantidade) if hasattr(s, 'quantidade') and s.quantidade else 0
+            
+            if debug and i < 3:  # Log apenas os primeiros 3 para não poluir
+                logger.debug("🔍 Registro %s - Status: '%s' (original), Qtd: %s", i+1, status, quantidade)
+            
+            # Separar status "Aberto" de "Parcial"
+            if status_lower in ['aberta', 'aberto', 'pendente', 'nova'] or status == '':
+                solicitacoes_abertas += 1
+                itens_abertas += quantidade
+            elif status_lower in ['parcial']:
+                solicitacoes_parciais += 1
+                itens_parciais += quantidade
+                if debug and i < 3:
+                    logger.debug("   ✅ Contada como 'Parcial'")
+            elif status == 'Em Separação' or status_lower in ['em separação', 'em_separacao', 'em separacao', 'separando']:
+                solicitacoes_em_separacao += 1
+                itens_em_separacao += quantidade
+                if debug and i < 3:
+                    logger.debug("   ✅ Contada como 'Em Separação'")
+            # Não contar concluídas aqui porque elas são filtradas (não aparecem em solicitacoes_list)
+        
+        # Contar concluídas e excesso na lista COMPLETA (antes do filtro)
+        for s in solicitacoes_list_completa:
+            status = str(s.status).strip() if hasattr(s, 'status') and s.status else ''
+            status_lower = status.lower()
+            quantidade = int(s.quantidade) if hasattr(s, 'quantidade') and s.quantidade else 0
+            
+            # IMPORTANTE: "Finalizado" também é considerado concluído para cálculo da taxa
+            if status_lower in ['concluida', 'concluído', 'concluido', 'finalizada', 'finalizado', 'entregue', 'concluída', 'excesso']:
+                solicitacoes_concluidas += 1
+                itens_concluidas += quantidade
+        
+        logger.debug("📈 Contagem por status:")
+        logger.debug("   Abertas: %s solicitações (%s itens)", solicitacoes_abertas, itens_abertas)
+        logger.debug("   Parciais: %s solicitações (%s itens)", solicitacoes_parciais, itens_parciais)
+        logger.debug("   Em Separação: %s solicitações (%s itens)", solicitacoes_em_separacao, itens_em_separacao)
+        logger.debug("   Concluídas: %s solicitações (%s itens)", solicitacoes_concluidas, itens_concluidas)
+        
+        # Dados da matriz (já carregados com as solicitações)
+        total_produtos = len(matriz_data) if matriz_data else 0
+        
+        # Calcular solicitações de hoje (data atual)
+        hoje_obj = datetime.now().date()  # Data de hoje sem hora
+        hoje_str = hoje_obj.strftime('%d/%m/%Y')
+        solicitacoes_hoje = 0
+        total_itens_hoje = 0
+        
+        logger.debug("📅 Buscando solicitações de hoje: %s (tipo: %s)", hoje_str, type(hoje_obj))
+        logger.debug("📅 Total de solicitações a verificar: %s", len(solicitacoes_list))
+        
+        for i, s in enumerate(solicitacoes_list):
+            try:
+                data_solicitacao = None
+                
+                # Tentar acessar a data de diferentes formas
+                if hasattr(s, 'data') and s.data is not None:
+                    data_solicitacao = s.data
+                    if debug and i < 5:  # Debug primeiras 5
+                        logger.debug("   📅 Solicitação %s: data encontrada - tipo: %s, valor: %s", i+1, type(data_solicitacao), data_solicitacao)
+                elif hasattr(s, '__dict__') and 'data' in s.__dict__:
+                    data_solicitacao = s.__dict__['data']
+                    if debug and i < 5:
+                        logger.debug("   📅 Solicitação %s: data encontrada no __dict__ - tipo: %s, valor: %s", i+1, type(data_solicitacao), data_solicitacao)
+                
+                if not data_solicitacao:
+                    if debug and i < 5:
+                        logger.debug("   ⚠️ Solicitação %s: SEM DATA", i+1)
+                    continue
+                
+                # Converter para date para comparação
+                data_formatada = None
+                
+                # Se é Timestamp do pandas
+                if hasattr(data_solicitacao, 'date') and hasattr(data_solicitacao, 'to_pydatetime'):
+                    try:
+                        data_formatada = data_solicitacao.to_pydatetime().date()
+                    except:
+                        try:
+                            data_formatada = data_solicitacao.date()
+                        except:
+                            pass
+                # Se já é um objeto datetime
+                elif isinstance(data_solicitacao, datetime):
+                    data_formatada = data_solicitacao.date()
+                # Se é date
+                elif isinstance(data_solicitacao, date):
+                    data_formatada = data_solicitacao
+                # Se é string
+                elif isinstance(data_solicitacao, str) and data_solicitacao.strip():
+                    try:
+                        # Formato DD/MM/YYYY ou DD/MM/YYYY HH:MM
+                        if '/' in data_solicitacao:
+                            data_parte = data_solicitacao.split(' ')[0]  # Remove hora se existir
+                            try:
+                                data_formatada = datetime.strptime(data_parte, '%d/%m/%Y').date()
+                            except:
+                                # Tentar formato DD/MM/YY
+                                try:
+                                    data_formatada = datetime.strptime(data_parte, '%d/%m/%y').date()
+                                except:
+                                    pass
+                        # Formato YYYY-MM-DD
+                        elif '-' in data_solicitacao:
+                            data_parte = data_solicitacao.split(' ')[0]  # Remove hora se existir
+                            data_formatada = datetime.strptime(data_parte, '%Y-%m-%d').date()
+                    except Exception as parse_error:
+                        if debug and i < 3:  # Debug apenas primeiras 3
+                            logger.debug("   ⚠️ Erro ao parsear data '%s': %s", data_solicitacao, parse_error)
+                        continue
+                
+                # Comparar datas
+                if data_formatada:
+                    if debug and i < 5:  # Debug primeiras 5
+                        logger.debug("   📅 Solicitação %s: data_formatada=%s, hoje_obj=%s, são iguais? %s", i+1, data_formatada, hoje_obj, data_formatada == hoje_obj)
+                    
+                    if data_formatada == hoje_obj:
+                        solicitacoes_hoje += 1
+                        quantidade = int(s.quantidade) if hasattr(s, 'quantidade') and s.quantidade else 0
+                        total_itens_hoje += quantidade
+                        logger.debug("   ✅ Solicitação %s é de hoje - Data: %s, Qtd: %s", i+1, data_formatada, quantidade)
+                elif debug and i < 5:
+                    logger.debug("   ⚠️ Solicitação %s: data_formatada é None (não foi possível converter)", i+1)
+                        
+            except Exception as e:
+                if debug and i < 3:  # Debug apenas primeiras 3
+                    logger.debug("   ⚠️ Erro ao processar data da solicitação %s: %s", i+1, e)
+                    if hasattr(s, 'data'):
+                        logger.debug("      Tipo da data: %s, Valor: %s", type(s.data), s.data)
+                continue
+        
+        logger.debug("📅 Solicitações de hoje: %s (%s itens)", solicitacoes_hoje, total_itens_hoje)
+        
+        # Calcular total de itens de todas as solicitações
+        total_itens = sum(int(s.quantidade) if hasattr(s, 'quantidade') and s.quantidade else 0 for s in solicitacoes_list_completa)
+        
+        stats = {
+            'total_solicitacoes': len(solicitacoes_list_completa),  # Total sem filtro
+            'total_itens': total_itens,
+            'solicitacoes_abertas': solicitacoes_abertas,
+            'itens_abertas': itens_abertas,
+            'solicitacoes_parciais': solicitacoes_parciais,
+            'itens_parciais': itens_parciais,
+            'solicitacoes_em_separacao': solicitacoes_em_separacao,
+            'itens_em_separacao': itens_em_separacao,
+            'solicitacoes_concluidas': solicitacoes_concluidas,
+            'itens_concluidas': itens_concluidas,
+            'total_produtos': total_produtos,
+            'solicitacoes_hoje': solicitacoes_hoje,
+            'produtos_baixo_estoque': itens_em_falta,  # Agora conta itens com status "Falta"
+            'total_itens_hoje': total_itens_hoje,
+            'ultima_atualizacao': datetime.now().strftime('%d/%m/%Y %H:%M')
+        }
+        
+        return render_template('index.html', stats=stats)
+        
+    except Exception as e:
+        logger.error("❌ Erro ao carregar dashboard: %s", e)
+        # Fallback com dados básicos
+        stats = {
+            'total_solicitacoes': 0,
+            'total_itens': 0,
+            'solicitacoes_abertas': 0,
+            'itens_abertas': 0,
+            'solicitacoes_parciais': 0,
+            'itens_parciais': 0,
+            'solicitacoes_em_separacao': 0,
+            'itens_em_separacao': 0,
+            'solicitacoes_concluidas': 0,
+            'itens_concluidas': 0,
+            'total_produtos': 0,
+            'solicitacoes_hoje': 0,
+            'produtos_baixo_estoque': 0,  # Agora representa itens em falta
+            'total_itens_hoje': 0,
+            'ultima_atualizacao': datetime.now().strftime('%d/%m/%Y %H:%M')
+        }
+        return render_template('index.html', stats=stats)
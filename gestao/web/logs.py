@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Rotas dos logs: página, exportação CSV e arquivamento
+"""
+
+from datetime import datetime
+
+from flask import flash, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from gestao.extensions import db
+from gestao.logs.activity import consulta_logs, retencao_logs
+from gestao.models import User
+from gestao.routing import Rotas
+
+rotas = Rotas()
+
+
+@rotas.route('/logs')
+@login_required
+def logs():
+    """Página de visualização de logs - APENAS ADMIN"""
+    if not current_user.is_admin:
+        flash('Apenas administradores podem acessar os logs', 'error')
+        return redirect(url_for('index'))
+    
+    # Filtros
+    filtros = {
+        'acao': request.args.get('acao', ''),
+        'entidade': request.args.get('entidade', ''),
+        'usuario': request.args.get('usuario', ''),
+        'status': request.args.get('status', ''),
+        'data_inicio': request.args.get('data_inicio', ''),
+        'data_fim': request.args.get('data_fim', '')
+    }
+    
+    # Paginação por cursor (?antes= / ?depois=): custo constante em qualquer página
+    logs = consulta_logs.pagina(filtros,
+                                antes=request.args.get('antes', ''),
+                                depois=request.args.get('depois', ''),
+                                por_pagina=50)
+    
+    # Estatísticas e opções dos filtros em cache (recalculadas em segundo plano)
+    stats = consulta_logs.estatisticas()
+    usuarios = [nome for (nome,) in db.session.query(User.username).order_by(User.username).all()]
+    
+    return render_template('logs.html', 
+                         logs=logs, 
+                         stats=stats,
+                         usuarios=usuarios,
+                         acao_filter=filtros['acao'],
+                         entidade_filter=filtros['entidade'],
+                         usuario_filter=filtros['usuario'],
+                         status_filter=filtros['status'],
+                         data_inicio=filtros['data_inicio'],
+                         data_fim=filtros['data_fim'])
+
+
+@rotas.route('/logs/export')
+@login_required
+def export_logs():
+    """Exportar logs para CSV - APENAS ADMIN"""
+    if not current_user.is_admin:
+        flash('Apenas administradores podem exportar logs', 'error')
+        return redirect(url_for('index'))
+    
+    from flask import Response, stream_with_context
+    
+    # Aplicar mesmos filtros da página
+    filtros = {
+        'acao': request.args.get('acao', ''),
+        'entidade': request.args.get('entidade', ''),
+        'usuario': request.args.get('usuario', ''),
+        'status': request.args.get('status', ''),
+        'data_inicio': request.args.get('data_inicio', ''),
+        'data_fim': request.args.get('data_fim', '')
+    }
+    # formato=excel: BOM + ';' (abre direto no Excel em português); gzip=1: arquivo .csv.gz
+    excel = request.args.get('formato', '') == 'excel'
+    compactar = request.args.get('gzip', '') == '1'
+    
+    # CSV gerado em partes enquanto é enviado: memória constante no número de logs
+    partes = consulta_logs.exportar_csv(filtros, excel=excel, compactar=compactar)
+    nome_arquivo = f'logs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    if compactar:
+        response = Response(stream_with_context(partes), mimetype='application/gzip')
+        nome_arquivo += '.gz'
+    else:
+        response = Response(stream_with_context(partes), content_type='text/csv; charset=utf-8')
+    response.headers['Content-Disposition'] = f'attachment; filename={nome_arquivo}'
+    
+    return response
+
+
+@rotas.route('/logs/arquivar', methods=['POST'])
+@login_required
+def arquivar_logs_route():
+    """Arquiva os logs vencidos da tabela Log e da aba "Logs" - APENAS ADMIN"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'message': 'Apenas administradores podem arquivar logs'}), 403
+    
+    try:
+        resultado = retencao_logs.executar(planilha=request.args.get('planilha', '1') != '0')
+        return jsonify(resultado), 200 if resultado['success'] else 500
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro: {str(e)}'
+        }), 500
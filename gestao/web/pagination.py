@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Lista completa com a interface de paginação que os templates esperam
+"""
+
+
+
+
+# Classe para compatibilidade com paginação
+class CompleteList:
+    def __init__(self, items):
+        self.items = items
+        self.page = 1
+        self.pages = 1
+        self.per_page = len(items)
+        self.total = len(items)
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __len__(self):
+        return len(self.items)
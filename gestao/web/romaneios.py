@@ -0,0 +1,996 @@
+#!/usr/bin/env python3
+"""
+Rotas dos romaneios: criação, controle, PDF, processamento e reimpressão
+"""
+
+import logging
+import os
+from datetime import datetime
+from functools import partial
+
+from flask import flash, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from logging_config import obter_logger
+from gestao import state
+from gestao.romaneio.processing import (atualizar_imprecao_itens, montar_romaneio_processamento,
+                                        processar_baixa_item, salvar_dados_realizar_baixa)
+from gestao.romaneio.service import (buscar_impressao_por_id, buscar_itens_impressao, buscar_status_impressao,
+                                     buscar_todas_impressoes, criar_impressao, obter_tipo_romaneio,
+                                     validar_selecao_impressao, verificar_itens_em_impressao_pendente,
+                                     verificar_itens_em_separacao)
+from gestao.routing import Rotas
+from gestao.sheets.connection import get_google_sheets_connection
+from gestao.sheets.data import buscar_solicitacoes_selecionadas, converter_data_planilha, NOMES_ABA_SOLICITACOES
+from gestao.sheets.status import atualizar_status_google_sheets_selecionadas
+from gestao.sheets.tabs import criar_aba_realizar_baixa, criar_colunas_impressao_itens
+
+logger = obter_logger(__name__)
+
+rotas = Rotas()
+
+
+@rotas.route('/api/pdf-status/<id_impressao>')
+@login_required
+def verificar_status_pdf(id_impressao):
+    """Verifica o status da geração do PDF"""
+    try:
+        status = state.pdf_generation_status.obter(id_impressao, {
+            'status': 'nao_iniciado',
+            'progresso': 0
+        })
+        
+        return jsonify({
+            'success': True,
+            'status': status
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
+@rotas.route('/formulario-impressao')
+@login_required
+def formulario_impressao():
+    """Exibe formulário de impressão para separação física"""
+    try:
+        # Obter IDs selecionados da query string
+        ids_selecionados = request.args.get('ids', '').split(',')
+        ids_selecionados = [id.strip() for id in ids_selecionados if id.strip()]
+        
+        # Verificar se veio da página de faltas
+        origem = request.args.get('origem', '')
+        tipo_romaneio = 'Itens em Falta' if origem == 'falta' else 'Romaneio de Separação'
+        
+        if not ids_selecionados:
+            flash('Nenhuma solicitação selecionada', 'warning')
+            return redirect(url_for('solicitacoes'))
+        
+        # Validar se a seleção pode ser impressa
+        validacao = validar_selecao_impressao(ids_selecionados)
+        if not validacao['valido']:
+            flash(f'❌ {validacao["mensagem"]}', 'error')
+            return redirect(url_for('solicitacoes'))
+        
+        # Buscar dados das solicitações selecionadas do Google Sheets
+        solicitacoes_selecionadas = buscar_solicitacoes_selecionadas(ids_selecionados)
+        
+        if not solicitacoes_selecionadas:
+            flash('Nenhuma solicitação encontrada', 'error')
+            return redirect(url_for('solicitacoes'))
+        
+        # Criar impressão no sistema de controle
+        id_impressao = criar_impressao(
+            usuario=current_user.username,
+            solicitacoes_selecionadas=solicitacoes_selecionadas,
+            observacoes="",  # Deixar vazio - observações serão preenchidas no processamento
+            tipo_romaneio=tipo_romaneio
+        )
+        
+        if not id_impressao:
+            flash('Erro ao criar controle de impressão', 'error')
+            return redirect(url_for('solicitacoes'))
+        
+        return render_template('formulario_impressao.html', 
+                             solicitacoes=solicitacoes_selecionadas,
+                             ids_selecionados=ids_selecionados,
+                             id_impressao=id_impressao,
+                             tipo_romaneio=tipo_romaneio,
+                             origem=origem)
+        
+    except Exception as e:
+        print(f"❌ Erro ao carregar formulário de impressão: {e}")
+        flash('Erro ao carregar formulário de impressão', 'error')
+        return redirect(url_for('solicitacoes'))
+
+
+@rotas.route('/alterar-status-impressao', methods=['POST'])
+@login_required
+def alterar_status_impressao():
+    """Altera status das solicitações selecionadas para 'Em Separação' após impressão - Apenas Google Sheets"""
+    try:
+        print("🖨️ Alterando status das solicitações selecionadas para 'Em Separação' após impressão...")
+        
+        # Obter dados da requisição
+        data = request.get_json()
+        ids_selecionados = data.get('ids_selecionados', [])
+        
+        if not ids_selecionados:
+            return jsonify({
+                'success': False,
+                'message': 'Nenhuma solicitação selecionada',
+                'count': 0
+            })
+        
+        print(f"📋 IDs selecionados: {ids_selecionados}")
+        
+        # Atualizar apenas as solicitações selecionadas no Google Sheets
+        count = atualizar_status_google_sheets_selecionadas(ids_selecionados)
+        
+        if count == 0:
+            return jsonify({
+                'success': True, 
+                'message': 'Nenhuma solicitação encontrada para alterar status',
+                'count': 0
+            })
+        
+        return jsonify({
+            'success': True,
+            'message': f'{count} solicitações selecionadas alteradas para "Em Separação" no Google Sheets',
+            'count': count
+        })
+        
+    except Exception as e:
+        print(f"❌ Erro ao alterar status das solicitações: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao alterar status: {str(e)}',
+            'count': 0
+        }), 500
+
+
+@rotas.route('/controle-impressoes')
+@login_required
+def controle_impressoes():
+    """Página de controle de impressões"""
+    try:
+        # Obter parâmetros de filtro
+        status_filtro = request.args.get('status', '')
+        usuario_filtro = request.args.get('usuario', '')
+        data_filtro = request.args.get('data', '')
+        id_filtro = request.args.get('id', '')
+        
+        # Buscar todas as impressões (não apenas pendentes)
+        todas_impressoes = buscar_todas_impressoes()
+        
+        # Aplicar filtros
+        impressoes_filtradas = todas_impressoes
+        
+        if status_filtro:
+            impressoes_filtradas = [imp for imp in impressoes_filtradas if imp.get('status', '').lower() == status_filtro.lower()]
+        
+        if usuario_filtro:
+            impressoes_filtradas = [imp for imp in impressoes_filtradas if usuario_filtro.lower() in imp.get('usuario_impressao', '').lower()]
+        
+        if data_filtro:
+            impressoes_filtradas = [imp for imp in impressoes_filtradas if data_filtro in imp.get('data_impressao', '')]
+        
+        if id_filtro:
+            impressoes_filtradas = [imp for imp in impressoes_filtradas if id_filtro.lower() in imp.get('id_impressao', '').lower()]
+        
+        # Adicionar informações sobre PDFs para cada impressão
+        # Otimização: consultar o inventário de PDFs em memória (atualizado a cada upload e
+        # reconciliado com o bucket em segundo plano) em vez de listar o bucket a cada página
+        try:
+            from pdf_storage import obter_armazenamento_pdf
+            armazenamento = obter_armazenamento_pdf()
+            
+            if armazenamento.tipo != 'cloud_storage':
+                # Pasta local / memória: consultar cada PDF é barato
+                for impressao in impressoes_filtradas:
+                    impressao['pdf_info'] = armazenamento.info(impressao.get('id_impressao', ''))
+            else:
+                from pdf_inventory import obter_inventario_pdf
+                from salvar_pdf_gcs import get_gcs_bucket
+            
+                bucket_name = armazenamento.bucket_name
+                inventario = obter_inventario_pdf(bucket_name)
+            
+                # Só a primeira abertura depois que a instância sobe espera a carga inicial do índice
+                if not inventario.aguardar_carga(timeout=int(os.environ.get('PDF_INVENTORY_WAIT_SECONDS', '30'))):
+                    print("⚠️ Inventário de PDFs ainda carregando - exibindo o que já foi indexado")
+            
+                # PDFs gravados por outra instância depois da última reconciliação ainda não estão no índice:
+                # conferir direto no bucket apenas os romaneios recentes que estão faltando
+                # (data ilegível conta como recente: conferir sai mais barato que mostrar sem PDF)
+                if inventario.ultima_reconciliacao:
+                    limite_recentes = datetime.fromtimestamp(inventario.ultima_reconciliacao - 300)
+                    ids_faltando = []
+                    for imp in impressoes_filtradas:
+                        if not imp.get('id_impressao') or inventario.contem(imp['id_impressao']):
+                            continue
+                        data_impressao = converter_data_planilha(imp.get('data_impressao'))
+                        if data_impressao is None or data_impressao >= limite_recentes:
+                            ids_faltando.append(imp['id_impressao'])
+                    if ids_faltando:
+                        bucket = get_gcs_bucket(bucket_name)
+                        if bucket is not None:
+                            inventario.conferir(ids_faltando, bucket)
+            
+                for impressao in impressoes_filtradas:
+                    impressao['pdf_info'] = inventario.info(impressao.get('id_impressao', ''))
+                    
+        except Exception as e:
+            print(f"⚠️ Erro ao verificar PDFs no Cloud Storage: {e}")
+            # Se der erro, apenas marcar como não encontrado
+            for impressao in impressoes_filtradas:
+                impressao['pdf_info'] = {'existe': False}
+        
+        return render_template('controle_impressoes.html', 
+                             impressoes=impressoes_filtradas,
+                             filtros={
+                                 'status': status_filtro,
+                                 'usuario': usuario_filtro,
+                                 'data': data_filtro,
+                                 'id': id_filtro
+                             })
+        
+    except Exception as e:
+        print(f"❌ Erro ao carregar controle de impressões: {e}")
+        flash('Erro ao carregar controle de impressões', 'error')
+        return redirect(url_for('solicitacoes'))
+
+
+@rotas.route('/imprimir-romaneio/<id_impressao>')
+@login_required
+def imprimir_romaneio(id_impressao):
+    """Imprime o PDF salvo do romaneio"""
+    try:
+        from pdf_storage import obter_armazenamento_pdf
+        
+        print(f"🖨️ Buscando PDF do romaneio: {id_impressao}")
+        
+        # Entrega direto do armazenamento configurado (Cloud Storage em partes com ETag/Range,
+        # pasta local ou memória) - original tem prioridade sobre a cópia
+        response = obter_armazenamento_pdf().responder(id_impressao)
+        if response is not None:
+            print(f"✅ PDF encontrado")
+            return response
+        
+        print(f"❌ PDF não encontrado: {id_impressao}")
+        flash(f'PDF do romaneio {id_impressao} não encontrado', 'error')
+        return redirect(url_for('controle_impressoes'))
+            
+    except Exception as e:
+        print(f"❌ Erro ao imprimir romaneio: {e}")
+        import traceback
+        traceback.print_exc()
+        flash('Erro ao abrir PDF do romaneio', 'error')
+        return redirect(url_for('controle_impressoes'))
+
+
+@rotas.route('/processar-romaneio/<id_impressao>')
+@login_required
+def processar_romaneio(id_impressao):
+    """Página para processar um romaneio - preencher quantidades separadas"""
+    try:
+        from fanout import ler_abas
+        
+        print(f"🔄 Processando romaneio: {id_impressao}")
+        
+        # Buscar dados do romaneio
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            flash('Erro ao conectar com Google Sheets', 'error')
+            return redirect(url_for('controle_impressoes'))
+        
+        # As três abas são independentes: lidas ao mesmo tempo (ver fanout.py)
+        abas = ler_abas(sheet, ["IMPRESSOES", "IMPRESSAO_ITENS", NOMES_ABA_SOLICITACOES])
+        
+        if abas[NOMES_ABA_SOLICITACOES[0]] is None:
+            print("❌ Nenhuma aba de solicitações encontrada para processamento")
+            flash('Aba de solicitações não encontrada', 'error')
+            return redirect(url_for('controle_impressoes'))
+        
+        romaneio_data, itens_data = montar_romaneio_processamento(
+            id_impressao, abas["IMPRESSOES"] or [], abas["IMPRESSAO_ITENS"] or [], abas[NOMES_ABA_SOLICITACOES[0]])
+        
+        if not romaneio_data:
+            flash('Romaneio não encontrado', 'error')
+            return redirect(url_for('controle_impressoes'))
+        
+        print(f"✅ Renderizando template com {len(itens_data)} itens")
+        return render_template('processar_romaneio.html', 
+                             romaneio=romaneio_data,
+                             itens=itens_data)
+        
+    except Exception as e:
+        print(f"❌ Erro ao processar romaneio: {e}")
+        flash('Erro ao carregar dados do romaneio', 'error')
+        return redirect(url_for('controle_impressoes'))
+
+
+@rotas.route('/criar-colunas-impressao-itens', methods=['POST'])
+@login_required
+def criar_colunas_impressao_itens_route():
+    """Rota para criar/verificar colunas da aba IMPRESSAO_ITENS"""
+    try:
+        if criar_colunas_impressao_itens():
+            return jsonify({
+                'success': True,
+                'message': 'Colunas da aba IMPRESSAO_ITENS criadas/verificadas com sucesso!'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Erro ao criar/verificar colunas da aba IMPRESSAO_ITENS'
+            }), 500
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro: {str(e)}'
+        }), 500
+
+
+@rotas.route('/criar-aba-realizar-baixa', methods=['POST'])
+@login_required
+def criar_aba_realizar_baixa_route():
+    """Rota para criar a aba 'Realizar baixa'"""
+    try:
+        if criar_aba_realizar_baixa():
+            return jsonify({
+                'success': True,
+                'message': 'Aba "Realizar baixa" criada com sucesso!'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Erro ao criar aba "Realizar baixa"'
+            }), 500
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Erro: {str(e)}'
+        }), 500
+
+
+@rotas.route('/salvar-processamento-romaneio', methods=['POST'])
+@login_required
+def salvar_processamento_romaneio():
+    """Processa romaneio usando arquitetura otimizada"""
+    try:
+        logger.info("🚀 PROCESSAMENTO OTIMIZADO DE ROMANEIO INICIADO!")
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'message': 'Dados JSON não encontrados'}), 400
+        
+        id_romaneio = data.get('id_romaneio')
+        itens_processados = data.get('itens', [])
+        observacoes_gerais = data.get('observacoes_gerais', '')
+        checkbox_data = data.get('checkbox_data', {})
+        
+        logger.info("📦 Processando romaneio %s com %s itens", id_romaneio, len(itens_processados))
+        logger.debug("🔍 Dados do formulário recebidos: %s", itens_processados)
+        logger.info("📝 Observações gerais: '%s'", observacoes_gerais)
+        logger.debug("📋 Dados dos checkboxes: %s", checkbox_data)
+        
+        # Processar checkboxes primeiro
+        if checkbox_data:
+            excluir_items = checkbox_data.get('excluir', [])
+            falta_items = checkbox_data.get('falta', [])
+            
+            logger.info("🗑️ Processando %s itens para EXCLUIR (Finalizado)", len(excluir_items))
+            logger.warning("⚠️ Processando %s itens para FALTA", len(falta_items))
+            
+            # Processar itens para excluir (status = Finalizado)
+            for item_excluir in excluir_items:
+                item_id = item_excluir['id']
+                observacao = item_excluir['observacao']
+                qtd_separada = int(item_excluir.get('qtd_separada', 0))
+                logger.debug("🗑️ Marcando item %s como FINALIZADO - Obs: '%s', Qtd: %s", item_id, observacao, qtd_separada)
+                
+                # Verificar se já existe este item nos itens_processados
+                item_existente = None
+                for item in itens_processados:
+                    if item.get('id_solicitacao') == item_id:
+                        item_existente = item
+                        break
+                
+                if item_existente:
+                    # Atualizar item existente com status especial
+                    item_existente['status_especial'] = 'Finalizado'
+                    item_existente['observacoes'] = observacao
+                else:
+                    # Adicionar aos itens processados com status especial
+                    item_excluir_data = {
+                        'id_solicitacao': item_id,
+                        'qtd_separada': qtd_separada,
+                        'observacoes': observacao,
+                        'excluir': True,
+                        'status_especial': 'Finalizado'
+                    }
+                    itens_processados.append(item_excluir_data)
+            
+            # Processar itens para falta (status = Falta)
+            for item_falta in falta_items:
+                item_id = item_falta['id']
+                observacao = item_falta['observacao']
+                qtd_separada = int(item_falta.get('qtd_separada', 0))
+                logger.warning("⚠️ Marcando item %s como FALTA - Obs: '%s', Qtd: %s", item_id, observacao, qtd_separada)
+                
+                # Verificar se já existe este item nos itens_processados
+                item_existente = None
+                for item in itens_processados:
+                    if item.get('id_solicitacao') == item_id:
+                        item_existente = item
+                        break
+                
+                if item_existente:
+                    # Atualizar item existente com status especial
+                    item_existente['status_especial'] = 'Falta'
+                    if observacao:
+                        item_existente['observacoes'] = observacao
+                else:
+                    # Adicionar aos itens processados com status especial
+                    item_falta_data = {
+                        'id_solicitacao': item_id,
+                        'qtd_separada': qtd_separada,
+                        'observacoes': observacao,
+                        'falta': True,
+                        'status_especial': 'Falta'
+                    }
+                    itens_processados.append(item_falta_data)
+        
+        # 1. Buscar TODAS as solicitações (não apenas ativas) para garantir atualização
+        # IMPORTANTE: Não filtrar por status aqui, pois pode haver itens com status já alterado
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            return jsonify({'success': False, 'message': 'Erro ao conectar com Google Sheets'})
+        
+        # Solicitações, IMPRESSAO_ITENS (passo 2) e IMPRESSOES (passo 5) não dependem umas das
+        # outras: lidas ao mesmo tempo (ver fanout.py). Nada abaixo escreve em IMPRESSOES antes
+        # do passo 5, então a leitura antecipada continua valendo.
+        from fanout import em_paralelo
+        
+        def ler_aba(nome):
+            aba = sheet.worksheet(nome)
+            return aba, aba.get_all_values()
+        
+        abas = em_paralelo({nome: partial(ler_aba, nome) for nome in ("Solicitações", "IMPRESSAO_ITENS", "IMPRESSOES")})
+        solicitacoes_worksheet, solicitacoes_values = abas["Solicitações"]
+        
+        if not solicitacoes_values or len(solicitacoes_values) < 2:
+            return jsonify({'success': False, 'message': 'Planilha de solicitações está vazia'})
+        
+        header = solicitacoes_values[0]
+        solicitacoes_ativas = solicitacoes_values[1:]  # TODAS as solicitações (sem filtro de status)
+        
+        logger.debug("📋 TOTAL de solicitações encontradas: %s", len(solicitacoes_ativas))
+        logger.debug("📋 Header das solicitações: %s", header)
+        
+        # Debug: mostrar algumas linhas das solicitações
+        if solicitacoes_ativas:
+            logger.debug("🔍 Primeiras 3 linhas das solicitações:")
+            for i, row in enumerate(solicitacoes_ativas[:3]):
+                logger.debug("   Linha %s: %s... (total: %s colunas)", i, row[:5], len(row))
+                if len(row) > 15:
+                    logger.debug("      Coluna P (ID_SOLICITACAO): '%s'", row[15])
+                    if len(row) > 9:
+                        logger.debug("      Status: '%s'", row[8] if len(row) > 8 else 'N/A')
+                else:
+                    logger.debug("      ❌ Linha %s tem apenas %s colunas, coluna P não existe", i, len(row))
+        else:
+            logger.error("❌ Nenhuma solicitação encontrada!")
+        
+        # 2. Buscar TODOS os itens do romaneio na IMPRESSAO_ITENS
+        all_itens_romaneio = abas["IMPRESSAO_ITENS"][1]
+        
+        # Encontrar todos os itens deste romaneio
+        itens_romaneio = []
+        for i, row in enumerate(all_itens_romaneio[1:], start=2):  # Pular cabeçalho
+            if len(row) > 0 and row[0] == id_romaneio:  # ID_IMPRESSAO
+                itens_romaneio.append({
+                    'linha': i,
+                    'id_solicitacao': row[1] if len(row) > 1 else '',  # ID_SOLICITACAO
+                    'row_data': row
+                })
+        
+        logger.debug("📋 Encontrados %s itens do romaneio %s na IMPRESSAO_ITENS", len(itens_romaneio), id_romaneio)
+        
+        # 3. Processar TODOS os itens do romaneio (mesmo com quantidade zero)
+        itens_atualizados = []
+        logger.info("🔄 Processando TODOS os %s itens do romaneio...", len(itens_romaneio))
+        
+        for item_romaneio in itens_romaneio:
+            id_solicitacao = item_romaneio['id_solicitacao']
+            
+            # Buscar dados do formulário para este item
+            dados_formulario = None
+            for item_form in itens_processados:
+                if item_form.get('id_solicitacao') == id_solicitacao:
+                    dados_formulario = item_form
+                    break
+            
+            # Se não encontrou no formulário, usar valores padrão
+            if not dados_formulario:
+                qtd_separada = 0
+                observacoes = ''
+                status_especial = None
+                logger.warning("⚠️ Item %s não encontrado no formulário - usando valores padrão (Qtd: 0)", id_solicitacao)
+            else:
+                qtd_separada = int(dados_formulario.get('qtd_separada', 0))
+                observacoes = dados_formulario.get('observacoes', '')
+                status_especial = dados_formulario.get('status_especial')
+                logger.debug("✅ Item %s encontrado no formulário - Qtd: %s, Obs: '%s', Status Especial: %s", id_solicitacao, qtd_separada, observacoes, status_especial)
+            
+            # Processar item (SEMPRE, mesmo com quantidade zero)
+            logger.debug("🔄 Processando item %s com quantidade %s...", id_solicitacao, qtd_separada)
+            resultado = processar_baixa_item(
+                id_solicitacao, qtd_separada, observacoes, 
+                solicitacoes_ativas, header, status_especial
+            )
+            
+            if resultado:
+                itens_atualizados.append(resultado)
+                logger.debug("✅ Item %s processado com sucesso!", id_solicitacao)
+            else:
+                logger.error("❌ Erro ao processar item %s!", id_solicitacao)
+        
+        if not itens_atualizados:
+            return jsonify({'success': False, 'message': 'Nenhum item válido para processar'})
+        
+        # 4. Atualizar planilha de solicitações
+        atualizacoes = []
+        for item in itens_atualizados:
+            col_indices = item['col_indices']
+            row_index = item['row_index']
+            
+            # Converter índices para letras
+            def col_index_to_letter(col_index):
+                result = ""
+                while col_index >= 0:
+                    result = chr(65 + (col_index % 26)) + result
+                    col_index = col_index // 26 - 1
+                return result
+            
+            atualizacoes.extend([
+                {
+                    'range': f'{col_index_to_letter(col_indices["qtd_separada"])}{row_index}',
+                    'values': [[str(item['qtd_separada_total'])]]
+                },
+                {
+                    'range': f'{col_index_to_letter(col_indices["status"])}{row_index}',
+                    'values': [[item['status']]]
+                },
+                {
+                    'range': f'{col_index_to_letter(col_indices["saldo"])}{row_index}',
+                    'values': [[str(item['saldo'])]]
+                }
+            ])
+        
+        # Executar atualizações em lote
+        if atualizacoes:
+            logger.info("🔄 EXECUTANDO %s ATUALIZAÇÕES NA PLANILHA SOLICITAÇÕES:", len(atualizacoes))
+            for atualizacao in atualizacoes:
+                logger.debug("   📍 %s: %s", atualizacao['range'], atualizacao['values'])
+            
+            try:
+                resultado_batch = solicitacoes_worksheet.batch_update(atualizacoes)
+                logger.info("✅ %s atualizações realizadas na planilha Solicitações", len(atualizacoes))
+                logger.debug("📊 Resposta do batch_update: %s", resultado_batch)
+            except Exception as batch_error:
+                logger.error("❌ ERRO AO EXECUTAR batch_update: %s", batch_error)
+                import traceback
+                traceback.print_exc()
+                # Tentar atualizar uma célula de cada vez como fallback
+                logger.info("🔄 Tentando atualizar uma célula por vez (fallback)...")
+                for atualizacao in atualizacoes:
+                    try:
+                        solicitacoes_worksheet.update(atualizacao['range'], atualizacao['values'])
+                        logger.debug("   ✅ Atualizado: %s", atualizacao['range'])
+                    except Exception as cell_error:
+                        logger.debug("   ❌ Erro ao atualizar %s: %s", atualizacao['range'], cell_error)
+        else:
+            logger.warning("⚠️ NENHUMA ATUALIZAÇÃO PREPARADA! Verifique se os itens foram processados corretamente.")
+            logger.debug("   Total de itens atualizados recebidos: %s", len(itens_atualizados))
+        
+        # 5. Atualizar IMPRESSAO_ITENS
+        usuario_atual = current_user.username if current_user.is_authenticated else 'Sistema'
+        logger.info("🔄 Atualizando IMPRESSAO_ITENS com %s itens...", len(itens_processados))
+        resultado_impressao_itens = atualizar_imprecao_itens(id_romaneio, itens_processados, usuario_atual)
+        if resultado_impressao_itens:
+            logger.info("✅ IMPRESSAO_ITENS atualizada com sucesso!")
+        else:
+            logger.error("❌ Erro ao atualizar IMPRESSAO_ITENS!")
+        
+        # 5. Marcar romaneio como processado e atualizar dados de processamento
+        logger.info("🔄 ATUALIZANDO ABA IMPRESSOES...")
+        logger.debug("🔍 Buscando romaneio %s na aba IMPRESSOES...", id_romaneio)
+        
+        impressoes_worksheet, impressoes_values = abas["IMPRESSOES"]
+        
+        logger.debug("📊 Total de linhas na aba IMPRESSOES: %s", len(impressoes_values))
+        logger.debug("📋 Cabeçalho IMPRESSOES: %s", impressoes_values[0] if impressoes_values else 'VAZIO')
+        
+        # Encontrar colunas necessárias
+        header_impressoes = impressoes_values[0] if impressoes_values else []
+        col_indices_impressoes = {}
+        for i, col_name in enumerate(header_impressoes):
+            col_name_clean = col_name.strip()
+            logger.debug("   Coluna %s: '%s'", i, col_name_clean)
+            if col_name_clean == 'STATUS':
+                col_indices_impressoes['status'] = i
+            elif col_name_clean == 'DATA_PROCESSAMENTO':
+                col_indices_impressoes['data_processamento'] = i
+            elif col_name_clean == 'USUARIO_PROCESSAMENTO':
+                col_indices_impressoes['usuario_processamento'] = i
+            elif col_name_clean == 'OBSERVACOES':
+                col_indices_impressoes['observacoes'] = i
+                logger.debug("   ✅ Coluna OBSERVACOES encontrada na posição %s", i)
+        
+        logger.debug("📍 Colunas IMPRESSOES encontradas: %s", col_indices_impressoes)
+        
+        # Se não encontrou a coluna USUARIO_PROCESSAMENTO, criar
+        if 'usuario_processamento' not in col_indices_impressoes:
+            logger.warning("⚠️ Coluna USUARIO_PROCESSAMENTO não encontrada - criando...")
+            impressoes_worksheet.add_cols(1)
+            # Adicionar cabeçalho na nova coluna
+            ultima_coluna = len(header_impressoes)
+            impressoes_worksheet.update(f'{chr(65 + ultima_coluna)}1', [['USUARIO_PROCESSAMENTO']])
+            col_indices_impressoes['usuario_processamento'] = ultima_coluna
+            logger.info("✅ Coluna USUARIO_PROCESSAMENTO criada na posição %s", ultima_coluna)
+        
+        romaneio_encontrado = False
+        for i, row in enumerate(impressoes_values[1:], start=2):
+            if len(row) > 0 and row[0] == id_romaneio:
+                logger.debug("✅ Romaneio %s encontrado na linha %s", id_romaneio, i)
+                romaneio_encontrado = True
+                
+                # Atualizar status
+                if 'status' in col_indices_impressoes:
+                    col_letra = chr(65 + col_indices_impressoes["status"])
+                    impressoes_worksheet.update(f'{col_letra}{i}', [['Processado']])
+                    logger.debug("   📋 Status atualizado para 'Processado' -> %s%s", col_letra, i)
+                else:
+                    logger.debug("   ❌ Coluna 'Status' não encontrada!")
+                
+                # Atualizar data de processamento
+                if 'data_processamento' in col_indices_impressoes:
+                    data_processamento = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    col_letra = chr(65 + col_indices_impressoes["data_processamento"])
+                    impressoes_worksheet.update(f'{col_letra}{i}', [[data_processamento]])
+                    logger.debug("   📅 Data processamento: %s -> %s%s", data_processamento, col_letra, i)
+                else:
+                    logger.debug("   ❌ Coluna 'Data_Processamento' não encontrada!")
+                
+                # Atualizar usuário que processou
+                if 'usuario_processamento' in col_indices_impressoes:
+                    usuario_atual = current_user.username if current_user.is_authenticated else 'Sistema'
+                    col_letra = chr(65 + col_indices_impressoes["usuario_processamento"])
+                    impressoes_worksheet.update(f'{col_letra}{i}', [[usuario_atual]])
+                    logger.debug("   👤 Usuário processamento: %s -> %s%s", usuario_atual, col_letra, i)
+                else:
+                    logger.debug("   ❌ Coluna 'Usuario_Processamento' não encontrada!")
+                
+                # Atualizar observações gerais (sempre, mesmo se vazio)
+                if 'observacoes' in col_indices_impressoes:
+                    col_letra = chr(65 + col_indices_impressoes["observacoes"])
+                    # Sempre atualizar, mesmo se observacoes_gerais estiver vazio
+                    impressoes_worksheet.update(f'{col_letra}{i}', [[observacoes_gerais]])
+                    logger.debug("   📝 Observações gerais: '%s' -> %s%s", observacoes_gerais, col_letra, i)
+                else:
+                    logger.debug("   ⚠️ Coluna OBSERVACOES não encontrada na aba IMPRESSOES!")
+                    logger.debug("   📋 Colunas disponíveis: %s", list(col_indices_impressoes.keys()))
+                
+                logger.debug("✅ Romaneio %s marcado como processado na linha %s", id_romaneio, i)
+                break
+        
+        if not romaneio_encontrado:
+            logger.error("❌ Romaneio %s NÃO encontrado na aba IMPRESSOES!", id_romaneio)
+            logger.debug("   Verificando estrutura da planilha...")
+            logger.debug("   Primeiras 5 linhas da aba IMPRESSOES:")
+            for j, row in enumerate(impressoes_values[:5]):
+                logger.debug("     Linha %s: %s", j, row)
+            logger.debug("   🔍 Procurando por ID: '%s'", id_romaneio)
+            logger.debug("   📋 IDs encontrados nas primeiras linhas:")
+            for j, row in enumerate(impressoes_values[1:6], start=1):
+                if len(row) > 0:
+                    logger.debug("     Linha %s: ID = '%s'", j+1, row[0])
+        
+        # 6. Salvar dados na aba "Realizar baixa" para controle externo
+        logger.info("🔄 SALVANDO DADOS NA ABA 'REALIZAR BAIXA'...")
+        usuario_atual = current_user.username if current_user.is_authenticated else 'Sistema'
+        resultado_realizar_baixa = salvar_dados_realizar_baixa(id_romaneio, itens_processados, usuario_atual)
+        if resultado_realizar_baixa:
+            logger.info("✅ Dados salvos na aba 'Realizar baixa' com sucesso!")
+        else:
+            logger.warning("⚠️ Erro ao salvar dados na aba 'Realizar baixa' (não crítico)")
+        
+        return jsonify({
+            'success': True, 
+            'message': f'Romaneio {id_romaneio} processado com sucesso!',
+            'itens_atualizados': len(itens_atualizados)
+        })
+        
+    except Exception as e:
+        logger.error("❌ Erro no processamento otimizado: %s", e)
+        return jsonify({'success': False, 'message': f'Erro: {str(e)}'})
+
+
+def _responder_copia_romaneio(id_impressao, pdf_copia, data_reimpressao, pdf_engine):
+    """Carimba a data de reimpressão na cópia (em cache ou recém-gerada) e devolve o PDF"""
+    from flask import Response
+    from pdf_cache import aplicar_carimbo_reimpressao
+    
+    try:
+        pdf_content = aplicar_carimbo_reimpressao(pdf_copia, data_reimpressao, engine=pdf_engine)
+    except Exception as e:
+        print(f"⚠️ Erro ao carimbar data de reimpressão (enviando cópia sem a data): {e}")
+        pdf_content = pdf_copia
+    
+    return Response(
+        pdf_content,
+        mimetype='application/pdf',
+        headers={
+            'Content-Disposition': f'inline; filename="{id_impressao}_Copia.pdf"'
+        }
+    )
+
+
+@rotas.route('/reimprimir-romaneio/<id_impressao>')
+@login_required
+def reimprimir_romaneio(id_impressao):
+    """Reimprime um romaneio existente gerando uma cópia com marca d'água"""
+    try:
+        from cloud_config import get_pdf_engine, get_pdf_generator
+        from pdf_cache import obter_cache_pdf, calcular_chave_pdf
+        from datetime import datetime
+        
+        debug = logger.isEnabledFor(logging.DEBUG)
+        logger.debug("🔄 Gerando cópia do romaneio: %s", id_impressao)
+        
+        # Data e hora da reimpressão: carimbada por cima da cópia, que é a mesma em toda reimpressão
+        data_reimpressao = datetime.now().strftime('%d/%m/%Y, %H:%M:%S')
+        pdf_engine = get_pdf_engine()
+        cache_pdf = obter_cache_pdf()
+        
+        # O conteúdo do romaneio não muda depois de impresso: se a cópia já está no cache,
+        # servir direto sem reler IMPRESSOES/IMPRESSAO_ITENS nem gerar o PDF de novo
+        if cache_pdf:
+            pdf_copia = cache_pdf.buscar_pdf_romaneio(id_impressao, is_reprint=True, engine=pdf_engine)
+            if pdf_copia:
+                logger.debug("⚡ Cópia do romaneio %s servida do cache (%s bytes)", id_impressao, len(pdf_copia))
+                return _responder_copia_romaneio(id_impressao, pdf_copia, data_reimpressao, pdf_engine)
+        
+        # Buscar dados do romaneio original
+        sheet = get_google_sheets_connection()
+        if not sheet:
+            flash('Erro ao conectar com Google Sheets', 'error')
+            return redirect(url_for('controle_impressoes'))
+        
+        # Buscar dados da impressão
+        impressoes_worksheet = sheet.worksheet("IMPRESSOES")
+        all_values = impressoes_worksheet.get_all_values()
+        
+        romaneio_data = None
+        for row in all_values[1:]:  # Pular cabeçalho
+            if len(row) >= 4 and row[0] == id_impressao:
+                romaneio_data = {
+                    'id_impressao': row[0],
+                    'data_impressao': row[1],
+                    'usuario_impressao': row[2],
+                    'status': row[3],
+                    'total_itens': int(row[4]) if row[4].isdigit() else 0,
+                    'observacoes': row[5] if len(row) > 5 else ''
+                }
+                # Romaneios anteriores à coluna TIPO_ROMANEIO ficam com o título padrão
+                tipo_romaneio = obter_tipo_romaneio(id_impressao, row)
+                if tipo_romaneio:
+                    romaneio_data['tipo_romaneio'] = tipo_romaneio
+                break
+        
+        if not romaneio_data:
+            flash('Romaneio não encontrado', 'error')
+            return redirect(url_for('controle_impressoes'))
+        
+        # Buscar itens da impressão
+        itens_worksheet = sheet.worksheet("IMPRESSAO_ITENS")
+        itens_values = itens_worksheet.get_all_values()
+        
+        itens_data = []
+        for row in itens_values[1:]:  # Pular cabeçalho
+            # Estrutura: A=ID_IMPRESSAO(0), B=ID_SOLICITACAO(1), C=DATA(2), D=SOLICITANTE(3), 
+            # E=CODIGO(4), F=DESCRICAO(5), G=UNIDADE(6), H=QUANTIDADE(7), 
+            # I=LOCACAO_MATRIZ(8), J=SALDO_ESTOQUE(9), K=MEDIA_MENSAL(10), L=ALTA_DEMANDA(11)
+            if len(row) >= 10 and row[0] == id_impressao:  # Verificar ID_IMPRESSAO na coluna A (índice 0)
+                # Processar localização (coluna I, índice 8)
+                locacao = row[8] if len(row) > 8 and row[8] else '1 E5 E03/F03'
+                
+                # Processar saldo estoque (coluna J, índice 9)
+                try:
+                    saldo_str = str(row[9]).strip() if len(row) > 9 else '0'
+                    saldo_estoque = int(float(saldo_str.replace(',', '.'))) if saldo_str and saldo_str != '' else 600
+                except (ValueError, TypeError):
+                    saldo_estoque = 600
+                
+                # Processar média mensal (coluna K, índice 10)
+                try:
+                    media_str = str(row[10]).strip() if len(row) > 10 else '0'
+                    media_mensal = int(float(media_str.replace(',', '.'))) if media_str and media_str != '' else 41
+                except (ValueError, TypeError):
+                    media_mensal = 41
+                
+                # Processar alta demanda (coluna L, índice 11)
+                alta_demanda = False
+                if len(row) > 11:
+                    alta_demanda_str = str(row[11]).strip().lower()
+                    alta_demanda = alta_demanda_str in ['sim', 's', 'yes', 'y', 'true', '1', 'verdadeiro']
+                
+                # Processar quantidade (coluna H, índice 7)
+                try:
+                    qtd_str = str(row[7]).strip() if len(row) > 7 else '0'
+                    quantidade = int(float(qtd_str.replace(',', '.'))) if qtd_str and qtd_str != '' else 0
+                except (ValueError, TypeError):
+                    quantidade = 0
+                
+                if debug:
+                    logger.debug("   📍 Reimpressão - Dados extraídos: Código=%s, Localização=%s, Saldo=%s, Média=%s", row[4] if len(row) > 4 else '', locacao, saldo_estoque, media_mensal)
+                
+                item = {
+                    'data': row[2] if len(row) > 2 else '',
+                    'solicitante': row[3] if len(row) > 3 else '',
+                    'codigo': row[4] if len(row) > 4 else '',
+                    'descricao': row[5] if len(row) > 5 else '',
+                    'quantidade': quantidade,
+                    'alta_demanda': alta_demanda,
+                    'locacao_matriz': locacao,
+                    'saldo_estoque': saldo_estoque,
+                    'media_mensal': media_mensal,
+                    'qtd_pendente': quantidade,
+                    'qtd_separada': 0
+                }
+                itens_data.append(item)
+        
+        romaneio_data['is_reprint'] = True
+        
+        # Mesmo conteúdo (dados, itens, template, motor) => mesmo PDF: reaproveitar se já existir
+        chave_pdf = calcular_chave_pdf(romaneio_data, itens_data, is_reprint=True, engine=pdf_engine)
+        pdf_copia = cache_pdf.buscar_pdf(chave_pdf) if cache_pdf else None
+        
+        if not pdf_copia:
+            # Gerar PDF com marca d'água de cópia usando o motor configurado (PDF_ENGINE)
+            # (sem data de reimpressão: ela é carimbada por requisição)
+            pdf_function = get_pdf_generator(pdf_engine)
+            logger.debug("📄 Motor de PDF para reimpressão: %s", pdf_engine)
+            
+            # Motores baseados em HTML usam a variante do template própria para PDF (cópia já renderizada)
+            html_content = None
+            if pdf_engine != 'reportlab':
+                html_content = render_template('formulario_impressao_pdf.html', 
+                                             id_impressao=id_impressao,
+                                             solicitacoes=itens_data,
+                                             tipo_romaneio=romaneio_data.get('tipo_romaneio'),
+                                             data_impressao=romaneio_data['data_impressao'],
+                                             is_reprint=True)
+            
+            resultado = pdf_function(html_content, romaneio_data, pasta_destino=None, is_reprint=True, itens_data=itens_data)
+            
+            if not resultado['success']:
+                flash(f'Erro ao gerar cópia: {resultado["message"]}', 'error')
+                return redirect(url_for('controle_impressoes'))
+            
+            # Todos os motores devolvem os bytes; a gravação da cópia segue em segundo plano
+            # (resultado['upload']) sem segurar a resposta
+            pdf_copia = resultado.get('pdf_content')
+            if not pdf_copia:
+                flash('Erro ao localizar PDF da cópia', 'error')
+                return redirect(url_for('controle_impressoes'))
+        
+            if cache_pdf:
+                cache_pdf.salvar_pdf(chave_pdf, pdf_copia, romaneio_id=id_impressao, is_reprint=True, engine=pdf_engine)
+        elif cache_pdf:
+            cache_pdf.registrar_romaneio(chave_pdf, id_impressao, is_reprint=True, engine=pdf_engine)
+        
+        # Retornar PDF para download/visualização
+        return _responder_copia_romaneio(id_impressao, pdf_copia, data_reimpressao, pdf_engine)
+        
+    except Exception as e:
+        logger.error("❌ Erro ao reimprimir romaneio: %s", e)
+        flash('Erro ao reimprimir romaneio', 'error')
+        return redirect(url_for('controle_impressoes'))
+
+
+@rotas.route('/detalhes-impressao/<id_impressao>')
+@login_required
+def detalhes_impressao(id_impressao):
+    """Exibe detalhes de uma impressão específica"""
+    try:
+        # Buscar itens da impressão
+        itens = buscar_itens_impressao(id_impressao)
+        
+        if not itens:
+            flash('Impressão não encontrada', 'error')
+            return redirect(url_for('controle_impressoes'))
+        
+        # Buscar status da impressão na aba IMPRESSOES
+        status_impressao = buscar_status_impressao(id_impressao)
+        
+        return render_template('detalhes_impressao.html', 
+                             id_impressao=id_impressao,
+                             itens=itens,
+                             status_impressao=status_impressao)
+        
+    except Exception as e:
+        print(f"❌ Erro ao carregar detalhes da impressão: {e}")
+        flash('Erro ao carregar detalhes da impressão', 'error')
+        return redirect(url_for('controle_impressoes'))
+
+
+@rotas.route('/verificar-itens-impressao', methods=['POST'])
+@login_required
+def verificar_itens_impressao():
+    """Verifica quais itens já estão em impressão pendente ou com status 'Em Separação'"""
+    try:
+        data = request.get_json()
+        ids = data.get('ids', [])
+        
+        if not ids:
+            return jsonify({
+                'success': True,
+                'itens_em_impressao': [],
+                'itens_em_separacao': []
+            })
+        
+        # Verificar itens em impressão pendente
+        itens_em_impressao = verificar_itens_em_impressao_pendente(ids)
+        
+        # Verificar itens com status "Em Separação"
+        itens_em_separacao = verificar_itens_em_separacao(ids)
+        
+        total_bloqueados = len(itens_em_impressao) + len(itens_em_separacao)
+        
+        return jsonify({
+            'success': True,
+            'itens_em_impressao': itens_em_impressao,
+            'itens_em_separacao': itens_em_separacao,
+            'total_verificados': len(ids),
+            'total_bloqueados': total_bloqueados
+        })
+        
+    except Exception as e:
+        print(f"❌ Erro ao verificar itens em impressão: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Erro ao verificar itens: {str(e)}',
+            'itens_em_impressao': [],
+            'itens_em_separacao': []
+        }), 500
+
+
+@rotas.route('/buscar-impressao/<id_impressao>')
+@login_required
+def buscar_impressao(id_impressao):
+    """Busca impressão específica por ID"""
+    try:
+        impressao = buscar_impressao_por_id(id_impressao)
+        
+        if impressao:
+            return jsonify({
+                'success': True,
+                'impressao': impressao
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Impressão não encontrada'
+            })
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar impressão: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Erro interno: {str(e)}'
+        }), 500
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Rotas das solicitações: listagens, impressão da lista, matriz e baixas
+"""
+
+from datetime import datetime
+
+from flask import flash, jsonify, make_response, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from logging_config import obter_logger
+from gestao.extensions import db
+from gestao.logs.activity import log_activity
+from gestao.models import Solicitacao
+from gestao.routing import Rotas
+from gestao.sheets.data import carregar_dados_solicitacoes, get_matriz_data_from_sheets, process_google_sheets_data
+from gestao.sheets.status import atualizar_status_para_em_separacao, update_quantidade_separada_na_planilha
+from gestao.web.pagination import CompleteList
+
+logger = obter_logger(__name__)
+
+rotas = Rotas()
+
+
+# Rotas para solicitações
+@rotas.route('/solicitacoes')
+@login_required
+def solicitacoes():
+    status_filter = request.args.get('status', '')
+    codigo_search = request.args.get('codigo', '')
+    
+    # Consultar planilha em tempo real (com cache), junto com matriz e romaneios
+    df, matriz_data, romaneios_map = carregar_dados_solicitacoes()
+    
+    if df is None or df.empty:
+        flash('❌ Erro: Não foi possível conectar com a planilha do Google Sheets. A conta de serviço precisa ter acesso à planilha. Verifique as permissões e tente novamente.', 'error')
+        return render_template('solicitacoes.html', 
+                             solicitacoes=CompleteList([]), 
+                             codigo_search=codigo_search,
+                             contagens={'aberta': 0, 'pendente': 0, 'aprovada': 0, 'em_separacao': 0, 'entrega_parcial': 0, 'cancelada': 0, 'concluida': 0, 'total': 0})
+    
+    # Processar dados da planilha
+    solicitacoes_list = process_google_sheets_data(df, matriz_data, romaneios_map)
+    
+    # Filtrar automaticamente as concluídas, excesso, faltas e finalizadas
+    solicitacoes_list = [s for s in solicitacoes_list if s.status not in ['Concluida', 'Excesso', 'Falta', 'Finalizado']]
+    
+    # Aplicar busca por código se especificado (antes de ordenar - mais eficiente)
+    if codigo_search:
+        codigo_search_clean = codigo_search.strip()
+        solicitacoes_list = [s for s in solicitacoes_list if codigo_search_clean in str(s.codigo)]
+    
+    # Ordenar por data crescente (mais antigo primeiro)
+    solicitacoes_list.sort(key=lambda x: x.data, reverse=False)
+    
+    # Calcular contagens por status (uma passada só)
+    status_counts = {}
+    for solicitacao in solicitacoes_list:
+        status = solicitacao.status
+        status_counts[status] = status_counts.get(status, 0) + 1
+    
+    # Contagens específicas para os botões
+    contagens = {
+        'aberta': status_counts.get('ABERTA', 0) + status_counts.get('Aberta', 0),
+        'pendente': status_counts.get('pendente', 0) + status_counts.get('Pendente', 0),
+        'aprovada': status_counts.get('aprovada', 0) + status_counts.get('Aprovada', 0),
+        'em_separacao': status_counts.get('Em Separação', 0) + status_counts.get('em separação', 0),
+        'entrega_parcial': status_counts.get('Entrega Parcial', 0) + status_counts.get('entrega parcial', 0),
+        'cancelada': status_counts.get('cancelada', 0) + status_counts.get('Cancelada', 0),
+        'concluida': status_counts.get('Concluida', 0) + status_counts.get('concluida', 0),
+        'total': len(solicitacoes_list)
+    }
+    
+    solicitacoes = CompleteList(solicitacoes_list)
+    
+    # Adicionar headers para evitar cache
+    response = make_response(render_template('solicitacoes.html', 
+                         solicitacoes=solicitacoes, 
+                         codigo_search=codigo_search,
+                         contagens=contagens))
+    
+    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    response.headers['Pragma'] = 'no-cache'
+    response.headers['Expires'] = '0'
+    
+    return response
+
+
+@rotas.route('/solicitacoes/falta')
+@login_required
+def solicitacoes_falta():
+    """Página de solicitações com status FALTA"""
+    codigo_search = request.args.get('codigo', '')
+    
+    print(f"🔍 Página de FALTAS - Busca por código: '{codigo_search}'")
+    
+    # Consultar planilha em tempo real, junto com matriz e romaneios
+    df, matriz_data, romaneios_map = carregar_dados_solicitacoes()
+    
+    if df is None or df.empty:
+        print("❌ Erro: Não foi possível conectar com Google Sheets")
+        flash('❌ Erro: Não foi possível conectar com a planilha do Google Sheets. A conta de serviço precisa ter acesso à planilha. Verifique as permissões e tente novamente.', 'error')
+        return render_template('solicitacoes_falta.html', 
+                             solicitacoes=CompleteList([]), 
+                             codigo_search=codigo_search,
+                             contagens={'falta': 0, 'total': 0})
+    
+    # Processar dados da planilha
+    solicitacoes_list = process_google_sheets_data(df, matriz_data, romaneios_map)
+    
+    # Filtrar APENAS itens com status "Falta"
+    solicitacoes_list = [s for s in solicitacoes_list if s.status == 'Falta']
+    print(f"📊 Total de itens com status FALTA: {len(solicitacoes_list)}")
+    
+    # Aplicar busca por código se especificado
+    if codigo_search:
+        codigo_search_clean = codigo_search.strip()
+        solicitacoes_list = [s for s in solicitacoes_list if str(s.codigo).strip() == codigo_search_clean]
+        print(f"📊 Após filtro por código: {len(solicitacoes_list)} registros")
+    
+    # Criar objeto CompleteList
+    solicitacoes_completas = CompleteList(solicitacoes_list)
+    
+    # Contagens
+    contagens = {
+        'falta': len(solicitacoes_list),
+        'total': len(solicitacoes_list)
+    }
+    
+    return render_template('solicitacoes_falta.html', 
+                         solicitacoes=solicitacoes_completas,
+                         codigo_search=codigo_search,
+                         contagens=contagens)
+
+
+@rotas.route('/solicitacoes/print')
+@login_required
+def print_solicitacoes():
+    """Página de impressão de solicitações"""
+    status_filter = request.args.get('status', '')
+    codigo_search = request.args.get('codigo', '')
+    
+    logger.debug("status_filter: '%s', codigo_search: '%s'", status_filter, codigo_search)
+    
+    # Consultar planilha em tempo real - APENAS ONLINE (junto com matriz e romaneios)
+    df, matriz_data, romaneios_map = carregar_dados_solicitacoes()
+    
+    if df is None or df.empty:
+        logger.error("❌ ERRO: Não foi possível conectar com a planilha do Google Sheets")
+        flash('❌ Erro: Não foi possível conectar com a planilha do Google Sheets. Verifique sua conexão com a internet e tente novamente.', 'error')
+        return render_template('print_solicitacoes.html', 
+                             solicitacoes=[],
+                             status_filter=status_filter,
+                             codigo_search=codigo_search)
+    
+    # Processar dados da planilha
+    solicitacoes_list = process_google_sheets_data(df, matriz_data, romaneios_map)
+    
+    # Debug: mostrar status únicos encontrados
+    status_unicos = list(set([s.status for s in solicitacoes_list]))
+    logger.debug("Status únicos encontrados: %s", status_unicos)
+    
+    # Filtrar automaticamente as concluídas e finalizadas para deixar a interface mais limpa
+    solicitacoes_list = [s for s in solicitacoes_list if s.status != 'Concluida' and s.status != 'Finalizado']
+    logger.debug("Total de registros após filtrar concluídas: %s", len(solicitacoes_list))
+    
+    # Aplicar filtro por status se especificado
+    if status_filter:
+        logger.debug("Aplicando filtro para status: '%s'", status_filter)
+        # Fazer comparação flexível para diferentes variações de status
+        if status_filter.upper() == 'ABERTA':
+            solicitacoes_list = [s for s in solicitacoes_list if s.status.upper() == 'ABERTA' or s.status == 'Aberta']
+        else:
+            solicitacoes_list = [s for s in solicitacoes_list if s.status == status_filter]
+        logger.debug("Total de registros após filtro: %s", len(solicitacoes_list))
+    
+    # Aplicar busca por código se especificado
+    if codigo_search:
+        logger.debug("Aplicando busca por código: '%s'", codigo_search)
+        codigo_search_clean = codigo_search.strip()
+        solicitacoes_list = [s for s in solicitacoes_list if codigo_search_clean in str(s.codigo)]
+    
+    # Ordenar por data decrescente
+    solicitacoes_list.sort(key=lambda x: x.data, reverse=True)
+    
+    # Atualizar status para "Em Separação" quando impresso
+    codigos_para_imprimir = [s.codigo for s in solicitacoes_list if s.status in ['Aberta', 'pendente', 'aprovada']]
+    if codigos_para_imprimir:
+        logger.info("🖨️ Atualizando status para 'Em Separação' para códigos: %s", codigos_para_imprimir)
+        atualizar_status_para_em_separacao(codigos_para_imprimir)
+    
+    logger.debug("Total de registros para impressão: %s", len(solicitacoes_list))
+    
+    return render_template('print_solicitacoes.html', 
+                         solicitacoes=solicitacoes_list,
+                         status_filter=status_filter,
+                         codigo_search=codigo_search)
+
+
+# Rota de teste simples
+@rotas.route('/simple-solicitacoes')
+@login_required
+def simple_solicitacoes():
+    status_filter = request.args.get('status', '')
+    
+    logger.debug("status_filter recebido: '%s'", status_filter)
+    
+    query = Solicitacao.query
+    if status_filter:
+        query = query.filter_by(status=status_filter)
+    
+    solicitacoes_list = query.order_by(Solicitacao.data.asc()).all()
+    
+    # Criar objeto compatível
+    
+    solicitacoes = CompleteList(solicitacoes_list)
+    
+    logger.debug("Enviando para template - total: %s", solicitacoes.total)
+    
+    return render_template('simple_solicitacoes.html', 
+                         solicitacoes=solicitacoes, 
+                         status_filter=status_filter)
+
+
+# Rota para sincronizar dados da matriz
+@rotas.route('/sincronizar-matriz')
+@login_required
+def sincronizar_matriz():
+    """Sincroniza dados da aba MATRIZ_IMPORTADA do Google Sheets"""
+    print("🔄 Sincronizando dados da aba MATRIZ_IMPORTADA...")
+    
+    # Buscar dados da matriz do Google Sheets
+    matriz_data = get_matriz_data_from_sheets()
+    
+    # Mensagem de sucesso removida - a barra de progresso já indica a conclusão
+    
+    return redirect(url_for('solicitacoes'))
+
+
+# Funcionalidade de baixa de estoque
+@rotas.route('/solicitacoes/<int:id>/baixar', methods=['POST'])
+@login_required
+def baixar_estoque(id):
+    solicitacao = Solicitacao.query.get_or_404(id)
+    quantidade_separada = int(request.form['quantidade_separada'])
+    
+    # Verificar se a solicitação está em separação
+    if solicitacao.status != 'Em Separação':
+        log_activity('baixar_estoque', 'Solicitacao', id, f'Tentativa de baixa em status inválido: {solicitacao.status}', 'erro')
+        flash('Apenas solicitações em separação podem ter baixa registrada!', 'error')
+        return redirect(url_for('solicitacoes'))
+    
+    # Verificar se a quantidade não excede o solicitado
+    if quantidade_separada > solicitacao.quantidade:
+        flash('Quantidade separada não pode ser maior que a solicitada!', 'error')
+        return redirect(url_for('solicitacoes'))
+    
+    # Atualizar quantidade separada (somar com valor existente)
+    solicitacao.qtd_separada += quantidade_separada
+    
+    # Calcular saldo restante
+    solicitacao.saldo = solicitacao.quantidade - solicitacao.qtd_separada
+    
+    # Atualizar status baseado na quantidade separada
+    if solicitacao.qtd_separada == solicitacao.quantidade:
+        solicitacao.status = 'Concluida'
+        solicitacao.data_separacao = datetime.utcnow()
+        solicitacao.separado_por = current_user.username
+    elif solicitacao.qtd_separada > 0:
+        solicitacao.status = 'Entrega Parcial'
+        if not solicitacao.data_separacao:
+            solicitacao.data_separacao = datetime.utcnow()
+        if not solicitacao.separado_por:
+            solicitacao.separado_por = current_user.username
+    
+    db.session.commit()
+    
+    # Log da operação
+    log_activity('baixar_estoque', 'Solicitacao', id, 
+                f'Baixa registrada: {quantidade_separada} unidades. Status alterado para: {solicitacao.status}', 
+                'sucesso')
+    
+    flash(f'Baixa registrada! {quantidade_separada} unidades separadas. Status: {solicitacao.status}', 'success')
+    return redirect(url_for('solicitacoes'))
+
+
+# Funcionalidade para colocar em separação
+@rotas.route('/solicitacoes/<int:id>/separar', methods=['POST'])
+@login_required
+def colocar_em_separacao(id):
+    solicitacao = Solicitacao.query.get_or_404(id)
+    
+    # Verificar se pode ser colocada em separação
+    if solicitacao.status not in ['pendente', 'aprovada']:
+        log_activity('separar', 'Solicitacao', id, f'Tentativa de separação em status inválido: {solicitacao.status}', 'erro')
+        flash('Apenas solicitações pendentes ou aprovadas podem ser colocadas em separação!', 'error')
+        return redirect(url_for('solicitacoes'))
+    
+    solicitacao.status = 'Em Separação'
+    db.session.commit()
+    
+    # Log da operação
+    log_activity('separar', 'Solicitacao', id, f'Solicitação colocada em separação', 'sucesso')
+    
+    flash('Solicitação colocada em separação!', 'success')
+    return redirect(url_for('solicitacoes'))
+
+
+@rotas.route('/solicitacoes/<int:id>/complementar', methods=['POST'])
+@login_required
+def complementar_quantidade(id):
+    """Complementa a quantidade separada de uma solicitação na planilha do Google Sheets"""
+    try:
+        data = request.get_json()
+        quantidade_nova = int(data.get('quantidade', 0))
+        codigo = data.get('codigo', '')
+        
+        if quantidade_nova <= 0:
+            return jsonify({'success': False, 'message': 'Quantidade deve ser maior que zero'})
+        
+        if not codigo:
+            return jsonify({'success': False, 'message': 'Código não fornecido'})
+        
+        # Atualizar na planilha do Google Sheets
+        sucesso = update_quantidade_separada_na_planilha(codigo, quantidade_nova)
+        
+        if sucesso:
+            return jsonify({
+                'success': True, 
+                'message': f'Quantidade {quantidade_nova} adicionada com sucesso na planilha! Status atualizado conforme regra de negócio.',
+                'qtd_separada': quantidade_nova,
+                'codigo': codigo,
+                'status': 'Atualizado'
+            })
+        else:
+            return jsonify({
+                'success': False, 
+                'message': 'Erro ao atualizar a planilha do Google Sheets'
+            })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Erro ao complementar quantidade: {str(e)}'})
+
+
+@rotas.route('/solicitacoes/baixar-lote', methods=['POST'])
+@login_required
+def baixar_estoque_lote():
+    try:
+        # Obter IDs das solicitações selecionadas
+        solicitacao_ids = request.form.getlist('solicitacao_ids')
+        
+        if not solicitacao_ids:
+            log_activity('baixar_lote', 'Solicitacao', None, 'Tentativa de baixa em lote sem seleção', 'erro')
+            flash('Nenhuma solicitação selecionada!', 'error')
+            return redirect(url_for('solicitacoes'))
+        
+        baixas_registradas = 0
+        
+        for solicitacao_id in solicitacao_ids:
+            solicitacao = Solicitacao.query.get(int(solicitacao_id))
+            
+            if not solicitacao:
+                continue
+                
+            # Verificar se a solicitação está em separação
+            if solicitacao.status != 'Em Separação':
+                continue
+            
+            # Obter quantidade a separar
+            quantidade_key = f'quantidades_{solicitacao_id}'
+            quantidade_separada = request.form.get(quantidade_key)
+            
+            if not quantidade_separada:
+                continue
+                
+            quantidade_separada = int(quantidade_separada)
+            
+            # Verificar se a quantidade não excede o solicitado
+            if quantidade_separada > (solicitacao.quantidade - solicitacao.qtd_separada):
+                flash(f'Solicitação #{solicitacao_id}: Quantidade excede o permitido!', 'warning')
+                continue
+            
+            # Atualizar quantidade separada (somar com valor existente)
+            solicitacao.qtd_separada += quantidade_separada
+            
+            # Calcular saldo restante (nunca menor que 0)
+            solicitacao.saldo = max(0, solicitacao.quantidade - solicitacao.qtd_separada)
+            
+            # Atualizar status baseado na quantidade separada
+            if solicitacao.qtd_separada == solicitacao.quantidade:
+                solicitacao.status = 'Concluida'
+                solicitacao.data_separacao = datetime.utcnow()
+                solicitacao.separado_por = current_user.username
+            elif solicitacao.qtd_separada > 0:
+                solicitacao.status = 'Entrega Parcial'
+                if not solicitacao.data_separacao:
+                    solicitacao.data_separacao = datetime.utcnow()
+                if not solicitacao.separado_por:
+                    solicitacao.separado_por = current_user.username
+            
+            baixas_registradas += 1
+        
+        db.session.commit()
+        
+        if baixas_registradas > 0:
+            log_activity('baixar_lote', 'Solicitacao', None, f'Baixa em lote: {baixas_registradas} solicitações processadas', 'sucesso')
+            flash(f'Baixa em lote realizada! {baixas_registradas} solicitações processadas.', 'success')
+        else:
+            log_activity('baixar_lote', 'Solicitacao', None, 'Baixa em lote: nenhuma solicitação processada', 'aviso')
+            flash('Nenhuma baixa foi registrada. Verifique as solicitações selecionadas.', 'warning')
+            
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Erro ao processar baixa em lote: {str(e)}', 'error')
+    
+    return redirect(url_for('solicitacoes'))
@@ -0,0 +1,57 @@
+"""
+Configuração do gunicorn (Dockerfile/Cloud Run e App Engine: gunicorn -c gunicorn.conf.py)
+
+Modelo de concorrência: processos (workers) x threads (gthread)
+
+- Threads atendem bem a espera de I/O: chamadas ao Google Sheets e ao Cloud Storage
+  (100-500 ms cada) liberam o GIL, então 8 threads num worker esperam 8 respostas ao mesmo tempo.
+- Trabalho de CPU (pandas em /solicitacoes e no processamento do romaneio, ReportLab nos PDFs)
+  segura o GIL: threads do mesmo worker ficam em fila. Só mais workers (processos) usam mais
+  de um núcleo. Cada worker custa uma cópia do app na memória (~150-250 MB).
+- Estado visto por todos os workers (status dos PDFs, invalidação de cache, sessões, limites
+  de login) fica em shared_state.py: com mais de um worker ele vai sempre para o banco. O
+  número de workers vem de shared_state.workers_configurados(), a mesma conta do app.
+
+Regra prática (ver benchmarks/benchmark_concorrencia.py para medir no ambiente de destino):
+    WEB_CONCURRENCY  = núcleos do serviço (CPU do Cloud Run / classe da instância); sem a
+                       variável: núcleos da cota de CPU do contêiner, no máximo 2
+    GUNICORN_THREADS = 8 (aumentar se a carga for quase só espera do Sheets)
+
+Variáveis: PORT, WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_TIMEOUT, GUNICORN_PRELOAD,
+GUNICORN_MAX_REQUESTS, WARMUP_ENABLED.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shared_state import workers_configurados  # noqa: E402
+
+bind = f":{os.environ.get('PORT', '8080')}"
+worker_class = 'gthread'
+workers = workers_configurados()
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+# 0 = sem limite: a geração de PDF e leituras grandes do Sheets podem passar de 30 s
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '0'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recicla workers periodicamente (memória do pandas/ReportLab que não volta ao sistema)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = max_requests // 10
+
+# preload: importa o app uma vez no master e compartilha as páginas (copy-on-write) entre
+# os workers. As threads de fundo (logs, notificador de erros) são recriadas em cada worker.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
+# Logs do gunicorn no mesmo destino dos logs do app (stdout/stderr do contêiner)
+accesslog = None
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Aquece o cache do Sheets do worker em segundo plano (a porta já foi aberta pelo master)"""
+    from gestao.factory import iniciar_aquecimento
+    iniciar_aquecimento(worker.wsgi)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Fila de logs de auditoria gravados em lote na aba "Logs" do Google Sheets
+
+log_activity só enfileira a entrada (sem chamada à API dentro da requisição). Uma thread
+de fundo descarrega a fila com um único append_rows quando:
+  - a fila chega a LOG_BATCH_SIZE entradas, ou
+  - passam LOG_FLUSH_SECONDS desde a última descarga
+
+IDs: o maior ID da coluna A (col_values, sem baixar a aba inteira) é lido uma vez e semeia o
+contador. Com reservar_ids (contador atômico no estado compartilhado do banco) cada lote
+reserva a sua faixa e os workers nunca repetem IDs. Sem ele (um worker, estado em memória) o
+contador é local e a coluna é relida quando a faixa devolvida pelo append_rows mostra que
+outra instância escreveu no meio ou que o arquivamento (log_retention) removeu linhas. Se o
+Sheets estiver indisponível, o lote vai para a tabela Log (fallback_log) em vez de se perder.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+import atexit
+from collections import deque
+
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Cabeçalhos da aba "Logs" (ordem das colunas de cada linha)
+CABECALHOS_LOGS = [
+    "ID", "Data/Hora", "Usuário", "Ação", "Entidade",
+    "ID_Entidade", "Detalhes", "IP_Address", "User_Agent", "Status"
+]
+
+# "Logs!A101:J105" -> 101, 105
+_PADRAO_FAIXA = re.compile(r'![A-Z]+(\d+)(?::[A-Z]+(\d+))?$')
+
+
+def _linhas_da_faixa(resposta):
+    """Primeira e última linha gravadas segundo a resposta do append_rows (ou None)"""
+    try:
+        faixa = resposta['updates']['updatedRange']
+    except (KeyError, TypeError):
+        return None
+    match = _PADRAO_FAIXA.search(faixa)
+    if not match:
+        return None
+    primeira = int(match.group(1))
+    return primeira, int(match.group(2) or primeira)
+
+
+class FilaLogs:
+    """Buffer thread-safe de logs com descarga em lote por tamanho ou tempo"""
+
+    def __init__(self, obter_aba, fallback_log, tamanho_lote=50, intervalo=5.0, max_pendentes=5000,
+                 reservar_ids=None):
+        """
+        Args:
+            obter_aba: função que retorna a aba "Logs" (gspread.Worksheet) ou None
+            fallback_log: função que grava uma lista de entradas na tabela Log
+            reservar_ids: função (quantidade, minimo) -> último ID reservado, atômica entre os
+                          workers; devolve None quando não há contador compartilhado (usa o local)
+            tamanho_lote: descarregar assim que houver esse número de entradas
+            intervalo: descarregar no máximo a cada intervalo segundos
+            max_pendentes: limite da fila (acima dele as entradas mais antigas vão para o fallback)
+        """
+        self.obter_aba = obter_aba
+        self.fallback_log = fallback_log
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.max_pendentes = max_pendentes
+        self.reservar_ids = reservar_ids
+        self._pendentes = deque()
+        self._lock = threading.Lock()
+        # Só uma descarga por vez (thread de fundo, atexit ou chamada manual)
+        self._lock_descarga = threading.Lock()
+        self._acordar = threading.Event()
+        self._aba = None
+        self._proximo_id = None
+        self._ultima_linha = None
+        self._ultimo_id_gravado = 0
+        self._thread = None
+        self._pid = None
+
+    def registrar(self, entrada):
+        """
+        Enfileira uma entrada de log (retorna na hora)
+
+        Args:
+            entrada: dict com data_hora, usuario, usuario_id, acao, entidade, entidade_id,
+                     detalhes, ip_address, user_agent, status
+        """
+        excedentes = []
+        with self._lock:
+            self._pendentes.append(entrada)
+            while len(self._pendentes) > self.max_pendentes:
+                excedentes.append(self._pendentes.popleft())
+            cheio = len(self._pendentes) >= self.tamanho_lote
+        self._garantir_thread()
+        if excedentes:
+            logger.warning("⚠️ Fila de logs cheia: %s entradas enviadas para a tabela Log", len(excedentes))
+            self._gravar_fallback(excedentes)
+        if cheio:
+            self._acordar.set()
+
+    def pendentes(self):
+        with self._lock:
+            return len(self._pendentes)
+
+    def descarregar(self):
+        """
+        Grava todas as entradas pendentes (em lotes de tamanho_lote)
+
+        Returns:
+            int: Número de entradas gravadas na planilha
+        """
+        gravadas = 0
+        with self._lock_descarga:
+            while True:
+                with self._lock:
+                    if not self._pendentes:
+                        break
+                    lote = [self._pendentes.popleft() for _ in range(min(self.tamanho_lote, len(self._pendentes)))]
+                if self._gravar_planilha(lote):
+                    gravadas += len(lote)
+                else:
+                    self._gravar_fallback(lote)
+        return gravadas
+
+    def _gravar_planilha(self, lote):
+        try:
+            if self._aba is None:
+                self._aba = self.obter_aba()
+                if self._aba is None:
+                    return False
+                self._proximo_id = None
+            if self._proximo_id is None:
+                self._ler_proximo_id()
+
+            # Faixa reservada no contador compartilhado (None: sem contador, numeração local)
+            ultimo_id = self.reservar_ids(len(lote), self._proximo_id - 1) if self.reservar_ids else None
+            compartilhado = ultimo_id is not None
+            primeiro_id = ultimo_id - len(lote) + 1 if compartilhado else self._proximo_id
+            linhas = [self._montar_linha(primeiro_id + i, entrada) for i, entrada in enumerate(lote)]
+            resposta = self._aba.append_rows(linhas)
+            self._proximo_id = primeiro_id + len(linhas)
+            self._ultimo_id_gravado = self._proximo_id - 1
+            logger.info("✅ %s logs salvos na planilha (IDs %s-%s)", len(linhas), primeiro_id, self._ultimo_id_gravado)
+
+            # Numeração local: o lote deveria cair logo depois da última linha conhecida. Se não
+            # caiu, outra instância escreveu no meio (ou o arquivamento removeu linhas): reler a
+            # coluna de IDs antes do próximo lote
+            faixa = _linhas_da_faixa(resposta)
+            if faixa:
+                if not compartilhado and self._ultima_linha is not None and faixa[0] != self._ultima_linha + 1:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Aba Logs alterada por outro processo: IDs serão relidos no próximo lote")
+                    self._proximo_id = None
+                self._ultima_linha = faixa[1]
+            return True
+        except Exception as e:
+            logger.error("❌ Erro ao salvar logs na planilha: %s", e)
+            # Reconectar na próxima descarga
+            self._aba = None
+            return False
+
+    def _ler_proximo_id(self):
+        """
+        Maior ID numérico da coluna A + 1 (uma leitura só da coluna, não da aba inteira)
+
+        Nunca volta atrás: se o arquivamento esvaziou a aba, continua do último ID gravado.
+        """
+        valores = self._aba.col_values(1)
+        ids = [int(valor) for valor in valores[1:] if str(valor).strip().isdigit()]
+        self._proximo_id = max((max(ids) if ids else 0) + 1, self._ultimo_id_gravado + 1)
+        self._ultima_linha = len(valores)
+
+    @staticmethod
+    def _montar_linha(log_id, entrada):
+        return [
+            log_id,
+            entrada['data_hora'].strftime('%d/%m/%Y %H:%M:%S'),
+            entrada['usuario'],
+            entrada['acao'],
+            entrada['entidade'],
+            entrada.get('entidade_id') or '',
+            entrada.get('detalhes') or '',
+            entrada.get('ip_address') or '',
+            entrada.get('user_agent') or '',
+            entrada['status']
+        ]
+
+    def _gravar_fallback(self, entradas):
+        try:
+            self.fallback_log(entradas)
+        except Exception as e:
+            logger.error("❌ Erro ao salvar logs no banco local: %s", e)
+
+    def _garantir_thread(self):
+        """Inicia a thread de descarga (de novo após fork, ex.: workers do gunicorn)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._loop_descarga, name='fila-logs', daemon=True)
+        self._thread.start()
+
+    def _loop_descarga(self):
+        while True:
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            try:
+                self.descarregar()
+            except Exception as e:
+                logger.warning("⚠️ Erro na descarga da fila de logs: %s", e)
+            # Evitar rodadas seguidas quando chegam muitos logs de uma vez
+            time.sleep(0.1)
+
+
+def criar_fila_logs(obter_aba, fallback_log, reservar_ids=None):
+    """
+    Cria a fila de logs com a configuração do ambiente e descarrega o que sobrar ao encerrar
+
+    reservar_ids: contador de IDs compartilhado entre os workers (ver FilaLogs)
+
+    Variáveis: LOG_BATCH_SIZE (50), LOG_FLUSH_SECONDS (5), LOG_BUFFER_MAX (5000)
+    """
+    fila = FilaLogs(
+        obter_aba,
+        fallback_log,
+        tamanho_lote=int(os.environ.get('LOG_BATCH_SIZE', '50')),
+        intervalo=float(os.environ.get('LOG_FLUSH_SECONDS', '5')),
+        max_pendentes=int(os.environ.get('LOG_BUFFER_MAX', '5000')),
+        reservar_ids=reservar_ids,
+    )
+    atexit.register(fila.descarregar)
+    return fila
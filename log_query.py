@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Consulta dos logs de auditoria (tabela Log) com custo constante por página
+
+- Filtros por igualdade (acao, entidade, usuario, status) e intervalo de datas, todos
+  atendidos pelos índices compostos declarados em Log.__table_args__
+- Paginação por cursor (keyset) em (timestamp, id): a página N custa o mesmo que a página 1,
+  sem OFFSET e sem COUNT do resultado filtrado
+- Estatísticas do topo da página (total, hoje, erros) e opções dos filtros em cache com TTL;
+  depois de expirar, o valor antigo continua sendo servido enquanto uma thread recalcula
+"""
+
+import csv
+import io
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from sqlalchemy import or_
+
+# Colunas da exportação CSV
+CABECALHO_CSV_LOGS = ['ID', 'Data/Hora', 'Usuário', 'Ação', 'Entidade', 'ID Entidade', 'Detalhes', 'IP', 'Status']
+
+# Linhas lidas do banco por vez na exportação (yield_per)
+TAMANHO_LOTE_EXPORTACAO = 1000
+
+# Formato do cursor na URL: "<timestamp ISO>_<id>"
+_SEPARADOR_CURSOR = '_'
+
+
+def codificar_cursor(log):
+    """Cursor que aponta para o log (usado em ?antes= / ?depois=)"""
+    return f"{log.timestamp.isoformat()}{_SEPARADOR_CURSOR}{log.id}"
+
+
+def decodificar_cursor(cursor):
+    """Retorna (timestamp, id) ou None se o cursor for inválido"""
+    if not cursor:
+        return None
+    try:
+        timestamp, log_id = cursor.rsplit(_SEPARADOR_CURSOR, 1)
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except ValueError:
+        return None
+
+
+class ConsultaLogs:
+    """Consultas da página /logs e da exportação sobre o modelo Log"""
+
+    def __init__(self, db, modelo_log, ttl_estatisticas=60, modelo_resumo=None):
+        self.db = db
+        self.Log = modelo_log
+        # LogResumo: contagens dos meses já arquivados (log_retention.py)
+        self.LogResumo = modelo_resumo
+        self.ttl_estatisticas = ttl_estatisticas
+        self._estatisticas = None
+        self._estatisticas_em = 0
+        self._lock = threading.Lock()
+        self._recalculando = False
+        self._app = None
+
+    def filtrar(self, filtros):
+        """
+        Query do Log com os filtros da página aplicados
+
+        Args:
+            filtros: dict com acao, entidade, usuario, status, data_inicio, data_fim
+                     (datas no formato YYYY-MM-DD; valores vazios são ignorados).
+                     Uso interno (arquivamento): timestamp_de/timestamp_ate (datetime,
+                     intervalo [de, ate)) e id_maximo
+        """
+        Log = self.Log
+        query = Log.query
+        if filtros.get('acao'):
+            query = query.filter(Log.acao == filtros['acao'])
+        if filtros.get('entidade'):
+            query = query.filter(Log.entidade == filtros['entidade'])
+        if filtros.get('usuario'):
+            query = query.filter(Log.usuario_nome == filtros['usuario'])
+        if filtros.get('status'):
+            query = query.filter(Log.status == filtros['status'])
+        if filtros.get('data_inicio'):
+            try:
+                query = query.filter(Log.timestamp >= datetime.strptime(filtros['data_inicio'], '%Y-%m-%d'))
+            except ValueError:
+                pass
+        if filtros.get('data_fim'):
+            try:
+                query = query.filter(Log.timestamp <= datetime.strptime(filtros['data_fim'], '%Y-%m-%d'))
+            except ValueError:
+                pass
+        if filtros.get('timestamp_de'):
+            query = query.filter(Log.timestamp >= filtros['timestamp_de'])
+        if filtros.get('timestamp_ate'):
+            query = query.filter(Log.timestamp < filtros['timestamp_ate'])
+        if filtros.get('id_maximo'):
+            query = query.filter(Log.id <= filtros['id_maximo'])
+        return query
+
+    def pagina(self, filtros, antes=None, depois=None, por_pagina=50):
+        """
+        Uma página de logs do mais recente para o mais antigo
+
+        Args:
+            filtros: ver filtrar()
+            antes: cursor - logs mais antigos que ele (próxima página)
+            depois: cursor - logs mais novos que ele (página anterior)
+            por_pagina: tamanho da página
+
+        Returns:
+            dict: {'itens': [...], 'proximo': cursor ou None, 'anterior': cursor ou None}
+        """
+        Log = self.Log
+        query = self.filtrar(filtros)
+        cursor_antes = decodificar_cursor(antes)
+        cursor_depois = None if cursor_antes else decodificar_cursor(depois)
+
+        if cursor_depois:
+            # Página anterior: buscar em ordem crescente a partir do cursor e inverter
+            timestamp, log_id = cursor_depois
+            query = query.filter(Log.timestamp >= timestamp,
+                                 or_(Log.timestamp > timestamp, Log.id > log_id))
+            itens = query.order_by(Log.timestamp.asc(), Log.id.asc()).limit(por_pagina + 1).all()
+            tem_mais_novos = len(itens) > por_pagina
+            itens = list(reversed(itens[:por_pagina]))
+            tem_mais_antigos = True
+        else:
+            if cursor_antes:
+                timestamp, log_id = cursor_antes
+                # O limite simples em timestamp vira um intervalo no índice; o OR só desempata
+                query = query.filter(Log.timestamp <= timestamp,
+                                     or_(Log.timestamp < timestamp, Log.id < log_id))
+            itens = query.order_by(Log.timestamp.desc(), Log.id.desc()).limit(por_pagina + 1).all()
+            tem_mais_antigos = len(itens) > por_pagina
+            itens = itens[:por_pagina]
+            tem_mais_novos = cursor_antes is not None
+
+        return {
+            'itens': itens,
+            'proximo': codificar_cursor(itens[-1]) if itens and tem_mais_antigos else None,
+            'anterior': codificar_cursor(itens[0]) if itens and tem_mais_novos else None,
+        }
+
+    def iterar(self, filtros, tamanho_lote=1000):
+        """Percorre todos os logs filtrados (mais recente primeiro) em lotes por cursor"""
+        antes = None
+        while True:
+            pagina = self.pagina(filtros, antes=antes, por_pagina=tamanho_lote)
+            yield from pagina['itens']
+            if not pagina['proximo']:
+                break
+            antes = pagina['proximo']
+
+    def exportar_csv(self, filtros, excel=False, compactar=False):
+        """
+        Gera o CSV dos logs filtrados em partes (bytes), com memória constante
+
+        As linhas vêm do banco em lotes de TAMANHO_LOTE_EXPORTACAO (yield_per, cursor do lado
+        do servidor) e cada lote é escrito e enviado antes do próximo ser lido.
+
+        Args:
+            filtros: ver filtrar()
+            excel: CSV para o Excel em português (BOM UTF-8 e separador ';')
+            compactar: compactar a saída em gzip
+
+        Yields:
+            bytes: pedaços do arquivo
+        """
+        Log = self.Log
+        query = (self.filtrar(filtros)
+                 .with_entities(Log.id, Log.timestamp, Log.usuario_nome, Log.acao, Log.entidade,
+                                Log.entidade_id, Log.detalhes, Log.ip_address, Log.status)
+                 .order_by(Log.timestamp.desc(), Log.id.desc())
+                 .yield_per(TAMANHO_LOTE_EXPORTACAO))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=';' if excel else ',')
+        # wbits=31: formato gzip (cabeçalho + CRC), não só deflate
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compactar else None
+
+        def drenar():
+            dados = buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            return compressor.compress(dados) if compressor else dados
+
+        if excel:
+            buffer.write('\ufeff')
+        writer.writerow(CABECALHO_CSV_LOGS)
+        linhas = 0
+        for log_id, timestamp, usuario, acao, entidade, entidade_id, detalhes, ip, status in query:
+            writer.writerow([
+                log_id,
+                timestamp.strftime('%d/%m/%Y %H:%M:%S') if timestamp else '',
+                usuario,
+                acao,
+                entidade,
+                entidade_id or '',
+                detalhes or '',
+                ip or '',
+                status
+            ])
+            linhas += 1
+            if linhas % TAMANHO_LOTE_EXPORTACAO == 0:
+                pedaco = drenar()
+                if pedaco:
+                    yield pedaco
+        pedaco = drenar()
+        if compressor:
+            pedaco += compressor.flush()
+        if pedaco:
+            yield pedaco
+
+    def estatisticas(self):
+        """
+        Total de logs, logs de hoje, logs de erro e valores dos filtros (cache com TTL)
+
+        total e erros incluem os períodos já arquivados (LogResumo); arquivados é só a parte
+        arquivada. As opções dos filtros vêm só da tabela Log (o que a página consegue listar).
+
+        Returns:
+            dict: {'total', 'hoje', 'erros', 'arquivados', 'acoes', 'entidades'}
+        """
+        with self._lock:
+            atual = self._estatisticas
+            expirado = time.time() - self._estatisticas_em >= self.ttl_estatisticas
+            recalcular_em_fundo = atual is not None and expirado and not self._recalculando
+            if recalcular_em_fundo:
+                self._recalculando = True
+        if atual is None:
+            # Primeira vez no processo: calcular na hora
+            return self._recalcular_estatisticas()
+        if recalcular_em_fundo:
+            threading.Thread(target=self._recalcular_em_fundo, name='estatisticas-logs', daemon=True).start()
+        return atual
+
+    def invalidar_estatisticas(self):
+        with self._lock:
+            self._estatisticas_em = 0
+
+    def _recalcular_em_fundo(self):
+        try:
+            with self._app.app_context():
+                self._recalcular_estatisticas()
+        except Exception as e:
+            print(f"⚠️ Erro ao recalcular estatísticas de logs: {e}")
+        finally:
+            with self._lock:
+                self._recalculando = False
+
+    def _recalcular_estatisticas(self):
+        from flask import current_app
+        Log = self.Log
+        # Guardar o app para o recálculo em segundo plano (fora da requisição)
+        self._app = current_app._get_current_object()
+        inicio_hoje = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        estatisticas = {
+            'total': Log.query.count(),
+            'hoje': Log.query.filter(Log.timestamp >= inicio_hoje).count(),
+            'erros': Log.query.filter(Log.status == 'erro').count(),
+            'arquivados': 0,
+        }
+        if self.LogResumo is not None:
+            LogResumo = self.LogResumo
+            soma = self.db.func.coalesce(self.db.func.sum(LogResumo.total), 0)
+            arquivados = self.db.session.query(soma).scalar()
+            erros_arquivados = self.db.session.query(soma).filter(LogResumo.status == 'erro').scalar()
+            estatisticas['arquivados'] = arquivados
+            estatisticas['total'] += arquivados
+            estatisticas['erros'] += erros_arquivados
+        # Opções dos selects de Ação/Entidade (uma leitura do índice (entidade, acao))
+        pares = self.db.session.query(Log.entidade, Log.acao).distinct().all()
+        estatisticas['entidades'] = sorted({entidade for entidade, _ in pares if entidade})
+        estatisticas['acoes'] = sorted({acao for _, acao in pares if acao})
+        with self._lock:
+            self._estatisticas = estatisticas
+            self._estatisticas_em = time.time()
+        return estatisticas
+
+    def garantir_indices(self):
+        """Cria os índices do Log em bancos que já existiam antes deles (create_all não cria)"""
+        tabelas = [self.Log.__table__]
+        if self.LogResumo is not None:
+            tabelas.append(self.LogResumo.__table__)
+        for indice in (indice for tabela in tabelas for indice in tabela.indexes):
+            try:
+                indice.create(self.db.engine, checkfirst=True)
+            except Exception as e:
+                print(f"⚠️ Erro ao criar índice {indice.name}: {e}")
+
+
+def criar_consulta_logs(db, modelo_log, modelo_resumo=None):
+    """ConsultaLogs com o TTL das estatísticas do ambiente (LOG_STATS_CACHE_SECONDS, padrão 60)"""
+    return ConsultaLogs(db, modelo_log,
+                        ttl_estatisticas=int(os.environ.get('LOG_STATS_CACHE_SECONDS', '60')),
+                        modelo_resumo=modelo_resumo)
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Retenção dos logs de auditoria: arquivamento mensal da tabela Log e da aba "Logs"
+
+Mantém pequeno o conjunto ativo que a página /logs e a fila de logs consultam:
+  - Tabela Log: meses inteiros mais antigos que LOG_RETENTION_DAYS viram um CSV compactado
+    (GCS ou pasta local), as contagens por ação/entidade/status vão para LogResumo e as
+    linhas saem da tabela. As estatísticas da página /logs somam LogResumo ao que sobrou.
+  - Aba "Logs": as linhas de meses anteriores aos LOG_SHEET_KEEP_MONTHS mais recentes vão
+    para abas "Logs_AAAA_MM" (ou para CSV compactado, LOG_SHEET_ARCHIVE=arquivo), com as
+    contagens na aba "Logs_Resumo", e são removidas do topo da aba "Logs".
+
+Feito para rodar periodicamente (ex.: diariamente) por `flask arquivar-logs` ou pela rota
+POST /logs/arquivar. Uma execução sem meses vencidos não altera nada.
+"""
+
+import os
+import tempfile
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+
+from log_buffer import CABECALHOS_LOGS
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Aba com as contagens dos períodos arquivados da planilha
+ABA_RESUMO_LOGS = 'Logs_Resumo'
+CABECALHOS_RESUMO_LOGS = ['Período', 'Ação', 'Entidade', 'Status', 'Total', 'Destino', 'Arquivado em']
+
+# Linhas da aba "Logs" movidas por chamada à API (append_rows nas abas de arquivo)
+TAMANHO_LOTE_PLANILHA = 5000
+
+# Colunas da aba "Logs" usadas no resumo e na cópia (índices em CABECALHOS_LOGS)
+_COLUNA_ID = CABECALHOS_LOGS.index('ID')
+_COLUNA_DATA = CABECALHOS_LOGS.index('Data/Hora')
+_COLUNA_ACAO = CABECALHOS_LOGS.index('Ação')
+_COLUNA_ENTIDADE = CABECALHOS_LOGS.index('Entidade')
+_COLUNA_STATUS = CABECALHOS_LOGS.index('Status')
+
+
+def _linhas_novas(arquivadas, linhas):
+    """Linhas cujo ID ainda não está entre as arquivadas"""
+    ids = {str(linha[_COLUNA_ID]) for linha in arquivadas if linha}
+    return [linha for linha in linhas if str(linha[_COLUNA_ID]) not in ids]
+
+
+def inicio_mes(data):
+    """Primeiro instante do mês da data"""
+    return data.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def proximo_mes(data):
+    """Primeiro instante do mês seguinte"""
+    return inicio_mes(inicio_mes(data) + timedelta(days=32))
+
+
+def _periodo_planilha(valor):
+    """'dd/mm/AAAA HH:MM:SS' -> 'AAAA-MM' (ou None se não for uma data)"""
+    try:
+        data = datetime.strptime(str(valor).strip()[:10], '%d/%m/%Y')
+    except ValueError:
+        return None
+    return data.strftime('%Y-%m')
+
+
+def _gzip_csv(linhas):
+    """Compacta um CSV já montado (lista de linhas) em gzip"""
+    import csv
+    import io
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(linhas)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(buffer.getvalue().encode('utf-8')) + compressor.flush()
+
+
+def _ler_gzip_csv(conteudo):
+    """Linhas de um CSV compactado por _gzip_csv"""
+    import csv
+    import io
+    texto = zlib.decompress(conteudo, 31).decode('utf-8')
+    return list(csv.reader(io.StringIO(texto)))
+
+
+def _bucket_arquivo_logs():
+    """(bucket, nome do bucket) quando os arquivos vão para o Cloud Storage, senão (None, None)"""
+    from cloud_config import get_storage_config
+
+    config = get_storage_config()
+    if config['type'] != 'cloud_storage':
+        return None, None
+    from salvar_pdf_gcs import get_gcs_bucket
+    bucket = get_gcs_bucket(config['bucket_name'])
+    if bucket is None:
+        raise RuntimeError('Cloud Storage indisponível para o arquivo de logs')
+    return bucket, config['bucket_name']
+
+
+def salvar_arquivo_logs(nome, partes):
+    """
+    Grava um arquivo de logs arquivados no Cloud Storage ou numa pasta local
+
+    Segue PDF_STORAGE_BACKEND: com gcs vai para LOG_ARCHIVE_PREFIX (padrão arquivo/logs/)
+    no GCS_BUCKET_NAME; nos outros casos para LOG_ARCHIVE_DIR (padrão Logs_Arquivados).
+    Um arquivo com o mesmo nome é substituído.
+
+    Args:
+        nome: Nome do arquivo (ex.: logs_2026-01_20260301T030000.csv.gz)
+        partes: bytes ou iterável de bytes (ex.: ConsultaLogs.exportar_csv)
+
+    Returns:
+        str: Onde o arquivo ficou (gs://... ou caminho local)
+    """
+    if isinstance(partes, bytes):
+        partes = [partes]
+
+    bucket, bucket_name = _bucket_arquivo_logs()
+    if bucket is not None:
+        caminho = os.environ.get('LOG_ARCHIVE_PREFIX', 'arquivo/logs/') + nome
+        # Um mês compactado cabe com folga em memória; o upload precisa do conteúdo inteiro
+        bucket.blob(caminho).upload_from_string(b''.join(partes), content_type='application/gzip')
+        return f"gs://{bucket_name}/{caminho}"
+
+    pasta = os.environ.get('LOG_ARCHIVE_DIR', 'Logs_Arquivados')
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, nome)
+    # Gravar em arquivo temporário e renomear: nunca fica um arquivo pela metade
+    fd, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as arquivo:
+            for parte in partes:
+                arquivo.write(parte)
+        os.replace(temporario, caminho)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return caminho
+
+
+def ler_arquivo_logs(nome):
+    """
+    Conteúdo de um arquivo gravado por salvar_arquivo_logs
+
+    Returns:
+        bytes ou None se o arquivo não existe
+    """
+    bucket, _ = _bucket_arquivo_logs()
+    if bucket is not None:
+        from google.api_core.exceptions import NotFound
+        try:
+            return bucket.blob(os.environ.get('LOG_ARCHIVE_PREFIX', 'arquivo/logs/') + nome).download_as_bytes()
+        except NotFound:
+            return None
+
+    caminho = os.path.join(os.environ.get('LOG_ARCHIVE_DIR', 'Logs_Arquivados'), nome)
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, 'rb') as arquivo:
+        return arquivo.read()
+
+
+class RetencaoLogs:
+    """Arquivamento por idade da tabela Log e da aba "Logs" da planilha"""
+
+    def __init__(self, db, modelo_log, modelo_resumo, consulta=None, obter_planilha=None,
+                 dias_retencao=90, meses_planilha=1, destino_planilha='aba'):
+        """
+        Args:
+            db: instância do Flask-SQLAlchemy
+            modelo_log: modelo Log
+            modelo_resumo: modelo LogResumo (contagens dos períodos arquivados)
+            consulta: ConsultaLogs da página /logs (estatísticas invalidadas após arquivar)
+            obter_planilha: função que retorna a planilha (gspread.Spreadsheet) ou None
+            dias_retencao: logs mais novos que isso ficam na tabela (só meses inteiros saem)
+            meses_planilha: meses mantidos na aba "Logs", contando o atual
+            destino_planilha: 'aba' (abas Logs_AAAA_MM) ou 'arquivo' (CSV compactado)
+        """
+        self.db = db
+        self.Log = modelo_log
+        self.LogResumo = modelo_resumo
+        self.consulta = consulta
+        self.obter_planilha = obter_planilha
+        self.dias_retencao = dias_retencao
+        self.meses_planilha = max(meses_planilha, 1)
+        self.destino_planilha = destino_planilha
+
+    def limite_tabela(self, agora=None):
+        """Início do mês mais antigo que fica na tabela Log (meses anteriores são arquivados)"""
+        agora = agora or datetime.utcnow()
+        return inicio_mes(agora - timedelta(days=self.dias_retencao))
+
+    def limite_planilha(self, agora=None):
+        """Início do mês mais antigo que fica na aba "Logs" (horário local, como a coluna Data/Hora)"""
+        limite = inicio_mes(agora or datetime.now())
+        for _ in range(self.meses_planilha - 1):
+            limite = inicio_mes(limite - timedelta(days=1))
+        return limite
+
+    def arquivar_tabela(self, agora=None, gravar_arquivo=True):
+        """
+        Arquiva os meses vencidos da tabela Log, um mês por transação
+
+        Para cada mês: CSV compactado do mês, contagens somadas em LogResumo e remoção das
+        linhas. As contagens e a remoção são commitadas juntas e limitadas ao maior ID lido
+        no início, então o resumo bate exatamente com o que saiu da tabela.
+
+        Args:
+            agora: referência de tempo (padrão: agora, UTC como Log.timestamp)
+            gravar_arquivo: False só resume e remove (sem CSV)
+
+        Returns:
+            dict: {'success', 'message', 'periodos': [{'periodo', 'total', 'arquivo'}]}
+        """
+        Log = self.Log
+        limite = self.limite_tabela(agora)
+        periodos = []
+        try:
+            mais_antigo = self.db.session.query(self.db.func.min(Log.timestamp)).scalar()
+            id_maximo = self.db.session.query(self.db.func.max(Log.id)).filter(Log.timestamp < limite).scalar()
+            if mais_antigo is None or id_maximo is None:
+                return {'success': True, 'message': 'Nenhum log vencido na tabela', 'periodos': []}
+
+            mes = inicio_mes(mais_antigo)
+            while mes < limite:
+                fim = proximo_mes(mes)
+                resultado = self._arquivar_mes_tabela(mes, fim, id_maximo, gravar_arquivo)
+                if resultado:
+                    periodos.append(resultado)
+                mes = fim
+        except Exception as e:
+            self.db.session.rollback()
+            logger.error("❌ Erro ao arquivar logs da tabela: %s", e)
+            return {'success': False, 'message': f'Erro ao arquivar logs da tabela: {e}', 'periodos': periodos}
+        finally:
+            if periodos and self.consulta is not None:
+                self.consulta.invalidar_estatisticas()
+
+        total = sum(periodo['total'] for periodo in periodos)
+        return {
+            'success': True,
+            'message': f'{total} logs arquivados da tabela em {len(periodos)} período(s)',
+            'periodos': periodos
+        }
+
+    def _arquivar_mes_tabela(self, inicio, fim, id_maximo, gravar_arquivo):
+        Log = self.Log
+        LogResumo = self.LogResumo
+        periodo = inicio.strftime('%Y-%m')
+        filtros = {'timestamp_de': inicio, 'timestamp_ate': fim, 'id_maximo': id_maximo}
+        no_periodo = (Log.timestamp >= inicio, Log.timestamp < fim, Log.id <= id_maximo)
+
+        contagens = (self.db.session.query(Log.acao, Log.entidade, Log.status, self.db.func.count(Log.id))
+                     .filter(*no_periodo)
+                     .group_by(Log.acao, Log.entidade, Log.status)
+                     .all())
+        total = sum(quantidade for *_, quantidade in contagens)
+        if not total:
+            return None
+
+        arquivo = None
+        if gravar_arquivo and self.consulta is not None:
+            # Sufixo com data da execução: uma nova rodada no mesmo mês não sobrescreve a anterior
+            nome = f"logs_{periodo}_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.csv.gz"
+            arquivo = salvar_arquivo_logs(nome, self.consulta.exportar_csv(filtros, compactar=True))
+            logger.info("📦 Logs de %s arquivados em %s", periodo, arquivo)
+
+        existentes = {
+            (resumo.acao, resumo.entidade, resumo.status): resumo
+            for resumo in LogResumo.query.filter_by(periodo=periodo).all()
+        }
+        for acao, entidade, status, quantidade in contagens:
+            resumo = existentes.get((acao, entidade, status))
+            if resumo is None:
+                resumo = LogResumo(periodo=periodo, acao=acao, entidade=entidade, status=status, total=0)
+                self.db.session.add(resumo)
+            resumo.total += quantidade
+            resumo.arquivo = arquivo or resumo.arquivo
+            resumo.arquivado_em = datetime.utcnow()
+
+        removidos = (Log.query.filter(*no_periodo)
+                     .delete(synchronize_session=False))
+        self.db.session.commit()
+        logger.info("🗄️ %s logs de %s removidos da tabela (resumo em LogResumo)", removidos, periodo)
+        return {'periodo': periodo, 'total': removidos, 'arquivo': arquivo}
+
+    def arquivar_planilha(self, agora=None):
+        """
+        Move as linhas antigas do topo da aba "Logs" para abas mensais ou CSV compactado
+
+        A fila de logs só acrescenta no fim da aba, então as linhas vencidas são um bloco
+        contínuo logo abaixo do cabeçalho: lê a coluna Data/Hora e copia esse bloco mês a mês,
+        removendo cada mês do topo logo depois de copiá-lo e de resumi-lo.
+
+        Pode ser repetida depois de uma falha em qualquer ponto: cada mês tem um único destino
+        (aba Logs_AAAA_MM ou planilha_logs_AAAA-MM.csv.gz) onde os IDs já copiados não entram de
+        novo, e o resumo do mês em Logs_Resumo é recontado a partir desse destino (substitui o
+        anterior, nunca soma duas vezes). A última linha nunca sai (é dela que a fila continua
+        a numeração dos IDs).
+
+        Returns:
+            dict: {'success', 'message', 'periodos': [{'periodo', 'total', 'destino'}]}
+        """
+        planilha = self.obter_planilha() if self.obter_planilha else None
+        if not planilha:
+            return {'success': False, 'message': 'Planilha indisponível', 'periodos': []}
+
+        try:
+            aba = planilha.worksheet('Logs')
+            limite = self.limite_planilha(agora).strftime('%Y-%m')
+
+            # Quantas linhas (a partir da 2) são de meses vencidos
+            datas = aba.col_values(_COLUNA_DATA + 1)[1:]
+            vencidas = 0
+            periodo_anterior = None
+            for valor in datas[:-1]:
+                periodo = _periodo_planilha(valor) or periodo_anterior
+                if periodo is None or periodo >= limite:
+                    break
+                periodo_anterior = periodo
+                vencidas += 1
+            if not vencidas:
+                return {'success': True, 'message': 'Nenhum log vencido na planilha', 'periodos': []}
+
+            linhas = aba.get(f'A2:{self._coluna_final()}{vencidas + 1}')
+            # Blocos contíguos do mesmo mês, na ordem da aba (cada um é removido do topo)
+            blocos = []
+            periodo_anterior = None
+            for linha in linhas:
+                linha = list(linha) + [''] * (len(CABECALHOS_LOGS) - len(linha))
+                periodo = _periodo_planilha(linha[_COLUNA_DATA]) or periodo_anterior
+                periodo_anterior = periodo
+                if blocos and blocos[-1][0] == periodo:
+                    blocos[-1][1].append(linha)
+                else:
+                    blocos.append((periodo, [linha]))
+
+            periodos = []
+            for periodo, linhas_periodo in blocos:
+                destino, arquivadas = self._copiar_periodo_planilha(planilha, periodo, linhas_periodo)
+                self._gravar_resumo_planilha(planilha, periodo, arquivadas, destino)
+                # Só remove depois de copiar e resumir: uma falha antes daqui não perde nada
+                aba.delete_rows(2, len(linhas_periodo) + 1)
+                periodos.append({'periodo': periodo, 'total': len(linhas_periodo), 'destino': destino})
+            logger.info("🗄️ %s linhas antigas removidas da aba Logs", vencidas)
+        except Exception as e:
+            logger.error("❌ Erro ao arquivar aba Logs: %s", e)
+            return {'success': False, 'message': f'Erro ao arquivar aba Logs: {e}', 'periodos': []}
+
+        return {
+            'success': True,
+            'message': f'{vencidas} linhas da aba Logs arquivadas em {len(periodos)} período(s)',
+            'periodos': periodos
+        }
+
+    @staticmethod
+    def _coluna_final():
+        return chr(ord('A') + len(CABECALHOS_LOGS) - 1)
+
+    def _copiar_periodo_planilha(self, planilha, periodo, linhas):
+        """
+        Acrescenta as linhas de um mês ao destino do mês (aba Logs_AAAA_MM ou CSV compactado)
+
+        Linhas com ID já presente no destino (execução anterior interrompida) ficam de fora.
+
+        Returns:
+            tuple: (destino, todas as linhas do mês no destino, as de antes e as copiadas agora)
+        """
+        import gspread
+
+        if self.destino_planilha == 'arquivo':
+            nome = f"planilha_logs_{periodo}.csv.gz"
+            conteudo = ler_arquivo_logs(nome)
+            arquivadas = _ler_gzip_csv(conteudo)[1:] if conteudo else []
+            novas = _linhas_novas(arquivadas, linhas)
+            destino = salvar_arquivo_logs(nome, _gzip_csv([CABECALHOS_LOGS] + arquivadas + novas))
+            logger.info("📦 %s linhas de %s da aba Logs arquivadas em %s", len(novas), periodo, destino)
+            return destino, arquivadas + novas
+
+        titulo = 'Logs_' + periodo.replace('-', '_')
+        try:
+            aba_arquivo = planilha.worksheet(titulo)
+            arquivadas = aba_arquivo.get_all_values()[1:]
+        except gspread.WorksheetNotFound:
+            aba_arquivo = planilha.add_worksheet(title=titulo, rows=1, cols=len(CABECALHOS_LOGS))
+            aba_arquivo.append_rows([CABECALHOS_LOGS], value_input_option='RAW')
+            arquivadas = []
+        novas = _linhas_novas(arquivadas, linhas)
+        for inicio in range(0, len(novas), TAMANHO_LOTE_PLANILHA):
+            aba_arquivo.append_rows(novas[inicio:inicio + TAMANHO_LOTE_PLANILHA], value_input_option='RAW')
+        logger.info("📦 %s linhas de %s movidas para a aba %s", len(novas), periodo, titulo)
+        return titulo, arquivadas + novas
+
+    def _gravar_resumo_planilha(self, planilha, periodo, linhas_periodo, destino):
+        """
+        Contagens por ação/entidade/status do mês na aba Logs_Resumo
+
+        Substitui as linhas do mês que já existirem numa única escrita (linhas que sobrarem no
+        fim são apagadas na mesma chamada), então repetir o resumo não soma duas vezes.
+        """
+        import gspread
+
+        arquivado_em = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        contagens = Counter(
+            (linha[_COLUNA_ACAO], linha[_COLUNA_ENTIDADE], linha[_COLUNA_STATUS])
+            for linha in (list(linha) + [''] * (len(CABECALHOS_LOGS) - len(linha)) for linha in linhas_periodo)
+        )
+        novas = [[periodo, acao, entidade, status, total, destino, arquivado_em]
+                 for (acao, entidade, status), total in sorted(contagens.items())]
+
+        try:
+            aba_resumo = planilha.worksheet(ABA_RESUMO_LOGS)
+        except gspread.WorksheetNotFound:
+            aba_resumo = planilha.add_worksheet(title=ABA_RESUMO_LOGS, rows=1, cols=len(CABECALHOS_RESUMO_LOGS))
+            aba_resumo.append_rows([CABECALHOS_RESUMO_LOGS], value_input_option='RAW')
+
+        atuais = aba_resumo.get_all_values()
+        if not any(linha and linha[0] == periodo for linha in atuais[1:]):
+            if novas:
+                aba_resumo.append_rows(novas, value_input_option='RAW')
+            return
+
+        mantidas = [CABECALHOS_RESUMO_LOGS] + [linha for linha in atuais[1:] if linha and linha[0] != periodo]
+        valores = mantidas + novas
+        valores += [[''] * len(CABECALHOS_RESUMO_LOGS)] * (len(atuais) - len(valores))
+        if len(valores) > aba_resumo.row_count:
+            aba_resumo.add_rows(len(valores) - aba_resumo.row_count)
+        aba_resumo.update('A1', valores, value_input_option='RAW')
+
+    def executar(self, agora=None, planilha=True):
+        """
+        Arquiva a tabela Log e (opcionalmente) a aba "Logs"
+
+        Returns:
+            dict: {'success', 'message', 'tabela': {...}, 'planilha': {...} ou None}
+        """
+        tabela = self.arquivar_tabela(agora)
+        resultado_planilha = self.arquivar_planilha(agora) if planilha else None
+        mensagens = [tabela['message']]
+        if resultado_planilha:
+            mensagens.append(resultado_planilha['message'])
+        return {
+            'success': tabela['success'] and (resultado_planilha is None or resultado_planilha['success']),
+            'message': '; '.join(mensagens),
+            'tabela': tabela,
+            'planilha': resultado_planilha
+        }
+
+
+def criar_retencao_logs(db, modelo_log, modelo_resumo, consulta, obter_planilha):
+    """
+    RetencaoLogs com a configuração do ambiente
+
+    Variáveis: LOG_RETENTION_DAYS (90), LOG_SHEET_KEEP_MONTHS (1), LOG_SHEET_ARCHIVE (aba | arquivo)
+    """
+    destino = os.environ.get('LOG_SHEET_ARCHIVE', 'aba').strip().lower()
+    if destino not in ('aba', 'arquivo'):
+        logger.warning("⚠️ LOG_SHEET_ARCHIVE inválido (%s), usando aba", destino)
+        destino = 'aba'
+    return RetencaoLogs(
+        db,
+        modelo_log,
+        modelo_resumo,
+        consulta=consulta,
+        obter_planilha=obter_planilha,
+        dias_retencao=int(os.environ.get('LOG_RETENTION_DAYS', '90')),
+        meses_planilha=int(os.environ.get('LOG_SHEET_KEEP_MONTHS', '1')),
+        destino_planilha=destino,
+    )
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Logs de diagnóstico estruturados (JSON por linha), com níveis e amostragem
+
+- Um logger por módulo: logger = obter_logger(__name__)
+- LOG_LEVEL (padrão INFO): mensagens de DEBUG nem são formatadas. Nos laços por linha de
+  planilha, guardar o teste fora do laço:
+
+      debug = logger.isEnabledFor(logging.DEBUG)
+      for linha in linhas:
+          if debug:
+              logger.debug("Linha %s: %s", indice, linha)
+
+- LOG_FORMAT: json (padrão no Cloud Run/App Engine; uma linha JSON com severity, message,
+  logger, rota... que o coletor de logs da plataforma entende) ou texto (desenvolvimento)
+- Amostragem: a mesma mensagem (mesmo template, argumentos diferentes) do mesmo logger
+  passa LOG_SAMPLE_BURST vezes por janela de LOG_SAMPLE_SECONDS; depois só 1 a cada
+  LOG_SAMPLE_RATE. A primeira que passa na janela seguinte informa quantas foram suprimidas.
+  ERROR e acima nunca são amostrados.
+- A escrita no stdout acontece numa thread própria (QueueHandler/QueueListener): quem loga
+  não espera o pipe do gunicorn/Cloud Run. Em workers criados por fork a thread é recriada.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from metrics import _rota_atual as _rota_metricas
+
+_configurado = False
+_lock_configuracao = threading.Lock()
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro (campos reconhecidos pelo Cloud Logging: severity, message)"""
+
+    def format(self, record):
+        entrada = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'severity': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        rota = getattr(record, 'rota', None)
+        if rota:
+            entrada['rota'] = rota
+        campos = getattr(record, 'campos', None)
+        if campos:
+            entrada.update(campos)
+        suprimidas = getattr(record, 'suprimidas', 0)
+        if suprimidas:
+            entrada['suprimidas'] = suprimidas
+        if record.exc_info:
+            entrada['traceback'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entrada['traceback'] = record.exc_text
+        return json.dumps(entrada, ensure_ascii=False, default=str)
+
+
+class FormatadorTexto(logging.Formatter):
+    """Formato para o terminal em desenvolvimento (parecido com os prints de antes)"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s', '%H:%M:%S')
+
+    def format(self, record):
+        texto = super().format(record)
+        suprimidas = getattr(record, 'suprimidas', 0)
+        if suprimidas:
+            texto += f' (+{suprimidas} semelhantes suprimidas)'
+        return texto
+
+
+class FiltroAmostragem(logging.Filter):
+    """Limita mensagens repetitivas por (logger, template) e janela de tempo"""
+
+    def __init__(self, rajada=20, janela=60.0, taxa=100, nivel_maximo=logging.WARNING):
+        """
+        Args:
+            rajada: mensagens iguais que passam por janela antes de amostrar
+            janela: duração da janela em segundos
+            taxa: depois da rajada, passa 1 a cada taxa mensagens
+            nivel_maximo: níveis acima deste nunca são amostrados
+        """
+        super().__init__()
+        self.rajada = rajada
+        self.janela = janela
+        self.taxa = max(taxa, 1)
+        self.nivel_maximo = nivel_maximo
+        self._contadores = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.nivel_maximo:
+            return True
+        chave = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg))
+        agora = time.monotonic()
+        with self._lock:
+            contador = self._contadores.get(chave)
+            if contador is None or agora - contador[0] >= self.janela:
+                suprimidas = contador[2] if contador else 0
+                # [início da janela, vistas na janela, suprimidas ainda não informadas]
+                self._contadores[chave] = [agora, 1, 0]
+                if len(self._contadores) > 10000:
+                    self._contadores = {chave: self._contadores[chave]}
+            else:
+                contador[1] += 1
+                vistas = contador[1]
+                if vistas > self.rajada and (vistas - self.rajada) % self.taxa:
+                    contador[2] += 1
+                    return False
+                suprimidas = contador[2]
+                contador[2] = 0
+        record.suprimidas = suprimidas
+        return True
+
+
+def _rota_atual():
+    """Rota da requisição em andamento (mesma fonte das métricas) ou None"""
+    valor = _rota_metricas.get()
+    return None if valor == 'fundo' else valor
+
+
+def _formato_padrao():
+    # Em produção o coletor de logs da plataforma lê o stdout como JSON
+    if os.getenv('K_SERVICE') or os.getenv('GAE_APPLICATION'):
+        return 'json'
+    return 'texto'
+
+
+def configurar_logging(nivel=None, formato=None, fluxo=None):
+    """
+    Configura o logging do processo (uma vez; chamadas seguintes não fazem nada)
+
+    Args:
+        nivel: nível mínimo (padrão: LOG_LEVEL ou INFO)
+        formato: 'json' ou 'texto' (padrão: LOG_FORMAT, json no Cloud Run/App Engine)
+        fluxo: destino das linhas (padrão: sys.stdout)
+    """
+    global _configurado
+    with _lock_configuracao:
+        if _configurado:
+            return
+        _configurado = True
+
+    nivel = (nivel or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    formato = (formato or os.getenv('LOG_FORMAT') or _formato_padrao()).lower()
+
+    saida = logging.StreamHandler(fluxo or sys.stdout)
+    saida.setFormatter(FormatadorJSON() if formato == 'json' else FormatadorTexto())
+
+    # Quem loga só enfileira; a thread do listener formata e escreve
+    fila = queue.SimpleQueue()
+    enfileirador = logging.handlers.QueueHandler(fila)
+    enfileirador.addFilter(FiltroAmostragem(
+        rajada=int(os.getenv('LOG_SAMPLE_BURST', '20')),
+        janela=float(os.getenv('LOG_SAMPLE_SECONDS', '60')),
+        taxa=int(os.getenv('LOG_SAMPLE_RATE', '100')),
+    ))
+    # Só mensagem/rota são resolvidas por quem loga; formatar e escrever fica com o listener
+    enfileirador.prepare = _preparar_registro
+    ouvinte = logging.handlers.QueueListener(fila, saida, respect_handler_level=False)
+    ouvinte.start()
+    atexit.register(ouvinte.stop)
+
+    def _reiniciar_no_filho():
+        # Com preload_app o gunicorn importa o app no master e faz fork: a thread do
+        # listener não existe no worker. Fila nova (a herdada pode estar com o lock preso)
+        nova_fila = queue.SimpleQueue()
+        enfileirador.queue = nova_fila
+        ouvinte.queue = nova_fila
+        ouvinte._thread = None
+        ouvinte.start()
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_reiniciar_no_filho)
+
+    raiz = logging.getLogger()
+    raiz.setLevel(getattr(logging, nivel, logging.INFO))
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+    raiz.addHandler(enfileirador)
+    # Bibliotecas muito verbosas em DEBUG
+    for barulhento in ('urllib3', 'google', 'gspread', 'werkzeug'):
+        logging.getLogger(barulhento).setLevel(max(raiz.level, logging.INFO))
+
+
+def _preparar_registro(record):
+    """
+    Substituto do QueueHandler.prepare: resolve na thread de quem loga só o que depende do
+    momento (mensagem, traceback, rota) e deixa a formatação para a thread de saída
+    """
+    record.msg = record.getMessage()
+    record.args = None
+    if record.exc_info:
+        record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+    if not getattr(record, 'rota', None):
+        record.rota = _rota_atual()
+    return record
+
+
+def obter_logger(nome):
+    """Logger do módulo (configura o logging do processo na primeira chamada)"""
+    configurar_logging()
+    return logging.getLogger(nome)
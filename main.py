@@ -3,14 +3,17 @@ Ponto de entrada para o Google Cloud App Engine
 Este arquivo é necessário para o deploy no Google Cloud
 """
 
-from app import app, db, cache_manager
+from gestao import criar_app
+from gestao.cli import inicializar_banco
+from gestao.factory import iniciar_aquecimento
 
-# Atualizar criação de índices antes do primeiro request
+app = criar_app()
+
+# Em desenvolvimento: banco (tabelas, índices, admin) antes do primeiro request
 if __name__ == '__main__':
     with app.app_context():
-        # Criar tabelas se não existirem
-        db.create_all()
-        
-        print("🚀 Aplicação iniciada com sucesso!")
-        app.run(debug=False, host='0.0.0.0', port=8080)
-
+        inicializar_banco()
+    
+    print("🚀 Aplicação iniciada com sucesso!")
+    iniciar_aquecimento(app)
+    app.run(debug=False, host='0.0.0.0', port=8080)
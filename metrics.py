@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Métricas de latência por rota e por chamada externa (formato texto do Prometheus)
+
+- Cada requisição é medida por rota, método e status (app_requisicao_segundos)
+- Chamadas externas e trechos pesados são medidos em spans, agregados por rota e operação
+  (app_operacao_segundos): leituras/escritas do Sheets, armazenamento de PDFs, motores
+  de PDF, processamento com pandas e renderização Jinja
+- Tudo em histogramas com faixas fixas, em memória por processo; exposto na rota
+  /admin/metrics
+
+Uso:
+    with medir('sheets.get_all_values'):
+        ...
+
+    @cronometrar('pandas.process_google_sheets_data')
+    def process_google_sheets_data(...): ...
+
+    instrumentar(gspread.Worksheet, ['get_all_values', 'append_rows'], 'sheets')
+
+Custo: um span são duas leituras de perf_counter, um lock e uma busca binária nas faixas
+(~1-2 µs, ver benchmarks/benchmark_metrics.py). METRICS_ENABLED=false desliga tudo.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+# Limites superiores das faixas dos histogramas, em segundos
+FAIXAS_PADRAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRICAS_HABILITADAS = os.environ.get('METRICS_ENABLED', 'true').lower() in ['true', 'on', '1']
+
+# Rota da requisição em andamento (fora de requisição: threads de fundo, CLI)
+_rota_atual = ContextVar('rota_metricas', default='fundo')
+# Prefixo da operação instrumentada em andamento (evita contar chamadas internas aninhadas)
+_operacao_externa = ContextVar('operacao_externa_metricas', default=None)
+
+
+class Histograma:
+    """Contagens por faixa, soma e total de observações"""
+
+    __slots__ = ('contagens', 'soma', 'total')
+
+    def __init__(self, quantidade_faixas):
+        # Uma posição por faixa + a faixa +Inf
+        self.contagens = [0] * (quantidade_faixas + 1)
+        self.soma = 0.0
+        self.total = 0
+
+
+class RegistroMetricas:
+    """Histogramas nomeados com rótulos, thread-safe"""
+
+    def __init__(self, faixas=FAIXAS_PADRAO):
+        self.faixas = tuple(faixas)
+        self._histogramas = {}
+        self._descricoes = {}
+        self._lock = threading.Lock()
+
+    def descrever(self, nome, descricao, nomes_rotulos):
+        """Registra o texto de ajuda e os nomes dos rótulos de uma métrica"""
+        self._descricoes[nome] = (descricao, tuple(nomes_rotulos))
+
+    def observar(self, nome, rotulos, segundos):
+        """
+        Registra uma observação
+
+        Args:
+            nome: nome da métrica (ex.: app_operacao_segundos)
+            rotulos: tupla com os valores dos rótulos, na ordem de descrever()
+            segundos: duração medida
+        """
+        indice = bisect_left(self.faixas, segundos)
+        chave = (nome, rotulos)
+        with self._lock:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                histograma = self._histogramas[chave] = Histograma(len(self.faixas))
+            histograma.contagens[indice] += 1
+            histograma.soma += segundos
+            histograma.total += 1
+
+    def limpar(self):
+        with self._lock:
+            self._histogramas.clear()
+
+    def resumo(self):
+        """{(nome, rotulos): (total, soma)} - para inspeção e benchmarks"""
+        with self._lock:
+            return {chave: (h.total, h.soma) for chave, h in self._histogramas.items()}
+
+    def exportar(self):
+        """
+        Todas as métricas no formato de exposição em texto do Prometheus (versão 0.0.4)
+
+        Returns:
+            str
+        """
+        with self._lock:
+            copia = {chave: (list(h.contagens), h.soma, h.total) for chave, h in self._histogramas.items()}
+
+        linhas = []
+        for nome in sorted({nome for nome, _ in copia}):
+            descricao, nomes_rotulos = self._descricoes.get(nome, (nome, ()))
+            linhas.append(f"# HELP {nome} {descricao}")
+            linhas.append(f"# TYPE {nome} histogram")
+            for (nome_chave, rotulos), (contagens, soma, total) in sorted(copia.items()):
+                if nome_chave != nome:
+                    continue
+                pares = [f'{rotulo}="{_escapar(valor)}"' for rotulo, valor in zip(nomes_rotulos, rotulos)]
+                prefixo_faixa = ','.join(pares) + (',' if pares else '')
+                acumulado = 0
+                for limite, contagem in zip(self.faixas, contagens):
+                    acumulado += contagem
+                    linhas.append(f'{nome}_bucket{{{prefixo_faixa}le="{limite}"}} {acumulado}')
+                linhas.append(f'{nome}_bucket{{{prefixo_faixa}le="+Inf"}} {total}')
+                rotulos_texto = '{' + ','.join(pares) + '}' if pares else ''
+                linhas.append(f'{nome}_sum{rotulos_texto} {soma:.6f}')
+                linhas.append(f'{nome}_count{rotulos_texto} {total}')
+        return '\n'.join(linhas) + '\n'
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registro = RegistroMetricas()
+registro.descrever('app_requisicao_segundos', 'Duração das requisições por rota', ('rota', 'metodo', 'status'))
+registro.descrever('app_operacao_segundos', 'Duração de chamadas externas e trechos medidos, por rota',
+                   ('rota', 'operacao'))
+
+
+class _Span:
+    """Context manager de medir(); leve de propósito (__slots__, sem alocação extra)"""
+
+    __slots__ = ('operacao', 'inicio')
+
+    def __init__(self, operacao):
+        self.operacao = operacao
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        registro.observar('app_operacao_segundos', (_rota_atual.get(), self.operacao),
+                          time.perf_counter() - self.inicio)
+        return False
+
+
+class _SpanDesligado:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_SPAN_DESLIGADO = _SpanDesligado()
+
+
+def medir(operacao):
+    """
+    Span: mede o bloco e registra na rota atual
+
+    Args:
+        operacao: nome da operação (ex.: 'sheets.batch_update', 'pdf.chrome')
+    """
+    if not METRICAS_HABILITADAS:
+        return _SPAN_DESLIGADO
+    return _Span(operacao)
+
+
+def cronometrar(operacao):
+    """Decorator: mede cada chamada da função como um span"""
+    def decorator(func):
+        if not METRICAS_HABILITADAS:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(operacao):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrumentar(classe, metodos, prefixo):
+    """
+    Envolve métodos de uma classe (ex.: gspread.Worksheet) em spans "<prefixo>.<método>"
+
+    Chamadas aninhadas com o mesmo prefixo (get_all_records chama get_values) contam uma
+    vez só, na mais externa. Chamar de novo para a mesma classe não envolve duas vezes.
+
+    Args:
+        classe: classe cujos métodos serão medidos
+        metodos: nomes dos métodos (os que não existirem na classe são ignorados)
+        prefixo: prefixo da operação (ex.: 'sheets', 'storage.gcs')
+    """
+    if not METRICAS_HABILITADAS:
+        return
+    for nome in metodos:
+        original = getattr(classe, nome, None)
+        if original is None or getattr(original, '_metricas_original', None) is not None:
+            continue
+        setattr(classe, nome, _envolver_metodo(original, f'{prefixo}.{nome}', prefixo))
+
+
+def _envolver_metodo(original, operacao, prefixo):
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        if _operacao_externa.get() == prefixo:
+            return original(*args, **kwargs)
+        token = _operacao_externa.set(prefixo)
+        inicio = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            registro.observar('app_operacao_segundos', (_rota_atual.get(), operacao),
+                              time.perf_counter() - inicio)
+            _operacao_externa.reset(token)
+    wrapper._metricas_original = original
+    return wrapper
+
+
+def instalar_metricas(app):
+    """
+    Mede as requisições e a renderização de templates do app Flask
+
+    Registrar logo depois de criar o app, para que o tempo dos outros before_request
+    também entre na medida da rota.
+    """
+    if not METRICAS_HABILITADAS:
+        return
+    from flask import g, request, before_render_template, template_rendered
+
+    @app.before_request
+    def _iniciar_medida_requisicao():
+        g._metricas_inicio = time.perf_counter()
+        g._metricas_token_rota = _rota_atual.set(request.endpoint or 'desconhecida')
+
+    @app.after_request
+    def _registrar_medida_requisicao(response):
+        inicio = g.pop('_metricas_inicio', None)
+        if inicio is not None:
+            registro.observar('app_requisicao_segundos',
+                              (request.endpoint or 'desconhecida', request.method, str(response.status_code)),
+                              time.perf_counter() - inicio)
+        return response
+
+    @app.teardown_request
+    def _encerrar_medida_requisicao(excecao=None):
+        token = g.pop('_metricas_token_rota', None)
+        if token is not None:
+            _rota_atual.reset(token)
+
+    def _inicio_template(sender, template, context, **extra):
+        g._metricas_template = time.perf_counter()
+
+    def _fim_template(sender, template, context, **extra):
+        inicio = g.pop('_metricas_template', None)
+        if inicio is not None:
+            registro.observar('app_operacao_segundos', (_rota_atual.get(), 'jinja.render'),
+                              time.perf_counter() - inicio)
+
+    before_render_template.connect(_inicio_template, app, weak=False)
+    template_rendered.connect(_fim_template, app, weak=False)
@@ -11,6 +11,10 @@ import shutil
 import tempfile
 from datetime import datetime
 
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
 def gerar_pdf_browser_romaneio(romaneio_data, itens_data, is_reprint=False):
     """
     Gera PDF usando o navegador - LAYOUT 100% IDÊNTICO ao formulario_impressao.html
@@ -472,7 +476,7 @@ def gerar_pdf_browser_romaneio(romaneio_data, itens_data, is_reprint=False):
         return filepath
         
     except Exception as e:
-        print(f"❌ Erro ao gerar HTML: {e}")
+        logger.error("❌ Erro ao gerar HTML: %s", e)
         return None
 
 def abrir_pdf_no_navegador(filepath):
@@ -486,269 +490,249 @@ def abrir_pdf_no_navegador(filepath):
         # Abrir no navegador padrão
         webbrowser.open(file_url)
         
-        print(f"✅ Arquivo aberto no navegador: {file_url}")
+        logger.info("✅ Arquivo aberto no navegador: %s", file_url)
         return True
         
     except Exception as e:
-        print(f"❌ Erro ao abrir no navegador: {e}")
+        logger.error("❌ Erro ao abrir no navegador: %s", e)
         return False
 
-def salvar_pdf_direto_html(html_content, romaneio_data, pasta_destino=None, is_reprint=False):
+# Caminhos comuns do Chrome/Edge no Windows e Linux (Cloud Run)
+CAMINHOS_NAVEGADOR_WINDOWS = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    r"C:\Users\{}\AppData\Local\Google\Chrome\Application\chrome.exe".format(os.getenv('USERNAME', '')),
+    r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+    r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"
+]
+CAMINHOS_NAVEGADOR_LINUX = [
+    '/usr/bin/google-chrome',
+    '/usr/bin/google-chrome-stable',
+    '/usr/bin/chromium',
+    '/usr/bin/chromium-browser',
+    '/snap/bin/chromium'
+]
+
+# Opções do Page.printToPDF: o tamanho/margens vêm do @page do template
+OPCOES_PRINT_TO_PDF = {
+    'printBackground': True,
+    'preferCSSPageSize': True,
+    'displayHeaderFooter': False,
+}
+
+def encontrar_navegador():
+    """Retorna o caminho do Chrome/Edge instalado ou None"""
+    caminhos = CAMINHOS_NAVEGADOR_WINDOWS if sys.platform == 'win32' else CAMINHOS_NAVEGADOR_LINUX
+    for path in caminhos:
+        if os.path.exists(path):
+            return path
+    # Tentar encontrar no PATH (funciona em Windows e Linux)
+    for cmd in ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome', 'msedge']:
+        if shutil.which(cmd):
+            return cmd
+    return None
+
+def _flags_navegador():
+    """Flags do modo headless (Linux precisa das flags adicionais para rodar no Docker)"""
+    flags = ['--headless', '--disable-gpu']
+    if sys.platform != 'win32':
+        flags += [
+            '--no-sandbox',  # Necessário para rodar como root no Docker
+            '--disable-dev-shm-usage',  # Evita problemas de memória compartilhada
+            '--disable-software-rasterizer',
+        ]
+    return flags
+
+class _ConexaoDevTools:
+    """
+    Conexão com o Chrome pelo protocolo DevTools via --remote-debugging-pipe
+
+    O Chrome lê comandos do fd 3 e escreve respostas no fd 4 (JSON terminado em \\0).
+    Não abre porta de rede nem precisa de biblioteca de websocket.
+    """
+
+    def __init__(self, browser_path, timeout=60):
+        import fcntl
+        import time
+        self.timeout = timeout
+        self.prazo = time.monotonic() + timeout
+        self._proximo_id = 0
+        self._buffer = b''
+        # Pipes: nós -> Chrome (fd 3 do Chrome) e Chrome -> nós (fd 4 do Chrome)
+        leitura, self._escrita = os.pipe()
+        self._leitura, escrita = os.pipe()
+        # Levar as pontas do Chrome para fds >= 10: os dup2 para 3 e 4 abaixo não podem
+        # sobrescrever uma ponta que por acaso já seja o fd 3 ou 4 neste processo
+        leitura_chrome = fcntl.fcntl(leitura, fcntl.F_DUPFD_CLOEXEC, 10)
+        escrita_chrome = fcntl.fcntl(escrita, fcntl.F_DUPFD_CLOEXEC, 10)
+        os.close(leitura)
+        os.close(escrita)
+        devnull = os.open(os.devnull, os.O_RDWR | os.O_CLOEXEC)
+        try:
+            # posix_spawn remapeia os fds sem preexec_fn (que não é seguro com threads)
+            argv = [browser_path, *_flags_navegador(), '--remote-debugging-pipe', 'about:blank']
+            self.pid = os.posix_spawnp(browser_path, argv, os.environ, file_actions=[
+                (os.POSIX_SPAWN_DUP2, devnull, 0),
+                (os.POSIX_SPAWN_DUP2, devnull, 1),
+                (os.POSIX_SPAWN_DUP2, devnull, 2),
+                (os.POSIX_SPAWN_DUP2, leitura_chrome, 3),
+                (os.POSIX_SPAWN_DUP2, escrita_chrome, 4),
+            ])
+        except OSError:
+            os.close(self._escrita)
+            os.close(self._leitura)
+            raise
+        finally:
+            os.close(leitura_chrome)
+            os.close(escrita_chrome)
+            os.close(devnull)
+
+    def enviar(self, metodo, params=None, session_id=None):
+        """Envia um comando e espera a resposta (eventos recebidos no meio são ignorados)"""
+        import json
+        self._proximo_id += 1
+        mensagem = {'id': self._proximo_id, 'method': metodo, 'params': params or {}}
+        if session_id:
+            mensagem['sessionId'] = session_id
+        dados = json.dumps(mensagem).encode('utf-8') + b'\0'
+        while dados:
+            dados = dados[os.write(self._escrita, dados):]
+        while True:
+            resposta = self._receber()
+            if resposta.get('id') == self._proximo_id:
+                if 'error' in resposta:
+                    raise RuntimeError(f"{metodo}: {resposta['error'].get('message')}")
+                return resposta.get('result', {})
+
+    def _receber(self):
+        import json
+        import select
+        import time
+        while b'\0' not in self._buffer:
+            restante = self.prazo - time.monotonic()
+            if restante <= 0:
+                raise TimeoutError(f'Chrome não respondeu em {self.timeout}s')
+            prontos, _, _ = select.select([self._leitura], [], [], restante)
+            if prontos:
+                bloco = os.read(self._leitura, 1024 * 1024)
+                if not bloco:
+                    raise RuntimeError('Chrome encerrou a conexão DevTools')
+                self._buffer += bloco
+        mensagem, self._buffer = self._buffer.split(b'\0', 1)
+        return json.loads(mensagem)
+
+    def fechar(self):
+        import signal
+        import time
+        try:
+            self.enviar('Browser.close')
+            espera = 5
+        except Exception:
+            # Chrome travado ou já encerrado: não vale esperar a saída normal
+            espera = 0
+        for fd in (self._escrita, self._leitura):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        # Aguardar o Chrome sair e garantir que não fique processo órfão/zumbi
+        prazo = time.monotonic() + espera
+        while os.waitpid(self.pid, os.WNOHANG) == (0, 0):
+            if time.monotonic() >= prazo:
+                os.kill(self.pid, signal.SIGKILL)
+                os.waitpid(self.pid, 0)
+                break
+            time.sleep(0.05)
+
+def gerar_pdf_devtools(browser_path, html_content, timeout=60):
+    """
+    Gera o PDF em memória: o HTML é injetado com Page.setDocumentContent e o PDF volta
+    do Page.printToPDF em base64 - nenhum arquivo é gravado em disco
+
+    Returns:
+        bytes: Conteúdo do PDF
+    """
+    import base64
+    conexao = _ConexaoDevTools(browser_path, timeout)
+    try:
+        target_id = conexao.enviar('Target.createTarget', {'url': 'about:blank'})['targetId']
+        session_id = conexao.enviar('Target.attachToTarget', {'targetId': target_id, 'flatten': True})['sessionId']
+        frame_id = conexao.enviar('Page.getFrameTree', session_id=session_id)['frameTree']['frame']['id']
+        conexao.enviar('Page.setDocumentContent', {'frameId': frame_id, 'html': html_content}, session_id)
+        resultado = conexao.enviar('Page.printToPDF', OPCOES_PRINT_TO_PDF, session_id)
+        return base64.b64decode(resultado['data'])
+    finally:
+        conexao.fechar()
+
+def gerar_pdf_linha_comando(browser_path, html_content, timeout=60):
+    """
+    Gera o PDF com --print-to-pdf (Windows/Edge, onde o pipe do DevTools não está disponível)
+
+    Os arquivos ficam num diretório temporário próprio, removido ao final mesmo em caso de erro.
+
+    Returns:
+        bytes: Conteúdo do PDF
     """
-    Salva PDF diretamente do HTML já renderizado (otimizado)
-    Gera em arquivo temporário se pasta_destino for None
+    with tempfile.TemporaryDirectory(prefix='romaneio_pdf_') as pasta:
+        html_path = os.path.join(pasta, 'romaneio.html')
+        pdf_path = os.path.join(pasta, 'romaneio.pdf')
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        file_url = f"file:///{os.path.abspath(html_path).replace(os.sep, '/')}"
+        cmd = [browser_path, *_flags_navegador(), '--print-to-pdf=' + pdf_path, file_url]
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+        if result.returncode != 0 or not os.path.exists(pdf_path):
+            erro = result.stderr.decode('utf-8', errors='ignore') if result.stderr else 'Erro desconhecido'
+            raise RuntimeError(f'Chrome falhou (código {result.returncode}): {erro[:500]}')
+        with open(pdf_path, 'rb') as f:
+            return f.read()
+
+def salvar_pdf_direto_html(html_content, romaneio_data, pasta_destino=None, is_reprint=False, itens_data=None):
+    """
+    Gera o PDF do HTML já renderizado com o Chrome headless, direto em memória
+    (itens_data é ignorado - mantido para compatibilidade com os outros geradores)
+
+    Os bytes vão para o armazenamento configurado (pdf_storage). pasta_destino, se informada,
+    grava uma cópia local extra.
     """
     try:
-        import subprocess
-        import shutil
-        import tempfile
-        
-        # Nome do arquivo
         romaneio_id = romaneio_data.get('id_impressao', 'ROM-000001')
-        if is_reprint:
-            filename = f"{romaneio_id}_Copia.pdf"
-        else:
-            filename = f"{romaneio_id}.pdf"
-        
-        # Se pasta_destino for None, usar arquivo temporário
-        if pasta_destino is None:
-            temp_dir = tempfile.gettempdir()
-            filepath = os.path.join(temp_dir, filename)
-        else:
-            # Criar pasta se não existir
-            os.makedirs(pasta_destino, exist_ok=True)
-            filepath = os.path.join(pasta_destino, filename)
         
         # Adicionar identificação de cópia se necessário
-        if is_reprint:
-            # Modificar o título para incluir "CÓPIA"
-            html_content = html_content.replace(
-                '<h2>Romaneio de Separação</h2>', 
-                '<h2 style="color: red; border: 2px solid red; padding: 10px; background-color: #ffebee;">📋 CÓPIA - Romaneio de Separação</h2>'
-            )
-            
-            # Modificar o ID do romaneio para incluir "CÓPIA"
-            romaneio_id = romaneio_data.get('id_impressao', 'ROM-000001')
-            html_content = html_content.replace(
-                f'ROM-{romaneio_id.split("-")[-1]}',
-                f'ROM-{romaneio_id.split("-")[-1]} - CÓPIA'
-            )
-            
-            # Adicionar texto no rodapé com data de reimpressão
-            data_reimpressao = romaneio_data.get('data_reimpressao', '')
-            if data_reimpressao:
-                rodape_texto = f'Sistema v4.0.0 - Romaneios de Separação | ⚠️ DOCUMENTO DE CÓPIA/REIMPRESSÃO<br><strong>Reimpressão realizada em: {data_reimpressao}</strong>'
-            else:
-                rodape_texto = 'Sistema v4.0.0 - Romaneios de Separação | ⚠️ DOCUMENTO DE CÓPIA/REIMPRESSÃO'
-            
-            html_content = html_content.replace(
-                'Sistema v4.0.0 - Romaneios de Separação',
-                rodape_texto
-            )
-        
-        # Criar arquivo HTML temporário
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as temp_file:
-            temp_file.write(html_content)
-            temp_html_path = temp_file.name
-        
-        try:
-            # Converter caminho para URL file://
-            file_url = f"file:///{os.path.abspath(temp_html_path).replace(os.sep, '/')}"
-            
-            # Caminhos comuns do Chrome/Edge no Windows e Linux
-            chrome_paths = []
-            
-            # Windows
-            if sys.platform == 'win32':
-                chrome_paths = [
-                    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-                    r"C:\Users\{}\AppData\Local\Google\Chrome\Application\chrome.exe".format(os.getenv('USERNAME', '')),
-                    r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-                    r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"
-                ]
-            else:
-                # Linux (Cloud Run)
-                chrome_paths = [
-                    '/usr/bin/google-chrome',
-                    '/usr/bin/google-chrome-stable',
-                    '/usr/bin/chromium',
-                    '/usr/bin/chromium-browser',
-                    '/snap/bin/chromium'
-                ]
-            
-            # Encontrar Chrome/Edge instalado
-            browser_path = None
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    browser_path = path
-                    break
-            
-            if not browser_path:
-                # Tentar encontrar no PATH (funciona em Windows e Linux)
-                for cmd in ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome', 'msedge']:
-                    if shutil.which(cmd):
-                        browser_path = cmd
-                        break
-            
-            if browser_path:
-                # Usar caminho absoluto para o PDF
-                abs_filepath = os.path.abspath(filepath)
-                
-                # Comando para gerar PDF (Linux precisa de flags adicionais)
-                if sys.platform == 'win32':
-                    # Windows
-                    if 'msedge' in browser_path.lower():
-                        cmd = [browser_path, '--headless', '--disable-gpu', '--print-to-pdf=' + abs_filepath, file_url]
-                    else:
-                        cmd = [browser_path, '--headless', '--disable-gpu', '--print-to-pdf=' + abs_filepath, file_url]
-                else:
-                    # Linux (Cloud Run)
-                    cmd = [
-                        browser_path,
-                        '--headless',
-                        '--disable-gpu',
-                        '--no-sandbox',  # Necessário para rodar como root no Docker
-                        '--disable-dev-shm-usage',  # Evita problemas de memória compartilhada
-                        '--disable-software-rasterizer',
-                        '--print-to-pdf=' + abs_filepath,
-                        file_url
-                    ]
-                
-                print(f"🔄 Gerando PDF com: {browser_path}")
-                print(f"📋 Comando: {' '.join(cmd)}")
-                print(f"📄 Arquivo destino: {filepath}")
-                
-                result = subprocess.run(cmd, capture_output=True, timeout=60)
-                
-                print(f"📊 Resultado do Chrome:")
-                print(f"   Return code: {result.returncode}")
-                if result.stdout:
-                    print(f"   Stdout: {result.stdout.decode('utf-8', errors='ignore')[:200]}")
-                if result.stderr:
-                    print(f"   Stderr: {result.stderr.decode('utf-8', errors='ignore')[:200]}")
-                
-                # Verificar se arquivo foi criado
-                if os.path.exists(filepath):
-                    file_size = os.path.getsize(filepath)
-                    print(f"✅ Arquivo criado: {filepath} ({file_size} bytes)")
-                else:
-                    print(f"❌ Arquivo NÃO foi criado: {filepath}")
-                
-                if result.returncode == 0 and os.path.exists(filepath):
-                    print(f"✅ PDF gerado automaticamente: {filepath}")
-                    
-                    # SEMPRE salvar no Cloud Storage após gerar o PDF
-                    print(f"🔍 === INICIANDO SALVAMENTO NO CLOUD STORAGE ===")
-                    print(f"📄 Arquivo gerado: {filepath}")
-                    print(f"📏 Verificando tamanho do arquivo...")
-                    
-                    try:
-                        # Verificar se arquivo existe e tem tamanho válido
-                        if not os.path.exists(filepath):
-                            print(f"❌ ERRO: Arquivo não existe: {filepath}")
-                            return {'success': True, 'message': 'PDF gerado mas arquivo não encontrado', 'file_path': filepath}
-                        
-                        file_size = os.path.getsize(filepath)
-                        if file_size == 0:
-                            print(f"❌ ERRO: Arquivo está vazio: {filepath}")
-                            return {'success': True, 'message': 'PDF gerado mas arquivo está vazio', 'file_path': filepath}
-                        
-                        print(f"✅ Arquivo existe e tem {file_size} bytes")
-                        
-                        # Importar função de salvamento
-                        from salvar_pdf_gcs import salvar_pdf_gcs
-                        
-                        # Ler o PDF gerado
-                        print(f"📖 Lendo conteúdo do PDF...")
-                        with open(filepath, 'rb') as f:
-                            pdf_content = f.read()
-                        
-                        print(f"📊 Conteúdo lido: {len(pdf_content)} bytes")
-                        
-                        # Validar se é um PDF válido
-                        if not pdf_content.startswith(b'%PDF'):
-                            print(f"❌ ERRO: Arquivo não é um PDF válido (começa com: {pdf_content[:50]})")
-                            return {'success': True, 'message': 'PDF gerado mas conteúdo inválido', 'file_path': filepath}
-                        
-                        print(f"✅ PDF válido detectado")
-                        
-                        # Obter bucket name
-                        bucket_name = os.environ.get('GCS_BUCKET_NAME', 'romaneios-separacao')
-                        print(f"☁️ === SALVANDO NO CLOUD STORAGE ===")
-                        print(f"📦 Bucket: {bucket_name}")
-                        print(f"🆔 Romaneio ID: {romaneio_id}")
-                        print(f"📤 Chamando salvar_pdf_gcs...")
-                        
-                        # Salvar no Cloud Storage
-                        gcs_path = salvar_pdf_gcs(pdf_content, romaneio_id, bucket_name, is_reprint)
-                        
-                        if gcs_path:
-                            print(f"✅ === SUCESSO: PDF SALVO NO CLOUD STORAGE ===")
-                            print(f"✅ Caminho: {gcs_path}")
-                            return {
-                                'success': True, 
-                                'message': 'PDF gerado e salvo no Cloud Storage', 
-                                'file_path': filepath,
-                                'gcs_path': gcs_path
-                            }
-                        else:
-                            print(f"❌ === FALHA: salvar_pdf_gcs retornou None ===")
-                            print(f"⚠️ Arquivo temporário mantido em: {filepath} para tentativa posterior")
-                            return {'success': True, 'message': 'PDF gerado (não salvo no Cloud Storage - retornou None)', 'file_path': filepath}
-                            
-                    except ImportError as import_error:
-                        print(f"❌ ERRO CRÍTICO: Não foi possível importar salvar_pdf_gcs: {import_error}")
-                        import traceback
-                        traceback.print_exc()
-                        return {'success': True, 'message': 'PDF gerado (erro ao importar função de salvamento)', 'file_path': filepath}
-                    except Exception as gcs_error:
-                        print(f"❌ === ERRO AO SALVAR NO CLOUD STORAGE ===")
-                        print(f"❌ Tipo do erro: {type(gcs_error).__name__}")
-                        print(f"❌ Mensagem: {str(gcs_error)}")
-                        import traceback
-                        traceback.print_exc()
-                        # Retornar sucesso mesmo se falhar o Cloud Storage (PDF foi gerado)
-                        return {'success': True, 'message': f'PDF gerado (erro ao salvar: {str(gcs_error)})', 'file_path': filepath}
-                else:
-                    # Chrome falhou - logar detalhes
-                    error_msg = result.stderr.decode('utf-8', errors='ignore') if result.stderr else "Erro desconhecido"
-                    stdout_msg = result.stdout.decode('utf-8', errors='ignore') if result.stdout else ""
-                    print(f"❌ === CHROME FALHOU AO GERAR PDF ===")
-                    print(f"❌ Return code: {result.returncode}")
-                    print(f"❌ Stderr: {error_msg[:500]}")
-                    if stdout_msg:
-                        print(f"❌ Stdout: {stdout_msg[:500]}")
-                    print(f"⚠️ Tentando usar fallback (HTML)...")
-            
-            # Se não conseguiu gerar automaticamente, salvar HTML para impressão manual
-            print("⚠️ Não foi possível gerar PDF automaticamente, salvando HTML...")
-            
-            # Se pasta_destino for None, usar arquivo temporário
-            if pasta_destino is None:
-                temp_dir = tempfile.gettempdir()
-                html_final_path = os.path.join(temp_dir, f"{romaneio_id}.html")
-            else:
-                html_final_path = os.path.join(pasta_destino, f"{romaneio_id}.html")
-            
-            with open(html_final_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # Abrir no navegador (apenas se não estiver no Cloud Run)
-            if not os.environ.get('K_SERVICE'):
-                abrir_pdf_no_navegador(html_final_path)
-            
-            return {'success': True, 'message': 'HTML salvo para impressão manual', 'file_path': html_final_path}
-            
-        finally:
-            # Limpar arquivo temporário
+        # (o template formulario_impressao_pdf.html já renderiza a cópia no Jinja)
+        from pdf_cloud_generator import html_pronto_para_pdf, aplicar_marcacao_copia
+        if is_reprint and not html_pronto_para_pdf(html_content):
+            html_content = aplicar_marcacao_copia(html_content, romaneio_data)
+        
+        browser_path = encontrar_navegador()
+        if not browser_path:
+            logger.error("❌ Chrome/Edge não encontrado para gerar o PDF")
+            return {'success': False, 'message': 'Chrome/Edge não encontrado (use PDF_ENGINE=reportlab)'}
+        
+        logger.info("🔄 Gerando PDF com: %s", browser_path)
+        inicio = datetime.now()
+        if sys.platform == 'win32':
+            pdf_content = gerar_pdf_linha_comando(browser_path, html_content)
+        else:
             try:
-                os.unlink(temp_html_path)
-            except:
-                pass
+                pdf_content = gerar_pdf_devtools(browser_path, html_content)
+            except Exception as e:
+                logger.warning("⚠️ DevTools falhou (%s), tentando --print-to-pdf...", e)
+                pdf_content = gerar_pdf_linha_comando(browser_path, html_content)
+        duracao_ms = (datetime.now() - inicio).total_seconds() * 1000
+        logger.info("✅ PDF gerado com Chrome: %s bytes em %.0f ms", len(pdf_content), duracao_ms)
+        
+        if pasta_destino:
+            from pdf_generator import salvar_pdf_local
+            salvar_pdf_local(pasta_destino, romaneio_id, pdf_content, is_reprint)
+        
+        # Gravação no armazenamento configurado em segundo plano (resultado['upload'])
+        from pdf_storage import resultado_pdf_gerado
+        return resultado_pdf_gerado(pdf_content, romaneio_id, is_reprint, 'chrome',
+                                    'PDF gerado automaticamente')
         
     except Exception as e:
-        print(f"❌ Erro ao salvar PDF: {e}")
+        logger.error("❌ Erro ao salvar PDF: %s", e)
         return {'success': False, 'message': f'Erro: {str(e)}'}
 
 def salvar_pdf_automatico(romaneio_data, itens_data, pasta_destino='Romaneios_Separacao', is_reprint=False):
@@ -757,7 +741,6 @@ def salvar_pdf_automatico(romaneio_data, itens_data, pasta_destino='Romaneios_Se
     """
     try:
         import subprocess
-        import time
         import shutil
         
         # Criar pasta se não existir
@@ -816,26 +799,26 @@ def salvar_pdf_automatico(romaneio_data, itens_data, pasta_destino='Romaneios_Se
                 else:
                     cmd = [browser_path, '--headless', '--disable-gpu', '--print-to-pdf=' + abs_filepath, file_url]
                 
-                print(f"🔄 Tentando gerar PDF com: {browser_path}")
+                logger.info("🔄 Tentando gerar PDF com: %s", browser_path)
                 result = subprocess.run(cmd, capture_output=True, timeout=30)
                 
                 if result.returncode == 0 and os.path.exists(filepath):
-                    print(f"✅ PDF gerado automaticamente: {filepath}")
+                    logger.info("✅ PDF gerado automaticamente: %s", filepath)
                     return {'success': True, 'message': 'PDF gerado e salvo automaticamente', 'file_path': filepath}
                 else:
-                    print(f"⚠️ Erro ao gerar PDF: {result.stderr.decode()}")
+                    logger.warning("⚠️ Erro ao gerar PDF: %s", result.stderr.decode())
             
             # Se não conseguiu gerar automaticamente, abrir no navegador
-            print("⚠️ Não foi possível gerar PDF automaticamente, abrindo no navegador...")
+            logger.warning("⚠️ Não foi possível gerar PDF automaticamente, abrindo no navegador...")
             abrir_pdf_no_navegador(html_file)
             return {'success': True, 'message': 'Arquivo aberto no navegador para impressão manual', 'file_path': html_file}
             
         except Exception as e:
-            print(f"⚠️ Erro ao gerar PDF automaticamente: {e}")
-            print("Abrindo no navegador para impressão manual...")
+            logger.warning("⚠️ Erro ao gerar PDF automaticamente: %s", e)
+            logger.info("Abrindo no navegador para impressão manual...")
             abrir_pdf_no_navegador(html_file)
             return {'success': True, 'message': 'Arquivo aberto no navegador para impressão manual', 'file_path': html_file}
         
     except Exception as e:
-        print(f"❌ Erro ao salvar PDF: {e}")
+        logger.error("❌ Erro ao salvar PDF: %s", e)
         return {'success': False, 'message': f'Erro: {str(e)}'}
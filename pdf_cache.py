@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Cache de PDFs de romaneio endereçado por conteúdo
+
+A chave é um hash SHA-256 de (dados do romaneio, itens, versão do template, motor, is_reprint).
+O conteúdo de um romaneio não muda depois de impresso, então o mesmo PDF pode ser servido
+em todas as reimpressões sem reler o Google Sheets nem gerar o PDF de novo.
+
+Camadas:
+  - disco local (rápido, por instância) com limite de tamanho e remoção dos menos usados
+  - Cloud Storage (compartilhado entre instâncias) sob o prefixo cache/pdf/, também com limite
+
+O PDF guardado é a cópia SEM a data de reimpressão; a data é carimbada por requisição
+(aplicar_carimbo_reimpressao), o que custa poucos milissegundos.
+"""
+
+import os
+import io
+import re
+import json
+import hashlib
+import tempfile
+import threading
+
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Incrementar sempre que o layout do PDF mudar de um jeito que não apareça no código-fonte
+# dos geradores (ex.: fontes); mudanças no template/gerador já mudam a versão automaticamente
+VERSAO_TEMPLATE_PDF = '1'
+
+# Campos do romaneio que aparecem no PDF (status, observações etc. não entram na chave)
+CAMPOS_ROMANEIO_PDF = ('id_impressao', 'data_impressao', 'usuario_impressao', 'tipo_romaneio')
+
+PREFIXO_CACHE_GCS = 'cache/pdf/'
+
+# Arquivo de layout de cada motor (o hash do arquivo entra na versão da chave)
+_ARQUIVOS_LAYOUT = {
+    'reportlab': 'pdf_generator.py',
+    'xhtml2pdf': os.path.join('templates', 'formulario_impressao_pdf.html'),
+    'chrome': os.path.join('templates', 'formulario_impressao_pdf.html'),
+}
+
+_versoes_layout = {}
+_alturas_carimbo = {}
+
+# Corpo da linha "Reimpressão realizada em: ..." carimbada na última página
+FONTE_CARIMBO = 8
+
+
+def _versao_layout(engine):
+    """Versão do layout do motor: VERSAO_TEMPLATE_PDF + hash do template/gerador (calculado uma vez)"""
+    if engine not in _versoes_layout:
+        digest = ''
+        arquivo = _ARQUIVOS_LAYOUT.get(engine)
+        if arquivo:
+            caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), arquivo)
+            try:
+                with open(caminho, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()[:16]
+            except OSError:
+                pass
+        _versoes_layout[engine] = f"{VERSAO_TEMPLATE_PDF}:{engine}:{digest}"
+    return _versoes_layout[engine]
+
+
+def calcular_chave_pdf(romaneio_data, itens_data, is_reprint=False, engine='reportlab'):
+    """
+    Calcula a chave do cache para um romaneio
+
+    Args:
+        romaneio_data: Dados do romaneio (só os campos de CAMPOS_ROMANEIO_PDF são usados)
+        itens_data: Lista de itens do romaneio
+        is_reprint: Se é a cópia (reimpressão)
+        engine: Motor de PDF (reportlab, xhtml2pdf ou chrome)
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    conteudo = {
+        'versao': _versao_layout(engine),
+        'is_reprint': bool(is_reprint),
+        'romaneio': {campo: romaneio_data.get(campo) for campo in CAMPOS_ROMANEIO_PDF},
+        'itens': itens_data or [],
+    }
+    serializado = json.dumps(conteudo, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(serializado.encode('utf-8')).hexdigest()
+
+
+class CacheDisco:
+    """Camada em disco local com limite de tamanho (remove os arquivos usados há mais tempo)"""
+
+    def __init__(self, pasta, max_bytes):
+        self.pasta = pasta
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.pasta, exist_ok=True)
+
+    def _caminho(self, nome):
+        return os.path.join(self.pasta, nome.replace('/', '__'))
+
+    def buscar(self, nome):
+        caminho = self._caminho(nome)
+        try:
+            with open(caminho, 'rb') as f:
+                conteudo = f.read()
+            # mtime funciona como "último uso" para a remoção por LRU
+            os.utime(caminho, None)
+            return conteudo
+        except OSError:
+            return None
+
+    def salvar(self, nome, conteudo):
+        caminho = self._caminho(nome)
+        try:
+            # Escrita atômica: outra thread/processo nunca lê um arquivo pela metade
+            fd, temporario = tempfile.mkstemp(dir=self.pasta, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(conteudo)
+            os.replace(temporario, caminho)
+        except OSError as e:
+            logger.warning("⚠️ Cache de PDF: não foi possível gravar %s no disco: %s", nome, e)
+            return
+        self._remover_excedente()
+
+    def _remover_excedente(self):
+        with self._lock:
+            arquivos = []
+            total = 0
+            for entrada in os.scandir(self.pasta):
+                if entrada.is_file() and not entrada.name.endswith('.tmp'):
+                    info = entrada.stat()
+                    arquivos.append((info.st_mtime, info.st_size, entrada.path))
+                    total += info.st_size
+            if total <= self.max_bytes:
+                return
+            arquivos.sort()
+            for _, tamanho, caminho in arquivos:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(caminho)
+                    total -= tamanho
+                except OSError:
+                    pass
+
+
+class CacheGCS:
+    """Camada no Cloud Storage (compartilhada entre instâncias) com limite de tamanho"""
+
+    # A listagem do prefixo para aplicar o limite só roda a cada N gravações
+    VERIFICAR_LIMITE_A_CADA = 20
+
+    def __init__(self, bucket_name, max_bytes, prefixo=PREFIXO_CACHE_GCS):
+        self.bucket_name = bucket_name
+        self.max_bytes = max_bytes
+        self.prefixo = prefixo
+        self._gravacoes = 0
+        self._lock = threading.Lock()
+
+    def _obter_bucket(self):
+        from salvar_pdf_gcs import get_gcs_bucket
+        return get_gcs_bucket(self.bucket_name)
+
+    def buscar(self, nome):
+        try:
+            from google.api_core.exceptions import NotFound
+            bucket = self._obter_bucket()
+            if bucket is None:
+                return None
+            try:
+                return bucket.blob(self.prefixo + nome).download_as_bytes()
+            except NotFound:
+                return None
+        except Exception as e:
+            logger.warning("⚠️ Cache de PDF: erro ao ler %s do Cloud Storage: %s", nome, e)
+            return None
+
+    def salvar(self, nome, conteudo):
+        try:
+            bucket = self._obter_bucket()
+            if bucket is None:
+                return
+            content_type = 'application/pdf' if nome.endswith('.pdf') else 'text/plain'
+            bucket.blob(self.prefixo + nome).upload_from_string(conteudo, content_type=content_type)
+        except Exception as e:
+            logger.warning("⚠️ Cache de PDF: erro ao gravar %s no Cloud Storage: %s", nome, e)
+            return
+        with self._lock:
+            self._gravacoes += 1
+            verificar = self._gravacoes % self.VERIFICAR_LIMITE_A_CADA == 0
+        if verificar:
+            self._remover_excedente()
+
+    def _remover_excedente(self):
+        try:
+            blobs = [b for b in self._obter_bucket().list_blobs(prefix=self.prefixo) if b.name.endswith('.pdf')]
+            total = sum(b.size or 0 for b in blobs)
+            if total <= self.max_bytes:
+                return
+            blobs.sort(key=lambda b: b.updated)
+            for blob in blobs:
+                if total <= self.max_bytes:
+                    break
+                blob.delete()
+                total -= blob.size or 0
+        except Exception as e:
+            logger.warning("⚠️ Cache de PDF: erro ao aplicar limite no Cloud Storage: %s", e)
+
+
+class CachePDF:
+    """
+    Cache de PDFs em camadas (disco local -> Cloud Storage)
+
+    Além dos PDFs (por chave de conteúdo), guarda um apontador romaneio -> chave para
+    que a reimpressão encontre o PDF sem precisar reler o Google Sheets.
+    """
+
+    def __init__(self, camadas):
+        self.camadas = [c for c in camadas if c is not None]
+
+    def _buscar(self, nome):
+        for indice, camada in enumerate(self.camadas):
+            conteudo = camada.buscar(nome)
+            if conteudo is not None:
+                # Promover para as camadas mais rápidas
+                for anterior in self.camadas[:indice]:
+                    anterior.salvar(nome, conteudo)
+                return conteudo
+        return None
+
+    def _salvar(self, nome, conteudo):
+        for camada in self.camadas:
+            camada.salvar(nome, conteudo)
+
+    @staticmethod
+    def _nome_apontador(romaneio_id, is_reprint, engine):
+        sufixo = 'copia' if is_reprint else 'original'
+        return f"romaneios/{romaneio_id}_{sufixo}_{engine}.chave"
+
+    def buscar_pdf(self, chave):
+        return self._buscar(f"{chave}.pdf")
+
+    def salvar_pdf(self, chave, pdf_content, romaneio_id=None, is_reprint=False, engine='reportlab'):
+        self._salvar(f"{chave}.pdf", pdf_content)
+        if romaneio_id:
+            self.registrar_romaneio(chave, romaneio_id, is_reprint, engine)
+
+    def registrar_romaneio(self, chave, romaneio_id, is_reprint=False, engine='reportlab'):
+        """Aponta o romaneio para a chave do PDF (permite buscar só pelo ID depois)"""
+        self._salvar(self._nome_apontador(romaneio_id, is_reprint, engine), chave.encode('ascii'))
+
+    def buscar_pdf_romaneio(self, romaneio_id, is_reprint=False, engine='reportlab'):
+        """
+        Busca o PDF de um romaneio pelo ID (sem precisar dos dados/itens)
+
+        Returns:
+            bytes ou None: PDF em cache
+        """
+        chave = self._buscar(self._nome_apontador(romaneio_id, is_reprint, engine))
+        if not chave:
+            return None
+        return self.buscar_pdf(chave.decode('ascii'))
+
+
+def _margem_pagina_template(arquivo):
+    """Margem (pt) do @page do template HTML, ou None se o template não declara em cm"""
+    caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), arquivo)
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            encontrado = re.search(r'@page\s*\{[^}]*?\bmargin:\s*([\d.]+)cm\s*;', f.read())
+    except OSError:
+        return None
+    if not encontrado:
+        return None
+    from reportlab.lib.units import cm
+    return float(encontrado.group(1)) * cm
+
+
+def _altura_carimbo(engine):
+    """
+    Linha de base (pt) do carimbo de reimpressão na faixa livre do rodapé do motor
+
+    ReportLab: entre o rodapé "Sistema v4.0.0 ..." e a margem inferior do documento.
+    HTML (xhtml2pdf/chrome): dentro da margem inferior do @page do template, onde o
+    conteúdo não entra. Calculada uma vez por motor.
+
+    Returns:
+        float ou None se a faixa livre do motor não é conhecida
+    """
+    if engine not in _alturas_carimbo:
+        if engine == 'reportlab':
+            from pdf_generator import ALTURA_RODAPE, MARGEM_INFERIOR
+            base, topo = ALTURA_RODAPE + FONTE_CARIMBO, MARGEM_INFERIOR
+        else:
+            margem = _margem_pagina_template(_ARQUIVOS_LAYOUT[engine]) if engine in _ARQUIVOS_LAYOUT else None
+            base, topo = 0, margem
+        altura = None
+        if topo is not None and topo - base >= FONTE_CARIMBO:
+            altura = base + (topo - base - FONTE_CARIMBO) / 2
+        _alturas_carimbo[engine] = altura
+    return _alturas_carimbo[engine]
+
+
+def aplicar_carimbo_reimpressao(pdf_content, data_reimpressao, engine='reportlab'):
+    """
+    Carimba "Reimpressão realizada em: ..." na última página de um PDF já pronto
+
+    Desenha só uma página pequena com ReportLab e mescla com pypdf, sem gerar o
+    romaneio de novo. A gravação é incremental: o PDF original é mantido e só a
+    última página alterada é anexada no final (não reescreve as outras páginas).
+
+    Args:
+        pdf_content: PDF da cópia (sem data de reimpressão)
+        data_reimpressao: Data/hora da reimpressão (dd/mm/yyyy, HH:MM:SS)
+        engine: Motor que gerou o PDF (define onde fica a faixa livre do rodapé)
+
+    Returns:
+        bytes: PDF com o carimbo
+
+    Raises:
+        ValueError: se a faixa livre do rodapé do motor não é conhecida
+    """
+    altura_carimbo = _altura_carimbo(engine)
+    if altura_carimbo is None:
+        raise ValueError(f"área do rodapé desconhecida para o motor {engine}")
+
+    from pypdf import PdfReader, PdfWriter
+    from reportlab.lib import colors
+    from reportlab.pdfgen import canvas
+
+    writer = PdfWriter(io.BytesIO(pdf_content), incremental=True)
+    ultima_pagina = writer.pages[-1]
+    largura = float(ultima_pagina.mediabox.width)
+    altura = float(ultima_pagina.mediabox.height)
+
+    buffer_carimbo = io.BytesIO()
+    carimbo = canvas.Canvas(buffer_carimbo, pagesize=(largura, altura))
+    carimbo.setFont('Helvetica-Bold', FONTE_CARIMBO)
+    carimbo.setFillColor(colors.grey)
+    carimbo.drawCentredString(largura / 2, altura_carimbo, f"Reimpressão realizada em: {data_reimpressao}")
+    carimbo.save()
+
+    ultima_pagina.merge_page(PdfReader(io.BytesIO(buffer_carimbo.getvalue())).pages[0])
+
+    saida = io.BytesIO()
+    writer.write(saida)
+    return saida.getvalue()
+
+
+_cache_pdf = None
+_cache_pdf_lock = threading.Lock()
+
+
+def obter_cache_pdf():
+    """
+    Retorna o cache de PDFs do processo (criado na primeira chamada a partir do ambiente)
+
+    Variáveis de ambiente:
+        PDF_CACHE_ENABLED: 'false' desliga o cache (padrão: true)
+        PDF_CACHE_DIR: pasta do cache em disco (padrão: <tmp>/romaneios_pdf_cache)
+        PDF_CACHE_MAX_MB: limite do cache em disco (padrão: 200)
+        PDF_CACHE_GCS: 'true'/'false' liga ou desliga a camada no Cloud Storage
+            (padrão: ligada só quando os PDFs ficam no Cloud Storage, PDF_STORAGE_BACKEND=gcs)
+        PDF_CACHE_GCS_MAX_MB: limite da camada no Cloud Storage (padrão: 2048)
+
+    Returns:
+        CachePDF ou None se desligado
+    """
+    global _cache_pdf
+    if os.environ.get('PDF_CACHE_ENABLED', 'true').lower() == 'false':
+        return None
+    if _cache_pdf is None:
+        with _cache_pdf_lock:
+            if _cache_pdf is None:
+                camadas = []
+                pasta = os.environ.get('PDF_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'romaneios_pdf_cache')
+                try:
+                    camadas.append(CacheDisco(pasta, int(os.environ.get('PDF_CACHE_MAX_MB', '200')) * 1024 * 1024))
+                except OSError as e:
+                    logger.warning("⚠️ Cache de PDF em disco indisponível (%s): %s", pasta, e)
+                from cloud_config import get_storage_config
+                padrao_gcs = 'true' if get_storage_config()['type'] == 'cloud_storage' else 'false'
+                if os.environ.get('PDF_CACHE_GCS', padrao_gcs).lower() != 'false':
+                    bucket_name = os.environ.get('GCS_BUCKET_NAME', 'romaneios-separacao')
+                    camadas.append(CacheGCS(bucket_name, int(os.environ.get('PDF_CACHE_GCS_MAX_MB', '2048')) * 1024 * 1024))
+                _cache_pdf = CachePDF(camadas)
+                logger.info("✅ Cache de PDF ativo: %s camada(s)", len(camadas))
+    return _cache_pdf
@@ -7,363 +7,302 @@ Módulo para geração de PDF e salvamento no Cloud Storage
 import os
 import io
 from datetime import datetime
+from xml.sax.saxutils import escape
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas as rl_canvas
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
-import tempfile
+
+# Colunas EXATAMENTE iguais ao formulario_impressao.html (larguras do @media print)
+COLUNAS_ROMANEIO = [
+    ("Data e Hora", 2.4*cm),
+    ("Solicitante", 2.3*cm),
+    ("Código", 1.8*cm),
+    ("Descrição", 6.4*cm),
+    ("Alta Demanda", 1.9*cm),
+    ("Localização", 2.6*cm),
+    ("Saldo Estoque", 2.0*cm),
+    ("Média Consumo", 2.1*cm),
+    ("Saldo que Ficou", 2.3*cm),
+    ("Qtd. Pendente", 2.0*cm),
+    ("Qtd. Separada", 2.3*cm),
+]
+
+RODAPE_ROMANEIO = "Sistema v4.0.0 - Romaneios de Separação"
+
+# Linha de base do rodapé e margem inferior do documento: a faixa entre os dois fica livre
+# (o pdf_cache carimba a data de reimpressão nela)
+ALTURA_RODAPE = 0.5*cm
+MARGEM_INFERIOR = 1.2*cm
+
+# Descrições até este tamanho cabem em uma linha da coluna (Paragraph é ~10x mais caro que texto simples)
+_MAX_CHARS_DESCRICAO_SIMPLES = 40
+
+# Estilos criados uma única vez no carregamento do módulo (reutilizados em todo PDF)
+_styles = getSampleStyleSheet()
+_title_style = ParagraphStyle('RomTitle', parent=_styles['Normal'], fontSize=16, leading=19,
+                              alignment=TA_LEFT, fontName='Helvetica-Bold')
+_subtitle_style = ParagraphStyle('RomSubtitle', parent=_styles['Normal'], fontSize=12, leading=15,
+                                 alignment=TA_LEFT, fontName='Helvetica-Bold')
+_info_style = ParagraphStyle('RomInfo', parent=_styles['Normal'], fontSize=12, leading=15,
+                             alignment=TA_RIGHT, fontName='Helvetica-Bold')
+_cell_style = ParagraphStyle('RomCell', parent=_styles['Normal'], fontSize=9, leading=11,
+                             alignment=TA_LEFT, fontName='Helvetica')
+_footer_style = ParagraphStyle('RomFooter', parent=_styles['Normal'], fontSize=8, leading=10,
+                               alignment=TA_CENTER, textColor=colors.grey)
+
+_estilo_tabela_itens = TableStyle([
+    # Cabeçalho (igual ao @media print do HTML)
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),  # font-size: 9px no print
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 4),  # padding: 4px 2px no print
+    ('TOPPADDING', (0, 0), (-1, 0), 4),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),  # border: 1px solid #000
+
+    # Dados (igual ao @media print do HTML)
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 3),  # padding: 3px 2px no print
+    ('TOPPADDING', (0, 1), (-1, -1), 3),
+    ('LEFTPADDING', (0, 0), (-1, -1), 2),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')]),
+
+    # Destaques específicos (igual ao HTML)
+    ('FONTNAME', (2, 1), (2, -1), 'Helvetica-Bold'),                 # Código em negrito
+    ('BACKGROUND', (2, 1), (2, -1), colors.HexColor('#e3f2fd')),     # Código com fundo azul
+    ('FONTNAME', (5, 1), (5, -1), 'Helvetica-Bold'),                 # Localização em negrito
+    ('BACKGROUND', (5, 1), (5, -1), colors.HexColor('#fff3cd')),     # Localização com fundo amarelo
+    ('BOX', (5, 0), (5, -1), 2, colors.black),                       # Localização com borda 2px
+    ('FONTNAME', (6, 1), (7, -1), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (6, 1), (6, -1), colors.HexColor('#f39c12')),      # Saldo Estoque em laranja
+    ('FONTNAME', (9, 1), (9, -1), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (9, 1), (9, -1), colors.HexColor('#e74c3c')),      # Qtd Pendente em vermelho
+    ('BACKGROUND', (8, 1), (8, -1), colors.HexColor('#f8f9fa')),     # Saldo que ficou (preenchimento manual)
+    ('BACKGROUND', (10, 1), (10, -1), colors.HexColor('#f8f9fa')),   # Qtd separada (preenchimento manual)
+])
+
+
+def _formatar_id_romaneio(id_impressao):
+    """Formata o ID do romaneio igual ao cabeçalho do HTML (ROM-000001)"""
+    rom_id = str(id_impressao or 'N/A')
+    if rom_id.startswith('ROM-'):
+        return rom_id
+    if '-' in rom_id:
+        return f"ROM-{rom_id.split('-')[-1]}"
+    return f"ROM-{rom_id}"
+
+
+def _texto_celula(valor, padrao=''):
+    """Converte valor de célula para texto (células simples não interpretam marcação)"""
+    if valor is None or valor == '':
+        valor = padrao
+    return str(valor)
+
+
+def _celula_descricao(descricao):
+    """Descrição curta vai como texto simples; só descrições longas viram Paragraph (quebra de linha)"""
+    texto = '' if descricao is None else str(descricao)
+    if len(texto) <= _MAX_CHARS_DESCRICAO_SIMPLES:
+        return texto
+    return Paragraph(escape(texto), _cell_style)
+
+
+class _RomaneioCanvas(rl_canvas.Canvas):
+    """
+    Canvas que adia o desenho do rodapé até o final do documento para
+    conseguir imprimir "Página X de Y" e a marca d'água de cópia em todas as páginas
+    """
+
+    def __init__(self, *args, is_reprint=False, texto_rodape=RODAPE_ROMANEIO, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._paginas = []
+        self._is_reprint = is_reprint
+        self._texto_rodape = texto_rodape
+
+    def showPage(self):
+        self._paginas.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        total_paginas = len(self._paginas)
+        for estado in self._paginas:
+            self.__dict__.update(estado)
+            self._desenhar_extras(total_paginas)
+            super().showPage()
+        super().save()
+
+    def _desenhar_extras(self, total_paginas):
+        largura, altura = self._pagesize
+
+        if self._is_reprint:
+            # Marca d'água diagonal (igual ao .watermark do HTML: rotate(-45deg), 10% de opacidade)
+            self.saveState()
+            self.setFillColor(colors.Color(0, 0, 0, alpha=0.1))
+            self.setFont('Helvetica-Bold', 96)
+            self.translate(largura / 2, altura / 2)
+            self.rotate(45)
+            self.drawCentredString(0, 0, "CÓPIA")
+            self.restoreState()
+
+        self.saveState()
+        self.setFont('Helvetica', 8)
+        self.setFillColor(colors.grey)
+        self.drawCentredString(largura / 2, ALTURA_RODAPE, self._texto_rodape)
+        self.drawRightString(largura - 0.5*cm, ALTURA_RODAPE, f"Página {self._pageNumber} de {total_paginas}")
+        self.restoreState()
+
 
 def gerar_pdf_romaneio(romaneio_data, itens_data, is_reprint=False):
     """
     Gera PDF do romaneio de separação - LAYOUT IDÊNTICO ao formulario_impressao.html
-    
+
+    Renderiza tudo em memória com ReportLab (sem navegador, sem parse de HTML).
+    Romaneios grandes são paginados automaticamente: o cabeçalho da tabela se
+    repete em cada página e o rodapé mostra "Página X de Y".
+
     Args:
-        romaneio_data: Dados do romaneio (id, data, usuario, etc.)
+        romaneio_data: Dados do romaneio (id, data, usuario, tipo_romaneio, data_reimpressao etc.)
         itens_data: Lista de itens do romaneio
-        is_reprint: Se é uma reimpressão/cópia
-    
+        is_reprint: Se é uma reimpressão/cópia (adiciona marca d'água "CÓPIA")
+
     Returns:
         bytes: Conteúdo do PDF em bytes
     """
     buffer = io.BytesIO()
-    
+    itens_data = itens_data or []
+
     # Configurar documento em paisagem A4 (igual ao @media print do HTML)
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), 
-                          rightMargin=0.5*cm, leftMargin=0.5*cm,
-                          topMargin=0.5*cm, bottomMargin=0.5*cm)
-    
-    # Estilos
-    styles = getSampleStyleSheet()
-    
-    # Conteúdo do PDF
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4),
+                            rightMargin=0.5*cm, leftMargin=0.5*cm,
+                            topMargin=0.5*cm, bottomMargin=MARGEM_INFERIOR,
+                            title=_formatar_id_romaneio(romaneio_data.get('id_impressao')),
+                            author=str(romaneio_data.get('usuario_impressao', '')))
+
     story = []
-    
-    # Cabeçalho EXATAMENTE igual ao formulario_impressao.html
-    # Título principal no canto esquerdo (font-size: 16px no print)
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Normal'],
-        fontSize=16,  # Igual ao @media print .formulario-title
-        alignment=TA_LEFT,
-        spaceAfter=5,
-        fontName='Helvetica-Bold'
-    )
-    
-    story.append(Paragraph("LINE FLEX - Gestão de Estoque", title_style))
-    
-    # Subtítulo abaixo do título (font-size: 12px no print)
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Normal'],
-        fontSize=12,  # Igual ao @media print .formulario-subtitle
-        alignment=TA_LEFT,
-        spaceAfter=10,
-        fontName='Helvetica-Bold'
-    )
-    
-    story.append(Paragraph("Romaneio de Separação", subtitle_style))
-    
-    # Adicionar marca d'água para cópia (sutil)
+
+    # Cabeçalho: título/subtítulo à esquerda, ID/data/total à direita (igual ao HTML)
+    tipo_romaneio = romaneio_data.get('tipo_romaneio') or 'Romaneio de Separação'
+    rom_id = _formatar_id_romaneio(romaneio_data.get('id_impressao'))
     if is_reprint:
-        watermark_style = ParagraphStyle(
-            'Watermark',
-            parent=styles['Normal'],
-            fontSize=18,
-            textColor=colors.lightgrey,
-            alignment=TA_CENTER,
-            spaceAfter=5
-        )
-        story.append(Paragraph("CÓPIA", watermark_style))
-    
-    # Informações do lado direito (igual ao formulario_impressao.html)
-    info_style = ParagraphStyle(
-        'Info',
-        parent=styles['Normal'],
-        fontSize=12,  # Igual ao @media print .formulario-subtitle
-        alignment=TA_RIGHT,
-        spaceAfter=5,
-        fontName='Helvetica-Bold'
+        rom_id = f"{rom_id} - CÓPIA"
+    data_impressao = romaneio_data.get('data_impressao') or datetime.now().strftime('%d/%m/%Y, %H:%M:%S')
+
+    cabecalho = Table(
+        [[Paragraph("LINE FLEX - Gestão de Estoque", _title_style), Paragraph(escape(rom_id), _info_style)],
+         [Paragraph(escape(tipo_romaneio), _subtitle_style), Paragraph(escape(str(data_impressao)), _info_style)],
+         ['', Paragraph(f"{len(itens_data)} itens", _info_style)]],
+        colWidths=[doc.width * 0.6, doc.width * 0.4]
     )
-    
-    # ROM-ID (igual ao HTML)
-    rom_id = romaneio_data.get('id_impressao', 'N/A')
-    if '-' in rom_id:
-        rom_id = f"ROM-{rom_id.split('-')[-1]}"
-    else:
-        rom_id = f"ROM-{rom_id}"
-    
-    story.append(Paragraph(rom_id, info_style))
-    story.append(Paragraph(f"{romaneio_data.get('data_impressao', 'N/A')}", info_style))
-    story.append(Paragraph(f"{romaneio_data.get('total_itens', 0)} itens | 1 páginas", info_style))
-    
-    # Linha separadora (igual ao HTML)
-    story.append(Spacer(1, 0.2*cm))
-    story.append(Paragraph("_" * 100, title_style))
+    cabecalho.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 1),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ('LINEBELOW', (0, -1), (-1, -1), 2, colors.black),  # border-bottom: 2px solid #000
+    ]))
+    story.append(cabecalho)
     story.append(Spacer(1, 0.3*cm))
-    
+
     # Tabela EXATAMENTE igual ao formulario_impressao.html
-    if itens_data:
-        # Cabeçalho da tabela (igual ao HTML)
-        table_data = [["Data e Hora", "Solicitante", "Código", "Descrição", "Alta Demanda", 
-                      "Localização", "Saldo Estoque", "Média Consumo", "Saldo que Ficou", "Qtd. Pendente", "Qtd. Separada"]]
-        
-        # Dados dos itens
-        for item in itens_data:
-            # Formatar data e hora
-            data_hora = item.get('data', '')
-            
-            # Ícone de alta demanda (estrela) - igual ao HTML
-            alta_demanda = "★" if item.get('quantidade', 0) > 50 else ""
-            
-            row = [
-                data_hora,
-                item.get('solicitante', ''),
-                item.get('codigo', ''),
-                item.get('descricao', ''),
-                alta_demanda,
-                item.get('locacao_matriz', '1 E5 E03/F03'),  # Valor padrão igual ao HTML
-                str(item.get('saldo_estoque', 600)),  # Valor padrão igual ao HTML
-                str(item.get('media_mensal', 41)),    # Valor padrão igual ao HTML
-                "_____",  # Saldo que ficou (igual ao HTML)
-                str(item.get('qtd_pendente', 0)),
-                "_____"   # Qtd separada (igual ao HTML)
-            ]
-            table_data.append(row)
-        
-        # Criar tabela com larguras EXATAS do HTML (@media print)
-        # Larguras em cm baseadas no HTML: col-data-hora: 80px, col-solicitante: 70px, etc.
-        items_table = Table(table_data, colWidths=[2.2*cm, 1.9*cm, 1.4*cm, 4.2*cm, 1.7*cm, 
-                                                  2.2*cm, 1.9*cm, 1.9*cm, 2.2*cm, 1.9*cm, 2.2*cm])
-        
-        items_table.setStyle(TableStyle([
-            # Cabeçalho (igual ao @media print do HTML)
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),  # #f0f0f0
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),  # font-size: 9px no print
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 4),  # padding: 4px 2px no print
-            ('TOPPADDING', (0, 0), (-1, 0), 4),
-            ('LEFTPADDING', (0, 0), (-1, 0), 2),
-            ('RIGHTPADDING', (0, 0), (-1, 0), 2),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),  # border: 1px solid #000
-            
-            # Dados (igual ao @media print do HTML)
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),  # font-size: 9px no print
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 3),  # padding: 3px 2px no print
-            ('TOPPADDING', (0, 1), (-1, -1), 3),
-            ('LEFTPADDING', (0, 1), (-1, -1), 2),
-            ('RIGHTPADDING', (0, 1), (-1, -1), 2),
-            
-            # Destaques específicos (igual ao HTML)
-            ('FONTNAME', (2, 1), (2, -1), 'Helvetica-Bold'),  # Código em negrito
-            ('BACKGROUND', (2, 1), (2, -1), colors.lightblue),  # Código com fundo azul
-            ('FONTNAME', (5, 1), (5, -1), 'Helvetica-Bold'),  # Localização em negrito
-            ('BACKGROUND', (5, 1), (5, -1), colors.yellow),   # Localização com fundo amarelo
-            ('TEXTCOLOR', (6, 1), (6, -1), colors.orange),    # Saldo Estoque em laranja
-            ('TEXTCOLOR', (9, 1), (9, -1), colors.red),       # Qtd Pendente em vermelho
-            ('BACKGROUND', (8, 1), (8, -1), colors.lightgrey),  # Saldo que ficou com fundo cinza
-            ('BACKGROUND', (10, 1), (10, -1), colors.lightgrey),  # Qtd separada com fundo cinza
-        ]))
-        
-        story.append(items_table)
-    
-    # Rodapé (igual ao formulario_impressao.html)
-    story.append(Spacer(1, 1*cm))
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_CENTER,
-        textColor=colors.grey
-    )
-    story.append(Paragraph("Sistema v4.0.0 - Romaneios de Separação", footer_style))
-    
+    table_data = [[titulo for titulo, _ in COLUNAS_ROMANEIO]]
+
+    for item in itens_data:
+        quantidade = item.get('quantidade', item.get('qtd_pendente', 0))
+        table_data.append([
+            _texto_celula(item.get('data', '')),
+            _texto_celula(item.get('solicitante', '')),
+            _texto_celula(item.get('codigo', '')),
+            _celula_descricao(item.get('descricao', '')),
+            "ALTA" if item.get('alta_demanda') else "-",
+            _texto_celula(item.get('locacao_matriz'), '1 E5 E03/F03'),  # Valor padrão igual ao HTML
+            _texto_celula(item.get('saldo_estoque'), 600),               # Valor padrão igual ao HTML
+            _texto_celula(item.get('media_mensal'), 41),                 # Valor padrão igual ao HTML
+            "",  # Saldo que ficou (preenchido à mão)
+            _texto_celula(quantidade, 0),
+            ""   # Qtd separada (preenchida à mão)
+        ])
+
+    # repeatRows=1: cabeçalho da tabela se repete em todas as páginas
+    items_table = Table(table_data, colWidths=[largura for _, largura in COLUNAS_ROMANEIO], repeatRows=1)
+    estilo = TableStyle(_estilo_tabela_itens.getCommands())
+    for idx, item in enumerate(itens_data, start=1):
+        if item.get('alta_demanda'):
+            estilo.add('TEXTCOLOR', (4, idx), (4, idx), colors.HexColor('#dc3545'))
+            estilo.add('FONTNAME', (4, idx), (4, idx), 'Helvetica-Bold')
+    items_table.setStyle(estilo)
+    story.append(items_table)
+
+    # Rodapé de reimpressão (igual ao bloco is_reprint do formulario_impressao.html)
+    texto_rodape = RODAPE_ROMANEIO
+    if is_reprint:
+        texto_rodape = f"{RODAPE_ROMANEIO} | DOCUMENTO DE CÓPIA/REIMPRESSÃO"
+        data_reimpressao = romaneio_data.get('data_reimpressao')
+        if data_reimpressao:
+            story.append(Spacer(1, 0.4*cm))
+            story.append(Paragraph(f"<b>Reimpressão realizada em: {escape(str(data_reimpressao))}</b>", _footer_style))
+
     # Construir PDF
-    doc.build(story)
-    
-    # Retornar bytes
-    buffer.seek(0)
+    doc.build(story, canvasmaker=lambda *args, **kwargs: _RomaneioCanvas(
+        *args, is_reprint=is_reprint, texto_rodape=texto_rodape, **kwargs))
+
     return buffer.getvalue()
 
-# ============================================================================
-# FUNÇÕES DO GOOGLE DRIVE - REMOVIDAS
-# ============================================================================
-# Estas funções foram removidas pois agora usamos apenas Cloud Storage
-# Mantidas comentadas para referência histórica
-"""
-def conectar_google_drive():
-    """
-    Conecta com Google Drive API
-    
-    Returns:
-        service: Serviço do Google Drive ou None se erro
-    """
-    try:
-        # Usar as mesmas credenciais do Google Sheets
-        from app import get_google_sheets_connection
-        
-        # Obter credenciais do gspread
-        sheet = get_google_sheets_connection()
-        if not sheet:
-            print("❌ Não foi possível conectar com Google Sheets")
-            return None
-        
-        # Obter credenciais do cliente
-        credentials = sheet.auth
-        
-        # Criar serviço do Google Drive
-        service = build('drive', 'v3', credentials=credentials)
-        
-        return service
-        
-    except Exception as e:
-        print(f"❌ Erro ao conectar com Google Drive: {e}")
-        return None
 
-def criar_pasta_romaneios(service, pasta_pai_id=None):
+def salvar_pdf_reportlab(html_content, romaneio_data, pasta_destino=None, is_reprint=False, itens_data=None):
     """
-    Cria pasta para romaneios no Google Drive se não existir
-    
-    Args:
-        service: Serviço do Google Drive
-        pasta_pai_id: ID da pasta pai (opcional)
-    
-    Returns:
-        str: ID da pasta ou None se erro
-    """
-    try:
-        # Nome da pasta
-        folder_name = "Romaneios de Separação"
-        
-        # Construir query de busca
-        if pasta_pai_id:
-            query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false and '{pasta_pai_id}' in parents"
-        else:
-            query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
-        
-        # Verificar se pasta já existe
-        results = service.files().list(q=query).execute()
-        
-        if results['files']:
-            # Pasta já existe
-            folder_id = results['files'][0]['id']
-            print(f"✅ Pasta '{folder_name}' já existe: {folder_id}")
-            return folder_id
-        
-        # Criar pasta
-        folder_metadata = {
-            'name': folder_name,
-            'mimeType': 'application/vnd.google-apps.folder'
-        }
-        
-        # Adicionar pasta pai se especificada
-        if pasta_pai_id:
-            folder_metadata['parents'] = [pasta_pai_id]
-        
-        folder = service.files().create(body=folder_metadata, fields='id').execute()
-        folder_id = folder.get('id')
-        
-        print(f"✅ Pasta '{folder_name}' criada: {folder_id}")
-        return folder_id
-        
-    except Exception as e:
-        print(f"❌ Erro ao criar pasta no Google Drive: {e}")
-        return None
+    Gera o PDF do romaneio com ReportLab (em processo) e agenda a gravação no armazenamento
 
-def salvar_pdf_google_drive(service, folder_id, romaneio_id, pdf_content):
-    """
-    Salva PDF no Google Drive
-    
-    Args:
-        service: Serviço do Google Drive
-        folder_id: ID da pasta
-        romaneio_id: ID do romaneio
-        pdf_content: Conteúdo do PDF em bytes
-    
-    Returns:
-        str: ID do arquivo salvo ou None se erro
-    """
-    try:
-        # Nome do arquivo
-        filename = f"{romaneio_id}.pdf"
-        
-        # Criar arquivo temporário
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(pdf_content)
-            temp_file_path = temp_file.name
-        
-        try:
-            # Metadados do arquivo
-            file_metadata = {
-                'name': filename,
-                'parents': [folder_id]
-            }
-            
-            # Upload do arquivo
-            media = MediaIoBaseUpload(io.BytesIO(pdf_content), mimetype='application/pdf')
-            file = service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id'
-            ).execute()
-            
-            file_id = file.get('id')
-            print(f"✅ PDF salvo no Google Drive: {filename} (ID: {file_id})")
-            
-            return file_id
-            
-        finally:
-            # Limpar arquivo temporário
-            os.unlink(temp_file_path)
-        
-    except Exception as e:
-        print(f"❌ Erro ao salvar PDF no Google Drive: {e}")
-        return None
+    Mesma assinatura de salvar_pdf_cloud/salvar_pdf_direto_html para poder ser usado
+    como gerador intercambiável. O html_content é ignorado: o layout é montado
+    diretamente a partir de itens_data.
 
-def buscar_pasta_por_nome(service, nome_pasta, pasta_pai_id=None):
-    """
-    Busca pasta no Google Drive por nome
-    
     Args:
-        service: Serviço do Google Drive
-        nome_pasta: Nome da pasta a buscar
-        pasta_pai_id: ID da pasta pai (opcional)
-    
+        html_content: Ignorado (mantido para compatibilidade de assinatura)
+        romaneio_data: Dados do romaneio
+        pasta_destino: Pasta local extra (opcional). O PDF sempre vai para o armazenamento configurado
+        is_reprint: Se é uma reimpressão/cópia
+        itens_data: Lista de itens do romaneio
+
     Returns:
-        str: ID da pasta ou None se não encontrada
+        dict: Resultado da operação (inclui 'pdf_content' com os bytes gerados e
+              'upload', o Future da gravação - ver pdf_storage.resultado_pdf_gerado)
     """
     try:
-        # Construir query de busca
-        if pasta_pai_id:
-            query = f"name='{nome_pasta}' and mimeType='application/vnd.google-apps.folder' and trashed=false and '{pasta_pai_id}' in parents"
-        else:
-            query = f"name='{nome_pasta}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
-        
-        results = service.files().list(q=query).execute()
-        
-        if results['files']:
-            folder_id = results['files'][0]['id']
-            print(f"✅ Pasta '{nome_pasta}' encontrada: {folder_id}")
-            return folder_id
-        
-        print(f"❌ Pasta '{nome_pasta}' não encontrada")
-        return None
-        
+        romaneio_id = romaneio_data.get('id_impressao', 'ROM-000001')
+
+        inicio = datetime.now()
+        pdf_content = gerar_pdf_romaneio(romaneio_data, itens_data or [], is_reprint)
+        duracao_ms = (datetime.now() - inicio).total_seconds() * 1000
+        print(f"✅ PDF gerado com ReportLab: {len(pdf_content)} bytes em {duracao_ms:.0f} ms")
+
+        if pasta_destino:
+            salvar_pdf_local(pasta_destino, romaneio_id, pdf_content, is_reprint)
+
+        # Gravação no armazenamento configurado em segundo plano (resultado['upload'])
+        from pdf_storage import resultado_pdf_gerado
+        return resultado_pdf_gerado(pdf_content, romaneio_id, is_reprint, 'reportlab', 'PDF gerado com ReportLab')
+
     except Exception as e:
-        print(f"❌ Erro ao buscar pasta: {e}")
-        return None
-"""
+        print(f"❌ Erro ao gerar PDF com ReportLab: {e}")
+        return {'success': False, 'message': f'Erro: {str(e)}'}
+
+# ============================================================================
+# FUNÇÕES DO GOOGLE DRIVE - REMOVIDAS
+# ============================================================================
+# Removidas pois agora usamos apenas Cloud Storage (ver histórico do git).
+# O bloco antigo ficava dentro de uma string com docstrings aninhadas, o que
+# impedia este módulo de ser importado.
 
 def salvar_pdf_local(pasta_destino, romaneio_id, pdf_content, is_reprint=False):
     """
@@ -378,38 +317,8 @@ def salvar_pdf_local(pasta_destino, romaneio_id, pdf_content, is_reprint=False):
     Returns:
         str: Caminho do arquivo salvo ou None se erro
     """
-    try:
-        # Criar pasta se não existir
-        os.makedirs(pasta_destino, exist_ok=True)
-        
-        # Nome do arquivo com sufixo para cópia
-        if is_reprint:
-            # Verificar se já existe cópia para determinar número
-            contador = 1
-            while True:
-                if contador == 1:
-                    filename = f"{romaneio_id}_Copia.pdf"
-                else:
-                    filename = f"{romaneio_id}_Copia_{contador}.pdf"
-                
-                filepath = os.path.join(pasta_destino, filename)
-                if not os.path.exists(filepath):
-                    break
-                contador += 1
-        else:
-            filename = f"{romaneio_id}.pdf"
-            filepath = os.path.join(pasta_destino, filename)
-        
-        # Salvar arquivo
-        with open(filepath, 'wb') as f:
-            f.write(pdf_content)
-        
-        print(f"✅ PDF salvo localmente: {filepath}")
-        return filepath
-        
-    except Exception as e:
-        print(f"❌ Erro ao salvar PDF localmente: {e}")
-        return None
+    from pdf_storage import ArmazenamentoLocal
+    return ArmazenamentoLocal(pasta_destino).salvar(romaneio_id, pdf_content, is_reprint)
 
 def gerar_e_salvar_romaneio_pdf(romaneio_data, itens_data, pasta_destino=None, is_reprint=False):
     """
@@ -485,7 +394,7 @@ def buscar_pdf_romaneio_local(pasta_destino, romaneio_id):
 
 def buscar_pdf_romaneio(romaneio_id):
     """
-    Busca PDF do romaneio (apenas local - Cloud Storage é buscado em outra função)
+    Busca PDF do romaneio no armazenamento configurado (ver pdf_storage)
     
     Args:
         romaneio_id: ID do romaneio
@@ -494,9 +403,8 @@ def buscar_pdf_romaneio(romaneio_id):
         bytes: Conteúdo do PDF ou None se não encontrado
     """
     try:
-        # Sempre buscar localmente primeiro
-        pasta_destino = 'Romaneios_Separacao'
-        return buscar_pdf_romaneio_local(pasta_destino, romaneio_id)
+        from pdf_storage import obter_armazenamento_pdf
+        return obter_armazenamento_pdf().ler(romaneio_id, is_reprint=False)
         
     except Exception as e:
         print(f"❌ Erro ao buscar PDF: {e}")
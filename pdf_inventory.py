@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Inventário dos PDFs de romaneio no Cloud Storage (índice em memória)
+
+Em vez de listar o bucket inteiro a cada abertura do Controle de Impressões, o sistema
+mantém um índice {ID do romaneio: PDFs} que é:
+  - atualizado na hora por salvar_pdf_gcs a cada upload
+  - reconciliado com o bucket em segundo plano (listagem paginada) a cada
+    PDF_INVENTORY_RECONCILE_SECONDS, para pegar PDFs gravados por outras instâncias
+
+A página só consulta o dicionário, então o tempo não cresce com o número de objetos no bucket.
+Romaneios conferidos no bucket e não encontrados (conferir) ficam marcados como ausentes até
+a próxima reconciliação: a mesma página aberta de novo não repete os get_blob.
+"""
+
+import os
+import re
+import threading
+import time
+
+PREFIXO_ROMANEIOS = 'ROM-'
+
+# Tamanho da página da listagem na reconciliação (máximo do GCS é 1000)
+TAMANHO_PAGINA_LISTAGEM = 1000
+
+# "ROM-000001.pdf" -> ('ROM-000001', ''), "ROM-000001_Copia.pdf" -> ('ROM-000001', '_Copia')
+_PADRAO_NOME_PDF = re.compile(r'^(ROM-[^/]+?)(_Copia)?\.pdf$')
+
+
+def _interpretar_nome(nome_blob):
+    """Retorna (id_romaneio, tipo) ou None se o objeto não for PDF de romaneio"""
+    match = _PADRAO_NOME_PDF.match(nome_blob)
+    if not match:
+        return None
+    return match.group(1), ('copia' if match.group(2) else 'original')
+
+
+class InventarioPDF:
+    """Índice thread-safe dos PDFs de um bucket"""
+
+    def __init__(self, bucket_name, intervalo_reconciliacao=600):
+        self.bucket_name = bucket_name
+        self.intervalo_reconciliacao = intervalo_reconciliacao
+        self.ultima_reconciliacao = None
+        self._pdfs = {}
+        # Conferidos no bucket sem PDF desde a última reconciliação
+        self._ausentes = set()
+        self._lock = threading.Lock()
+        self._carregado = threading.Event()
+        self._reconciliando = False
+        # Uploads feitos durante uma reconciliação (reaplicados sobre a listagem nova)
+        self._gravados_durante_reconciliacao = None
+        self._thread = None
+
+    def registrar(self, nome_blob, tamanho=None, data_modificacao=None):
+        """Registra (ou atualiza) um PDF no índice - chamado a cada upload"""
+        interpretado = _interpretar_nome(nome_blob)
+        if not interpretado:
+            return
+        id_romaneio, tipo = interpretado
+        entrada = {'nome': nome_blob, 'tamanho': tamanho, 'data_modificacao': data_modificacao}
+        with self._lock:
+            self._pdfs.setdefault(id_romaneio, {})[tipo] = entrada
+            self._ausentes.discard(id_romaneio)
+            if self._gravados_durante_reconciliacao is not None:
+                self._gravados_durante_reconciliacao.append((id_romaneio, tipo, entrada))
+
+    def registrar_blob(self, blob):
+        self.registrar(blob.name, blob.size, blob.updated)
+
+    def contem(self, id_romaneio):
+        with self._lock:
+            return id_romaneio in self._pdfs
+
+    def info(self, id_romaneio):
+        """
+        Informações do PDF no formato de verificar_pdf_romaneio (original tem prioridade sobre a cópia)
+
+        Returns:
+            dict: pdf_info ({'existe': False} se não estiver no índice)
+        """
+        with self._lock:
+            pdfs = self._pdfs.get(id_romaneio)
+            if not pdfs:
+                return {'existe': False}
+            tipo = 'original' if 'original' in pdfs else 'copia'
+            entrada = pdfs[tipo]
+        return {
+            'existe': True,
+            'tipo': tipo,
+            'caminho': f"gs://{self.bucket_name}/{entrada['nome']}",
+            'nome': entrada['nome'],
+            'tamanho': entrada['tamanho'],
+            'data_modificacao': entrada['data_modificacao'],
+            'local': 'cloud_storage'
+        }
+
+    def reconciliar(self, bucket):
+        """
+        Refaz o índice a partir do bucket (listagem paginada, página a página)
+
+        Uploads registrados enquanto a listagem roda são preservados.
+        """
+        with self._lock:
+            if self._reconciliando:
+                return False
+            self._reconciliando = True
+            self._gravados_durante_reconciliacao = []
+        try:
+            inicio = time.time()
+            novos = {}
+            total_objetos = 0
+            blobs = bucket.list_blobs(prefix=PREFIXO_ROMANEIOS, page_size=TAMANHO_PAGINA_LISTAGEM)
+            for pagina in blobs.pages:
+                for blob in pagina:
+                    total_objetos += 1
+                    interpretado = _interpretar_nome(blob.name)
+                    if interpretado:
+                        id_romaneio, tipo = interpretado
+                        novos.setdefault(id_romaneio, {})[tipo] = {
+                            'nome': blob.name, 'tamanho': blob.size, 'data_modificacao': blob.updated
+                        }
+            with self._lock:
+                for id_romaneio, tipo, entrada in self._gravados_durante_reconciliacao:
+                    novos.setdefault(id_romaneio, {})[tipo] = entrada
+                self._pdfs = novos
+                self._ausentes = set()
+                self.ultima_reconciliacao = inicio
+            self._carregado.set()
+            print(f"✅ Inventário de PDFs reconciliado: {len(novos)} romaneios ({total_objetos} objetos) em {time.time() - inicio:.1f}s")
+            return True
+        finally:
+            with self._lock:
+                self._reconciliando = False
+                self._gravados_durante_reconciliacao = None
+
+    def conferir(self, ids_romaneios, bucket, limite=20):
+        """
+        Confere direto no bucket (get_blob) romaneios que não estão no índice
+
+        Cobre PDFs gravados por outra instância depois da última reconciliação. Os que não
+        existem ficam em _ausentes até a próxima reconciliação (não são conferidos de novo);
+        o limite mantém o custo da página constante.
+        """
+        with self._lock:
+            pendentes = [i for i in dict.fromkeys(ids_romaneios) if i not in self._pdfs and i not in self._ausentes]
+        for id_romaneio in pendentes[:limite]:
+            encontrado = False
+            for nome in (f"{id_romaneio}.pdf", f"{id_romaneio}_Copia.pdf"):
+                blob = bucket.get_blob(nome)
+                if blob is not None:
+                    self.registrar_blob(blob)
+                    encontrado = True
+            if not encontrado:
+                with self._lock:
+                    self._ausentes.add(id_romaneio)
+
+    def aguardar_carga(self, timeout):
+        """Espera a primeira reconciliação terminar (True se o índice já está carregado)"""
+        return self._carregado.wait(timeout)
+
+    def iniciar_reconciliacao_periodica(self, obter_bucket):
+        """Inicia (uma vez) a thread que reconcilia o índice a cada intervalo_reconciliacao segundos"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop_reconciliacao, args=(obter_bucket,),
+                                            name=f"inventario-pdf-{self.bucket_name}", daemon=True)
+        self._thread.start()
+
+    def _loop_reconciliacao(self, obter_bucket):
+        while True:
+            try:
+                bucket = obter_bucket()
+                if bucket is not None:
+                    self.reconciliar(bucket)
+            except Exception as e:
+                print(f"⚠️ Erro ao reconciliar inventário de PDFs: {e}")
+            time.sleep(self.intervalo_reconciliacao)
+
+
+_inventarios = {}
+_inventarios_lock = threading.Lock()
+
+
+def obter_inventario_pdf(bucket_name='romaneios-separacao', iniciar=True):
+    """
+    Retorna o inventário de PDFs do bucket (um por processo)
+
+    Args:
+        bucket_name: Nome do bucket
+        iniciar: Se True, garante que a reconciliação periódica está rodando
+
+    Returns:
+        InventarioPDF
+    """
+    with _inventarios_lock:
+        inventario = _inventarios.get(bucket_name)
+        if inventario is None:
+            intervalo = int(os.environ.get('PDF_INVENTORY_RECONCILE_SECONDS', '600'))
+            inventario = InventarioPDF(bucket_name, intervalo)
+            _inventarios[bucket_name] = inventario
+    if iniciar:
+        from salvar_pdf_gcs import get_gcs_bucket
+        inventario.iniciar_reconciliacao_periodica(lambda: get_gcs_bucket(bucket_name))
+    return inventario
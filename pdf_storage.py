@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Armazenamento dos PDFs de romaneio com backends intercambiáveis
+
+Todos os pontos que gravam, leem, verificam ou entregam PDFs usam a mesma interface:
+
+    armazenamento = obter_armazenamento_pdf()
+    armazenamento.salvar_async(romaneio_id, pdf_content, is_reprint)   # upload sem bloquear
+    armazenamento.ler(romaneio_id)                                     # bytes ou None
+    armazenamento.info(romaneio_id)                                    # pdf_info (existe, tipo, tamanho...)
+    armazenamento.responder(romaneio_id)                               # Response do Flask ou None
+
+Backends (PDF_STORAGE_BACKEND, ver cloud_config.get_storage_config):
+    ArmazenamentoGCS     - Google Cloud Storage (padrão)
+    ArmazenamentoLocal   - pasta local
+    ArmazenamentoMemoria - dicionário em memória (testes/benchmarks)
+
+Os PDFs circulam sempre como bytes (sem arquivo temporário no meio do caminho).
+tests/test_pdf_storage.py roda as mesmas verificações contra os três backends.
+"""
+
+import io
+import os
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from logging_config import obter_logger
+from metrics import instrumentar
+
+logger = obter_logger(__name__)
+
+# Uploads em segundo plano: poucas threads bastam (o gargalo é a rede, não a CPU)
+_executor_uploads = ThreadPoolExecutor(max_workers=int(os.environ.get('PDF_UPLOAD_WORKERS', '4')),
+                                       thread_name_prefix='pdf-upload')
+
+
+def nome_arquivo_pdf(romaneio_id, is_reprint=False):
+    """Nome do arquivo do PDF (ROM-000001.pdf / ROM-000001_Copia.pdf)"""
+    return f"{romaneio_id}_Copia.pdf" if is_reprint else f"{romaneio_id}.pdf"
+
+
+def _candidatos(romaneio_id, is_reprint=None):
+    """(tipo, nome) na ordem de busca: original tem prioridade sobre a cópia"""
+    if is_reprint is None:
+        return [('original', nome_arquivo_pdf(romaneio_id)), ('copia', nome_arquivo_pdf(romaneio_id, True))]
+    return [('copia' if is_reprint else 'original', nome_arquivo_pdf(romaneio_id, is_reprint))]
+
+
+class ArmazenamentoPDF:
+    """Interface comum dos backends de armazenamento de PDF"""
+
+    tipo = 'base'
+
+    def salvar(self, romaneio_id, pdf_content, is_reprint=False):
+        """
+        Grava o PDF (bloqueante)
+
+        Returns:
+            str: Caminho do PDF no backend ou None se erro
+        """
+        raise NotImplementedError
+
+    def salvar_async(self, romaneio_id, pdf_content, is_reprint=False):
+        """
+        Agenda a gravação em segundo plano e retorna na hora
+
+        Returns:
+            Future: resultado é o mesmo de salvar() (caminho ou None)
+        """
+        return _executor_uploads.submit(self.salvar, romaneio_id, pdf_content, is_reprint)
+
+    def ler(self, romaneio_id, is_reprint=None):
+        """
+        Lê o PDF (is_reprint=None busca o original e depois a cópia)
+
+        Returns:
+            bytes ou None se não encontrado
+        """
+        raise NotImplementedError
+
+    def info(self, romaneio_id):
+        """
+        Metadados do PDF no formato usado pelo Controle de Impressões
+
+        Returns:
+            dict: {'existe': True, 'tipo', 'caminho', 'nome', 'tamanho', 'data_modificacao', 'local'}
+                  ou {'existe': False}
+        """
+        raise NotImplementedError
+
+    def responder(self, romaneio_id):
+        """
+        Resposta HTTP com o PDF (com ETag/Range quando o backend permite)
+
+        Returns:
+            Response ou None se não encontrado
+        """
+        raise NotImplementedError
+
+
+class ArmazenamentoLocal(ArmazenamentoPDF):
+    """PDFs em uma pasta do sistema de arquivos"""
+
+    tipo = 'local'
+
+    def __init__(self, pasta='Romaneios_Separacao'):
+        self.pasta = pasta
+
+    def caminho(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def salvar(self, romaneio_id, pdf_content, is_reprint=False):
+        try:
+            os.makedirs(self.pasta, exist_ok=True)
+            caminho = self.caminho(nome_arquivo_pdf(romaneio_id, is_reprint))
+            # Escrita atômica: quem estiver lendo nunca vê o arquivo pela metade
+            fd, temporario = tempfile.mkstemp(dir=self.pasta, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf_content)
+            os.replace(temporario, caminho)
+            logger.info("✅ PDF salvo localmente: %s", caminho)
+            return caminho
+        except Exception as e:
+            logger.error("❌ Erro ao salvar PDF localmente: %s", e)
+            return None
+
+    def ler(self, romaneio_id, is_reprint=None):
+        for _, nome in _candidatos(romaneio_id, is_reprint):
+            try:
+                with open(self.caminho(nome), 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                continue
+        return None
+
+    def info(self, romaneio_id):
+        for tipo, nome in _candidatos(romaneio_id):
+            caminho = self.caminho(nome)
+            try:
+                stat = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            return {
+                'existe': True,
+                'tipo': tipo,
+                'caminho': caminho,
+                'nome': nome,
+                'tamanho': stat.st_size,
+                'data_modificacao': datetime.fromtimestamp(stat.st_mtime),
+                'local': 'local'
+            }
+        return {'existe': False}
+
+    def responder(self, romaneio_id):
+        from flask import send_file
+        info = self.info(romaneio_id)
+        if not info['existe']:
+            return None
+        # send_file já trata ETag/Last-Modified/Range para arquivos em disco
+        return send_file(os.path.abspath(info['caminho']), mimetype='application/pdf',
+                         as_attachment=False, download_name=info['nome'], conditional=True)
+
+
+class ArmazenamentoGCS(ArmazenamentoPDF):
+    """PDFs no Google Cloud Storage (cliente/bucket compartilhados de salvar_pdf_gcs)"""
+
+    tipo = 'cloud_storage'
+
+    def __init__(self, bucket_name='romaneios-separacao'):
+        self.bucket_name = bucket_name
+
+    def salvar(self, romaneio_id, pdf_content, is_reprint=False):
+        from salvar_pdf_gcs import salvar_pdf_gcs
+        return salvar_pdf_gcs(pdf_content, romaneio_id, self.bucket_name, is_reprint)
+
+    def ler(self, romaneio_id, is_reprint=None):
+        from google.api_core.exceptions import NotFound
+        from salvar_pdf_gcs import get_gcs_bucket
+        bucket = get_gcs_bucket(self.bucket_name)
+        if bucket is None:
+            return None
+        for _, nome in _candidatos(romaneio_id, is_reprint):
+            try:
+                return bucket.blob(nome).download_as_bytes()
+            except NotFound:
+                continue
+        return None
+
+    def _buscar_blob(self, romaneio_id):
+        from salvar_pdf_gcs import get_gcs_bucket
+        bucket = get_gcs_bucket(self.bucket_name)
+        if bucket is None:
+            return None, None
+        for tipo, nome in _candidatos(romaneio_id):
+            blob = bucket.get_blob(nome)
+            if blob is not None:
+                return tipo, blob
+        return None, None
+
+    def info(self, romaneio_id):
+        tipo, blob = self._buscar_blob(romaneio_id)
+        if blob is None:
+            return {'existe': False}
+        return {
+            'existe': True,
+            'tipo': tipo,
+            'caminho': f"gs://{self.bucket_name}/{blob.name}",
+            'nome': blob.name,
+            'tamanho': blob.size,
+            'data_modificacao': blob.updated,
+            'local': 'cloud_storage'
+        }
+
+    def responder(self, romaneio_id):
+        from pdf_streaming import responder_pdf_blob
+        _, blob = self._buscar_blob(romaneio_id)
+        if blob is None:
+            return None
+        return responder_pdf_blob(blob, f"{romaneio_id}.pdf")
+
+
+class ArmazenamentoMemoria(ArmazenamentoPDF):
+    """PDFs em um dicionário do processo (testes e benchmarks)"""
+
+    tipo = 'memoria'
+
+    def __init__(self):
+        self._pdfs = {}
+        self._lock = threading.Lock()
+
+    def salvar(self, romaneio_id, pdf_content, is_reprint=False):
+        nome = nome_arquivo_pdf(romaneio_id, is_reprint)
+        with self._lock:
+            self._pdfs[nome] = (bytes(pdf_content), datetime.now(timezone.utc))
+        return f"memoria://{nome}"
+
+    def _buscar(self, romaneio_id, is_reprint=None):
+        with self._lock:
+            for tipo, nome in _candidatos(romaneio_id, is_reprint):
+                if nome in self._pdfs:
+                    return tipo, nome, self._pdfs[nome]
+        return None, None, None
+
+    def ler(self, romaneio_id, is_reprint=None):
+        _, _, registro = self._buscar(romaneio_id, is_reprint)
+        return registro[0] if registro else None
+
+    def info(self, romaneio_id):
+        tipo, nome, registro = self._buscar(romaneio_id)
+        if registro is None:
+            return {'existe': False}
+        return {
+            'existe': True,
+            'tipo': tipo,
+            'caminho': f"memoria://{nome}",
+            'nome': nome,
+            'tamanho': len(registro[0]),
+            'data_modificacao': registro[1],
+            'local': 'memoria'
+        }
+
+    def responder(self, romaneio_id):
+        from flask import send_file
+        _, nome, registro = self._buscar(romaneio_id)
+        if registro is None:
+            return None
+        conteudo, data_modificacao = registro
+        return send_file(io.BytesIO(conteudo), mimetype='application/pdf', as_attachment=False,
+                         download_name=nome, conditional=True,
+                         etag=hashlib.md5(conteudo).hexdigest(), last_modified=data_modificacao)
+
+
+# Latência de cada backend em /admin/metrics (operações storage.<backend>.<método>)
+for _classe, _prefixo in ((ArmazenamentoLocal, 'storage.local'),
+                          (ArmazenamentoGCS, 'storage.gcs'),
+                          (ArmazenamentoMemoria, 'storage.memoria')):
+    instrumentar(_classe, ('salvar', 'ler', 'info', 'responder'), _prefixo)
+
+
+def criar_armazenamento_pdf(config=None):
+    """
+    Cria o backend a partir da configuração de armazenamento
+
+    Args:
+        config: dict de cloud_config.get_storage_config() (None = ler do ambiente)
+
+    Returns:
+        ArmazenamentoPDF
+    """
+    if config is None:
+        from cloud_config import get_storage_config
+        config = get_storage_config()
+    if config['type'] == 'local':
+        return ArmazenamentoLocal(config.get('local_path', 'Romaneios_Separacao'))
+    if config['type'] == 'memoria':
+        return ArmazenamentoMemoria()
+    return ArmazenamentoGCS(config.get('bucket_name', 'romaneios-separacao'))
+
+
+_armazenamento = None
+_armazenamento_lock = threading.Lock()
+
+
+def obter_armazenamento_pdf():
+    """Retorna o armazenamento de PDFs do processo (criado na primeira chamada)"""
+    global _armazenamento
+    if _armazenamento is None:
+        with _armazenamento_lock:
+            if _armazenamento is None:
+                _armazenamento = criar_armazenamento_pdf()
+                logger.info("📦 Armazenamento de PDFs: %s", _armazenamento.tipo)
+    return _armazenamento
+
+
+def definir_armazenamento_pdf(armazenamento):
+    """Substitui o armazenamento do processo (testes/benchmarks); None volta a ler do ambiente"""
+    global _armazenamento
+    with _armazenamento_lock:
+        _armazenamento = armazenamento
+
+
+def resultado_pdf_gerado(pdf_content, romaneio_id, is_reprint=False, tipo='', message='PDF gerado'):
+    """
+    Valida o PDF gerado e agenda a gravação no armazenamento sem bloquear
+
+    Usado por todos os geradores para devolver o mesmo formato de resultado.
+
+    Returns:
+        dict: {'success', 'message', 'tipo', 'pdf_content', 'caminho', 'upload' (Future)}
+              + 'gcs_path' quando o backend é o Cloud Storage
+    """
+    if not pdf_content or not pdf_content.startswith(b'%PDF'):
+        inicio = pdf_content[:20] if pdf_content else b''
+        return {'success': False, 'message': f'Arquivo não é um PDF válido (começa com: {inicio})'}
+
+    armazenamento = obter_armazenamento_pdf()
+    nome = nome_arquivo_pdf(romaneio_id, is_reprint)
+    resultado = {
+        'success': True,
+        'message': message,
+        'tipo': tipo,
+        'pdf_content': pdf_content,
+        'upload': armazenamento.salvar_async(romaneio_id, pdf_content, is_reprint),
+    }
+    if isinstance(armazenamento, ArmazenamentoGCS):
+        resultado['gcs_path'] = f"gs://{armazenamento.bucket_name}/{nome}"
+        resultado['caminho'] = resultado['gcs_path']
+    elif isinstance(armazenamento, ArmazenamentoLocal):
+        resultado['caminho'] = armazenamento.caminho(nome)
+    else:
+        resultado['caminho'] = f"memoria://{nome}"
+    logger.debug("📤 Gravação do PDF agendada (%s): %s (%s bytes)", armazenamento.tipo, resultado['caminho'], len(pdf_content))
+    return resultado
+
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Entrega de PDFs em partes (streaming) com requisições condicionais e parciais
+
+- ETag / If-None-Match e Last-Modified / If-Modified-Since -> 304 sem reenviar o PDF
+- Range / If-Range -> 206 com só o trecho pedido (o visualizador de PDF do navegador
+  busca as páginas sob demanda)
+- O conteúdo é lido do Cloud Storage em blocos de TAMANHO_BLOCO, então a memória da
+  instância não cresce com o tamanho do PDF
+"""
+
+from flask import Response, request
+
+# Tamanho de cada leitura no Cloud Storage e de cada pedaço enviado ao navegador
+TAMANHO_BLOCO = 256 * 1024
+
+
+def _gerar_blocos_blob(blob, inicio, fim):
+    """Lê o trecho [inicio, fim] do blob em blocos (uma requisição ranged por bloco)"""
+    with blob.open('rb', chunk_size=TAMANHO_BLOCO) as leitor:
+        leitor.seek(inicio)
+        restante = fim - inicio + 1
+        while restante > 0:
+            bloco = leitor.read(min(TAMANHO_BLOCO, restante))
+            if not bloco:
+                break
+            restante -= len(bloco)
+            yield bloco
+
+
+def _nao_modificado(etag, ultima_modificacao):
+    """Verifica If-None-Match (prioritário) e If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and ultima_modificacao:
+        return ultima_modificacao.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _range_valido(etag, ultima_modificacao):
+    """O Range só vale se o If-Range (quando enviado) ainda bate com o arquivo atual"""
+    if request.range is None:
+        return False
+    if_range = request.if_range
+    if if_range.etag:
+        return if_range.etag == etag
+    if if_range.date and ultima_modificacao:
+        return ultima_modificacao.replace(microsecond=0) <= if_range.date
+    return True
+
+
+def responder_pdf_blob(blob, download_name):
+    """
+    Monta a resposta HTTP de um PDF do Cloud Storage sem carregá-lo inteiro na memória
+
+    Args:
+        blob: Blob com metadados carregados (ver salvar_pdf_gcs.buscar_blob_pdf_gcs)
+        download_name: Nome do arquivo exibido no navegador
+
+    Returns:
+        Response: 200 (streaming), 206 (trecho), 304 (não modificado) ou 416 (range inválido)
+    """
+    tamanho = blob.size or 0
+    etag = blob.etag or str(blob.generation)
+    ultima_modificacao = blob.updated
+
+    response = Response(mimetype='application/pdf')
+    response.set_etag(etag)
+    response.last_modified = ultima_modificacao
+    response.accept_ranges = 'bytes'
+    # Sempre revalidar (barato: 304 sem corpo) - o PDF pode ser substituído por uma nova geração
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['Content-Disposition'] = f'inline; filename="{download_name}"'
+
+    if _nao_modificado(etag, ultima_modificacao):
+        response.status_code = 304
+        return response
+
+    inicio, fim = 0, tamanho - 1
+    if _range_valido(etag, ultima_modificacao):
+        intervalo = request.range.range_for_length(tamanho)
+        if intervalo is None:
+            if len(request.range.ranges) == 1:
+                response.status_code = 416
+                response.headers['Content-Range'] = f'bytes */{tamanho}'
+                return response
+            # Vários intervalos (multipart/byteranges) não são suportados: envia o arquivo inteiro
+        else:
+            inicio, fim = intervalo[0], intervalo[1] - 1
+            response.status_code = 206
+            response.content_range = f'bytes {inicio}-{fim}/{tamanho}'
+
+    response.content_length = fim - inicio + 1
+    if request.method == 'HEAD' or tamanho == 0:
+        return response
+
+    response.response = _gerar_blocos_blob(blob, inicio, fim)
+    response.direct_passthrough = True
+    return response
@@ -4,12 +4,75 @@ Funções para salvar PDFs no Google Cloud Storage
 """
 
 import os
+import threading
 from google.cloud import storage as gcs
+from google.api_core.exceptions import NotFound
 from google.oauth2.service_account import Credentials
 import json
-import io
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+# Cliente e buckets compartilhados pelo processo (criar o cliente re-lê as credenciais e abre
+# uma nova sessão HTTP; reaproveitar economiza esse custo em toda operação com PDF)
+_gcs_client = None
+_gcs_buckets = {}
+_gcs_lock = threading.Lock()
 
 def get_gcs_client():
+    """
+    Retorna o cliente do Google Cloud Storage do processo (criado na primeira chamada)
+    
+    Com GCS_BACKEND=fake usa o armazenamento em memória de fake_gcs.py (testes/benchmarks).
+    
+    Returns:
+        Client ou None se não foi possível criar (nova tentativa na próxima chamada)
+    """
+    global _gcs_client
+    if _gcs_client is not None:
+        return _gcs_client
+    with _gcs_lock:
+        if _gcs_client is None:
+            if os.environ.get('GCS_BACKEND', '').lower() == 'fake':
+                from fake_gcs import FakeGCSClient
+                _gcs_client = FakeGCSClient()
+                logger.info("🧪 Usando Cloud Storage em memória (GCS_BACKEND=fake)")
+            else:
+                _gcs_client = _criar_gcs_client()
+        return _gcs_client
+
+def get_gcs_bucket(bucket_name='romaneios-separacao'):
+    """
+    Retorna o handle do bucket (reaproveitado entre chamadas, sem requisição ao GCS)
+    
+    Args:
+        bucket_name: Nome do bucket
+    
+    Returns:
+        Bucket ou None se não há cliente
+    """
+    bucket = _gcs_buckets.get(bucket_name)
+    if bucket is not None:
+        return bucket
+    client = get_gcs_client()
+    if not client:
+        return None
+    with _gcs_lock:
+        return _gcs_buckets.setdefault(bucket_name, client.bucket(bucket_name))
+
+def set_gcs_client(client):
+    """
+    Substitui o cliente do processo (ex.: FakeGCSClient em testes); None força recriar
+    
+    Args:
+        client: Cliente compatível com google.cloud.storage.Client
+    """
+    global _gcs_client
+    with _gcs_lock:
+        _gcs_client = client
+        _gcs_buckets.clear()
+
+def _criar_gcs_client():
     """Cria cliente do Google Cloud Storage"""
     try:
         creds = None
@@ -17,16 +80,16 @@ def get_gcs_client():
         
         # Debug: verificar ambiente
         is_cloud_run = os.environ.get('K_SERVICE') is not None
-        print(f"🌐 Ambiente detectado: {'Cloud Run' if is_cloud_run else 'Local'}")
-        print(f"🔍 Variáveis de ambiente disponíveis:")
-        print(f"   - K_SERVICE: {os.environ.get('K_SERVICE', 'NÃO DEFINIDA')}")
-        print(f"   - GOOGLE_SERVICE_ACCOUNT_INFO: {'DEFINIDA' if os.environ.get('GOOGLE_SERVICE_ACCOUNT_INFO') else 'NÃO DEFINIDA'}")
-        print(f"   - GCS_BUCKET_NAME: {os.environ.get('GCS_BUCKET_NAME', 'NÃO DEFINIDA')}")
+        logger.info("🌐 Ambiente detectado: %s", 'Cloud Run' if is_cloud_run else 'Local')
+        logger.debug("🔍 Variáveis de ambiente disponíveis:")
+        logger.debug("   - K_SERVICE: %s", os.environ.get('K_SERVICE', 'NÃO DEFINIDA'))
+        logger.debug("   - GOOGLE_SERVICE_ACCOUNT_INFO: %s", 'DEFINIDA' if os.environ.get('GOOGLE_SERVICE_ACCOUNT_INFO') else 'NÃO DEFINIDA')
+        logger.debug("   - GCS_BUCKET_NAME: %s", os.environ.get('GCS_BUCKET_NAME', 'NÃO DEFINIDA'))
         
         # Opção 1: Ler de variável de ambiente (Cloud Run/Produção)
         service_account_info = os.environ.get('GOOGLE_SERVICE_ACCOUNT_INFO')
         if service_account_info:
-            print("📋 Carregando credenciais da variável de ambiente...")
+            logger.info("📋 Carregando credenciais da variável de ambiente...")
             try:
                 # Limpar e preparar JSON (remover quebras de linha extras, espaços)
                 # Pode estar como string JSON dentro de string (double encoding)
@@ -34,7 +97,7 @@ def get_gcs_client():
                 
                 # Tentar fazer decode se estiver como string escapada
                 if cleaned_info.startswith('"') and cleaned_info.endswith('"'):
-                    print("📋 Detectado JSON como string escapada, fazendo decode...")
+                    logger.info("📋 Detectado JSON como string escapada, fazendo decode...")
                     cleaned_info = json.loads(cleaned_info)
                 
                 # Tentar fazer parse do JSON
@@ -47,28 +110,28 @@ def get_gcs_client():
                 required_fields = ['type', 'project_id', 'private_key', 'client_email']
                 missing_fields = [field for field in required_fields if field not in info]
                 if missing_fields:
-                    print(f"❌ ERRO: Campos obrigatórios faltando: {missing_fields}")
+                    logger.error("❌ ERRO: Campos obrigatórios faltando: %s", missing_fields)
                     return None
                 
                 creds = Credentials.from_service_account_info(info)
                 project_id = info.get('project_id')
                 client_email = info.get('client_email', 'N/A')
-                print(f"✅ Credenciais carregadas da variável de ambiente")
-                print(f"   Projeto: {project_id}")
-                print(f"   Service Account: {client_email}")
+                logger.info("✅ Credenciais carregadas da variável de ambiente")
+                logger.info("   Projeto: %s", project_id)
+                logger.info("   Service Account: %s", client_email)
             except json.JSONDecodeError as e:
-                print(f"❌ ERRO: JSON inválido na variável GOOGLE_SERVICE_ACCOUNT_INFO")
-                print(f"   Erro: {e}")
-                print(f"   Tamanho da string: {len(service_account_info)} caracteres")
-                print(f"   Primeiros 200 caracteres: {service_account_info[:200]}")
-                print(f"   Últimos 100 caracteres: {service_account_info[-100:]}")
+                logger.error("❌ ERRO: JSON inválido na variável GOOGLE_SERVICE_ACCOUNT_INFO")
+                logger.error("   Erro: %s", e)
+                logger.error("   Tamanho da string: %s caracteres", len(service_account_info))
+                logger.error("   Primeiros 200 caracteres: %s", service_account_info[:200])
+                logger.error("   Últimos 100 caracteres: %s", service_account_info[-100:])
                 return None
             except KeyError as e:
-                print(f"❌ ERRO: Campo obrigatório faltando no JSON: {e}")
-                print(f"   Campos disponíveis: {list(info.keys()) if 'info' in locals() else 'N/A'}")
+                logger.error("❌ ERRO: Campo obrigatório faltando no JSON: %s", e)
+                logger.error("   Campos disponíveis: %s", list(info.keys()) if 'info' in locals() else 'N/A')
                 return None
             except Exception as e:
-                print(f"❌ ERRO ao processar credenciais da variável: {e}")
+                logger.error("❌ ERRO ao processar credenciais da variável: %s", e)
                 import traceback
                 traceback.print_exc()
                 return None
@@ -77,54 +140,54 @@ def get_gcs_client():
         if not creds:
             credential_file = 'gestaosolicitacao-fe66ad097590.json'
             if os.path.exists(credential_file):
-                print(f"📋 Carregando credenciais do arquivo: {credential_file}")
+                logger.info("📋 Carregando credenciais do arquivo: %s", credential_file)
                 try:
                     with open(credential_file, 'r', encoding='utf-8') as f:
                         info = json.load(f)
                         creds = Credentials.from_service_account_info(info)
                         project_id = info.get('project_id')
-                    print(f"✅ Credenciais carregadas do arquivo (Projeto: {project_id})")
+                    logger.info("✅ Credenciais carregadas do arquivo (Projeto: %s)", project_id)
                 except Exception as e:
-                    print(f"❌ ERRO ao ler arquivo de credenciais: {e}")
+                    logger.error("❌ ERRO ao ler arquivo de credenciais: %s", e)
                     return None
             else:
                 if is_cloud_run:
-                    print(f"⚠️ ATENÇÃO: No Cloud Run e arquivo {credential_file} não encontrado")
-                    print(f"⚠️ Verifique se a variável GOOGLE_SERVICE_ACCOUNT_INFO está configurada!")
+                    logger.warning("⚠️ ATENÇÃO: No Cloud Run e arquivo %s não encontrado", credential_file)
+                    logger.warning("⚠️ Verifique se a variável GOOGLE_SERVICE_ACCOUNT_INFO está configurada!")
                 else:
-                    print(f"⚠️ Arquivo de credenciais não encontrado: {credential_file}")
-                    print("⚠️ Tentando usar Application Default Credentials...")
+                    logger.warning("⚠️ Arquivo de credenciais não encontrado: %s", credential_file)
+                    logger.warning("⚠️ Tentando usar Application Default Credentials...")
         
         # Criar cliente
         if creds and project_id:
             try:
                 client = gcs.Client(credentials=creds, project=project_id)
-                print(f"✅ Cliente GCS criado com credenciais (Projeto: {project_id})")
+                logger.info("✅ Cliente GCS criado com credenciais (Projeto: %s)", project_id)
                 return client
             except Exception as e:
-                print(f"❌ ERRO ao criar cliente GCS com credenciais: {e}")
+                logger.error("❌ ERRO ao criar cliente GCS com credenciais: %s", e)
                 import traceback
                 traceback.print_exc()
                 return None
         else:
             # Fallback: Application Default Credentials (só funciona se a service account do Cloud Run tiver permissões)
             if is_cloud_run:
-                print("⚠️ ATENÇÃO: Tentando usar Application Default Credentials no Cloud Run")
-                print("⚠️ Certifique-se que a service account do Cloud Run tem permissões no bucket!")
+                logger.warning("⚠️ ATENÇÃO: Tentando usar Application Default Credentials no Cloud Run")
+                logger.warning("⚠️ Certifique-se que a service account do Cloud Run tem permissões no bucket!")
             else:
-                print("⚠️ Usando Application Default Credentials")
+                logger.warning("⚠️ Usando Application Default Credentials")
             try:
                 client = gcs.Client()
-                print("✅ Cliente GCS criado com Application Default Credentials")
+                logger.info("✅ Cliente GCS criado com Application Default Credentials")
                 return client
             except Exception as e:
-                print(f"❌ ERRO ao criar cliente GCS com Application Default Credentials: {e}")
+                logger.error("❌ ERRO ao criar cliente GCS com Application Default Credentials: %s", e)
                 import traceback
                 traceback.print_exc()
                 return None
             
     except Exception as e:
-        print(f"❌ ERRO CRÍTICO ao criar cliente GCS: {e}")
+        logger.error("❌ ERRO CRÍTICO ao criar cliente GCS: %s", e)
         import traceback
         traceback.print_exc()
         return None
@@ -143,37 +206,13 @@ def salvar_pdf_gcs(pdf_content, romaneio_id, bucket_name='romaneios-separacao',
         str: Caminho do arquivo no GCS (gs://bucket/file.pdf) ou None se erro
     """
     try:
-        print(f"☁️ === INÍCIO: Salvando PDF no Cloud Storage ===")
-        print(f"☁️ Romaneio ID: {romaneio_id}")
-        print(f"☁️ Bucket: {bucket_name}")
-        print(f"☁️ Tamanho do PDF: {len(pdf_content)} bytes")
+        logger.debug("☁️ Salvando PDF no Cloud Storage: %s (%s bytes, bucket %s)",
+                     romaneio_id, len(pdf_content), bucket_name)
         
-        # Criar cliente
-        client = get_gcs_client()
-        if not client:
-            print("❌ ERRO: Não foi possível criar cliente GCS")
-            return None
-        
-        # Verificar se bucket existe e temos acesso
-        try:
-            bucket = client.bucket(bucket_name)
-            # Tentar acessar metadados do bucket para verificar permissões
-            print(f"🔍 Verificando acesso ao bucket: {bucket_name}")
-            bucket.reload()
-            print(f"✅ Bucket encontrado e acessível: {bucket_name}")
-        except Exception as bucket_error:
-            error_msg = str(bucket_error).lower()
-            if '404' in error_msg or 'not found' in error_msg:
-                print(f"❌ ERRO: Bucket '{bucket_name}' não encontrado!")
-                print(f"   Verifique se o bucket existe no projeto")
-            elif '403' in error_msg or 'permission denied' in error_msg or 'forbidden' in error_msg:
-                print(f"❌ ERRO: Sem permissão para acessar o bucket '{bucket_name}'!")
-                print(f"   Verifique as permissões da service account no bucket")
-                print(f"   Permissões necessárias: Storage Object Creator, Storage Object Viewer")
-            else:
-                print(f"❌ ERRO ao acessar bucket: {bucket_error}")
-            import traceback
-            traceback.print_exc()
+        # Bucket compartilhado (sem bucket.reload(): erros de acesso aparecem no próprio upload)
+        bucket = get_gcs_bucket(bucket_name)
+        if bucket is None:
+            logger.error("❌ ERRO: Não foi possível criar cliente GCS")
             return None
         
         # Nome do arquivo
@@ -186,39 +225,40 @@ def salvar_pdf_gcs(pdf_content, romaneio_id, bucket_name='romaneios-separacao',
         blob = bucket.blob(filename)
         
         # Upload do arquivo
-        print(f"📤 Fazendo upload de {len(pdf_content)} bytes para {filename}...")
         try:
             blob.upload_from_string(pdf_content, content_type='application/pdf')
             
-            # Verificar se o upload foi bem-sucedido
-            if not blob.exists():
-                print(f"⚠️ ATENÇÃO: Upload completado mas arquivo não encontrado no bucket")
+            # Verificar o upload pelos metadados devolvidos na própria resposta (sem blob.exists())
+            file_size = blob.size
+            if file_size is not None and int(file_size) != len(pdf_content):
+                logger.warning("⚠️ ATENÇÃO: Upload completado com tamanho divergente (%s de %s bytes)", file_size, len(pdf_content))
                 return None
             
             gcs_path = f"gs://{bucket_name}/{filename}"
-            file_size = blob.size
-            print(f"✅ === SUCESSO: PDF salvo no Cloud Storage ===")
-            print(f"✅ Caminho: {gcs_path}")
-            print(f"✅ Tamanho confirmado: {file_size} bytes")
+            
+            # Manter o inventário de PDFs (Controle de Impressões) atualizado sem listar o bucket
+            try:
+                from pdf_inventory import obter_inventario_pdf
+                obter_inventario_pdf(bucket_name, iniciar=False).registrar_blob(blob)
+            except Exception as inventario_error:
+                logger.warning("⚠️ Não foi possível atualizar o inventário de PDFs: %s", inventario_error)
+            
+            logger.info("✅ PDF salvo no Cloud Storage: %s (%s bytes)", gcs_path, file_size)
             return gcs_path
         except Exception as upload_error:
             error_msg = str(upload_error).lower()
             if '403' in error_msg or 'permission denied' in error_msg or 'forbidden' in error_msg:
-                print(f"❌ ERRO: Sem permissão para fazer upload no bucket!")
-                print(f"   Verifique se a service account tem permissão 'Storage Object Creator'")
+                logger.error("❌ ERRO: Sem permissão para fazer upload no bucket!")
+                logger.error("   Verifique se a service account tem permissão 'Storage Object Creator'")
             elif '404' in error_msg or 'not found' in error_msg:
-                print(f"❌ ERRO: Bucket não encontrado durante upload")
+                logger.error("❌ ERRO: Bucket '%s' não encontrado durante upload", bucket_name)
+                logger.error("   Verifique se o bucket existe no projeto")
             else:
-                print(f"❌ ERRO durante upload: {upload_error}")
-            import traceback
-            traceback.print_exc()
+                logger.exception("❌ ERRO durante upload: %s", upload_error)
             return None
         
     except Exception as e:
-        print(f"❌ === ERRO CRÍTICO ao salvar PDF no Cloud Storage ===")
-        print(f"❌ Erro: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erro ao salvar PDF no Cloud Storage: %s", e)
         return None
 
 def buscar_pdf_gcs(romaneio_id, bucket_name='romaneios-separacao'):
@@ -233,33 +273,58 @@ def buscar_pdf_gcs(romaneio_id, bucket_name='romaneios-separacao'):
         bytes: Conteúdo do PDF ou None se não encontrado
     """
     try:
-        print(f"🔍 Buscando PDF no Cloud Storage: {romaneio_id}")
+        logger.debug("🔍 Buscando PDF no Cloud Storage: %s", romaneio_id)
         
-        # Criar cliente
-        client = get_gcs_client()
-        if not client:
+        bucket = get_gcs_bucket(bucket_name)
+        if bucket is None:
             return None
         
-        # Obter bucket
-        bucket = client.bucket(bucket_name)
+        # Download direto: 404 (NotFound) é o "não existe" - sem blob.exists() antes
+        for filename in (f"{romaneio_id}.pdf", f"{romaneio_id}_Copia.pdf"):
+            try:
+                pdf_content = bucket.blob(filename).download_as_bytes()
+                logger.debug("✅ PDF encontrado: %s", filename)
+                return pdf_content
+            except NotFound:
+                continue
         
-        # Tentar arquivo original
-        blob = bucket.blob(f"{romaneio_id}.pdf")
-        if blob.exists():
-            print(f"✅ PDF original encontrado: {romaneio_id}.pdf")
-            return blob.download_as_bytes()
+        logger.info("PDF não encontrado: %s", romaneio_id)
+        return None
         
-        # Tentar arquivo de cópia
-        blob_copia = bucket.blob(f"{romaneio_id}_Copia.pdf")
-        if blob_copia.exists():
-            print(f"✅ PDF de cópia encontrado: {romaneio_id}_Copia.pdf")
-            return blob_copia.download_as_bytes()
+    except Exception as e:
+        logger.error("❌ Erro ao buscar PDF no Cloud Storage: %s", e)
+        return None
+
+def buscar_blob_pdf_gcs(romaneio_id, bucket_name='romaneios-separacao'):
+    """
+    Busca apenas os metadados do PDF no Google Cloud Storage (sem baixar o conteúdo)
+    
+    Usado para entregar o PDF em partes (streaming) com ETag, Last-Modified e Range.
+    
+    Args:
+        romaneio_id: ID do romaneio
+        bucket_name: Nome do bucket
+    
+    Returns:
+        Blob: Blob com size/etag/updated/generation carregados, ou None se não encontrado
+    """
+    try:
+        bucket = get_gcs_bucket(bucket_name)
+        if bucket is None:
+            return None
         
-        print(f"❌ PDF não encontrado: {romaneio_id}")
+        # get_blob já devolve None se não existir (uma requisição de metadados por arquivo)
+        for filename in (f"{romaneio_id}.pdf", f"{romaneio_id}_Copia.pdf"):
+            blob = bucket.get_blob(filename)
+            if blob is not None:
+                logger.debug("✅ PDF encontrado: %s (%s bytes)", filename, blob.size)
+                return blob
+        
+        logger.info("PDF não encontrado: %s", romaneio_id)
         return None
         
     except Exception as e:
-        print(f"❌ Erro ao buscar PDF no Cloud Storage: {e}")
+        logger.error("❌ Erro ao buscar PDF no Cloud Storage: %s", e)
         return None
 
 def verificar_pdf_existe_gcs(romaneio_id, bucket_name='romaneios-separacao'):
@@ -274,24 +339,19 @@ def verificar_pdf_existe_gcs(romaneio_id, bucket_name='romaneios-separacao'):
         bool: True se existe, False caso contrário
     """
     try:
-        client = get_gcs_client()
-        if not client:
+        bucket = get_gcs_bucket(bucket_name)
+        if bucket is None:
             return False
         
-        bucket = client.bucket(bucket_name)
-        
-        # Verificar arquivo original
-        if bucket.blob(f"{romaneio_id}.pdf").exists():
-            return True
-        
-        # Verificar arquivo de cópia
-        if bucket.blob(f"{romaneio_id}_Copia.pdf").exists():
-            return True
+        # get_blob devolve None no 404 (sem exists() antes); o original é o mais comum
+        for filename in (f"{romaneio_id}.pdf", f"{romaneio_id}_Copia.pdf"):
+            if bucket.get_blob(filename) is not None:
+                return True
         
         return False
         
     except Exception as e:
-        print(f"❌ Erro ao verificar PDF: {e}")
+        logger.error("❌ Erro ao verificar PDF: %s", e)
         return False
 
 
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Estado de execução compartilhado entre threads e entre workers do gunicorn
+
+O que várias requisições e threads de fundo precisam ver igual (status da geração de PDFs,
+geração do cache do Sheets) fica aqui em vez de dicts globais do app.py:
+
+- EstadoMemoria: dict com lock, TTL e limite de chaves; vale para um processo (um worker)
+- EstadoBanco:   tabela EstadoCompartilhado no banco do app; vale para todos os workers e
+                 instâncias que usam o mesmo banco (SQLite local ou Cloud SQL)
+
+O número de workers vem de workers_configurados() (WEB_CONCURRENCY ou o padrão conservador),
+a mesma função que o gunicorn.conf.py usa: com mais de um worker o backend é sempre banco;
+SHARED_STATE_BACKEND=memoria|banco só escolhe com um worker.
+
+Os valores são JSON (dicts, listas, textos, números). alterar(), atualizar() e incrementar()
+são atômicos mesmo com vários workers: no banco a gravação só vale se a chave não mudou desde
+a leitura (senão relê e calcula de novo), e a criação simultânea da chave repete no conflito.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from logging_config import obter_logger
+
+logger = obter_logger(__name__)
+
+
+class EstadoMemoria:
+    """Chave -> valor com expiração, protegido por lock (um processo)"""
+
+    tipo = 'memoria'
+
+    def __init__(self, maximo_chaves=10000):
+        """
+        Args:
+            maximo_chaves: acima disso as chaves gravadas há mais tempo saem primeiro
+        """
+        self._valores = {}
+        self._lock = threading.Lock()
+        self.maximo_chaves = maximo_chaves
+
+    def obter(self, chave, padrao=None):
+        with self._lock:
+            item = self._valores.get(chave)
+            if item is None:
+                return padrao
+            valor, expira_em = item
+            if expira_em is not None and time.time() >= expira_em:
+                del self._valores[chave]
+                return padrao
+            # Cópia: quem lê não altera o estado sem passar por definir/atualizar
+            return json.loads(valor)
+
+    def definir(self, chave, valor, ttl=None):
+        """
+        Grava o valor
+
+        Args:
+            chave: nome da chave (ex.: 'pdf_status:ROM-000123')
+            valor: valor serializável em JSON
+            ttl: segundos até expirar (None = não expira)
+        """
+        serializado = json.dumps(valor, default=str)
+        with self._lock:
+            self._guardar(chave, serializado, ttl)
+
+    def alterar(self, chave, calcular, ttl=None):
+        """
+        Grava calcular(valor atual) de forma atômica e devolve o valor gravado
+
+        Args:
+            chave: nome da chave
+            calcular: função do valor atual (None se a chave não existe ou expirou) para o novo;
+                      no banco pode rodar mais de uma vez (gravação concorrente), sem efeitos colaterais
+            ttl: segundos até expirar (None = não expira), contados a partir desta gravação
+        """
+        with self._lock:
+            item = self._valores.get(chave)
+            atual = json.loads(item[0]) if item is not None and (item[1] is None or time.time() < item[1]) else None
+            valor = calcular(atual)
+            self._guardar(chave, json.dumps(valor, default=str), ttl)
+            return valor
+
+    def atualizar(self, chave, campos, ttl=None):
+        """Mescla campos no dict da chave (cria se não existir) e devolve o dict resultante"""
+        def mesclar(atual):
+            novo = dict(atual or {})
+            novo.update(campos)
+            return novo
+        return self.alterar(chave, mesclar, ttl)
+
+    def incrementar(self, chave, quantidade=1, minimo=0, ttl=None):
+        """
+        Soma quantidade ao contador da chave e devolve o novo valor
+
+        Args:
+            minimo: valor de partida se o contador não existe ou está abaixo dele
+                    (ex.: maior ID já gravado na planilha)
+        """
+        return self.alterar(chave, lambda atual: max(atual or 0, minimo) + quantidade, ttl)
+
+    def _guardar(self, chave, serializado, ttl):
+        # Reinsere no fim: a ordem do dict é a ordem de gravação (mais antigas primeiro)
+        self._valores.pop(chave, None)
+        self._valores[chave] = (serializado, time.time() + ttl if ttl else None)
+        while len(self._valores) > self.maximo_chaves:
+            del self._valores[next(iter(self._valores))]
+
+    def remover(self, chave):
+        with self._lock:
+            self._valores.pop(chave, None)
+
+    def limpar(self, prefixo=''):
+        with self._lock:
+            for chave in [c for c in self._valores if c.startswith(prefixo)]:
+                del self._valores[chave]
+
+    def espaco(self, prefixo, ttl=None):
+        return EspacoEstado(self, prefixo, ttl)
+
+
+class EstadoBanco(EstadoMemoria):
+    """Mesma interface, gravada na tabela do modelo (compartilhada entre processos)"""
+
+    tipo = 'banco'
+
+    # Releituras de alterar() quando outro worker grava a mesma chave no meio
+    TENTATIVAS = 20
+
+    def __init__(self, app, db, modelo):
+        """
+        Args:
+            app: app Flask (as operações abrem o próprio app_context: funcionam em threads de fundo)
+            db: instância SQLAlchemy do app
+            modelo: modelo EstadoCompartilhado (chave, valor, expira_em, atualizado_em)
+        """
+        super().__init__()
+        self.app = app
+        self.db = db
+        self.modelo = modelo
+        self._tabela_pronta = False
+        self._ultima_limpeza = 0
+
+    def _sessao(self):
+        """Contexto com a tabela criada (gunicorn não passa pelo db.create_all do __main__)"""
+        contexto = self.app.app_context()
+        contexto.push()
+        self._garantir_tabela()
+        return contexto
+
+    def _garantir_tabela(self):
+        if not self._tabela_pronta:
+            with self._lock:
+                if not self._tabela_pronta:
+                    self.modelo.__table__.create(bind=self.db.engine, checkfirst=True)
+                    self._tabela_pronta = True
+
+    def _contexto_atual(self):
+        """True dentro de um app_context deste app (requisição, CLI); threads de fundo não têm"""
+        from flask import current_app, has_app_context
+        return has_app_context() and current_app._get_current_object() is self.app
+
+    def obter(self, chave, padrao=None):
+        # Leitura no caminho de cada requisição (sessão, limite de login): usa o contexto e a
+        # sessão da requisição em vez de abrir e descartar outros. Select de colunas: não passa
+        # pelo identity map da sessão (sempre o valor atual) e não deixa objetos nela.
+        contexto = None
+        if self._contexto_atual():
+            self._garantir_tabela()
+        else:
+            contexto = self._sessao()
+        try:
+            linha = self.db.session.execute(
+                self.db.select(self.modelo.valor, self.modelo.expira_em).where(self.modelo.chave == chave)
+            ).first()
+            if linha is None or (linha.expira_em is not None and linha.expira_em <= datetime.utcnow()):
+                return padrao
+            return json.loads(linha.valor)
+        finally:
+            if contexto is not None:
+                self.db.session.remove()
+                contexto.pop()
+
+    def definir(self, chave, valor, ttl=None):
+        self.alterar(chave, lambda atual: valor, ttl)
+
+    def alterar(self, chave, calcular, ttl=None):
+        from sqlalchemy.exc import IntegrityError
+
+        contexto = self._sessao()
+        try:
+            for _ in range(self.TENTATIVAS):
+                agora = datetime.utcnow()
+                registro = self.db.session.get(self.modelo, chave, populate_existing=True)
+                atual = None
+                if registro is not None and (registro.expira_em is None or registro.expira_em > agora):
+                    atual = json.loads(registro.valor)
+                valor = calcular(atual)
+                campos = {
+                    'valor': json.dumps(valor, default=str),
+                    'expira_em': agora + timedelta(seconds=ttl) if ttl else None,
+                    'atualizado_em': agora,
+                }
+                try:
+                    if registro is None:
+                        self.db.session.add(self.modelo(chave=chave, **campos))
+                        self.db.session.commit()
+                    else:
+                        # Compare-and-set: só grava se a linha ainda é a que foi lida
+                        gravadas = self.modelo.query.filter_by(
+                            chave=chave, valor=registro.valor, atualizado_em=registro.atualizado_em
+                        ).update(campos, synchronize_session=False)
+                        self.db.session.commit()
+                        if not gravadas:
+                            continue
+                except IntegrityError:
+                    # Outro worker criou a chave entre a leitura e o insert
+                    self.db.session.rollback()
+                    continue
+                self._remover_expirados(agora)
+                return valor
+            raise RuntimeError(f"Chave {chave} alterada por outros workers em {self.TENTATIVAS} tentativas seguidas")
+        except Exception:
+            self.db.session.rollback()
+            raise
+        finally:
+            self.db.session.remove()
+            contexto.pop()
+
+    def _remover_expirados(self, agora):
+        # No máximo uma vez por minuto por processo
+        if time.time() - self._ultima_limpeza < 60:
+            return
+        self._ultima_limpeza = time.time()
+        self.modelo.query.filter(self.modelo.expira_em.isnot(None), self.modelo.expira_em <= agora).delete()
+        self.db.session.commit()
+
+    def remover(self, chave):
+        self._apagar(self.modelo.chave == chave)
+
+    def limpar(self, prefixo=''):
+        self._apagar(self.modelo.chave.startswith(prefixo, autoescape=True))
+
+    def _apagar(self, condicao):
+        contexto = self._sessao()
+        try:
+            self.modelo.query.filter(condicao).delete(synchronize_session=False)
+            self.db.session.commit()
+        except Exception:
+            self.db.session.rollback()
+            raise
+        finally:
+            self.db.session.remove()
+            contexto.pop()
+
+
+class EspacoEstado:
+    """Chaves de um assunto (ex.: status dos PDFs) com prefixo e TTL comuns"""
+
+    def __init__(self, estado, prefixo, ttl=None):
+        self.estado = estado
+        self.prefixo = prefixo + ':'
+        self.ttl = ttl
+
+    def obter(self, chave, padrao=None):
+        return self.estado.obter(self.prefixo + chave, padrao)
+
+    def definir(self, chave, valor):
+        self.estado.definir(self.prefixo + chave, valor, self.ttl)
+
+    def atualizar(self, chave, **campos):
+        return self.estado.atualizar(self.prefixo + chave, campos, self.ttl)
+
+    def alterar(self, chave, calcular):
+        return self.estado.alterar(self.prefixo + chave, calcular, self.ttl)
+
+    def incrementar(self, chave, quantidade=1, minimo=0):
+        return self.estado.incrementar(self.prefixo + chave, quantidade, minimo, self.ttl)
+
+    def remover(self, chave):
+        self.estado.remover(self.prefixo + chave)
+
+    def limpar(self):
+        self.estado.limpar(self.prefixo)
+
+
+def _cota_cpu_cgroup():
+    """Núcleos da cota de CPU do contêiner (cgroup v2 ou v1), None se sem limite ou desconhecida"""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as arquivo:
+            cota, periodo = arquivo.read().split()[:2]
+        if cota != 'max':
+            return int(cota) / int(periodo)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as arquivo:
+            cota = int(arquivo.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as arquivo:
+            periodo = int(arquivo.read())
+        return cota / periodo if cota > 0 and periodo > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def nucleos_disponiveis():
+    """Núcleos que o processo pode usar: afinidade de CPU limitada pela cota do cgroup"""
+    try:
+        nucleos = len(os.sched_getaffinity(0))
+    except AttributeError:
+        nucleos = os.cpu_count() or 1
+    cota = _cota_cpu_cgroup()
+    if cota is not None:
+        # Cota fracionária (ex.: 1.5 CPU) arredonda para baixo: worker a mais só disputa a mesma CPU
+        nucleos = min(nucleos, max(1, math.floor(cota)))
+    return nucleos
+
+
+def workers_configurados():
+    """
+    Workers (processos) do servidor: WEB_CONCURRENCY, ou no máximo 2 pelos núcleos disponíveis
+
+    O padrão é conservador porque cada worker custa uma cópia do app (~150-250 MB). Usada pelo
+    gunicorn.conf.py e por criar_estado_compartilhado, para os dois nunca discordarem.
+    """
+    valor = os.environ.get('WEB_CONCURRENCY', '').strip()
+    if valor:
+        return max(1, int(valor))
+    return min(nucleos_disponiveis(), 2)
+
+
+def criar_estado_compartilhado(app, db, modelo):
+    """
+    Estado compartilhado entre os workers
+
+    Com mais de um worker (workers_configurados) é sempre banco: memória por worker faria o
+    status dos PDFs, as invalidações de cache, os limites de login e as sessões divergirem.
+    Com um worker, SHARED_STATE_BACKEND (memoria|banco) escolhe; o padrão é memoria.
+    """
+    backend = os.environ.get('SHARED_STATE_BACKEND', '').strip().lower()
+    workers = workers_configurados()
+    if workers > 1:
+        if backend not in ('', 'banco'):
+            logger.warning("⚠️ SHARED_STATE_BACKEND=%s com %s workers: usando banco", backend, workers)
+        backend = 'banco'
+    elif not backend:
+        backend = 'memoria'
+    if backend == 'banco':
+        return EstadoBanco(app, db, modelo)
+    if backend != 'memoria':
+        logger.warning("⚠️ SHARED_STATE_BACKEND inválido (%s), usando memoria", backend)
+    return EstadoMemoria(maximo_chaves=int(os.environ.get('SHARED_STATE_MAX_KEYS', '10000')))
@@ -0,0 +1,35 @@
+"""
+Configuração dos testes (pytest, rodar da raiz do projeto: python -m pytest)
+
+Tudo roda offline: banco SQLite temporário, planilha em memória (SHEETS_BACKEND=fake) e
+armazenamento dos PDFs em memória. As variáveis são definidas antes de importar o app.
+"""
+
+import os
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PASTA_TEMP = tempfile.mkdtemp(prefix='testes_gestao_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(PASTA_TEMP, 'testes.db')
+os.environ['SHEETS_BACKEND'] = 'fake'
+os.environ['PDF_STORAGE_BACKEND'] = 'memoria'
+os.environ['SECRET_KEY'] = 'testes'
+os.environ['ERROR_EMAIL_RECIPIENT'] = 'testes@exemplo.com'
+os.environ['LOG_LEVEL'] = 'WARNING'
+os.environ['WARMUP_ENABLED'] = 'false'
+os.environ['METRICS_ENABLED'] = 'false'
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    """App Flask de teste (asgi.app) com as tabelas criadas"""
+    import asgi
+    from gestao.extensions import db
+    with asgi.app.app_context():
+        db.create_all()
+    return asgi.app
@@ -0,0 +1,53 @@
+"""
+asgi._autenticado: as mesmas regras de sessão das telas (gestao.auth.session)
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import asgi
+from gestao.auth.session import cache_usuarios
+from gestao.extensions import db
+from gestao.models import User
+
+
+@pytest.fixture(scope='module')
+def usuarios():
+    with asgi.app.app_context():
+        db.create_all()
+        ids = {}
+        for nome, ativo in [('asgi_ativo', True), ('asgi_inativo', False)]:
+            usuario = User.query.filter_by(username=nome).first()
+            if usuario is None:
+                usuario = User(username=nome, email=f'{nome}@exemplo.com', password_hash='-', is_active=ativo)
+                db.session.add(usuario)
+                db.session.commit()
+            ids[nome] = str(usuario.id)
+    cache_usuarios.invalidar()
+    return ids
+
+
+def test_sessao_recente_autenticada(usuarios):
+    assert asgi._autenticado({'_user_id': usuarios['asgi_ativo'], 'last_activity': int(time.time())})
+
+
+def test_sessao_expirada_epoch_recusada(usuarios):
+    tres_horas = int(time.time()) - 3 * 3600
+    assert not asgi._autenticado({'_user_id': usuarios['asgi_ativo'], 'last_activity': tres_horas})
+
+
+def test_sessao_expirada_formato_iso_recusada(usuarios):
+    antiga = (datetime.now() - timedelta(hours=3)).isoformat()
+    assert not asgi._autenticado({'_user_id': usuarios['asgi_ativo'], 'last_activity': antiga})
+
+
+def test_usuario_inativo_recusado(usuarios):
+    assert not asgi._autenticado({'_user_id': usuarios['asgi_inativo'], 'last_activity': int(time.time())})
+
+
+def test_usuario_inexistente_ou_sem_sessao_recusado(usuarios):
+    assert not asgi._autenticado({'_user_id': '999999', 'last_activity': int(time.time())})
+    assert not asgi._autenticado({'_user_id': 'abc'})
+    assert not asgi._autenticado({})
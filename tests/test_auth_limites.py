@@ -0,0 +1,116 @@
+"""
+gestao.auth: limite de tentativas de login entre workers, regravação do hash da senha e fila do hash
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from gestao import state
+from gestao.auth import passwords
+from gestao.auth.throttling import LimiteTentativas
+from shared_state import EstadoBanco
+
+
+@pytest.fixture
+def estado_banco(app, monkeypatch):
+    from gestao.extensions import db
+    from gestao.models import EstadoCompartilhado
+
+    estado = EstadoBanco(app, db, EstadoCompartilhado)
+    estado.limpar('login:')
+    monkeypatch.setattr(state, 'estado_compartilhado', estado)
+    return estado
+
+
+def test_falhas_simultaneas_nao_se_perdem(estado_banco):
+    limite = LimiteTentativas(janela=900, maximo_ip=0, maximo_usuario=100)
+
+    def falhar():
+        for _ in range(5):
+            limite.registrar_falha('10.0.0.1', 'Operador')
+
+    threads = [threading.Thread(target=falhar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(estado_banco.obter('login:usuario:operador')) == 40
+
+
+def test_bloqueio_depois_do_maximo(estado_banco):
+    limite = LimiteTentativas(janela=900, maximo_ip=0, maximo_usuario=3)
+    for _ in range(3):
+        assert limite.bloqueado('10.0.0.2', 'ana') == 0
+        limite.registrar_falha('10.0.0.2', 'ana')
+    assert limite.bloqueado('10.0.0.2', 'ana') > 0
+    limite.limpar_usuario('ana')
+    assert limite.bloqueado('10.0.0.2', 'ana') == 0
+
+
+@pytest.mark.parametrize('configurado, gravado, esperado', [
+    ('scrypt', 'scrypt:32768:8:1', False),
+    ('scrypt:32768:8:1', 'scrypt:32768:8:1', False),
+    ('pbkdf2', 'pbkdf2:sha256:600000', False),
+    ('pbkdf2:sha256', 'pbkdf2:sha256:600000', False),
+    ('pbkdf2:sha256:600000', 'pbkdf2:sha256:260000', True),
+    ('scrypt', 'pbkdf2:sha256:600000', True),
+    ('scrypt:16384:8:1', 'scrypt:32768:8:1', True),
+])
+def test_precisa_rehash_compara_parametros_normalizados(monkeypatch, configurado, gravado, esperado):
+    monkeypatch.setattr(passwords, 'METODO', configurado)
+    assert passwords.precisa_rehash(f'{gravado}$sal$hash') is esperado
+
+
+def test_hash_gerado_com_metodo_abreviado_nao_precisa_rehash(monkeypatch):
+    monkeypatch.setattr(passwords, 'METODO', 'scrypt')
+    assert not passwords.precisa_rehash(generate_password_hash('senha', 'scrypt'))
+
+
+@pytest.fixture
+def fila_hash(monkeypatch):
+    """Executor do hash com 1 trabalhador e 1 vaga na fila"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hash-senha-teste')
+    monkeypatch.setattr(passwords, '_executor', executor)
+    monkeypatch.setattr(passwords, '_vagas', threading.BoundedSemaphore(2))
+    monkeypatch.setattr(passwords, '_pid', os.getpid())
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_fila_cheia_recusa_na_hora_e_libera_ao_terminar(fila_hash):
+    liberar = threading.Event()
+    hash_senha = generate_password_hash('senha', 'pbkdf2:sha256:1000')
+    # Um cálculo rodando e um na fila ocupam as duas vagas
+    ocupando = [threading.Thread(target=passwords._executar, args=(liberar.wait,)) for _ in range(2)]
+    for thread in ocupando:
+        thread.start()
+    while passwords._vagas._value:
+        time.sleep(0.01)
+
+    with pytest.raises(passwords.HashOcupado):
+        passwords.verificar_senha(hash_senha, 'senha')
+
+    liberar.set()
+    for thread in ocupando:
+        thread.join()
+    assert passwords.verificar_senha(hash_senha, 'senha')
+
+
+def test_espera_acima_do_limite_libera_a_vaga_quando_o_calculo_termina(fila_hash, monkeypatch):
+    monkeypatch.setattr(passwords, 'TIMEOUT', 0.05)
+    liberar = threading.Event()
+
+    with pytest.raises(passwords.HashOcupado):
+        passwords._executar(liberar.wait)
+    assert passwords._vagas._value == 1  # quem desistiu não devolve a vaga antes da hora
+
+    liberar.set()
+    fila_hash.submit(lambda: None).result(timeout=5)
+    assert passwords._vagas._value == 2
@@ -0,0 +1,139 @@
+"""
+error_notifier: agrupamento por impressão digital, limite por hora e janela de repetição
+"""
+
+import types
+
+import pytest
+
+import error_notifier
+from error_notifier import NotificadorErros, impressao_digital
+
+
+def _erro(mensagem):
+    try:
+        raise ValueError(mensagem)
+    except ValueError as e:
+        return e
+
+
+def _outro_erro(mensagem):
+    try:
+        raise ValueError(mensagem)
+    except ValueError as e:
+        return e
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Relógio do módulo controlado pelo teste (em segundos)"""
+    agora = [1_000_000.0]
+    monkeypatch.setattr(error_notifier, 'time', types.SimpleNamespace(time=lambda: agora[0]))
+    return agora
+
+
+@pytest.fixture
+def enviados():
+    return []
+
+
+@pytest.fixture
+def notificador(relogio, enviados):
+    # Intervalo longo: a thread de fundo não envia durante o teste, só descarregar() explícito
+    return NotificadorErros(lambda assunto, corpo: enviados.append((assunto, corpo)),
+                            intervalo=3600, max_por_hora=2, janela_repeticao=600)
+
+
+def test_digital_ignora_a_mensagem_e_separa_pela_pilha():
+    assert impressao_digital(_erro('Romaneio 123 não encontrado')) == impressao_digital(_erro('Romaneio 456'))
+    assert impressao_digital(_erro('x')) != impressao_digital(_outro_erro('x'))
+    assert impressao_digital(_erro('x')) != impressao_digital(KeyError('x'))
+
+
+def test_ocorrencias_iguais_viram_um_grupo(notificador, enviados):
+    for i in range(5):
+        notificador.registrar(_erro(f'Romaneio {i}'), {'rota': f'/romaneio/{i}'})
+    notificador.registrar(_outro_erro('outro'))
+    assert notificador.pendentes() == 6
+
+    assert notificador.descarregar()
+    (assunto, corpo), = enviados
+    assert '2 ERROS' in assunto and '6 ocorrências' in assunto
+    assert '(5x)' in corpo and '(1x)' in corpo
+    # Mensagem e contexto da primeira ocorrência
+    assert 'Romaneio 0' in corpo and 'rota: /romaneio/0' in corpo and '/romaneio/4' not in corpo
+    assert notificador.pendentes() == 0
+
+
+def test_repeticao_dentro_da_janela_espera_o_proximo_resumo(notificador, enviados, relogio):
+    notificador.registrar(_erro('a'))
+    assert notificador.descarregar()
+
+    relogio[0] += 60
+    notificador.registrar(_erro('b'))
+    assert not notificador.descarregar()  # só repetição de erro já notificado
+    assert notificador.pendentes() == 1
+
+    relogio[0] += 600
+    assert notificador.descarregar()  # janela passou: sai no resumo, sem traceback
+    assert 'traceback omitido' in enviados[-1][1]
+    assert len(enviados) == 2
+
+
+def test_forcar_envia_repeticoes(notificador, enviados):
+    notificador.registrar(_erro('a'))
+    notificador.descarregar()
+    notificador.registrar(_erro('b'))
+    assert notificador.descarregar(forcar=True)
+    assert len(enviados) == 2
+
+
+def test_limite_por_hora_acumula_para_o_proximo_envio(notificador, enviados, relogio):
+    notificador.registrar(_erro('a'))
+    assert notificador.descarregar()
+    notificador.registrar(_outro_erro('b'))
+    assert notificador.descarregar()
+
+    # Terceiro erro novo na mesma hora: fica acumulando
+    relogio[0] += 60
+    notificador.registrar(KeyError('c'))
+    notificador.registrar(KeyError('c'))
+    assert not notificador.descarregar()
+    assert notificador.pendentes() == 2
+    assert len(enviados) == 2
+
+    # O primeiro envio saiu da última hora: libera um
+    relogio[0] += 3600 - 60
+    assert notificador.descarregar()
+    assert len(enviados) == 3 and "KeyError" in enviados[-1][0] and '(2x)' in enviados[-1][0]
+
+
+def test_falha_no_envio_devolve_o_resumo(relogio):
+    falhar = [True]
+    enviados = []
+
+    def enviar(assunto, corpo):
+        if falhar[0]:
+            raise ConnectionError('SMTP fora do ar')
+        enviados.append(assunto)
+
+    notificador = NotificadorErros(enviar, intervalo=3600, max_por_hora=10, janela_repeticao=600)
+    notificador.registrar(_erro('a'))
+    assert not notificador.descarregar()
+    notificador.registrar(_erro('b'))
+    assert notificador.pendentes() == 2
+
+    falhar[0] = False
+    assert notificador.descarregar()
+    assert '(2x)' in enviados[0]
+
+
+def test_limite_de_grupos_so_conta_os_demais(relogio, enviados):
+    notificador = NotificadorErros(lambda assunto, corpo: enviados.append(corpo), intervalo=3600, max_grupos=1)
+    notificador.registrar(_erro('a'))
+    notificador.registrar(_outro_erro('b'))
+    notificador.registrar(KeyError('c'))
+    assert notificador.pendentes() == 3
+
+    assert notificador.descarregar()
+    assert '2 ocorrências de outros erros não detalhadas' in enviados[0]
@@ -0,0 +1,48 @@
+"""
+log_buffer.FilaLogs: IDs únicos entre workers pelo contador compartilhado
+"""
+
+from datetime import datetime
+
+from fake_sheets import FakeSpreadsheet
+from log_buffer import CABECALHOS_LOGS, FilaLogs
+from shared_state import EstadoMemoria
+
+
+def _entrada(acao):
+    return {'data_hora': datetime(2026, 1, 5, 8, 0), 'usuario': 'ana', 'acao': acao,
+            'entidade': 'Romaneio', 'status': 'sucesso'}
+
+
+def _aba_logs(*ids_existentes):
+    aba = FakeSpreadsheet().add_worksheet('Logs', rows=100, cols=10)
+    aba.append_rows([CABECALHOS_LOGS] + [[i, '', '', '', '', '', '', '', '', ''] for i in ids_existentes])
+    return aba
+
+
+def _ids(aba):
+    return [int(valor) for valor in aba.col_values(1)[1:]]
+
+
+def test_workers_com_contador_compartilhado_nao_repetem_ids():
+    aba = _aba_logs(1, 2, 3)
+    estado = EstadoMemoria()
+
+    def reservar(quantidade, minimo):
+        return estado.incrementar('logs:ultimo_id', quantidade, minimo=minimo)
+
+    # Dois workers, cada um com a sua fila, gravando lotes intercalados na mesma aba
+    filas = [FilaLogs(lambda: aba, lambda entradas: None, tamanho_lote=2, reservar_ids=reservar)
+             for _ in range(2)]
+    for rodada in range(3):
+        for numero, fila in enumerate(filas):
+            fila._gravar_planilha([_entrada(f'w{numero}-{rodada}-a'), _entrada(f'w{numero}-{rodada}-b')])
+
+    assert _ids(aba) == list(range(1, 16))
+
+
+def test_sem_contador_compartilhado_continua_do_maior_id_da_aba():
+    aba = _aba_logs(7, 9)
+    fila = FilaLogs(lambda: aba, lambda entradas: None, reservar_ids=lambda quantidade, minimo: None)
+    assert fila._gravar_planilha([_entrada('a'), _entrada('b')])
+    assert _ids(aba) == [7, 9, 10, 11]
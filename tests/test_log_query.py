@@ -0,0 +1,92 @@
+"""
+log_query: paginação por cursor em (timestamp, id) nas duas direções, com empates no timestamp
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from log_query import ConsultaLogs, codificar_cursor, decodificar_cursor
+
+ENTIDADE = 'TestePaginacao'
+FILTROS = {'entidade': ENTIDADE}
+
+
+@pytest.fixture
+def consulta(app):
+    from gestao.extensions import db
+    from gestao.models import Log
+
+    with app.app_context():
+        # 8 logs em 5 instantes: vários empates no timestamp, desempatados pelo id
+        inicio = datetime(2026, 3, 1, 8, 0)
+        for minuto in (0, 0, 1, 2, 2, 2, 3, 4):
+            db.session.add(Log(timestamp=inicio + timedelta(minutes=minuto), usuario_id=1, usuario_nome='teste',
+                               acao='criar', entidade=ENTIDADE, status='sucesso'))
+        db.session.commit()
+        yield ConsultaLogs(db, Log)
+        Log.query.filter(Log.entidade == ENTIDADE).delete()
+        db.session.commit()
+
+
+def _ordem_esperada(consulta):
+    Log = consulta.Log
+    logs = Log.query.filter(Log.entidade == ENTIDADE).all()
+    return [log.id for log in sorted(logs, key=lambda log: (log.timestamp, log.id), reverse=True)]
+
+
+def _ids(pagina):
+    return [log.id for log in pagina['itens']]
+
+
+def test_paginas_para_tras_cobrem_tudo_uma_vez(consulta):
+    esperado = _ordem_esperada(consulta)
+
+    paginas = [consulta.pagina(FILTROS, por_pagina=3)]
+    while paginas[-1]['proximo']:
+        paginas.append(consulta.pagina(FILTROS, antes=paginas[-1]['proximo'], por_pagina=3))
+
+    assert [_ids(p) for p in paginas] == [esperado[0:3], esperado[3:6], esperado[6:8]]
+    assert paginas[0]['anterior'] is None
+    assert all(p['anterior'] for p in paginas[1:])
+
+
+def test_pagina_anterior_volta_para_as_mesmas_paginas(consulta):
+    esperado = _ordem_esperada(consulta)
+
+    primeira = consulta.pagina(FILTROS, por_pagina=3)
+    segunda = consulta.pagina(FILTROS, antes=primeira['proximo'], por_pagina=3)
+    terceira = consulta.pagina(FILTROS, antes=segunda['proximo'], por_pagina=3)
+
+    voltando = consulta.pagina(FILTROS, depois=terceira['anterior'], por_pagina=3)
+    assert _ids(voltando) == _ids(segunda) == esperado[3:6]
+    assert voltando['proximo'] == segunda['proximo']
+
+    inicio = consulta.pagina(FILTROS, depois=voltando['anterior'], por_pagina=3)
+    assert _ids(inicio) == esperado[0:3]
+    assert inicio['anterior'] is None  # não há logs mais novos
+    assert inicio['proximo'] == primeira['proximo']
+
+
+def test_cursor_no_meio_de_um_empate_nao_perde_nem_repete(consulta):
+    esperado = _ordem_esperada(consulta)
+    Log = consulta.Log
+
+    # Cursor no segundo dos três logs do mesmo minuto
+    meio = consulta.db.session.get(Log, esperado[3])
+    assert meio.timestamp == consulta.db.session.get(Log, esperado[2]).timestamp
+
+    cursor = codificar_cursor(meio)
+    assert _ids(consulta.pagina(FILTROS, antes=cursor, por_pagina=10)) == esperado[4:]
+    assert _ids(consulta.pagina(FILTROS, depois=cursor, por_pagina=10)) == esperado[:3]
+
+
+def test_cursor_invalido_volta_para_a_primeira_pagina(consulta):
+    esperado = _ordem_esperada(consulta)
+    assert decodificar_cursor('nao-e-cursor') is None
+    assert _ids(consulta.pagina(FILTROS, antes='nao-e-cursor', por_pagina=3)) == esperado[:3]
+    assert _ids(consulta.pagina(FILTROS, depois='2026-13-01_x', por_pagina=3)) == esperado[:3]
+
+
+def test_iterar_percorre_todos_em_lotes(consulta):
+    assert [log.id for log in consulta.iterar(FILTROS, tamanho_lote=3)] == _ordem_esperada(consulta)
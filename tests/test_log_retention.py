@@ -0,0 +1,123 @@
+"""
+log_retention.arquivar_planilha: execução interrompida no meio não duplica nem conta duas vezes
+"""
+
+from datetime import datetime
+
+from fake_sheets import FakeSpreadsheet
+from log_buffer import CABECALHOS_LOGS
+from log_retention import ABA_RESUMO_LOGS, RetencaoLogs
+
+AGORA = datetime(2026, 5, 15, 12, 0)
+
+
+def _planilha():
+    planilha = FakeSpreadsheet()
+    aba = planilha.add_worksheet('Logs', rows=100, cols=10)
+    datas = ['10/01/2026'] * 3 + ['03/02/2026'] * 2 + ['02/05/2026'] * 2
+    aba.append_rows([CABECALHOS_LOGS] + [
+        [str(i), f'{data} 08:00:00', 'ana', 'login', 'Usuario', '', '', '', '', 'sucesso']
+        for i, data in enumerate(datas, start=1)
+    ])
+    return planilha, aba
+
+
+def _retencao(planilha):
+    return RetencaoLogs(None, None, None, obter_planilha=lambda: planilha, meses_planilha=1)
+
+
+def _total_resumo(planilha, periodo):
+    return sum(int(linha[4]) for linha in planilha.worksheet(ABA_RESUMO_LOGS).get_all_values()[1:]
+               if linha[0] == periodo)
+
+
+def test_reexecucao_depois_de_falha_no_meio(monkeypatch):
+    planilha, aba = _planilha()
+    remocoes = []
+    delete_rows = aba.delete_rows
+
+    # Falha logo depois de copiar e resumir fevereiro, antes de removê-lo da aba Logs
+    def falhar_na_segunda(inicio, fim=None):
+        remocoes.append((inicio, fim))
+        if len(remocoes) == 2:
+            raise RuntimeError('cota excedida')
+        return delete_rows(inicio, fim)
+
+    monkeypatch.setattr(aba, 'delete_rows', falhar_na_segunda)
+    assert not _retencao(planilha).arquivar_planilha(AGORA)['success']
+    monkeypatch.setattr(aba, 'delete_rows', delete_rows)
+
+    resultado = _retencao(planilha).arquivar_planilha(AGORA)
+    assert resultado['success']
+
+    assert [linha[0] for linha in aba.get_all_values()[1:]] == ['6', '7']
+    assert [linha[0] for linha in planilha.worksheet('Logs_2026_01').get_all_values()[1:]] == ['1', '2', '3']
+    assert [linha[0] for linha in planilha.worksheet('Logs_2026_02').get_all_values()[1:]] == ['4', '5']
+    assert _total_resumo(planilha, '2026-01') == 3
+    assert _total_resumo(planilha, '2026-02') == 2
+
+
+def test_sem_meses_vencidos_nao_altera_nada():
+    planilha, aba = _planilha()
+    retencao = _retencao(planilha)
+    retencao.arquivar_planilha(AGORA)
+    assert retencao.arquivar_planilha(AGORA)['periodos'] == []
+    assert len(aba.get_all_values()) == 3
+
+
+def test_falha_antes_do_resumo_conta_o_mes_na_reexecucao(monkeypatch):
+    planilha, aba = _planilha()
+    gravar_resumo = RetencaoLogs._gravar_resumo_planilha
+    chamadas = []
+
+    # Janeiro copiado para Logs_2026_01, mas a execução cai antes de escrever o resumo
+    def falhar_na_primeira(self, *args):
+        chamadas.append(args)
+        if len(chamadas) == 1:
+            raise RuntimeError('cota excedida')
+        return gravar_resumo(self, *args)
+
+    monkeypatch.setattr(RetencaoLogs, '_gravar_resumo_planilha', falhar_na_primeira)
+    assert not _retencao(planilha).arquivar_planilha(AGORA)['success']
+    assert len(planilha.worksheet('Logs_2026_01').get_all_values()) == 4
+
+    assert _retencao(planilha).arquivar_planilha(AGORA)['success']
+    assert len(planilha.worksheet('Logs_2026_01').get_all_values()) == 4
+    assert _total_resumo(planilha, '2026-01') == 3
+    assert _total_resumo(planilha, '2026-02') == 2
+
+
+def test_destino_arquivo_reexecucao_nao_duplica(monkeypatch, tmp_path):
+    from log_retention import _ler_gzip_csv
+
+    monkeypatch.setenv('LOG_ARCHIVE_DIR', str(tmp_path))
+    planilha, aba = _planilha()
+    retencao = _retencao(planilha)
+    retencao.destino_planilha = 'arquivo'
+    delete_rows = aba.delete_rows
+
+    def falhar(inicio, fim=None):
+        raise RuntimeError('cota excedida')
+
+    monkeypatch.setattr(aba, 'delete_rows', falhar)
+    assert not retencao.arquivar_planilha(AGORA)['success']
+    monkeypatch.setattr(aba, 'delete_rows', delete_rows)
+    assert retencao.arquivar_planilha(AGORA)['success']
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['planilha_logs_2026-01.csv.gz', 'planilha_logs_2026-02.csv.gz']
+    linhas = _ler_gzip_csv((tmp_path / 'planilha_logs_2026-01.csv.gz').read_bytes())
+    assert [linha[0] for linha in linhas[1:]] == ['1', '2', '3']
+    assert _total_resumo(planilha, '2026-01') == 3
+    assert _total_resumo(planilha, '2026-02') == 2
+
+
+def test_executar_usa_a_mesma_referencia_de_tempo(monkeypatch):
+    planilha, aba = _planilha()
+    retencao = _retencao(planilha)
+    referencias = []
+    monkeypatch.setattr(retencao, 'arquivar_tabela',
+                        lambda agora=None: referencias.append(agora) or {'success': True, 'message': ''})
+
+    resultado = retencao.executar(AGORA)
+    assert referencias == [AGORA]
+    assert [p['periodo'] for p in resultado['planilha']['periodos']] == ['2026-01', '2026-02']
@@ -0,0 +1,82 @@
+"""
+pdf_cache: carimbo de reimpressão na faixa livre do rodapé e camadas padrão do cache
+"""
+
+import io
+
+import pytest
+from pypdf import PdfReader
+
+import pdf_cache
+from pdf_cache import CacheGCS, FONTE_CARIMBO, _margem_pagina_template, aplicar_carimbo_reimpressao, obter_cache_pdf
+from pdf_generator import ALTURA_RODAPE, MARGEM_INFERIOR, gerar_pdf_romaneio
+
+DATA_REIMPRESSAO = '02/01/2025, 09:30:00'
+
+
+def _pdf_romaneio(itens=3):
+    romaneio = {'id_impressao': 'ROM-000001', 'data_impressao': '01/01/2025, 08:00:00', 'usuario_impressao': 'teste'}
+    itens_data = [{
+        'data': '01/01/2025', 'solicitante': 'SOLICITANTE', 'codigo': f'{100000 + i}', 'descricao': 'Parafuso',
+        'quantidade': 1, 'alta_demanda': False, 'locacao_matriz': '1 E5', 'saldo_estoque': 600,
+        'media_mensal': 41, 'qtd_pendente': 1, 'qtd_separada': 0,
+    } for i in range(itens)]
+    return gerar_pdf_romaneio(romaneio, itens_data, is_reprint=True)
+
+
+def _altura_do_texto(pdf_content, trecho):
+    """Linha de base (pt) de onde o trecho aparece na última página"""
+    alturas = []
+
+    def visitante(texto, cm, tm, fonte, tamanho):
+        if trecho in texto:
+            alturas.append(tm[5] * cm[3] + cm[5])
+
+    PdfReader(io.BytesIO(pdf_content)).pages[-1].extract_text(visitor_text=visitante)
+    return alturas
+
+
+def test_carimbo_reportlab_fica_entre_o_rodape_e_a_margem():
+    original = _pdf_romaneio()
+    carimbado = aplicar_carimbo_reimpressao(original, DATA_REIMPRESSAO, engine='reportlab')
+
+    assert carimbado.startswith(original)  # gravação incremental
+    (altura,) = _altura_do_texto(carimbado, 'Reimpressão realizada em')
+    assert ALTURA_RODAPE + FONTE_CARIMBO <= altura
+    assert altura + FONTE_CARIMBO <= MARGEM_INFERIOR
+
+
+@pytest.mark.parametrize('engine', ['xhtml2pdf', 'chrome'])
+def test_carimbo_html_fica_dentro_da_margem_do_template(engine):
+    carimbado = aplicar_carimbo_reimpressao(_pdf_romaneio(), DATA_REIMPRESSAO, engine=engine)
+
+    (altura,) = _altura_do_texto(carimbado, 'Reimpressão realizada em')
+    margem = _margem_pagina_template(pdf_cache._ARQUIVOS_LAYOUT[engine])
+    assert 0 <= altura and altura + FONTE_CARIMBO <= margem
+
+
+def test_motor_sem_rodape_conhecido_nao_carimba():
+    with pytest.raises(ValueError):
+        aplicar_carimbo_reimpressao(_pdf_romaneio(), DATA_REIMPRESSAO, engine='desconhecido')
+
+
+@pytest.mark.parametrize('backend, gcs_env, camada_gcs', [
+    ('memoria', None, False),
+    ('local', None, False),
+    ('gcs', None, True),
+    ('gcs', 'false', False),
+    ('local', 'true', True),
+])
+def test_camada_gcs_padrao_acompanha_o_armazenamento(monkeypatch, tmp_path, backend, gcs_env, camada_gcs):
+    monkeypatch.setattr(pdf_cache, '_cache_pdf', None)
+    monkeypatch.setenv('PDF_CACHE_ENABLED', 'true')
+    monkeypatch.setenv('PDF_CACHE_DIR', str(tmp_path))
+    monkeypatch.setenv('PDF_STORAGE_BACKEND', backend)
+    if gcs_env is None:
+        monkeypatch.delenv('PDF_CACHE_GCS', raising=False)
+    else:
+        monkeypatch.setenv('PDF_CACHE_GCS', gcs_env)
+
+    cache = obter_cache_pdf()
+
+    assert any(isinstance(camada, CacheGCS) for camada in cache.camadas) == camada_gcs
@@ -0,0 +1,43 @@
+"""
+pdf_inventory.InventarioPDF.conferir: romaneios sem PDF não são conferidos de novo a cada página
+"""
+
+from fake_gcs import FakeGCSClient
+from pdf_inventory import InventarioPDF
+
+
+def _bucket():
+    return FakeGCSClient().bucket('romaneios-teste')
+
+
+def test_ausentes_nao_repetem_get_blob_ate_a_reconciliacao():
+    bucket = _bucket()
+    inventario = InventarioPDF('romaneios-teste')
+    inventario.reconciliar(bucket)
+    ids = [f'ROM-{i:06d}' for i in range(1, 21)]
+
+    inventario.conferir(ids, bucket)
+    assert bucket.client.chamadas['get_blob'] == 40
+    inventario.conferir(ids, bucket)
+    assert bucket.client.chamadas['get_blob'] == 40
+
+    # Gravado por outra instância: aparece depois da próxima reconciliação
+    bucket.blob('ROM-000003.pdf').upload_from_string(b'%PDF', content_type='application/pdf')
+    inventario.reconciliar(bucket)
+    assert inventario.contem('ROM-000003')
+    inventario.conferir(ids, bucket)
+    assert bucket.client.chamadas['get_blob'] == 40 + 38
+
+
+def test_conferir_registra_pdf_encontrado_e_upload_limpa_ausencia():
+    bucket = _bucket()
+    inventario = InventarioPDF('romaneios-teste')
+    inventario.reconciliar(bucket)
+    bucket.blob('ROM-000001_Copia.pdf').upload_from_string(b'%PDF', content_type='application/pdf')
+
+    inventario.conferir(['ROM-000001', 'ROM-000002'], bucket)
+    assert inventario.info('ROM-000001')['tipo'] == 'copia'
+    assert not inventario.contem('ROM-000002')
+
+    inventario.registrar('ROM-000002.pdf', 4)
+    assert inventario.info('ROM-000002')['existe']
@@ -0,0 +1,60 @@
+"""
+pdf_storage: a mesma interface nos três backends (pasta local, memória e GCS em memória)
+"""
+
+import pytest
+from flask import Flask
+
+from fake_gcs import FakeGCSClient
+from pdf_storage import ArmazenamentoGCS, ArmazenamentoLocal, ArmazenamentoMemoria
+
+ROMANEIO = 'ROM-TESTE-000001'
+ORIGINAL = b'%PDF-1.4 original'
+COPIA = b'%PDF-1.4 copia'
+
+
+@pytest.fixture(params=['local', 'memoria', 'gcs'])
+def armazenamento(request, tmp_path, monkeypatch):
+    if request.param == 'local':
+        return ArmazenamentoLocal(str(tmp_path))
+    if request.param == 'memoria':
+        return ArmazenamentoMemoria()
+    import salvar_pdf_gcs
+    monkeypatch.setattr(salvar_pdf_gcs, '_gcs_client', FakeGCSClient())
+    monkeypatch.setattr(salvar_pdf_gcs, '_gcs_buckets', {})
+    return ArmazenamentoGCS('bucket-teste')
+
+
+def test_romaneio_sem_pdf(armazenamento):
+    assert armazenamento.ler(ROMANEIO) is None
+    assert armazenamento.info(ROMANEIO) == {'existe': False}
+
+
+def test_copia_gravada_em_segundo_plano(armazenamento):
+    assert armazenamento.salvar_async(ROMANEIO, COPIA, is_reprint=True).result(timeout=30)
+    assert armazenamento.ler(ROMANEIO) == COPIA
+    info = armazenamento.info(ROMANEIO)
+    assert info['existe'] and info['tipo'] == 'copia' and info['tamanho'] == len(COPIA)
+
+
+def test_original_tem_prioridade_sobre_a_copia(armazenamento):
+    assert armazenamento.salvar(ROMANEIO, COPIA, is_reprint=True)
+    assert armazenamento.salvar(ROMANEIO, ORIGINAL)
+    assert armazenamento.ler(ROMANEIO) == ORIGINAL
+    assert armazenamento.ler(ROMANEIO, is_reprint=True) == COPIA
+    assert armazenamento.info(ROMANEIO)['tipo'] == 'original'
+
+
+def test_responder_com_etag_e_range(armazenamento):
+    armazenamento.salvar(ROMANEIO, ORIGINAL)
+    app = Flask(__name__)
+    with app.test_request_context('/'):
+        resposta = armazenamento.responder(ROMANEIO)
+        resposta.direct_passthrough = False
+        assert resposta.status_code == 200 and resposta.get_data() == ORIGINAL
+        assert resposta.headers.get('ETag')
+        assert armazenamento.responder('ROM-TESTE-INEXISTENTE') is None
+    with app.test_request_context('/', headers={'Range': 'bytes=0-3'}):
+        resposta = armazenamento.responder(ROMANEIO)
+        resposta.direct_passthrough = False
+        assert resposta.status_code == 206 and resposta.get_data() == ORIGINAL[:4]
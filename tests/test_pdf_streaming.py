@@ -0,0 +1,114 @@
+"""
+pdf_streaming: respostas 200/206/304/416 e If-Range sobre um blob do GCS em memória
+"""
+
+from datetime import timedelta
+
+import pytest
+from flask import Flask
+from werkzeug.http import http_date
+
+import pdf_streaming
+from fake_gcs import FakeGCSClient
+from pdf_streaming import responder_pdf_blob
+
+PDF = bytes(range(256)) * 40  # 10 KB
+
+
+@pytest.fixture
+def blob(monkeypatch):
+    # Blocos pequenos para o trecho atravessar várias leituras
+    monkeypatch.setattr(pdf_streaming, 'TAMANHO_BLOCO', 1024)
+    bucket = FakeGCSClient().bucket('bucket-teste')
+    bucket.blob('ROM-000001.pdf').upload_from_string(PDF, content_type='application/pdf')
+    return bucket.get_blob('ROM-000001.pdf')
+
+
+@pytest.fixture
+def responder(blob):
+    app = Flask(__name__)
+
+    def _responder(method='GET', **headers):
+        with app.test_request_context('/', method=method, headers=headers):
+            resposta = responder_pdf_blob(blob, 'ROM-000001.pdf')
+            resposta.direct_passthrough = False
+            return resposta
+    return _responder
+
+
+def test_sem_cabecalhos_envia_o_pdf_inteiro(responder, blob):
+    resposta = responder()
+    assert resposta.status_code == 200
+    assert resposta.get_data() == PDF
+    assert resposta.headers['ETag'] == f'"{blob.etag}"'
+    assert resposta.headers['Accept-Ranges'] == 'bytes'
+    assert resposta.content_length == len(PDF)
+
+
+def test_head_nao_le_o_blob(responder, blob):
+    resposta = responder(method='HEAD')
+    assert resposta.status_code == 200 and resposta.content_length == len(PDF)
+    assert blob.bucket.client.chamadas['download'] == 0
+
+
+def test_etag_igual_responde_304(responder, blob):
+    resposta = responder(**{'If-None-Match': f'"{blob.etag}"'})
+    assert resposta.status_code == 304
+    assert resposta.get_data() == b''
+    assert blob.bucket.client.chamadas['download'] == 0
+
+
+def test_etag_diferente_envia_o_pdf(responder):
+    assert responder(**{'If-None-Match': '"outra-versao"'}).status_code == 200
+
+
+def test_if_modified_since(responder, blob):
+    assert responder(**{'If-Modified-Since': http_date(blob.updated)}).status_code == 304
+    assert responder(**{'If-Modified-Since': http_date(blob.updated - timedelta(hours=1))}).status_code == 200
+
+
+def test_if_none_match_tem_prioridade_sobre_if_modified_since(responder, blob):
+    resposta = responder(**{'If-None-Match': '"outra-versao"', 'If-Modified-Since': http_date(blob.updated)})
+    assert resposta.status_code == 200
+
+
+def test_range_responde_206_com_o_trecho(responder):
+    resposta = responder(Range='bytes=1000-4999')
+    assert resposta.status_code == 206
+    assert resposta.get_data() == PDF[1000:5000]
+    assert resposta.headers['Content-Range'] == f'bytes 1000-4999/{len(PDF)}'
+    assert resposta.content_length == 4000
+
+
+def test_range_aberto_e_sufixo(responder):
+    assert responder(Range=f'bytes={len(PDF) - 10}-').get_data() == PDF[-10:]
+    assert responder(Range='bytes=-100').get_data() == PDF[-100:]
+
+
+def test_range_fora_do_arquivo_responde_416(responder):
+    resposta = responder(Range=f'bytes={len(PDF)}-{len(PDF) + 10}')
+    assert resposta.status_code == 416
+    assert resposta.headers['Content-Range'] == f'bytes */{len(PDF)}'
+    assert resposta.get_data() == b''
+
+
+def test_varios_intervalos_enviam_o_arquivo_inteiro(responder):
+    resposta = responder(Range='bytes=0-9,20-29')
+    assert resposta.status_code == 200 and resposta.get_data() == PDF
+
+
+def test_if_range_com_etag_atual_respeita_o_range(responder, blob):
+    resposta = responder(Range='bytes=0-99', **{'If-Range': f'"{blob.etag}"'})
+    assert resposta.status_code == 206 and resposta.get_data() == PDF[:100]
+
+
+def test_if_range_com_etag_antiga_envia_o_arquivo_inteiro(responder):
+    resposta = responder(Range='bytes=0-99', **{'If-Range': '"versao-anterior"'})
+    assert resposta.status_code == 200 and resposta.get_data() == PDF
+
+
+def test_if_range_com_data(responder, blob):
+    atual = responder(Range='bytes=0-99', **{'If-Range': http_date(blob.updated)})
+    assert atual.status_code == 206 and atual.get_data() == PDF[:100]
+    antiga = responder(Range='bytes=0-99', **{'If-Range': http_date(blob.updated - timedelta(hours=1))})
+    assert antiga.status_code == 200 and antiga.get_data() == PDF
@@ -0,0 +1,57 @@
+"""
+salvar_pdf_gcs: cliente e bucket reaproveitados e uma requisição por operação (GCS em memória)
+"""
+
+import pytest
+
+import salvar_pdf_gcs
+from fake_gcs import FakeGCSClient
+
+BUCKET = 'bucket-teste'
+PDF = b'%PDF-1.4 romaneio'
+
+
+@pytest.fixture
+def cliente(monkeypatch):
+    cliente = FakeGCSClient()
+    monkeypatch.setattr(salvar_pdf_gcs, '_gcs_client', cliente)
+    monkeypatch.setattr(salvar_pdf_gcs, '_gcs_buckets', {})
+    return cliente
+
+
+def test_cliente_e_bucket_criados_uma_vez_por_processo(monkeypatch):
+    criados = []
+    monkeypatch.setattr(salvar_pdf_gcs, '_gcs_client', None)
+    monkeypatch.setattr(salvar_pdf_gcs, '_gcs_buckets', {})
+    monkeypatch.setattr(salvar_pdf_gcs, '_criar_gcs_client', lambda: criados.append(FakeGCSClient()) or criados[-1])
+
+    assert salvar_pdf_gcs.get_gcs_client() is salvar_pdf_gcs.get_gcs_client()
+    assert salvar_pdf_gcs.get_gcs_bucket(BUCKET) is salvar_pdf_gcs.get_gcs_bucket(BUCKET)
+    assert len(criados) == 1
+
+
+def test_upload_numa_requisicao_sem_reload_nem_exists(cliente):
+    assert salvar_pdf_gcs.salvar_pdf_gcs(PDF, 'ROM-000001', BUCKET) == f'gs://{BUCKET}/ROM-000001.pdf'
+    assert dict(cliente.chamadas) == {'upload': 1}
+
+
+def test_leitura_direta_trata_404_como_ausente(cliente):
+    salvar_pdf_gcs.salvar_pdf_gcs(PDF, 'ROM-000001', BUCKET, is_reprint=True)
+    cliente.chamadas.clear()
+
+    assert salvar_pdf_gcs.buscar_pdf_gcs('ROM-000001', BUCKET) == PDF
+    assert salvar_pdf_gcs.buscar_pdf_gcs('ROM-000002', BUCKET) is None
+    # Só os downloads (o fake conta os que devolvem conteúdo): nenhum exists() antes
+    assert dict(cliente.chamadas) == {'download': 1}
+
+
+def test_verificar_existencia_nao_confunde_romaneios_de_mesmo_prefixo(cliente):
+    # RM-1 é prefixo de RM-10..RM-19: numa listagem por prefixo a cópia de RM-1 viria depois deles
+    for i in range(10, 25):
+        salvar_pdf_gcs.salvar_pdf_gcs(PDF, f'RM-{i}', BUCKET)
+    salvar_pdf_gcs.salvar_pdf_gcs(PDF, 'RM-1', BUCKET, is_reprint=True)
+    cliente.chamadas.clear()
+
+    assert salvar_pdf_gcs.verificar_pdf_existe_gcs('RM-1', BUCKET)
+    assert not salvar_pdf_gcs.verificar_pdf_existe_gcs('RM-2', BUCKET)
+    assert dict(cliente.chamadas) == {'get_blob': 4}
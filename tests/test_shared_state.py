@@ -0,0 +1,95 @@
+"""
+shared_state: número de workers e escolha do backend a partir da mesma configuração
+"""
+
+import threading
+
+import shared_state
+from shared_state import EstadoBanco, EstadoMemoria, criar_estado_compartilhado, workers_configurados
+
+
+def test_workers_padrao_conservador(monkeypatch):
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+    monkeypatch.setattr(shared_state, 'nucleos_disponiveis', lambda: 16)
+    assert workers_configurados() == 2
+
+
+def test_workers_pela_variavel(monkeypatch):
+    monkeypatch.setenv('WEB_CONCURRENCY', '4')
+    assert workers_configurados() == 4
+
+
+def test_cota_do_cgroup_limita_os_nucleos(monkeypatch):
+    monkeypatch.setattr(shared_state.os, 'sched_getaffinity', lambda pid: set(range(8)), raising=False)
+    monkeypatch.setattr(shared_state, '_cota_cpu_cgroup', lambda: 1.5)
+    assert shared_state.nucleos_disponiveis() == 1
+
+
+def test_varios_workers_usam_sempre_o_banco(monkeypatch):
+    monkeypatch.setenv('WEB_CONCURRENCY', '3')
+    monkeypatch.setenv('SHARED_STATE_BACKEND', 'memoria')
+    assert isinstance(criar_estado_compartilhado(None, None, None), EstadoBanco)
+
+
+def test_um_worker_usa_memoria_por_padrao(monkeypatch):
+    monkeypatch.setenv('WEB_CONCURRENCY', '1')
+    monkeypatch.delenv('SHARED_STATE_BACKEND', raising=False)
+    estado = criar_estado_compartilhado(None, None, None)
+    assert isinstance(estado, EstadoMemoria) and not isinstance(estado, EstadoBanco)
+
+
+def test_incrementar_parte_do_minimo():
+    estado = EstadoMemoria()
+    assert estado.incrementar('contador', 3, minimo=10) == 13
+    assert estado.incrementar('contador', 1, minimo=5) == 14
+
+
+def test_banco_incrementos_concorrentes_de_varios_workers(app):
+    from gestao.extensions import db
+    from gestao.models import EstadoCompartilhado
+
+    # Uma instância por "worker", todas no mesmo banco; a chave nasce durante a disputa
+    workers = [EstadoBanco(app, db, EstadoCompartilhado) for _ in range(4)]
+    workers[0].remover('teste:contador')
+    obtidos = []
+
+    def incrementar(estado):
+        for _ in range(25):
+            obtidos.append(estado.incrementar('teste:contador'))
+
+    threads = [threading.Thread(target=incrementar, args=(estado,)) for estado in workers for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(obtidos) == list(range(1, 201))
+    assert workers[0].obter('teste:contador') == 200
+
+
+def test_banco_alterar_com_ttl_e_expiracao(app):
+    from gestao.extensions import db
+    from gestao.models import EstadoCompartilhado
+
+    estado = EstadoBanco(app, db, EstadoCompartilhado)
+    estado.remover('teste:lista')
+    assert estado.alterar('teste:lista', lambda atual: (atual or []) + [1], ttl=60) == [1]
+    assert estado.espaco('teste', ttl=60).alterar('lista', lambda atual: atual + [2]) == [1, 2]
+    estado.alterar('teste:lista', lambda atual: atual, ttl=-1)
+    assert estado.alterar('teste:lista', lambda atual: atual) is None
+
+
+def test_banco_obter_dentro_da_requisicao_reusa_o_contexto(app):
+    from gestao.extensions import db
+    from gestao.models import EstadoCompartilhado
+
+    estado = EstadoBanco(app, db, EstadoCompartilhado)
+    estado.definir('teste:sessao', {'n': 1})
+    with app.test_request_context():
+        sessao = db.session()
+        assert estado.obter('teste:sessao') == {'n': 1}
+        # Outro worker grava no meio da requisição: a leitura seguinte vê o valor novo
+        EstadoBanco(app, db, EstadoCompartilhado).definir('teste:sessao', {'n': 2})
+        assert estado.obter('teste:sessao') == {'n': 2}
+        assert db.session() is sessao
+        assert not any(isinstance(obj, EstadoCompartilhado) for obj in sessao.identity_map.values())
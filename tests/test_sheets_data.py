@@ -0,0 +1,27 @@
+"""
+gestao.sheets.data: datas das abas nos dois formatos que aparecem na planilha
+"""
+
+from datetime import datetime
+
+import pytest
+
+from gestao.sheets.data import converter_data_planilha
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    ('2025-01-02 09:30:00', datetime(2025, 1, 2, 9, 30)),
+    ('02/01/2025 09:30:00', datetime(2025, 1, 2, 9, 30)),
+    ('02/01/2025, 09:30:00', datetime(2025, 1, 2, 9, 30)),
+    (' 02/01/2025 ', datetime(2025, 1, 2)),
+    ('', None),
+    (None, None),
+    ('ontem', None),
+])
+def test_converter_data_planilha(valor, esperado):
+    assert converter_data_planilha(valor) == esperado
+
+
+def test_dia_primeiro_compara_pela_data_e_nao_pelo_texto():
+    # Como texto, '15/01/2025' < '2025-01-10'; como data, é posterior
+    assert converter_data_planilha('15/01/2025 08:00:00') >= converter_data_planilha('2025-01-10 00:00:00')
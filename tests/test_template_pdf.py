@@ -0,0 +1,69 @@
+"""
+formulario_impressao_pdf.html: HTML pronto para PDF direto do Jinja, também em romaneios grandes
+"""
+
+import os
+import time
+
+import pytest
+from jinja2 import Environment, FileSystemLoader
+
+from pdf_cloud_generator import html_pronto_para_pdf, otimizar_html_para_xhtml2pdf
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def env():
+    return Environment(loader=FileSystemLoader(os.path.join(RAIZ, 'templates')), autoescape=True)
+
+
+def _itens(quantidade):
+    return [{
+        'data': f'{(i % 28) + 1:02d}/01/2025', 'solicitante': f'SOLICITANTE {i % 12}', 'codigo': f'{100000 + i}',
+        'descricao': f'Parafuso sextavado M{8 + i % 5}', 'quantidade': (i % 9) + 1, 'alta_demanda': i % 5 == 0,
+        'locacao_matriz': f'{i % 3 + 1} E{i % 9}', 'saldo_estoque': 600 - (i % 100), 'media_mensal': 41 + (i % 13),
+        'qtd_pendente': (i % 9) + 1, 'qtd_separada': 0,
+    } for i in range(quantidade)]
+
+
+def _renderizar(env, itens, is_reprint=False):
+    return env.get_template('formulario_impressao_pdf.html').render(
+        id_impressao='ROM-000123', solicitacoes=itens, tipo_romaneio='Romaneio de Separação',
+        data_impressao='01/01/2025, 08:00:00', is_reprint=is_reprint, data_reimpressao='02/01/2025, 09:30:00')
+
+
+def _mediana_ms(funcao, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return sorted(tempos)[len(tempos) // 2] * 1000
+
+
+def test_html_sai_pronto_sem_reescrita(env):
+    html = _renderizar(env, _itens(10))
+    assert html_pronto_para_pdf(html)
+    assert otimizar_html_para_xhtml2pdf(html) is html
+    assert '<script' not in html and 'cdn.' not in html and 'display: flex' not in html
+    assert '01/01/2025, 08:00:00' in html
+
+
+def test_copia_marcada_no_proprio_template(env):
+    html = _renderizar(env, _itens(10), is_reprint=True)
+    assert 'ROM-000123 - CÓPIA' in html
+    assert 'Reimpressão realizada em: 02/01/2025, 09:30:00' in html
+
+
+def test_romaneio_grande_renderiza_em_tempo_linear(env):
+    pequeno, grande = _itens(500), _itens(5000)
+    _renderizar(env, pequeno)  # compilação do template fora da medida
+    html = _renderizar(env, grande)
+    assert html.count('ROM-000123') >= 1 and html.count('SOLICITANTE 11') >= 400
+
+    tempo_pequeno = _mediana_ms(lambda: _renderizar(env, pequeno))
+    tempo_grande = _mediana_ms(lambda: _renderizar(env, grande))
+    # 10x mais itens: folga para ruído, mas nada quadrático (e nenhum romaneio real leva segundos)
+    assert tempo_grande < tempo_pequeno * 25
+    assert tempo_grande < 3000